@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+In-memory stand-ins for Playwright's Browser, BrowserContext and Page.
+Shared by the Sentry browser tests so that they run without Chromium.
+
+The fakes answer the scripts Sentry evaluates the way a page running a
+healthy game would. Tests can break a browser through its flags: clear
+``connected`` to make it die, set ``hung`` to make new contexts never
+open, or clear ``resettable`` to make hot page resets report leftovers.
+Every game load is recorded in ``browser.loaded`` as ``(how, what)``.
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from genesis_engine.core.hot_pages import HOT_PAGE_READY, HOT_PAGE_URL, LOAD_GAME, RESET_PAGE
+from genesis_engine.core.sentry_harness import READY_SNAPSHOT, WAIT_FOR_READY
+
+# What the readiness scripts return for a game that started cleanly
+READY = {"setupDone": True, "frames": 3, "errors": [], "readyMs": 1}
+
+class FakePage:
+    def __init__(self, browser):
+        self.browser = browser
+        self.url = "about:blank"
+        self.listeners = {}
+
+    def on(self, event, handler):
+        self.listeners.setdefault(event, []).append(handler)
+
+    def remove_listener(self, event, handler):
+        self.listeners[event].remove(handler)
+
+    async def goto(self, url, wait_until=None):
+        self.browser.check()
+        self.url = url
+        if url != HOT_PAGE_URL:
+            self.browser.loaded.append(("url", url))
+
+    async def set_content(self, html, wait_until=None):
+        self.browser.check()
+        self.browser.loaded.append(("content", html))
+
+    async def evaluate(self, script, *args):
+        self.browser.check()
+        if script == "() => 1 + 1":
+            return 2
+        if script == HOT_PAGE_READY:
+            return True
+        if script == LOAD_GAME:
+            self.browser.loaded.append(("hot", args[0]["title"]))
+            return None
+        if script == RESET_PAGE:
+            self.browser.resets += 1
+            return self.browser.resettable
+        if script in (WAIT_FOR_READY, READY_SNAPSHOT):
+            return dict(READY)
+        return True
+
+class FakeContext:
+    def __init__(self, browser, number):
+        self.browser = browser
+        self.number = number
+        self.routes = []
+        self.closed = False
+
+    async def route(self, pattern, handler):
+        self.routes.append(pattern)
+
+    async def add_init_script(self, script):
+        pass
+
+    async def new_page(self):
+        self.browser.check()
+        return FakePage(self.browser)
+
+    async def close(self):
+        self.closed = True
+
+class FakeBrowser:
+    def __init__(self):
+        self.connected = True
+        self.hung = False
+        self.resettable = True
+        self.version = "fake"
+        self.contexts = []
+        self.loaded = []
+        self.resets = 0
+
+    def is_connected(self):
+        return self.connected
+
+    def check(self):
+        """Fail like Playwright does once the browser is gone."""
+        if not self.connected:
+            raise RuntimeError("Target closed")
+
+    async def new_context(self, **options):
+        if self.hung:
+            await asyncio.sleep(3600)
+        if not self.connected:
+            raise RuntimeError("Browser closed")
+        self.contexts.append(FakeContext(self, len(self.contexts)))
+        return self.contexts[-1]
+
+    async def close(self):
+        self.connected = False
+
+def launcher(browsers):
+    """A BrowserContextPool launch function that appends each new FakeBrowser to ``browsers``."""
+    async def launch():
+        browsers.append(FakeBrowser())
+        return browsers[-1]
+    return launch
@@ -20,7 +20,22 @@ class Settings(BaseSettings):
     anthropic_api_key: Optional[str] = Field(None, env="ANTHROPIC_API_KEY")
     anthropic_model: str = Field("claude-sonnet-4-20250514", env="ANTHROPIC_MODEL")
     api_timeout: int = Field(60, env="API_TIMEOUT")
-    max_retries: int = Field(3, env="MAX_RETRIES")
+    max_retries: int = Field(3, env="MAX_RETRIES")  # attempts per model before falling back to the next
+    retry_budget_ratio: float = Field(0.1, env="RETRY_BUDGET_RATIO")  # process-wide retries per request
+    retry_budget_reserve: int = Field(10, env="RETRY_BUDGET_RESERVE")  # retries available before traffic builds the budget
+    retry_base_delay: float = Field(1.0, env="RETRY_BASE_DELAY")  # seconds; full-jitter backoff doubles per retry
+    retry_max_delay: float = Field(30.0, env="RETRY_MAX_DELAY")  # longer Retry-After values are not waited out
+    session_max_retries: int = Field(8, env="SESSION_MAX_RETRIES")  # LLM retries one generation may spend
+    model_policy_file: Optional[Path] = Field(None, env="MODEL_POLICY_FILE")  # JSON phase → models, reloaded on change
+    llm_providers: list[str] = Field(["anthropic"], env="LLM_PROVIDERS")  # anthropic, openai, stub; routed by live latency
+    anthropic_api_url: str = Field("https://api.anthropic.com/v1/messages", env="ANTHROPIC_API_URL")
+    openai_api_key: Optional[str] = Field(None, env="OPENAI_API_KEY")
+    openai_api_url: str = Field("https://api.openai.com/v1/chat/completions", env="OPENAI_API_URL")
+    openai_model: str = Field("gpt-4o", env="OPENAI_MODEL")  # stands in for Sonnet/Opus
+    openai_fast_model: str = Field("gpt-4o-mini", env="OPENAI_FAST_MODEL")  # stands in for Haiku
+    openai_max_tokens: int = Field(16384, env="OPENAI_MAX_TOKENS")
+    provider_failure_threshold: int = Field(3, env="PROVIDER_FAILURE_THRESHOLD")  # consecutive failures before cooldown
+    provider_cooldown: int = Field(60, env="PROVIDER_COOLDOWN")  # seconds
     
     # Server Configuration
     server_host: str = Field("0.0.0.0", env="SERVER_HOST")
@@ -39,11 +54,82 @@ class Settings(BaseSettings):
     # Game Generation Parameters
     game_max_tokens: int = Field(4096, env="GAME_MAX_TOKENS")
     game_temperature: float = Field(0.7, env="GAME_TEMPERATURE")
+    generation_mode: str = Field("standard", env="GENERATION_MODE")  # standard, incremental, skeleton or modular
+    incremental_max_features: int = Field(8, env="INCREMENTAL_MAX_FEATURES")
+    incremental_feature_retries: int = Field(2, env="INCREMENTAL_FEATURE_RETRIES")
+    incremental_debug_cycles: int = Field(1, env="INCREMENTAL_DEBUG_CYCLES")
+    modular_module_retries: int = Field(1, env="MODULAR_MODULE_RETRIES")
+    modular_debug_cycles: int = Field(1, env="MODULAR_DEBUG_CYCLES")
+    structured_planning: bool = Field(False, env="STRUCTURED_PLANNING")  # JSON GDD/tech plan via tool use
+    max_variants: int = Field(4, env="MAX_VARIANTS")  # Engineer takes sharing one Architect pass
+    variant_temperature_min: float = Field(0.4, env="VARIANT_TEMPERATURE_MIN")
+    variant_temperature_max: float = Field(1.0, env="VARIANT_TEMPERATURE_MAX")
+    context_token_budget: int = Field(12000, env="CONTEXT_TOKEN_BUDGET")  # Engineer/Debugger prompt context
+    debugger_context_lines: int = Field(8, env="DEBUGGER_CONTEXT_LINES")  # lines shown around each error
+    
+    # Warm start from previously validated games
+    enable_warm_start: bool = Field(True, env="ENABLE_WARM_START")
+    warm_start_min_similarity: float = Field(0.15, env="WARM_START_MIN_SIMILARITY")
+    warm_start_max_chars: int = Field(30000, env="WARM_START_MAX_CHARS")
+    
+    # Warm pool of pre-generated games for popular prompts
+    enable_warm_pool: bool = Field(False, env="ENABLE_WARM_POOL")
+    warm_pool_dir: Path = Field(Path("warm_pool"), env="WARM_POOL_DIR")
+    warm_pool_prompts: list[str] = Field(
+        [
+            "A space shooter where you dodge asteroids and collect power-ups",
+            "A platformer where you jump between clouds collecting stars",
+            "A puzzle game where you match colored blocks to clear the board"
+        ],
+        env="WARM_POOL_PROMPTS"
+    )
+    warm_pool_genres: list[str] = Field([], env="WARM_POOL_GENRES")  # skeleton genres, e.g. ["platformer"]
+    warm_pool_size: int = Field(1, env="WARM_POOL_SIZE")  # games kept per prompt/genre
+    warm_pool_max_age: int = Field(86400, env="WARM_POOL_MAX_AGE")  # seconds
+    warm_pool_min_headroom: float = Field(0.5, env="WARM_POOL_MIN_HEADROOM")  # fraction of rate limits left
+    warm_pool_interval: int = Field(60, env="WARM_POOL_INTERVAL")  # seconds between refill checks
+    
+    # Sentry browser testing
+    sentry_browser_slots: int = Field(0, env="SENTRY_BROWSER_SLOTS")  # concurrent browser tests; 0 = one per core
+    p5_cache_dir: Path = Field(Path("vendor/p5"), env="P5_CACHE_DIR")  # <version>/<file> plus manifest.json checksums
+    p5_cache_download: bool = Field(True, env="P5_CACHE_DOWNLOAD")  # false for fully offline builds
+    sentry_ready_frames: int = Field(3, env="SENTRY_READY_FRAMES")  # draw() frames that make a game ready
+    sentry_ready_timeout: float = Field(5.0, env="SENTRY_READY_TIMEOUT")  # seconds to wait for readiness
+    sentry_simulation_seconds: float = Field(120.0, env="SENTRY_SIMULATION_SECONDS")  # virtual play time; 0 disables
+    sentry_simulation_fps: int = Field(60, env="SENTRY_SIMULATION_FPS")
+    sentry_simulation_wall_limit: float = Field(10.0, env="SENTRY_SIMULATION_WALL_LIMIT")  # real seconds per simulation
+    sentry_fuzz_seconds: float = Field(30.0, env="SENTRY_FUZZ_SECONDS")  # virtual play under random input; 0 disables
+    sentry_fuzz_seed: int = Field(1337, env="SENTRY_FUZZ_SEED")  # seeds the input schedule and Math.random
+    sentry_fuzz_events_per_second: float = Field(4.0, env="SENTRY_FUZZ_EVENTS_PER_SECOND")
+    sentry_fuzz_minimize_runs: int = Field(16, env="SENTRY_FUZZ_MINIMIZE_RUNS")  # replays spent shrinking a failing trace
+    sentry_perf_frames: int = Field(300, env="SENTRY_PERF_FRAMES")  # frames timed after simulated play; 0 disables
+    sentry_perf_budget_ms: float = Field(16.7, env="SENTRY_PERF_BUDGET_MS")  # p95 frame time, one 60 fps frame
+    sentry_perf_long_frame_ms: float = Field(50.0, env="SENTRY_PERF_LONG_FRAME_MS")
+    sentry_perf_max_long_frames: int = Field(3, env="SENTRY_PERF_MAX_LONG_FRAMES")
+    sentry_heap_max_growth_mb_per_min: float = Field(2.0, env="SENTRY_HEAP_MAX_GROWTH_MB_PER_MIN")  # 0 disables
+    sentry_heap_samples: int = Field(8, env="SENTRY_HEAP_SAMPLES")  # heap samples across the simulated play
+    sentry_workers: int = Field(0, env="SENTRY_WORKERS")  # browser test processes; 0 runs the browser in the server
+    sentry_worker_slots: int = Field(2, env="SENTRY_WORKER_SLOTS")  # concurrent tests per worker process
+    sentry_worker_max_tests: int = Field(200, env="SENTRY_WORKER_MAX_TESTS")  # recycle a worker after this many tests
+    sentry_worker_max_rss_mb: float = Field(1500.0, env="SENTRY_WORKER_MAX_RSS_MB")  # worker + Chromium; 0 disables
+    sentry_worker_test_timeout: float = Field(180.0, env="SENTRY_WORKER_TEST_TIMEOUT")  # seconds before a worker is killed
+    sentry_worker_max_age: float = Field(3600.0, env="SENTRY_WORKER_MAX_AGE")  # seconds before a worker is recycled; 0 disables
+    sentry_worker_queue_timeout: float = Field(600.0, env="SENTRY_WORKER_QUEUE_TIMEOUT")  # seconds a test may wait for a worker
+    sentry_warm_up: bool = Field(True, env="SENTRY_WARM_UP")  # start the browser with the server and run a warm-up test
+    sentry_probe_interval: float = Field(30.0, env="SENTRY_PROBE_INTERVAL")  # seconds between liveness probes; 0 disables
+    sentry_browser_max_tests: int = Field(500, env="SENTRY_BROWSER_MAX_TESTS")  # recycle the browser after this many tests
+    sentry_browser_max_age: float = Field(3600.0, env="SENTRY_BROWSER_MAX_AGE")  # seconds; 0 disables
+    sentry_browser_max_rss_mb: float = Field(1500.0, env="SENTRY_BROWSER_MAX_RSS_MB")  # Chromium processes; 0 disables
+    sentry_hot_pages: bool = Field(True, env="SENTRY_HOT_PAGES")  # reuse pages with p5.js loaded, reset between tests
+    sentry_hot_page_max_uses: int = Field(50, env="SENTRY_HOT_PAGE_MAX_USES")  # tests before a hot page is replaced
+    sentry_cache_size: int = Field(256, env="SENTRY_CACHE_SIZE")  # validation results kept in memory; 0 disables
+    sentry_cache_dir: Optional[Path] = Field(None, env="SENTRY_CACHE_DIR")  # also persist results here across restarts
     
     # Feature Flags
     enable_mock_mode: bool = Field(False, env="ENABLE_MOCK_MODE")
     enable_websockets: bool = Field(True, env="ENABLE_WEBSOCKETS")
     enable_game_download: bool = Field(True, env="ENABLE_GAME_DOWNLOAD")
+    export_task_graph: bool = Field(False, env="EXPORT_TASK_GRAPH")  # writes task_graph.json per game
     
     # Lovable Platform Note: Set ENABLE_MOCK_MODE=true for Lovable deployment
     # since Lovable doesn't support Python backends
@@ -0,0 +1,405 @@
+"""
+Browser Context Pool for the Sentry Agent
+Hands out a fixed number of concurrent test slots over one headless
+Chromium. Every test runs in a fresh browser context (clean cookies,
+localStorage and cache), pre-created while the slot was idle so tests do
+not wait for it, and the pool records queueing and health metrics. The
+browser can be recycled for a fresh one without interrupting the tests
+running on it.
+
+A slot can also keep a long-lived "hot" page that is reset and reused
+across tests instead of being rebuilt for each one (see hot_pages.py).
+"""
+import asyncio
+import logging
+import os
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+# Seconds each step of a health probe may take before the browser counts as hung
+PROBE_TIMEOUT = 5.0
+
+# Returns a connected Playwright Browser
+LaunchFn = Callable[[], Awaitable[Any]]
+# Sets up a new BrowserContext (routes, init scripts) before it is handed out
+PrepareFn = Callable[[Any], Awaitable[None]]
+# Opens a hot page in a prepared context; resets one after a test, False if it cannot be reused
+OpenPageFn = Callable[[Any], Awaitable[Any]]
+ResetPageFn = Callable[[Any], Awaitable[bool]]
+
+
+def default_slot_count() -> int:
+    """One test slot per CPU core, leaving one core for the server when there are several."""
+    cores = os.cpu_count() or 1
+    return max(1, cores - 1) if cores > 2 else cores
+
+
+class _HotPage:
+    """A page kept open across tests, with the browser it belongs to."""
+
+    def __init__(self, key: str, context, page, browser):
+        self.key = key
+        self.context = context
+        self.page = page
+        self.browser = browser
+        self.uses = 0
+
+
+class _Slot:
+    """One concurrent test slot, the context pre-created for its next test and its hot page."""
+
+    def __init__(self, number: int):
+        self.number = number
+        self.context = None
+        self.hot: Optional[_HotPage] = None
+
+
+class BrowserContextPool:
+    """
+    Concurrent, isolated test slots over one browser.
+
+    ``context()`` waits for a free slot and yields a fresh browser context
+    that is closed afterwards; the slot's next context is created in the
+    background. ``hot_page()`` instead yields the slot's hot page, reused
+    for up to ``hot_page_uses`` tests. ``check_health()`` probes the browser
+    and relaunches it through ``launch`` when it has died.
+    """
+
+    def __init__(self, launch: LaunchFn, slots: Optional[int] = None,
+                 context_options: Optional[Dict[str, Any]] = None, prepare: Optional[PrepareFn] = None,
+                 hot_page_uses: int = 50):
+        self.launch = launch
+        self.slots = slots or default_slot_count()
+        self.context_options = context_options or {}
+        self.prepare = prepare
+        self.hot_page_uses = hot_page_uses
+        self.browser = None
+        self._free: Optional[asyncio.Queue] = None
+        self._slots: List[_Slot] = []
+        self._restart_lock: Optional[asyncio.Lock] = None
+        self._pending: set = set()
+
+        self.tests = 0
+        self.waiting = 0
+        self.max_waiting = 0
+        self.wait_times: List[float] = []
+        self.contexts_created = 0
+        self.context_failures = 0
+        self.hot_pages_opened = 0
+        self.hot_page_reuses = 0
+        self.hot_page_failures = 0
+        self.hot_pages_discarded = 0
+        self.restarts = 0
+        self.healthy = False
+        self.last_health_check: Optional[float] = None
+        self.launched_at: Optional[float] = None
+        self.tests_since_launch = 0
+        self.recycles: Dict[str, int] = {}
+        # Tests running per browser (by id), and replaced browsers waiting for theirs to finish
+        self._in_use: Dict[int, int] = {}
+        self._retired: List[Any] = []
+
+    async def start(self):
+        """Launch the browser and pre-create one context per slot."""
+        self.browser = await self.launch()
+        self._launched()
+        self._free = asyncio.Queue()
+        self._restart_lock = asyncio.Lock()
+        self._slots = [_Slot(number) for number in range(self.slots)]
+        for slot in self._slots:
+            slot.context = await self._new_context()
+            self._free.put_nowait(slot)
+        self.healthy = True
+        logger.info(f"Sentry browser pool started with {self.slots} test slots")
+
+    async def close(self):
+        for task in list(self._pending):
+            task.cancel()
+        for slot in self._slots:
+            await self._close_context(slot.context)
+            slot.context = None
+            await self._drop_hot_page(slot)
+        if self.browser is not None:
+            try:
+                await self.browser.close()
+            except Exception:
+                pass
+            self.browser = None
+        for browser in self._retired:
+            await self._close_browser(browser)
+        self._retired.clear()
+        self.healthy = False
+
+    def _launched(self):
+        self.launched_at = time.monotonic()
+        self.tests_since_launch = 0
+
+    @property
+    def age(self) -> float:
+        """Seconds since the current browser was launched."""
+        return time.monotonic() - self.launched_at if self.launched_at is not None else 0.0
+
+    async def _close_browser(self, browser):
+        try:
+            await browser.close()
+        except Exception:
+            pass
+
+    async def _create_context(self):
+        context = await self.browser.new_context(**self.context_options)
+        self.contexts_created += 1
+        if self.prepare is not None:
+            await self.prepare(context)
+        return context
+
+    async def _new_context(self):
+        try:
+            return await self._create_context()
+        except Exception as e:
+            self.context_failures += 1
+            logger.warning(f"Could not pre-create browser context: {e}")
+            return None
+
+    async def _close_context(self, context):
+        if context is None:
+            return
+        try:
+            await context.close()
+        except Exception:
+            pass
+
+    async def _acquire(self) -> _Slot:
+        """Wait for a free slot, recording how long it took."""
+        if self._free is None:
+            await self.start()
+        queued_at = time.monotonic()
+        self.waiting += 1
+        self.max_waiting = max(self.max_waiting, self.waiting)
+        try:
+            slot = await self._free.get()
+        finally:
+            self.waiting -= 1
+        self.wait_times.append(time.monotonic() - queued_at)
+        del self.wait_times[:-500]
+        return slot
+
+    def _use(self, browser):
+        self._in_use[id(browser)] = self._in_use.get(id(browser), 0) + 1
+        self.tests += 1
+        self.tests_since_launch += 1
+
+    async def _done_with(self, browser):
+        self._in_use[id(browser)] -= 1
+        if not self._in_use[id(browser)]:
+            del self._in_use[id(browser)]
+        await self._close_retired()
+
+    @asynccontextmanager
+    async def context(self):
+        """Wait for a free slot and yield a fresh browser context for one test."""
+        slot = await self._acquire()
+        context, slot.context = slot.context, None
+        owner = None
+        try:
+            if context is not None and getattr(context, "browser", self.browser) is not self.browser:
+                await self._close_context(context)  # Pre-created on a browser replaced since
+                context = None
+            if context is None:
+                context = await self._create_context()
+            owner = getattr(context, "browser", None) or self.browser
+            self._use(owner)
+            yield context
+        finally:
+            await self._close_context(context)
+            if owner is not None:
+                await self._done_with(owner)
+            # Pre-create the slot's next context without holding up this test's result
+            task = asyncio.create_task(self._release(slot))
+            self._pending.add(task)
+            task.add_done_callback(self._pending.discard)
+
+    async def _release(self, slot: _Slot):
+        try:
+            if self.browser is not None and self.browser.is_connected():
+                slot.context = await self._new_context()
+        finally:
+            self._free.put_nowait(slot)
+
+    @asynccontextmanager
+    async def hot_page(self, key: str, open_page: OpenPageFn, reset: ResetPageFn):
+        """
+        Wait for a free slot and yield its hot page for ``key``.
+
+        The page is opened with ``open_page(context)`` in a new prepared
+        context when the slot has none for ``key`` on the current browser,
+        or has used it ``hot_page_uses`` times; if that fails, None is
+        yielded and the caller falls back to ``context()``. After a test
+        that finished normally ``reset(page)`` readies the page for the
+        next one; otherwise, or when the reset fails, the page is closed.
+        """
+        slot = await self._acquire()
+        hot, slot.hot = slot.hot, None
+        keep = False
+        try:
+            if hot is not None and (hot.key != key or hot.browser is not self.browser
+                                    or hot.uses >= self.hot_page_uses):
+                await self._close_context(hot.context)
+                hot = None
+            if hot is None:
+                hot = await self._open_hot_page(key, open_page)
+            else:
+                self.hot_page_reuses += 1
+            if hot is None:
+                yield None
+                return
+            self._use(hot.browser)
+            try:
+                hot.uses += 1
+                yield hot.page
+                try:
+                    keep = await reset(hot.page)
+                except Exception as e:
+                    logger.warning(f"Could not reset hot page: {e}")
+                if not keep:
+                    self.hot_pages_discarded += 1
+            finally:
+                await self._done_with(hot.browser)
+        finally:
+            if keep:
+                slot.hot = hot
+            elif hot is not None:
+                await self._close_context(hot.context)
+            self._free.put_nowait(slot)
+
+    async def _open_hot_page(self, key: str, open_page: OpenPageFn) -> Optional[_HotPage]:
+        browser, context = self.browser, None
+        try:
+            context = await self._create_context()
+            page = await open_page(context)
+        except Exception as e:
+            self.hot_page_failures += 1
+            logger.warning(f"Could not open a hot page for {key}: {e}")
+            await self._close_context(context)
+            return None
+        self.hot_pages_opened += 1
+        return _HotPage(key, context, page, browser)
+
+    async def _drop_hot_page(self, slot: _Slot):
+        hot, slot.hot = slot.hot, None
+        if hot is not None:
+            await self._close_context(hot.context)
+
+    async def recycle(self, reason: str) -> bool:
+        """
+        Swap in a freshly launched browser.
+
+        Tests already running keep their contexts on the old browser, which
+        is closed once the last of them finishes; idle slots start over on
+        the new one.
+        """
+        async with self._restart_lock:
+            try:
+                browser = await self.launch()
+            except Exception as e:
+                logger.error(f"Could not launch a browser to recycle the old one ({reason}): {e}")
+                return False
+            old, self.browser = self.browser, browser
+            self._launched()
+            self.recycles[reason] = self.recycles.get(reason, 0) + 1
+            stale = []
+            for slot in self._slots:
+                if slot.context is not None:
+                    stale.append(slot.context)
+                    slot.context = None
+                if slot.hot is not None:
+                    stale.append(slot.hot.context)
+                    slot.hot = None
+            for context in stale:
+                await self._close_context(context)
+            if old is not None:
+                self._retired.append(old)
+            await self._close_retired()
+            logger.info(f"Sentry browser recycled ({reason})")
+            return True
+
+    async def _close_retired(self):
+        for browser in [browser for browser in self._retired if not self._in_use.get(id(browser))]:
+            self._retired.remove(browser)
+            await self._close_browser(browser)
+
+    async def check_health(self) -> bool:
+        """Probe the browser with a throwaway page; relaunch it if the probe fails."""
+        self.last_health_check = time.time()
+        if self.browser is not None and await self._probe():
+            self.healthy = True
+            return True
+
+        async with self._restart_lock:
+            if self.browser is not None and await self._probe():
+                self.healthy = True
+                return True
+            logger.warning("Sentry browser failed its health check - relaunching")
+            self.restarts += 1
+            try:
+                if self.browser is not None:
+                    try:
+                        await self.browser.close()
+                    except Exception:
+                        pass
+                self.browser = await self.launch()
+                self._launched()
+            except Exception as e:
+                logger.error(f"Sentry browser relaunch failed: {e}")
+                self.healthy = False
+                return False
+            # Contexts from the dead browser are useless; idle slots get new ones
+            for slot in self._slots:
+                slot.context = None
+                slot.hot = None
+            self.healthy = True
+            return True
+
+    async def _probe(self) -> bool:
+        if not self.browser.is_connected():
+            return False
+        context = None
+        try:
+            # Every step is bounded: a zombie browser stays connected but never answers
+            context = await asyncio.wait_for(self.browser.new_context(), PROBE_TIMEOUT)
+            page = await asyncio.wait_for(context.new_page(), PROBE_TIMEOUT)
+            return await asyncio.wait_for(page.evaluate("() => 1 + 1"), PROBE_TIMEOUT) == 2
+        except Exception:
+            return False
+        finally:
+            await self._close_context(context)
+
+    def metrics(self) -> Dict[str, Any]:
+        """Slot usage, queueing and health."""
+        waits = sorted(self.wait_times)
+        free = self._free.qsize() if self._free is not None else 0
+        return {
+            "slots": self.slots,
+            "in_use": self.slots - free if self._free is not None else 0,
+            "waiting": self.waiting,
+            "max_waiting": self.max_waiting,
+            "tests": self.tests,
+            "wait_ms_avg": round(sum(waits) / len(waits) * 1000, 1) if waits else 0.0,
+            "wait_ms_p95": round(waits[int(0.95 * (len(waits) - 1))] * 1000, 1) if waits else 0.0,
+            "contexts_created": self.contexts_created,
+            "context_failures": self.context_failures,
+            "hot_pages": sum(1 for slot in self._slots if slot.hot is not None),
+            "hot_pages_opened": self.hot_pages_opened,
+            "hot_page_reuses": self.hot_page_reuses,
+            "hot_page_failures": self.hot_page_failures,
+            "hot_pages_discarded": self.hot_pages_discarded,
+            "restarts": self.restarts,
+            "recycles": dict(self.recycles),
+            "browser_age_s": round(self.age, 1),
+            "tests_since_launch": self.tests_since_launch,
+            "retired_browsers": len(self._retired),
+            "healthy": self.healthy,
+            "last_health_check": self.last_health_check
+        }
@@ -0,0 +1,222 @@
+"""
+Prompt Context Builder for AI Genesis Engine
+Keeps Engineer and Debugger prompts flat across debug cycles: planning
+documents are stripped of markdown boilerplate and deduplicated, the
+Debugger sees only the code regions Sentry's errors point at plus an outline
+of the rest, and every prompt is trimmed to a token budget measured with a
+local estimator.
+"""
+import re
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from .input_fuzzer import fuzz_failure_summary
+
+# Roughly one token per short word piece or punctuation mark
+_TOKEN_PIECE = re.compile(r"[A-Za-z]{1,4}|\d{1,3}|[^\sA-Za-z\d]")
+
+_HEADING = re.compile(r'^[ \t]{0,3}#{1,6}[ \t]+', re.MULTILINE)
+_EMPHASIS = re.compile(r'(\*\*|__|(?<!\w)\*(?=\S)|(?<=\S)\*(?!\w))')
+_RULE = re.compile(r'^[ \t]*([-*_][ \t]*){3,}$', re.MULTILINE)
+
+_SIGNATURE = re.compile(
+    r'^\s*(?:(?:async\s+)?function\s*\*?\s*[\w$]+\s*\([^)]*\)'
+    r'|class\s+[\w$]+(?:\s+extends\s+[\w$.]+)?'
+    r'|(?:const|let|var)\s+[\w$]+\s*=\s*(?:async\s*)?(?:function\b|\([^)]*\)\s*=>|[\w$]+\s*=>)'
+    r'|(?!(?:if|for|while|switch|catch|return|function)\b)(?:async\s+|static\s+|get\s+|set\s+)*[\w$]+\s*\([^)]*\)\s*\{)'
+)
+_LINE_REFERENCE = re.compile(r'\bline\s+(\d+)', re.IGNORECASE)
+_QUOTED_NAME = re.compile(r"['\"`]([A-Za-z_$][\w$]*)['\"`]")
+_UNDEFINED_NAME = re.compile(r'([A-Za-z_$][\w$.]*)\s+is\s+(?:not\s+defined|not\s+a\s+function|undefined|null)')
+_CALLED_NAME = re.compile(r'([A-Za-z_$][\w$]*)\(\)')
+
+PATCH_BLOCK = re.compile(
+    r'<{5,}\s*SEARCH\s*\n(.*?)\n={5,}\s*\n(.*?)\n?>{5,}\s*REPLACE',
+    re.DOTALL
+)
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the token count of a text without calling the API."""
+    return len(_TOKEN_PIECE.findall(text or ""))
+
+
+def strip_markdown(text: str) -> str:
+    """Drop markdown decoration that costs tokens but carries no content."""
+    text = _RULE.sub('', text or "")
+    text = _HEADING.sub('', text)
+    text = _EMPHASIS.sub('', text)
+    text = re.sub(r'```[a-zA-Z]*\n?', '', text)
+    text = re.sub(r'[ \t]+\n', '\n', text)
+    return re.sub(r'\n{3,}', '\n\n', text).strip()
+
+
+def dedupe_lines(sections: List[str], min_length: int = 20) -> List[str]:
+    """Remove lines of later sections that already appeared in an earlier one."""
+    seen = set()
+    result = []
+    for section in sections:
+        kept = []
+        for line in section.splitlines():
+            key = re.sub(r'\W+', ' ', line).strip().lower()
+            if len(key) >= min_length:
+                if key in seen:
+                    continue
+                seen.add(key)
+            kept.append(line)
+        result.append("\n".join(kept))
+    return result
+
+
+def truncate_to_tokens(text: str, budget: int) -> str:
+    """Cut a text to roughly ``budget`` tokens on a line boundary."""
+    if estimate_tokens(text) <= budget:
+        return text
+    kept, used = [], 0
+    for line in text.splitlines():
+        cost = estimate_tokens(line) + 1
+        if used + cost > budget:
+            break
+        kept.append(line)
+        used += cost
+    return "\n".join(kept) + "\n[... truncated to fit the context budget ...]"
+
+
+def code_outline(code: str) -> List[Tuple[int, str]]:
+    """1-based line numbers and text of function, method and class signatures."""
+    return [(number, line.strip().rstrip('{').strip())
+            for number, line in enumerate(code.splitlines(), 1)
+            if _SIGNATURE.match(line)]
+
+
+def referenced_lines(code: str, errors: Iterable[str]) -> List[int]:
+    """1-based line numbers of the code that error messages point at."""
+    lines = code.splitlines()
+    targets = set()
+    names = set()
+    for error in errors:
+        for match in _LINE_REFERENCE.finditer(error):
+            targets.add(int(match.group(1)))
+        names.update(_QUOTED_NAME.findall(error))
+        names.update(name.split(".")[-1] for name in _UNDEFINED_NAME.findall(error))
+        names.update(_CALLED_NAME.findall(error))
+
+    for name in names:
+        pattern = re.compile(r'(?<![\w$])' + re.escape(name) + r'(?![\w$])')
+        hits = [number for number, line in enumerate(lines, 1) if pattern.search(line)]
+        # A name used everywhere says little about where the bug is
+        targets.update(hits[:6])
+    return sorted(number for number in targets if 1 <= number <= len(lines))
+
+
+def code_regions(code: str, line_numbers: List[int], context: int = 6) -> List[Tuple[int, int]]:
+    """Merge windows of ``context`` lines around each line into (start, end) regions."""
+    total = len(code.splitlines())
+    regions: List[Tuple[int, int]] = []
+    for number in sorted(line_numbers):
+        start, end = max(1, number - context), min(total, number + context)
+        if regions and start <= regions[-1][1] + 1:
+            regions[-1] = (regions[-1][0], max(regions[-1][1], end))
+        else:
+            regions.append((start, end))
+    return regions
+
+
+def render_code_excerpt(code: str, errors: Iterable[str], context: int = 6) -> str:
+    """Error-referenced code regions followed by an outline of everything else."""
+    lines = code.splitlines()
+    regions = code_regions(code, referenced_lines(code, errors), context)
+    if not regions:
+        # Nothing to anchor on: the whole file is the relevant region
+        regions = [(1, len(lines))] if lines else []
+    shown = set()
+    parts = []
+    for start, end in regions:
+        shown.update(range(start, end + 1))
+        excerpt = "\n".join(lines[start - 1:end])
+        parts.append(f"--- lines {start}-{end} ---\n{excerpt}")
+
+    outline = [f"{number}: {signature}" for number, signature in code_outline(code) if number not in shown]
+    if outline:
+        parts.append("--- outline of the remaining code ---\n" + "\n".join(outline))
+    return "\n\n".join(parts)
+
+
+def compact_test_results(test_results: Dict) -> str:
+    """Unique error messages from a Sentry result, one per line, then any failing input trace."""
+    messages = []
+    for key in ("errors", "runtime_errors", "console_errors"):
+        for message in test_results.get(key) or []:
+            line = " ".join(str(message).split())
+            if line not in messages:
+                messages.append(line)
+    report = "\n".join(f"- {message}" for message in messages) or "- Validation failed without a specific error"
+    trace = fuzz_failure_summary(test_results.get("fuzz"))
+    if trace:
+        report += "\n- " + trace.replace("\n", "\n    ")
+    return report
+
+
+def apply_patches(code: str, response: str) -> Optional[str]:
+    """
+    Apply SEARCH/REPLACE blocks from a Debugger response.
+
+    Returns the patched code, or None when the response has no blocks or a
+    search text does not occur exactly once in the code.
+    """
+    blocks = PATCH_BLOCK.findall(response or "")
+    if not blocks:
+        return None
+    for search, replace in blocks:
+        if code.count(search) != 1:
+            return None
+        code = code.replace(search, replace)
+    return code
+
+
+@dataclass
+class ContextSection:
+    """A named piece of prompt context."""
+    name: str
+    text: str
+    priority: int  # higher survives trimming longer
+    min_tokens: int = 0
+    atomic: bool = False  # dropped whole rather than truncated
+
+
+class ContextBuilder:
+    """
+    Assembles prompt sections within a token budget.
+
+    Sections over budget are trimmed lowest priority first, each down to its
+    ``min_tokens`` floor, so required context like the error list always
+    survives while bulky reference material goes first. Atomic sections,
+    such as a reference game whose truncated half would be misleading, are
+    dropped whole instead.
+    """
+
+    def __init__(self, token_budget: int):
+        self.token_budget = token_budget
+        self.sections: List[ContextSection] = []
+
+    def add(self, name: str, text: Optional[str], priority: int, min_tokens: int = 0,
+            atomic: bool = False) -> "ContextBuilder":
+        self.sections.append(ContextSection(name, text or "", priority, min_tokens, atomic))
+        return self
+
+    def build(self) -> Dict[str, str]:
+        """Section name -> text, trimmed to fit the budget together."""
+        texts = {section.name: section.text for section in self.sections}
+        over = sum(estimate_tokens(text) for text in texts.values()) - self.token_budget
+        for section in sorted(self.sections, key=lambda s: s.priority):
+            if over <= 0:
+                break
+            current = estimate_tokens(texts[section.name])
+            keep = 0 if section.atomic else max(section.min_tokens, current - over)
+            if keep < current:
+                texts[section.name] = truncate_to_tokens(texts[section.name], keep) if keep > 0 else ""
+                over -= current - estimate_tokens(texts[section.name])
+        return texts
+
+    def total_tokens(self) -> int:
+        return sum(estimate_tokens(text) for text in self.build().values())
@@ -0,0 +1,154 @@
+"""
+Structured Planning Documents for AI Genesis Engine
+Schemas for the Architect's Game Design Document and technical plan when
+they are requested as JSON, plus renderers for the markdown files written to
+the project and compact context strings for downstream agents.
+"""
+import json
+from typing import Any, Dict, List, Literal, Optional, Type
+
+from pydantic import BaseModel, Field, ValidationError
+
+from .skeletons import SKELETONS
+
+
+class GameDesign(BaseModel):
+    """Game Design Document as structured data."""
+    title: str = Field(description="Game title")
+    concept: str = Field(description="One or two sentence pitch")
+    core_mechanics: List[str] = Field(min_length=1, description="Rules and systems the game is built on")
+    controls: List[str] = Field(min_length=1, description="'<input>: <action>' entries, e.g. 'Arrow keys: move'")
+    win_conditions: List[str] = Field(default_factory=list)
+    loss_conditions: List[str] = Field(default_factory=list)
+    entities: List[str] = Field(default_factory=list, description="Player, enemies, items, each with a short description")
+    visual_style: str = Field("", description="Colors and shapes, drawn with simple p5.js primitives")
+    target_audience: str = ""
+    technical_requirements: List[str] = Field(default_factory=list)
+    genre: Optional[str] = Field(
+        None, description=f"Closest ready-made genre, one of: {', '.join(SKELETONS)}; null if none fits"
+    )
+
+
+class CodeComponent(BaseModel):
+    """A class or function group in the planned code."""
+    name: str
+    kind: Literal["class", "function", "module"] = "class"
+    responsibility: str
+    members: List[str] = Field(default_factory=list, description="Key methods, functions or fields")
+
+
+class PlanStep(BaseModel):
+    """One step of the implementation order."""
+    title: str
+    details: List[str] = Field(default_factory=list)
+
+
+class TechnicalPlan(BaseModel):
+    """Technical implementation plan as structured data."""
+    architecture: str = Field(description="How the single HTML file and p5.js sketch are organised")
+    components: List[CodeComponent] = Field(min_length=1)
+    game_states: List[str] = Field(default_factory=list, description="e.g. start, playing, game over")
+    implementation_order: List[PlanStep] = Field(min_length=1)
+    technical_challenges: List[str] = Field(default_factory=list)
+    libraries: List[str] = Field(default_factory=lambda: ["p5.js"])
+
+
+def tool_definition(model: Type[BaseModel], name: str, description: str) -> Dict[str, Any]:
+    """Anthropic tool definition whose input schema is the model's JSON schema."""
+    return {
+        "name": name,
+        "description": description,
+        "input_schema": model.model_json_schema()
+    }
+
+
+def parse_document(model: Type[BaseModel], data: Any) -> Dict[str, Any]:
+    """
+    Validate LLM output against a document schema.
+
+    Accepts a dict or a JSON string and returns the normalized dict.
+    Raises ValueError when the output does not match the schema.
+    """
+    try:
+        if isinstance(data, str):
+            return model.model_validate_json(data).model_dump()
+        return model.model_validate(data).model_dump()
+    except ValidationError as e:
+        raise ValueError(f"{model.__name__} does not match its schema: {e.error_count()} errors") from e
+
+
+def compact_context(document: Dict[str, Any]) -> str:
+    """Minified JSON for passing a structured document to the next agent."""
+    return json.dumps(document, separators=(",", ":"), ensure_ascii=False)
+
+
+def _bullets(items: List[str]) -> str:
+    return "\n".join(f"- {item}" for item in items) if items else "- None specified"
+
+
+def render_gdd_markdown(design: Dict[str, Any]) -> str:
+    """Render a structured design as the GDD.md document."""
+    return f"""# Game Design Document: {design['title']}
+
+## Concept
+{design['concept']}
+
+## Core Mechanics
+{_bullets(design['core_mechanics'])}
+
+## Player Controls
+{_bullets(design['controls'])}
+
+## Win/Loss Conditions
+**Win:**
+{_bullets(design['win_conditions'])}
+
+**Lose:**
+{_bullets(design['loss_conditions'])}
+
+## Entities
+{_bullets(design['entities'])}
+
+## Visual Style
+{design['visual_style'] or 'Simple geometric shapes'}
+
+## Target Audience
+{design['target_audience'] or 'General'}
+
+## Technical Requirements
+{_bullets(design['technical_requirements'])}
+"""
+
+
+def render_tech_plan_markdown(plan: Dict[str, Any]) -> str:
+    """Render a structured plan as the TECH_PLAN.md document."""
+    components = "\n\n".join(
+        f"### {component['name']} ({component['kind']})\n{component['responsibility']}"
+        + (f"\n{_bullets(component['members'])}" if component['members'] else "")
+        for component in plan['components']
+    )
+    # One sub-heading per step keeps the order parseable by extract_features
+    steps = "\n\n".join(
+        f"### {step['title']}" + (f"\n{_bullets(step['details'])}" if step['details'] else "")
+        for step in plan['implementation_order']
+    )
+    return f"""# Technical Implementation Plan
+
+## Architecture
+{plan['architecture']}
+
+## Core Classes and Functions
+{components}
+
+## Game States
+{_bullets(plan['game_states'])}
+
+## Implementation Order
+{steps}
+
+## Key Technical Challenges
+{_bullets(plan['technical_challenges'])}
+
+## Dependencies and Libraries
+{_bullets(plan['libraries'])}
+"""
@@ -0,0 +1,166 @@
+"""
+JS Heap Growth Monitor for the Sentry Agent
+Samples a game's JavaScript heap while minutes of play are simulated, fits
+a line through the samples and flags steady growth, the signature of
+``bullets``/``enemies`` arrays that are never trimmed or of per-frame
+allocations that stay reachable. Samples come from the Chrome DevTools
+Protocol after a forced garbage collection, or from ``performance.memory``
+when no CDP session is available. For a leaking game, two heap snapshots
+taken a stretch of play apart show which object types are piling up.
+"""
+import json
+import logging
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+HEAP_USED = "() => performance.memory ? performance.memory.usedJSHeapSize : null"
+
+# A trend must explain most of the variation and add up to real memory before it counts as a leak
+MIN_TREND_FIT = 0.7
+MIN_GROWTH_MB = 1.0
+
+# (count, self size in bytes) per constructor name
+TypeCounts = Dict[str, Tuple[int, int]]
+
+
+class HeapSampler:
+    """Used JS heap size of one page, through CDP when the browser offers it."""
+
+    def __init__(self, page, cdp=None):
+        self.page = page
+        self.cdp = cdp
+
+    @classmethod
+    async def attach(cls, page) -> "HeapSampler":
+        try:
+            cdp = await page.context.new_cdp_session(page)
+            await cdp.send("HeapProfiler.enable")
+        except Exception as e:
+            logger.debug(f"No CDP session for heap sampling, using performance.memory: {e}")
+            cdp = None
+        return cls(page, cdp)
+
+    @property
+    def source(self) -> str:
+        return "cdp" if self.cdp else "performance.memory"
+
+    async def sample(self) -> Optional[int]:
+        """Bytes of live JS heap; with CDP, measured after a full garbage collection."""
+        if self.cdp:
+            await self.cdp.send("HeapProfiler.collectGarbage")
+            usage = await self.cdp.send("Runtime.getHeapUsage")
+            return int(usage["usedSize"])
+        used = await self.page.evaluate(HEAP_USED)
+        return int(used) if used is not None else None
+
+    async def type_counts(self) -> Optional[TypeCounts]:
+        """Object counts and sizes by constructor from a full heap snapshot (CDP only)."""
+        if not self.cdp:
+            return None
+        chunks: List[str] = []
+        handler = lambda params: chunks.append(params["chunk"])
+        self.cdp.on("HeapProfiler.addHeapSnapshotChunk", handler)
+        try:
+            await self.cdp.send("HeapProfiler.takeHeapSnapshot", {"reportProgress": False})
+        finally:
+            self.cdp.remove_listener("HeapProfiler.addHeapSnapshotChunk", handler)
+        return aggregate_snapshot(json.loads("".join(chunks)))
+
+    async def close(self):
+        if self.cdp:
+            try:
+                await self.cdp.detach()
+            except Exception:
+                pass
+
+
+def aggregate_snapshot(snapshot: Dict[str, Any]) -> TypeCounts:
+    """Count and total self size of the objects and arrays in a V8 heap snapshot, by constructor name."""
+    meta = snapshot["snapshot"]["meta"]
+    fields = meta["node_fields"]
+    type_names = meta["node_types"][0]
+    type_at, name_at, size_at = fields.index("type"), fields.index("name"), fields.index("self_size")
+    nodes, strings = snapshot["nodes"], snapshot["strings"]
+    counts: Dict[str, List[int]] = {}
+    for start in range(0, len(nodes), len(fields)):
+        kind = type_names[nodes[start + type_at]]
+        if kind not in ("object", "array", "closure"):
+            continue
+        name = strings[nodes[start + name_at]] if kind != "closure" else "(closure)"
+        entry = counts.setdefault(name, [0, 0])
+        entry[0] += 1
+        entry[1] += nodes[start + size_at]
+    return {name: (count, size) for name, (count, size) in counts.items()}
+
+
+def retained_type_growth(before: TypeCounts, after: TypeCounts, top: int = 5) -> List[Dict[str, Any]]:
+    """The object types whose instance count grew most between two snapshots."""
+    growth = []
+    for name, (count, size) in after.items():
+        old_count, old_size = before.get(name, (0, 0))
+        if count > old_count:
+            growth.append({"type": name, "added": count - old_count, "bytes": size - old_size, "count": count})
+    growth.sort(key=lambda entry: (entry["added"], entry["bytes"]), reverse=True)
+    return growth[:top]
+
+
+def fit_trend(points: Sequence[Tuple[float, float]]) -> Tuple[float, float]:
+    """Least-squares slope of y over x and the fit's R²; (0, 0) when there is no trend to fit."""
+    n = len(points)
+    if n < 2:
+        return 0.0, 0.0
+    mean_x = sum(x for x, _ in points) / n
+    mean_y = sum(y for _, y in points) / n
+    sxx = sum((x - mean_x) ** 2 for x, _ in points)
+    syy = sum((y - mean_y) ** 2 for _, y in points)
+    if sxx == 0:
+        return 0.0, 0.0
+    slope = sum((x - mean_x) * (y - mean_y) for x, y in points) / sxx
+    r_squared = (slope * slope * sxx / syy) if syy else 0.0
+    return slope, r_squared
+
+
+def heap_report(samples: Sequence[Tuple[float, Optional[int]]], max_growth_mb_per_min: float,
+                source: str) -> Optional[Dict[str, Any]]:
+    """
+    Growth trend of (simulated seconds, heap bytes) samples.
+
+    The heap counts as leaking when it grows faster than
+    ``max_growth_mb_per_min`` on a line that fits the samples well and
+    adds up to at least ``MIN_GROWTH_MB`` over the session.
+    """
+    points = [(seconds, used / 1024 / 1024) for seconds, used in samples if used is not None]
+    if len(points) < 3:
+        return None
+    slope, r_squared = fit_trend(points)
+    growth_mb = points[-1][1] - points[0][1]
+    per_minute = slope * 60
+    return {
+        "source": source,
+        "samples": [[round(seconds, 2), round(mb, 3)] for seconds, mb in points],
+        "start_mb": round(points[0][1], 2),
+        "end_mb": round(points[-1][1], 2),
+        "growth_mb": round(growth_mb, 2),
+        "growth_mb_per_min": round(per_minute, 3),
+        "fit_r2": round(r_squared, 3),
+        "limit_mb_per_min": max_growth_mb_per_min,
+        "leaking": per_minute > max_growth_mb_per_min and r_squared >= MIN_TREND_FIT and growth_mb >= MIN_GROWTH_MB,
+        "retained_types": None
+    }
+
+
+def heap_errors(report: Optional[Dict[str, Any]]) -> List[str]:
+    """A validation error for a leaking heap, naming the types that pile up when they are known."""
+    if not report or not report["leaking"]:
+        return []
+    seconds = report["samples"][-1][0] - report["samples"][0][0]
+    message = (
+        f"JS heap grows without bound: {report['start_mb']}MB to {report['end_mb']}MB over {seconds:g}s of play "
+        f"({report['growth_mb_per_min']}MB/min, limit {report['limit_mb_per_min']:g}MB/min). Remove bullets, "
+        f"enemies and particles that leave the screen or die, and avoid creating objects every frame"
+    )
+    if report["retained_types"]:
+        types = ", ".join(f"{entry['type']} +{entry['added']}" for entry in report["retained_types"])
+        message += f". Objects piling up: {types}"
+    return [message]
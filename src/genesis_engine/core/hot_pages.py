@@ -0,0 +1,259 @@
+"""
+Hot Pages for the Sentry Agent
+Loading a game in a fresh page makes the browser fetch, parse and compile
+p5.js again before a single line of the game runs. A hot page loads p5.js
+once, with no sketch started; each test then injects only the game's
+markup and inline scripts, starts p5 in global mode, and resets the page
+afterwards so the next game finds it as it was.
+
+The game's scripts run inside one function scope, so their top-level
+``let``/``const`` declarations do not outlive the test; the p5.js hooks
+and top-level functions they define are put on ``window`` for p5 and for
+inline event handlers. Games that would behave differently that way
+(instance mode, modules, extra libraries) keep using fresh pages.
+"""
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional
+
+from .js_tokenizer import tokenize
+from .p5_vendor import parse_p5_url
+
+# Served to hot pages through route(); never fetched from the network
+HOT_PAGE_URL = "https://hot-page.sentry.invalid/"
+
+# Functions p5.js global mode looks up on window
+P5_HOOKS = (
+    "preload", "setup", "draw", "windowResized",
+    "keyPressed", "keyReleased", "keyTyped",
+    "mousePressed", "mouseReleased", "mouseClicked", "doubleClicked",
+    "mouseMoved", "mouseDragged", "mouseWheel",
+    "touchStarted", "touchMoved", "touchEnded",
+    "deviceMoved", "deviceTurned", "deviceShaken"
+)
+
+_SCRIPT = re.compile(r'<script\b([^>]*)>(.*?)</script\s*>', re.DOTALL | re.IGNORECASE)
+_SRC = re.compile(r'\bsrc\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s>]+))', re.IGNORECASE)
+_TYPE = re.compile(r'\btype\s*=\s*["\']?([^"\'\s>]+)', re.IGNORECASE)
+_JS_TYPES = {"text/javascript", "application/javascript", "text/ecmascript", "application/ecmascript"}
+_HEAD = re.compile(r'<head\b[^>]*>(.*?)</head\s*>', re.DOTALL | re.IGNORECASE)
+_BODY = re.compile(r'<body\b([^>]*)>(.*?)(?:</body\s*>|$)', re.DOTALL | re.IGNORECASE)
+_TITLE = re.compile(r'<title\b[^>]*>(.*?)</title\s*>', re.DOTALL | re.IGNORECASE)
+_STYLES = re.compile(
+    r'<style\b[^>]*>.*?</style\s*>|<link\b[^>]*\brel\s*=\s*["\']?stylesheet[^>]*>', re.DOTALL | re.IGNORECASE
+)
+_ATTRIBUTE = re.compile(r'([^\s=/>]+)(?:\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s>]+)))?')
+
+# Installed by the hot page itself, after p5.js. __hotPage.load(game) puts a
+# game in the page and starts it; __hotPage.reset(seed) removes everything
+# the game left behind (sketch, DOM, globals, listeners, timers, storage)
+# and returns false when something could not be undone.
+HOT_PAGE_SCRIPT = r"""
+(() => {
+  const hot = { tracking: false, listeners: [] };
+  const tracked = () => [window, document, document.documentElement, document.body];
+  const addEventListener = EventTarget.prototype.addEventListener;
+  EventTarget.prototype.addEventListener = function (type, listener, options) {
+    if (hot.tracking && tracked().includes(this)) hot.listeners.push([this, type, listener, options]);
+    return addEventListener.call(this, type, listener, options);
+  };
+
+  // Taken once p5.js has loaded, before any game
+  hot.snapshot = () => {
+    hot.globals = new Map();
+    for (const name of Object.getOwnPropertyNames(window)) {
+      const descriptor = Object.getOwnPropertyDescriptor(window, name);
+      hot.globals.set(name, descriptor && 'value' in descriptor && descriptor.writable ? descriptor.value : hot);
+    }
+    hot.head = new Set(document.head.childNodes);
+    hot.title = document.title;
+    hot.timer = setTimeout(() => {}, 0);
+    return typeof window.p5 === 'function';
+  };
+
+  hot.load = (game) => {
+    if (window.__sentry) window.__sentry.reset();
+    hot.tracking = true;
+    document.title = game.title;
+    document.head.insertAdjacentHTML('beforeend', game.head);
+    for (const [name, value] of game.bodyAttributes) document.body.setAttribute(name, value);
+    document.body.innerHTML = game.body;
+    const script = document.createElement('script');
+    script.textContent = game.code;
+    document.body.appendChild(script);
+    // As p5.js does on the load event of a page that defines a sketch
+    if (typeof window.setup === 'function' || typeof window.draw === 'function') {
+      if (window.__sentry) window.__sentry.instrument();
+      try {
+        new window.p5();
+      } catch (error) {
+        window.reportError(error);
+      }
+    }
+  };
+
+  hot.define = (functions) => {
+    for (const [name, value] of Object.entries(functions)) {
+      if (typeof value === 'function') window[name] = value;
+    }
+  };
+
+  hot.reset = (seed) => {
+    let clean = true;
+    hot.tracking = false;
+    try {
+      if (window.p5 && window.p5.instance) window.p5.instance.remove();
+    } catch (error) {
+      clean = false;
+    }
+    for (const [target, type, listener, options] of hot.listeners) target.removeEventListener(type, listener, options);
+    hot.listeners = [];
+    for (const target of tracked()) {
+      for (const name in target) {
+        if (name.startsWith('on') && target[name] !== null && !(target === window && hot.globals.get(name) !== hot)) {
+          try { target[name] = null; } catch (error) { clean = false; }
+        }
+      }
+    }
+    for (const name of Object.getOwnPropertyNames(window)) {
+      if (!hot.globals.has(name)) {
+        try { delete window[name]; } catch (error) { /* reported below */ }
+        if (Object.prototype.hasOwnProperty.call(window, name)) clean = false;
+      }
+    }
+    for (const [name, value] of hot.globals) {
+      if (value === hot) {
+        if (!Object.prototype.hasOwnProperty.call(window, name)) clean = false;
+      } else if (window[name] !== value) {
+        try { window[name] = value; } catch (error) { /* reported below */ }
+        if (window[name] !== value) clean = false;
+      }
+    }
+    if (window.__virtualTime) {
+      window.__virtualTime.reset();
+    } else {
+      const last = setTimeout(() => {}, 0);
+      for (let id = hot.timer + 1; id <= last; id++) { clearTimeout(id); clearInterval(id); }
+    }
+    for (const node of [...document.head.childNodes]) if (!hot.head.has(node)) node.remove();
+    for (const name of document.body.getAttributeNames()) document.body.removeAttribute(name);
+    document.body.replaceChildren();
+    document.title = hot.title;
+    try { localStorage.clear(); sessionStorage.clear(); } catch (error) { /* storage disabled */ }
+    if (window.__sentry) window.__sentry.reset();
+    if (window.__fuzz) window.__fuzz.reseed(seed);
+    return clean;
+  };
+
+  window.__hotPage = hot;
+})();
+"""
+
+HOT_PAGE_READY = "() => window.__hotPage ? window.__hotPage.snapshot() : false"
+LOAD_GAME = "(game) => window.__hotPage.load(game)"
+RESET_PAGE = "(seed) => window.__hotPage.reset(seed)"
+
+
+def hot_page_html(p5_src: str) -> str:
+    """The document of a hot page with p5.js from ``p5_src`` loaded and no sketch."""
+    return (
+        '<!DOCTYPE html>\n<html>\n<head>\n<meta charset="utf-8">\n<title></title>\n'
+        f'<script src="{p5_src}"></script>\n<script>{HOT_PAGE_SCRIPT}</script>\n'
+        '</head>\n<body></body>\n</html>\n'
+    )
+
+
+@dataclass
+class HotGame:
+    """The parts of a game that are injected into a hot page."""
+    p5_src: str
+    title: str
+    head: str
+    body_attributes: List[List[str]]
+    body: str
+    code: str
+
+    def payload(self) -> Dict[str, Any]:
+        """Argument for ``LOAD_GAME``."""
+        return {
+            "title": self.title, "head": self.head, "bodyAttributes": self.body_attributes,
+            "body": self.body, "code": self.code
+        }
+
+
+def _top_level_functions(tokens) -> List[str]:
+    """Names of the function declarations outside any bracket."""
+    names, depth = [], 0
+    for token, following in zip(tokens, tokens[1:]):
+        if token.kind == "punct" and token.text in ("(", "[", "{"):
+            depth += 1
+        elif token.kind == "punct" and token.text in (")", "]", "}"):
+            depth -= 1
+        elif depth == 0 and token.text == "function" and following.kind == "name":
+            names.append(following.text)
+    return names
+
+
+def hot_game(html: str) -> Optional[HotGame]:
+    """
+    The game split up for a hot page, or None when it needs a fresh page:
+    anything but exactly one external script that is p5.js itself from a
+    known CDN, module or non-JavaScript script blocks, a sketch that
+    starts p5 itself (instance mode), or ``document.write``.
+    """
+    p5_src, scripts = None, []
+    for match in _SCRIPT.finditer(html):
+        attributes, content = match.group(1), match.group(2)
+        src = _SRC.search(attributes)
+        if src:
+            url = next(group for group in src.groups() if group is not None)
+            parsed = parse_p5_url(url)
+            if p5_src is not None or parsed is None or parsed[1] not in ("p5.js", "p5.min.js"):
+                return None
+            p5_src = url
+            continue
+        script_type = _TYPE.search(attributes)
+        if script_type and script_type.group(1).lower() not in _JS_TYPES:
+            return None
+        scripts.append(content)
+    body = _BODY.search(html)
+    if p5_src is None or not scripts or body is None:
+        return None
+
+    code = "\n;\n".join(scripts)
+    tokens, _ = tokenize(code)
+    texts = [token.text for token in tokens]
+    if any(texts[i:i + 2] == ["new", "p5"] for i in range(len(texts) - 1)) or "document.write" in code:
+        return None
+
+    names = list(dict.fromkeys(list(P5_HOOKS) + _top_level_functions(tokens)))
+    exports = ", ".join(f"{name}: typeof {name} === 'function' ? {name} : undefined" for name in names)
+    head = _HEAD.search(html)
+    title = _TITLE.search(head.group(1)) if head else None
+    return HotGame(
+        p5_src=p5_src,
+        title=title.group(1).strip() if title else "",
+        head="\n".join(_STYLES.findall(head.group(1))) if head else "",
+        body_attributes=[
+            [name, next((value for value in values if value is not None), "")]
+            for name, *values in _ATTRIBUTE.findall(body.group(1))
+        ],
+        body=_SCRIPT.sub("", body.group(2)),
+        code=f"(function () {{\n{code}\n;window.__hotPage.define({{{exports}}});\n}}).call(window);\n"
+    )
+
+
+async def open_hot_page(context, p5_src: str):
+    """A new page in ``context`` with p5.js from ``p5_src`` loaded, ready for ``LOAD_GAME``."""
+    document = hot_page_html(p5_src)
+
+    async def serve(route):
+        await route.fulfill(status=200, content_type="text/html; charset=utf-8", body=document)
+
+    await context.route(HOT_PAGE_URL, serve)
+    page = await context.new_page()
+    await page.goto(HOT_PAGE_URL, wait_until="load")
+    if not await page.evaluate(HOT_PAGE_READY):
+        raise RuntimeError(f"p5.js did not load in the hot page from {p5_src}")
+    return page
+
@@ -0,0 +1,151 @@
+"""
+Incremental Build Support for AI Genesis Engine
+Splits the Architect's technical plan into ordered features and caches the
+last increment that passed Sentry, so a failing feature can be retried on
+its own instead of regenerating the whole game.
+"""
+import hashlib
+import json
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import List, Optional
+
+# Section headers the Architect uses for the build order
+_ORDER_HEADER = re.compile(
+    r'^#{1,4}\s*(?:\d+[.)]\s*)?.*(implementation\s+(order|sequence)|build\s+order|features?\s+to\s+build)',
+    re.IGNORECASE
+)
+_HEADER = re.compile(r'^(#{1,6})\s+(.*)$')
+_ITEM = re.compile(r'^\s*(?:\d+[.)]|[-*+])\s+(.*)$')
+
+
+@dataclass
+class Feature:
+    """A single buildable slice of the technical plan."""
+    title: str
+    details: List[str] = field(default_factory=list)
+
+    def describe(self) -> str:
+        """Render the feature for an Engineer prompt."""
+        if not self.details:
+            return self.title
+        return self.title + "\n" + "\n".join(f"- {detail}" for detail in self.details)
+
+
+def _clean(text: str) -> str:
+    return re.sub(r'[*_`]+', '', text).strip().rstrip(':')
+
+
+def extract_features(tech_plan: str, max_features: int = 8) -> List[Feature]:
+    """
+    Extract the ordered feature list from a markdown technical plan.
+
+    Prefers the "Implementation Order" section; sub-headings in that section
+    (e.g. "Phase 1: Core Foundation") become features with their list items
+    as details, otherwise each list item is a feature. Extra features are
+    folded into the last one so the build never exceeds ``max_features`` steps.
+    """
+    # Code samples in the plan contain comment lines that look like headers
+    lines = []
+    in_fence = False
+    for line in (tech_plan or "").splitlines():
+        if line.strip().startswith("```"):
+            in_fence = not in_fence
+            continue
+        if not in_fence:
+            lines.append(line)
+
+    section: List[str] = []
+    section_level = None
+    for line in lines:
+        header = _HEADER.match(line.strip())
+        if section_level is None:
+            if header and _ORDER_HEADER.match(line.strip()):
+                section_level = len(header.group(1))
+            continue
+        if header and len(header.group(1)) <= section_level:
+            break
+        section.append(line)
+
+    # No explicit build order: fall back to every list item in the plan
+    if section_level is None:
+        section = lines
+
+    features: List[Feature] = []
+    has_subsections = any(_HEADER.match(line.strip()) for line in section)
+    for line in section:
+        header = _HEADER.match(line.strip())
+        item = _ITEM.match(line)
+        if has_subsections:
+            if header:
+                features.append(Feature(_clean(header.group(2))))
+            elif item and features:
+                features[-1].details.append(_clean(item.group(1)))
+        elif item and _clean(item.group(1)):
+            features.append(Feature(_clean(item.group(1))))
+
+    features = [feature for feature in features if feature.title]
+    if not features:
+        return [Feature("Complete playable game", ["Implement every feature in the technical plan"])]
+
+    if len(features) > max_features:
+        merged = features[max_features - 1:]
+        tail = Feature(
+            " + ".join(feature.title for feature in merged),
+            [detail for feature in merged for detail in (feature.details or [feature.title])]
+        )
+        features = features[:max_features - 1] + [tail]
+    return features
+
+
+class IncrementCache:
+    """
+    Persists the last green increment of an incremental build.
+
+    Stored under ``<project>/.increments`` together with the plan fingerprint,
+    so a restarted build of the same plan resumes after the last feature
+    that passed Sentry.
+    """
+
+    def __init__(self, project_path: Path, tech_plan: str):
+        self.cache_dir = Path(project_path) / ".increments"
+        self.plan_hash = hashlib.sha256((tech_plan or "").encode("utf-8")).hexdigest()[:16]
+        self.completed_features = 0
+        self.code: Optional[str] = None
+
+    @property
+    def _manifest_path(self) -> Path:
+        return self.cache_dir / "manifest.json"
+
+    @property
+    def _code_path(self) -> Path:
+        return self.cache_dir / "last_green.html"
+
+    def load(self) -> bool:
+        """Load a cached increment for the same plan. Returns True on a hit."""
+        try:
+            manifest = json.loads(self._manifest_path.read_text(encoding="utf-8"))
+            if manifest.get("plan_hash") != self.plan_hash:
+                return False
+            self.code = self._code_path.read_text(encoding="utf-8")
+            self.completed_features = int(manifest.get("completed_features", 0))
+            return True
+        except (OSError, ValueError):
+            return False
+
+    def store(self, code: str, completed_features: int, feature_title: str):
+        """Record a new green increment."""
+        self.code = code
+        self.completed_features = completed_features
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            self._code_path.write_text(code, encoding="utf-8")
+            self._manifest_path.write_text(json.dumps({
+                "plan_hash": self.plan_hash,
+                "completed_features": completed_features,
+                "last_feature": feature_title
+            }, indent=2), encoding="utf-8")
+        except OSError:
+            # The in-memory copy is enough to finish this build
+            pass
@@ -0,0 +1,215 @@
+"""
+Seeded Input Fuzzing for the Sentry Agent
+Drives generated games with a reproducible schedule of keyboard and mouse
+input (arrows, WASD, space, R, moves and clicks) on the virtual clock, so
+crashes in ``keyPressed()`` handlers and input-dependent code paths are
+found before players find them. A failing input trace is shrunk to the
+few events that still reproduce the error and handed to the Debugger.
+"""
+import math
+import random
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+# key -> keyCode, as p5.js reads them from KeyboardEvent.key / .which
+FUZZ_KEYS = {
+    "ArrowLeft": 37, "ArrowUp": 38, "ArrowRight": 39, "ArrowDown": 40,
+    "w": 87, "a": 65, "s": 83, "d": 68, " ": 32, "r": 82
+}
+
+# Runs as a context init script after VIRTUAL_TIME_SCRIPT. Math.random is
+# seeded before the game's scripts run; p5's random() draws from it unless
+# the sketch calls randomSeed() itself. __fuzz.replay() dispatches a trace
+# of input events while simulating frames and stops at the first error,
+# whether it comes from draw() or from an input handler.
+FUZZ_SCRIPT = r"""
+(() => {
+  if (window.__fuzz) return;
+  const seeded = (seed) => {
+    let state = seed >>> 0;
+    return () => {
+      state = (state + 0x6D2B79F5) >>> 0;
+      let t = state;
+      t = Math.imul(t ^ (t >>> 15), t | 1);
+      t ^= t + Math.imul(t ^ (t >>> 7), t | 61);
+      return ((t ^ (t >>> 14)) >>> 0) / 4294967296;
+    };
+  };
+  Math.random = seeded(__SEED__);
+
+  const make = (type, Kind, init, extra) => {
+    const event = typeof Kind === 'function' ? new Kind(type, init) : new Event(type, init);
+    // keyCode/which cannot be set through the constructor, and p5.js still reads them
+    for (const [name, value] of Object.entries(extra || {})) {
+      Object.defineProperty(event, name, { value, configurable: true });
+    }
+    return event;
+  };
+  const canvas = () => typeof document.querySelector === 'function' ? document.querySelector('canvas') : null;
+
+  const key = (type, entry) => {
+    const init = { key: entry.key, bubbles: true, cancelable: true };
+    window.dispatchEvent(make(type, window.KeyboardEvent, init, {
+      key: entry.key, keyCode: entry.keyCode, which: entry.keyCode
+    }));
+  };
+  const mouse = (types, entry) => {
+    const target = canvas();
+    const rect = target ? target.getBoundingClientRect() : { left: 0, top: 0, width: 400, height: 400 };
+    const clientX = rect.left + entry.x * rect.width;
+    const clientY = rect.top + entry.y * rect.height;
+    const init = { clientX, clientY, button: 0, bubbles: true, cancelable: true };
+    for (const type of types) {
+      // p5.js 1.x listens for mouse events, 2.x for pointer events
+      const Kind = type.startsWith('pointer') ? window.PointerEvent : window.MouseEvent;
+      (target || window).dispatchEvent(make(type, Kind, init, { clientX, clientY, button: 0, which: 1 }));
+    }
+  };
+
+  const fuzz = {};
+  fuzz.reseed = (seed) => { Math.random = seeded(seed); };
+  fuzz.replay = ({ trace, frames, stepMs, wallLimitMs, seed }) => {
+    fuzz.reseed(seed);
+    const byFrame = new Map();
+    const at = (frame, action) => {
+      if (!byFrame.has(frame)) byFrame.set(frame, []);
+      byFrame.get(frame).push(action);
+    };
+    for (const entry of trace) {
+      if (entry.type === 'key') {
+        at(entry.frame, () => key('keydown', entry));
+        at(entry.frame + entry.hold, () => key('keyup', entry));
+      } else if (entry.type === 'move') {
+        at(entry.frame, () => mouse(['pointermove', 'mousemove'], entry));
+      } else if (entry.type === 'click') {
+        at(entry.frame, () => mouse(['pointerdown', 'mousedown'], entry));
+        at(entry.frame + 1, () => mouse(['pointerup', 'mouseup', 'click'], entry));
+      }
+    }
+
+    // Exceptions in event listeners are reported, not thrown, so catch them on the way
+    const thrown = [];
+    const onError = (event) => thrown.push(event.error || new Error(event.message));
+    window.addEventListener('error', onError);
+    const beforeFrame = (index) => {
+      for (const action of byFrame.get(index) || []) action();
+      if (thrown.length) throw thrown[0];
+    };
+    try {
+      return window.__virtualTime.simulate({ frames, stepMs, wallLimitMs, beforeFrame });
+    } finally {
+      window.removeEventListener('error', onError);
+    }
+  };
+
+  window.__fuzz = fuzz;
+})();
+"""
+
+REPLAY = "(options) => window.__fuzz && window.__virtualTime ? window.__fuzz.replay(options) : null"
+
+
+def fuzz_script(seed: int) -> str:
+    """``FUZZ_SCRIPT`` with Math.random seeded from ``seed``."""
+    return FUZZ_SCRIPT.replace("__SEED__", str(int(seed) & 0xFFFFFFFF))
+
+
+def generate_trace(seed: int, frames: int, fps: int, events_per_second: float = 4.0) -> List[Dict[str, Any]]:
+    """
+    A reproducible input schedule over ``frames`` simulated frames.
+
+    Mostly key presses held for up to half a second, with some mouse
+    moves and clicks; mouse positions are fractions of the canvas size.
+    """
+    rng = random.Random(seed)
+    mean_gap = fps / max(events_per_second, 0.01)
+    trace = []
+    frame = 0
+    while True:
+        frame += max(1, round(rng.expovariate(1 / mean_gap)))
+        if frame >= frames:
+            return trace
+        roll = rng.random()
+        if roll < 0.7:
+            key = rng.choice(list(FUZZ_KEYS))
+            trace.append({
+                "frame": frame, "type": "key", "key": key, "keyCode": FUZZ_KEYS[key],
+                "hold": rng.randint(1, max(1, fps // 2))
+            })
+        else:
+            trace.append({
+                "frame": frame, "type": "move" if roll < 0.85 else "click",
+                "x": round(rng.random(), 3), "y": round(rng.random(), 3)
+            })
+
+
+def replay_options(trace: List[Dict[str, Any]], frames: int, fps: int, wall_limit: float,
+                   seed: int) -> Dict[str, Any]:
+    """Arguments for ``REPLAY``."""
+    return {"trace": trace, "frames": frames, "stepMs": 1000 / fps, "wallLimitMs": wall_limit * 1000, "seed": seed}
+
+
+async def minimize_trace(trace: List[Dict[str, Any]], fails: Callable[[List[Dict[str, Any]]], Awaitable[bool]],
+                         max_runs: int) -> Tuple[List[Dict[str, Any]], int]:
+    """
+    Delta-debug ``trace`` down to a smaller trace for which ``fails`` still holds.
+
+    Tries dropping ever smaller chunks of events and keeps any reduction
+    that still fails. Returns the reduced trace and the replays spent;
+    stops early once ``max_runs`` replays have been used.
+    """
+    runs = 0
+    chunks = 2
+    while len(trace) >= 2 and runs < max_runs:
+        size = math.ceil(len(trace) / chunks)
+        reduced = False
+        for start in range(0, len(trace), size):
+            candidate = trace[:start] + trace[start + size:]
+            runs += 1
+            if await fails(candidate):
+                trace = candidate
+                chunks = max(chunks - 1, 2)
+                reduced = True
+                break
+            if runs >= max_runs:
+                break
+        if not reduced:
+            if chunks >= len(trace):
+                break
+            chunks = min(chunks * 2, len(trace))
+    if len(trace) == 1 and runs < max_runs:
+        # The error may not need any input at all
+        runs += 1
+        if await fails([]):
+            trace = []
+    return trace, runs
+
+
+def describe_event(entry: Dict[str, Any], fps: int) -> str:
+    when = f"frame {entry['frame']} ({entry['frame'] / fps:.2f}s)"
+    if entry["type"] == "key":
+        name = "Space" if entry["key"] == " " else entry["key"]
+        return f"{when}: hold {name} for {entry['hold']} frames"
+    action = "click" if entry["type"] == "click" else "move mouse"
+    return f"{when}: {action} at ({entry['x']:.0%}, {entry['y']:.0%}) of the canvas"
+
+
+def describe_trace(trace: List[Dict[str, Any]], fps: int, limit: int = 20) -> str:
+    """The input of a trace, one event per line, for reports and the Debugger."""
+    if not trace:
+        return "no input needed"
+    lines = [describe_event(entry, fps) for entry in trace[:limit]]
+    if len(trace) > limit:
+        lines.append(f"... and {len(trace) - limit} more events")
+    return "\n".join(lines)
+
+
+def fuzz_failure_summary(fuzz: Optional[Dict[str, Any]]) -> Optional[str]:
+    """A short account of a fuzzing failure and the input that reproduces it."""
+    failure = (fuzz or {}).get("failure")
+    if not failure:
+        return None
+    verdict = "minimized" if failure["reproduced"] else "not reproducible, full trace"
+    return (
+        f"Input that triggers \"{failure['message']}\" (seed {fuzz['seed']}, {verdict}):\n"
+        f"{describe_trace(failure['trace'], fuzz['fps'])}"
+    )
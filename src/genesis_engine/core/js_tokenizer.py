@@ -0,0 +1,261 @@
+"""
+JavaScript Tokenizer for Sentry's Static Checks
+A single-pass, linear-time tokenizer for the JavaScript in generated games
+that understands comments, string and template literals (including nested
+``${...}`` expressions) and regular expression literals, so braces inside
+them are not mistaken for code. Bracket matching over the token stream
+reports real problems with the exact line and column in the HTML file.
+"""
+import bisect
+import re
+from dataclasses import dataclass
+from typing import List, NamedTuple, Optional, Tuple
+
+_WHITESPACE = re.compile(r'[ \t\r\n\f\v\u00a0\u2028\u2029\ufeff]+')
+_NAME = re.compile(r'(?:[^\W\d]|\$)(?:\w|\$)*')
+_NUMBER = re.compile(
+    r'(?:0[xXoObB][\da-fA-F_]+|(?:\d[\d_]*(?:\.[\d_]*)?|\.\d[\d_]*)(?:[eE][+-]?\d+)?)n?'
+)
+_STRING = {
+    '"': re.compile(r'"(?:[^"\\\n]|\\.|\\\n)*"', re.DOTALL),
+    "'": re.compile(r"'(?:[^'\\\n]|\\.|\\\n)*'", re.DOTALL),
+}
+# Template text up to the closing backtick or the next ${
+_TEMPLATE_TEXT = re.compile(r'(?:[^`\\$]|\\.|\$(?!\{))*', re.DOTALL)
+_REGEX = re.compile(r'/(?![*/])(?:[^/\\\[\n]|\\.|\[(?:[^\]\\\n]|\\.)*\])+/[A-Za-z]*')
+_PUNCTUATOR = re.compile(
+    r'>>>=|\.\.\.|===|!==|\*\*=|<<=|>>=|>>>|&&=|\|\|=|\?\?=|=>|==|!=|<=|>=|&&|\|\||\?\?|\?\.(?!\d)'
+    r'|\+\+|--|\+=|-=|\*=|/=|%=|&=|\|=|\^=|\*\*|<<|>>|[{}()\[\];,<>+\-*/%&|^!~?:=.@#]'
+)
+_SCRIPT = re.compile(r'<script\b([^>]*)>(.*?)</script\s*>', re.DOTALL | re.IGNORECASE)
+_SCRIPT_TYPE = re.compile(r'\btype\s*=\s*["\']?([^"\'\s>]+)', re.IGNORECASE)
+_JS_TYPES = {"text/javascript", "application/javascript", "module", "text/ecmascript", "application/ecmascript"}
+
+# After these words a slash starts a regular expression, not a division
+_REGEX_KEYWORDS = frozenset((
+    "return", "typeof", "instanceof", "in", "of", "new", "delete", "void", "throw",
+    "case", "do", "else", "yield", "await"
+))
+
+OPENERS = {"(": ")", "[": "]", "{": "}"}
+CLOSERS = {")": "(", "]": "[", "}": "{"}
+
+
+class Token(NamedTuple):
+    """One token; ``start`` is its offset in the scanned text."""
+    kind: str  # name, number, string, template, template_head, template_middle, template_tail, regex, punct
+    text: str
+    start: int
+
+
+@dataclass
+class SyntaxIssue:
+    """A syntax problem at an exact position (1-based line and column)."""
+    message: str
+    line: int
+    column: int
+
+    def __str__(self) -> str:
+        return f"Line {self.line}, column {self.column}: {self.message}"
+
+
+class SourceMap:
+    """Offset to line/column lookups for one text."""
+
+    def __init__(self, text: str):
+        self.newlines = [match.start() for match in re.finditer("\n", text)]
+
+    def locate(self, offset: int) -> Tuple[int, int]:
+        line = bisect.bisect_left(self.newlines, offset)
+        line_start = self.newlines[line - 1] + 1 if line else 0
+        return line + 1, offset - line_start + 1
+
+
+def tokenize(text: str, start: int = 0, end: Optional[int] = None) -> Tuple[List[Token], List[Tuple[str, int]]]:
+    """
+    Tokens of the JavaScript in ``text[start:end]``, with token offsets into ``text``.
+
+    Comments and whitespace are skipped. Also returns (message, offset)
+    pairs for unterminated comments, strings, template literals and
+    characters that cannot start a token.
+    """
+    end = len(text) if end is None else end
+    tokens: List[Token] = []
+    problems: List[Tuple[str, int]] = []
+    # Brace depth inside each open ${ ... } of a template literal
+    templates: List[int] = []
+    regex_allowed = True
+    pos = start
+
+    def template_text(opening: int, first: int):
+        """Scan template text from ``first``; returns the position after it."""
+        match = _TEMPLATE_TEXT.match(text, first, end)
+        after = match.end()
+        if after >= end:
+            problems.append(("Unterminated template literal", opening))
+            return end, None
+        if text[after] == "`":
+            return after + 1, "tail"
+        return after + 2, "head"  # ${
+
+    while pos < end:
+        match = _WHITESPACE.match(text, pos, end)
+        if match:
+            pos = match.end()
+            continue
+        char = text[pos]
+
+        if char == "/" and pos + 1 < end and text[pos + 1] in "/*":
+            if text[pos + 1] == "/":
+                newline = text.find("\n", pos, end)
+                pos = end if newline < 0 else newline
+            else:
+                close = text.find("*/", pos + 2, end)
+                if close < 0:
+                    problems.append(("Unterminated block comment", pos))
+                    pos = end
+                else:
+                    pos = close + 2
+            continue
+
+        if char in _STRING:
+            match = _STRING[char].match(text, pos, end)
+            if match:
+                tokens.append(Token("string", match.group(), pos))
+                pos = match.end()
+            else:
+                problems.append(("Unterminated string literal", pos))
+                newline = text.find("\n", pos, end)
+                pos = end if newline < 0 else newline
+            regex_allowed = False
+            continue
+
+        if char == "`" or (char == "}" and templates and templates[-1] == 0):
+            opening = pos
+            resumed = char == "}"
+            if resumed:
+                templates.pop()
+            pos, state = template_text(opening, pos + 1)
+            if state == "head":
+                templates.append(0)
+            kind = {
+                (False, "tail"): "template", (False, "head"): "template_head",
+                (True, "head"): "template_middle", (True, "tail"): "template_tail"
+            }[resumed, state or "tail"]
+            tokens.append(Token(kind, text[opening:pos], opening))
+            regex_allowed = state == "head"
+            continue
+
+        match = _NAME.match(text, pos, end)
+        if match:
+            word = match.group()
+            tokens.append(Token("name", word, pos))
+            pos = match.end()
+            regex_allowed = word in _REGEX_KEYWORDS
+            continue
+
+        match = _NUMBER.match(text, pos, end)
+        if match:
+            tokens.append(Token("number", match.group(), pos))
+            pos = match.end()
+            regex_allowed = False
+            continue
+
+        if char == "/" and regex_allowed:
+            match = _REGEX.match(text, pos, end)
+            if match:
+                tokens.append(Token("regex", match.group(), pos))
+                pos = match.end()
+                regex_allowed = False
+                continue
+
+        match = _PUNCTUATOR.match(text, pos, end)
+        if match:
+            symbol = match.group()
+            if templates and symbol == "{":
+                templates[-1] += 1
+            elif templates and symbol == "}":
+                templates[-1] -= 1
+            tokens.append(Token("punct", symbol, pos))
+            pos = match.end()
+            regex_allowed = symbol not in (")", "]")
+            continue
+
+        if char == "\\":
+            # Identifier escapes (\u0041) are rare enough to pass through
+            pos += 1
+            continue
+        problems.append((f"Unexpected character {char!r}", pos))
+        pos += 1
+
+    return tokens, problems
+
+
+def bracket_problems(tokens: List[Token], source: SourceMap) -> List[Tuple[str, int]]:
+    """Unmatched, mismatched and unclosed (), [], {} and template ${ } as (message, offset) pairs."""
+    problems = []
+    stack: List[Tuple[str, int]] = []
+    for token in tokens:
+        if token.kind == "punct" and token.text in OPENERS:
+            stack.append((token.text, token.start))
+        elif token.kind == "template_head":
+            stack.append(("${", token.start))
+        elif token.kind in ("template_middle", "template_tail"):
+            if stack and stack[-1][0] == "${":
+                stack.pop()
+            if token.kind == "template_middle":
+                stack.append(("${", token.start))
+        elif token.kind == "punct" and token.text in CLOSERS:
+            expected = CLOSERS[token.text]
+            if stack and stack[-1][0] == expected:
+                stack.pop()
+            elif not stack:
+                problems.append((f"Unexpected '{token.text}' with no open '{expected}'", token.start))
+            else:
+                opener, offset = stack[-1]
+                line, column = source.locate(offset)
+                problems.append((
+                    f"'{token.text}' does not match '{opener}' opened at line {line}, column {column}", token.start
+                ))
+                # Recover: drop back to the matching opener if there is one, else treat this as the top's closer
+                for depth in range(len(stack) - 1, -1, -1):
+                    if stack[depth][0] == expected:
+                        del stack[depth:]
+                        break
+                else:
+                    stack.pop()
+    for opener, offset in stack:
+        closer = OPENERS.get(opener, "}")
+        problems.append((f"Unclosed '{opener}' (missing '{closer}')", offset))
+    return problems
+
+
+def script_ranges(html: str) -> List[Tuple[int, int]]:
+    """(start, end) offsets of the inline JavaScript blocks in an HTML document."""
+    ranges = []
+    for match in _SCRIPT.finditer(html):
+        attributes = match.group(1)
+        if re.search(r'\bsrc\s*=', attributes, re.IGNORECASE):
+            continue
+        script_type = _SCRIPT_TYPE.search(attributes)
+        if script_type and script_type.group(1).lower() not in _JS_TYPES:
+            continue
+        ranges.append((match.start(2), match.end(2)))
+    return ranges
+
+
+def check_javascript(text: str, ranges: Optional[List[Tuple[int, int]]] = None) -> List[SyntaxIssue]:
+    """Token-level syntax problems in ``text`` (or just in ``ranges`` of it), with line and column."""
+    source = SourceMap(text)
+    issues = []
+    for start, end in ranges if ranges is not None else [(0, len(text))]:
+        tokens, problems = tokenize(text, start, end)
+        problems += bracket_problems(tokens, source)
+        for message, offset in sorted(problems, key=lambda problem: problem[1]):
+            issues.append(SyntaxIssue(message, *source.locate(offset)))
+    return issues
+
+
+def check_html_scripts(html: str) -> List[SyntaxIssue]:
+    """Syntax problems in every inline script of an HTML document, positioned in the document."""
+    return check_javascript(html, script_ranges(html))
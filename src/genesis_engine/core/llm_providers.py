@@ -0,0 +1,363 @@
+"""
+LLM Provider Transport for AI Genesis Engine
+Normalizes requests and responses across Anthropic, OpenAI-compatible and
+local stub providers, and routes each request to the provider with the best
+live latency and error record so one vendor's outage or slowdown does not
+stall the whole generation queue.
+"""
+import asyncio
+import json
+import logging
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+import aiohttp
+
+from .rate_limits import get_rate_limit_tracker
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class LLMRequest:
+    """A provider-neutral completion request; ``tool`` uses the Anthropic tool schema."""
+    messages: List[Dict[str, Any]]
+    model: str
+    max_tokens: int
+    temperature: float
+    tool: Optional[Dict[str, Any]] = None
+
+
+@dataclass
+class LLMResponse:
+    """A provider-neutral completion: plain text, or the forced tool call's input."""
+    text: str
+    provider: str
+    model: str
+    tool_input: Optional[Dict[str, Any]] = None
+    input_tokens: int = 0
+    output_tokens: int = 0
+
+
+class ProviderError(Exception):
+    """A failed provider call, with the HTTP status and Retry-After when known."""
+
+    def __init__(self, message: str, provider: str, status: Optional[int] = None,
+                 retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.provider = provider
+        self.status = status
+        self.retry_after = retry_after
+
+    @property
+    def affects_health(self) -> bool:
+        """Outages, overload, rate limits and rejected credentials count against a provider; bad requests do not."""
+        return self.status is None or self.status in (401, 403, 429) or self.status >= 500
+
+    @property
+    def retryable(self) -> bool:
+        """Whether the same call may succeed after a backoff; rejected credentials will not."""
+        return self.affects_health and self.status not in (401, 403)
+
+
+def _retry_after(headers) -> Optional[float]:
+    try:
+        return float(headers.get("Retry-After"))
+    except (TypeError, ValueError):
+        return None
+
+
+class LLMProvider:
+    """Base class for a completion endpoint."""
+
+    name = "provider"
+
+    def model_for(self, model: str) -> str:
+        """The provider's model for a requested (Claude) model name."""
+        return model
+
+    async def complete(self, request: LLMRequest) -> LLMResponse:
+        raise NotImplementedError
+
+    async def _post(self, url: str, headers: Dict[str, str], payload: Dict[str, Any],
+                    timeout: aiohttp.ClientTimeout, observe: Optional[Callable] = None) -> Dict[str, Any]:
+        try:
+            async with aiohttp.ClientSession(timeout=timeout) as session:
+                async with session.post(url, headers=headers, json=payload) as response:
+                    if observe:
+                        observe(response.headers, response.status)
+                    if response.status == 200:
+                        return await response.json()
+                    error_text = await response.text()
+                    raise ProviderError(
+                        f"{self.name} returned {response.status}: {error_text[:300]}",
+                        self.name, response.status, _retry_after(response.headers)
+                    )
+        except (aiohttp.ClientError, TimeoutError) as e:
+            raise ProviderError(f"{self.name} request failed: {e.__class__.__name__}: {e}", self.name)
+
+
+class AnthropicProvider(LLMProvider):
+    """Anthropic Messages API."""
+
+    name = "anthropic"
+
+    def __init__(self, api_key: str, url: str = "https://api.anthropic.com/v1/messages",
+                 timeout: Optional[aiohttp.ClientTimeout] = None):
+        self.api_key = api_key
+        self.url = url
+        self.timeout = timeout or aiohttp.ClientTimeout(total=120)
+
+    async def complete(self, request: LLMRequest) -> LLMResponse:
+        headers = {
+            'Content-Type': 'application/json',
+            'x-api-key': self.api_key,
+            'anthropic-version': '2023-06-01'
+        }
+        payload = {
+            'model': request.model,
+            'max_tokens': request.max_tokens,
+            'messages': request.messages,
+            'temperature': request.temperature
+        }
+        if request.tool:
+            payload['tools'] = [request.tool]
+            payload['tool_choice'] = {'type': 'tool', 'name': request.tool['name']}
+
+        data = await self._post(self.url, headers, payload, self.timeout, get_rate_limit_tracker().observe)
+        text, tool_input = "", None
+        for block in data.get('content', []):
+            if block.get('type') == 'tool_use' and tool_input is None:
+                tool_input = block.get('input')
+            elif block.get('type') == 'text':
+                text += block.get('text', '')
+        usage = data.get('usage', {})
+        return LLMResponse(text, self.name, data.get('model', request.model), tool_input,
+                           usage.get('input_tokens', 0), usage.get('output_tokens', 0))
+
+
+class OpenAICompatibleProvider(LLMProvider):
+    """OpenAI Chat Completions API, or any server that speaks it."""
+
+    name = "openai"
+
+    def __init__(self, api_key: str, url: str = "https://api.openai.com/v1/chat/completions",
+                 model: str = "gpt-4o", fast_model: str = "gpt-4o-mini", max_tokens: int = 16384,
+                 timeout: Optional[aiohttp.ClientTimeout] = None):
+        self.api_key = api_key
+        self.url = url
+        self.model = model
+        self.fast_model = fast_model
+        self.max_tokens = max_tokens
+        self.timeout = timeout or aiohttp.ClientTimeout(total=120)
+
+    def model_for(self, model: str) -> str:
+        if not model.startswith("claude"):
+            return model
+        return self.fast_model if "haiku" in model else self.model
+
+    async def complete(self, request: LLMRequest) -> LLMResponse:
+        headers = {
+            'Content-Type': 'application/json',
+            'Authorization': f'Bearer {self.api_key}'
+        }
+        model = self.model_for(request.model)
+        payload = {
+            'model': model,
+            'max_tokens': min(request.max_tokens, self.max_tokens),
+            'messages': request.messages,
+            'temperature': request.temperature
+        }
+        if request.tool:
+            payload['tools'] = [{
+                'type': 'function',
+                'function': {
+                    'name': request.tool['name'],
+                    'description': request.tool.get('description', ''),
+                    'parameters': request.tool['input_schema']
+                }
+            }]
+            payload['tool_choice'] = {'type': 'function', 'function': {'name': request.tool['name']}}
+
+        data = await self._post(self.url, headers, payload, self.timeout)
+        try:
+            message = data['choices'][0]['message']
+        except (KeyError, IndexError, TypeError):
+            raise ProviderError(f"{self.name} response has no choices", self.name)
+
+        tool_input = None
+        for call in message.get('tool_calls') or []:
+            try:
+                tool_input = json.loads(call['function']['arguments'])
+            except (KeyError, TypeError, ValueError):
+                raise ProviderError(f"{self.name} returned malformed tool arguments", self.name)
+            break
+        usage = data.get('usage', {})
+        return LLMResponse(message.get('content') or "", self.name, data.get('model', model), tool_input,
+                           usage.get('prompt_tokens', 0), usage.get('completion_tokens', 0))
+
+
+class LocalStubProvider(LLMProvider):
+    """
+    Canned responses without network access, for local runs and load tests.
+
+    ``responder`` returns the text for a request; for tool requests it must
+    return the tool input as a JSON string.
+    """
+
+    name = "stub"
+
+    def __init__(self, responder: Callable[[LLMRequest], str], latency: float = 0.0):
+        self.responder = responder
+        self.latency = latency
+
+    async def complete(self, request: LLMRequest) -> LLMResponse:
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        text = self.responder(request)
+        if request.tool:
+            return LLMResponse("", self.name, request.model, json.loads(text), output_tokens=len(text) // 4)
+        return LLMResponse(text, self.name, request.model, output_tokens=len(text) // 4)
+
+
+# Seconds per 1k output tokens assumed for a provider before any provider is measured
+DEFAULT_LATENCY = 10.0
+
+
+@dataclass
+class ProviderStats:
+    """Live health of one provider, as exponentially weighted moving averages."""
+    latency: Optional[float] = None  # seconds per 1k output tokens
+    error_rate: float = 0.0
+    consecutive_failures: int = 0
+    cooldown_until: float = 0.0
+    requests: int = 0
+    failures: int = 0
+
+    def score(self, default_latency: float = DEFAULT_LATENCY) -> float:
+        """Lower is better; unmeasured providers are scored at ``default_latency``."""
+        latency = self.latency if self.latency is not None else default_latency
+        return latency * (1 + 4 * self.error_rate)
+
+
+_provider_stats: Dict[str, ProviderStats] = {}
+_provider_stats_lock = threading.Lock()
+
+
+@dataclass
+class ProviderRouter:
+    """
+    Tries providers best-first and records how each call went.
+
+    Providers in cooldown after ``failure_threshold`` consecutive failures
+    are only tried once every healthy provider has failed. Statistics are
+    shared by every router in the process unless ``stats`` is given.
+    """
+    providers: List[LLMProvider]
+    failure_threshold: int = 3
+    cooldown: float = 60.0
+    alpha: float = 0.3
+    stats: Dict[str, ProviderStats] = field(default_factory=lambda: _provider_stats)
+
+    def _stats(self, provider: LLMProvider) -> ProviderStats:
+        with _provider_stats_lock:
+            return self.stats.setdefault(provider.name, ProviderStats())
+
+    def order(self) -> List[LLMProvider]:
+        """
+        Healthy providers by score, then cooling-down ones by how soon they recover.
+
+        Unmeasured providers are scored as if they were as slow as the
+        slowest measured one, so they still get tried but their errors count.
+        """
+        now = time.time()
+        healthy = [p for p in self.providers if self._stats(p).cooldown_until <= now]
+        cooling = [p for p in self.providers if self._stats(p).cooldown_until > now]
+        measured = [self._stats(p).latency for p in self.providers if self._stats(p).latency is not None]
+        default_latency = max(measured, default=DEFAULT_LATENCY)
+        healthy.sort(key=lambda p: (self._stats(p).score(default_latency), self._stats(p).latency is not None))
+        cooling.sort(key=lambda p: self._stats(p).cooldown_until)
+        return healthy + cooling
+
+    def record(self, provider: LLMProvider, elapsed: float, response: Optional[LLMResponse] = None,
+               error: Optional[ProviderError] = None):
+        stats = self._stats(provider)
+        with _provider_stats_lock:
+            stats.requests += 1
+            if error is None:
+                per_ktok = elapsed / max(response.output_tokens, 100) * 1000
+                stats.latency = per_ktok if stats.latency is None else (
+                    self.alpha * per_ktok + (1 - self.alpha) * stats.latency
+                )
+                stats.error_rate *= 1 - self.alpha
+                stats.consecutive_failures = 0
+                stats.cooldown_until = 0.0
+            elif error.affects_health:
+                stats.failures += 1
+                stats.error_rate = self.alpha + (1 - self.alpha) * stats.error_rate
+                stats.consecutive_failures += 1
+                if stats.consecutive_failures >= self.failure_threshold:
+                    stats.cooldown_until = time.time() + self.cooldown
+
+    async def complete(self, request: LLMRequest) -> LLMResponse:
+        """Complete with the first provider that succeeds; raises the last ProviderError."""
+        if not self.providers:
+            raise ProviderError("No LLM providers configured", "router")
+        last_error = None
+        for provider in self.order():
+            started = time.monotonic()
+            try:
+                response = await provider.complete(request)
+            except ProviderError as e:
+                self.record(provider, time.monotonic() - started, error=e)
+                logger.warning(f"Provider {provider.name} failed for {request.model}: {e}")
+                last_error = e
+                continue
+            self.record(provider, time.monotonic() - started, response)
+            return response
+        raise last_error
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        return _metrics({provider.name: self._stats(provider) for provider in self.providers})
+
+
+def _metrics(stats: Dict[str, ProviderStats]) -> Dict[str, Dict[str, Any]]:
+    now = time.time()
+    return {
+        name: {
+            "seconds_per_1k_tokens": round(s.latency, 3) if s.latency is not None else None,
+            "error_rate": round(s.error_rate, 3),
+            "requests": s.requests,
+            "failures": s.failures,
+            "cooling_down": s.cooldown_until > now
+        }
+        for name, s in stats.items()
+    }
+
+
+def provider_metrics() -> Dict[str, Dict[str, Any]]:
+    """Health of every provider this process has routed to."""
+    with _provider_stats_lock:
+        return _metrics(dict(_provider_stats))
+
+
+def build_providers(anthropic_api_key: Optional[str], stub_responder: Callable[[LLMRequest], str],
+                    timeout: Optional[aiohttp.ClientTimeout] = None) -> List[LLMProvider]:
+    """Providers named in LLM_PROVIDERS that have credentials, in configured order."""
+    providers: List[LLMProvider] = []
+    for name in settings.llm_providers:
+        if name == "anthropic" and anthropic_api_key:
+            providers.append(AnthropicProvider(anthropic_api_key, settings.anthropic_api_url, timeout))
+        elif name == "openai" and settings.openai_api_key:
+            providers.append(OpenAICompatibleProvider(
+                settings.openai_api_key, settings.openai_api_url, settings.openai_model,
+                settings.openai_fast_model, settings.openai_max_tokens, timeout
+            ))
+        elif name == "stub":
+            providers.append(LocalStubProvider(stub_responder))
+        elif name not in ("anthropic", "openai"):
+            logger.warning(f"Unknown LLM provider '{name}' - skipping")
+    return providers
@@ -0,0 +1,161 @@
+"""
+Model Routing Policy for AI Genesis Engine
+Maps each generation phase to an ordered list of models and request
+parameters. The policy can be overridden with a JSON file that is reloaded
+whenever it changes, and routes can escalate to stronger models once a
+session keeps failing Sentry.
+"""
+import json
+import logging
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+FAST_MODEL = "claude-3-5-haiku-20241022"
+STRONG_MODEL = "claude-sonnet-4-20250514"
+STRONGEST_MODEL = "claude-opus-4-20250514"
+
+# Phases the AI client routes: design, plan, assets, engineer, debugger,
+# increment, module and skeleton. Phases without a route use the client's
+# default model hierarchy.
+DEFAULT_POLICY: Dict[str, Any] = {
+    "escalation_threshold": 2,
+    "phases": {
+        "design": {"models": [FAST_MODEL, STRONG_MODEL], "max_tokens": 4096},
+        "assets": {"models": [FAST_MODEL, STRONG_MODEL], "max_tokens": 4096},
+        "skeleton": {"models": [FAST_MODEL, STRONG_MODEL], "max_tokens": 2048, "temperature": 0.5},
+        "engineer": {"escalate_to": [STRONGEST_MODEL]},
+        "increment": {"escalate_to": [STRONGEST_MODEL]},
+        "debugger": {
+            "models": [FAST_MODEL, STRONG_MODEL],
+            "temperature": 0.2,
+            "escalate_to": [STRONG_MODEL, STRONGEST_MODEL]
+        }
+    }
+}
+
+
+@dataclass
+class PhaseRoute:
+    """Models and parameters for one phase."""
+    phase: str
+    models: List[str] = field(default_factory=list)
+    max_tokens: Optional[int] = None
+    temperature: Optional[float] = None
+    escalate_to: List[str] = field(default_factory=list)
+    escalated: bool = False
+
+    def candidates(self, default_models: List[str]) -> List[str]:
+        """Models to try in order, most preferred first, without duplicates."""
+        models = list(self.escalate_to) if self.escalated else []
+        models += self.models or default_models
+        return list(dict.fromkeys(models))
+
+    def params(self) -> Dict[str, Any]:
+        """Request parameters overriding the per-model defaults."""
+        params: Dict[str, Any] = {}
+        if self.max_tokens is not None:
+            params["max_tokens"] = self.max_tokens
+        if self.temperature is not None:
+            params["temperature"] = self.temperature
+        return params
+
+
+def _parse_policy(data: Dict[str, Any]) -> Dict[str, Any]:
+    """Validate a policy document, raising ValueError on malformed entries."""
+    if not isinstance(data, dict) or not isinstance(data.get("phases", {}), dict):
+        raise ValueError("Policy must be an object with a 'phases' object")
+
+    phases = {}
+    for phase, route in data.get("phases", {}).items():
+        if not isinstance(route, dict):
+            raise ValueError(f"Route for phase '{phase}' must be an object")
+        for key in ("models", "escalate_to"):
+            value = route.get(key, [])
+            if not isinstance(value, list) or not all(isinstance(m, str) for m in value):
+                raise ValueError(f"'{key}' for phase '{phase}' must be a list of model names")
+        phases[phase] = {
+            "models": route.get("models", []),
+            "escalate_to": route.get("escalate_to", []),
+            "max_tokens": int(route["max_tokens"]) if "max_tokens" in route else None,
+            "temperature": float(route["temperature"]) if "temperature" in route else None
+        }
+    return {"escalation_threshold": int(data.get("escalation_threshold", 2)), "phases": phases}
+
+
+class ModelRouter:
+    """
+    Resolves phase routes from the default policy or a policy file.
+
+    The file is checked on every lookup and reloaded when its modification
+    time changes; a file that fails to parse keeps the last good policy.
+    """
+
+    def __init__(self, policy_file: Optional[Path] = None):
+        self.policy_file = Path(policy_file) if policy_file else None
+        self._policy = _parse_policy(DEFAULT_POLICY)
+        self._mtime: Optional[float] = None
+        self._lock = threading.Lock()
+        self._maybe_reload()
+
+    @property
+    def escalation_threshold(self) -> int:
+        self._maybe_reload()
+        return self._policy["escalation_threshold"]
+
+    def _maybe_reload(self):
+        if not self.policy_file:
+            return
+        try:
+            mtime = self.policy_file.stat().st_mtime
+        except OSError:
+            return
+        if mtime == self._mtime:
+            return
+
+        with self._lock:
+            if mtime == self._mtime:
+                return
+            self._mtime = mtime
+            try:
+                policy = _parse_policy(json.loads(self.policy_file.read_text(encoding="utf-8")))
+            except (OSError, ValueError, TypeError) as e:
+                logger.error(f"Invalid model policy {self.policy_file}, keeping previous policy: {e}")
+                return
+            self._policy = policy
+            logger.info(f"Loaded model routing policy from {self.policy_file}")
+
+    def route(self, phase: str, failures: int = 0) -> PhaseRoute:
+        """
+        Route for a phase.
+
+        ``failures`` is the number of Sentry failures in the current session;
+        at the escalation threshold the phase's ``escalate_to`` models are
+        tried first.
+        """
+        self._maybe_reload()
+        policy = self._policy
+        entry = policy["phases"].get(phase, {})
+        return PhaseRoute(
+            phase=phase,
+            models=list(entry.get("models", [])),
+            max_tokens=entry.get("max_tokens"),
+            temperature=entry.get("temperature"),
+            escalate_to=list(entry.get("escalate_to", [])),
+            escalated=bool(entry.get("escalate_to")) and failures >= policy["escalation_threshold"]
+        )
+
+
+_model_router_instance = None
+
+def get_model_router() -> ModelRouter:
+    """Get the singleton model router instance."""
+    global _model_router_instance
+    if _model_router_instance is None:
+        _model_router_instance = ModelRouter(settings.model_policy_file)
+    return _model_router_instance
@@ -0,0 +1,230 @@
+"""
+Modular Code Generation for AI Genesis Engine
+Splits the game into independent modules (state machine, player, enemies,
+collisions, HUD) that are generated concurrently against a shared interface
+contract and merged into one HTML file by a deterministic stitcher.
+"""
+import html
+import json
+import re
+import textwrap
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List
+
+from .js_tokenizer import check_javascript
+
+MODULE_DIR = Path(__file__).parent.parent / "templates" / "modules"
+
+# Names owned by the stitcher's runtime
+RESERVED_NAMES = {"world", "setup", "draw", "preload", "keyPressed", "keyReleased",
+                  "mousePressed", "mouseReleased", "windowResized"}
+
+_TOP_LEVEL_NAME = re.compile(
+    r'^(?:async\s+)?(?:function\s*\*?\s*|class\s+|(?:const|let|var)\s+)([A-Za-z_$][\w$]*)',
+    re.MULTILINE
+)
+
+
+@dataclass
+class GameModule:
+    """One independently generated part of the game."""
+    name: str
+    description: str
+    exports: Dict[str, str]  # signature -> contract description
+
+    @property
+    def export_names(self) -> List[str]:
+        return [signature.split("(")[0] for signature in self.exports]
+
+    @property
+    def helper_prefix(self) -> str:
+        return f"_{self.name}_"
+
+    def fallback_code(self) -> str:
+        """Pre-written implementation used when generation fails."""
+        return (MODULE_DIR / f"{self.name}.js").read_text(encoding="utf-8").strip()
+
+
+# Stitch order: each module may call functions of any other module at runtime
+MODULES: List[GameModule] = [
+    GameModule("state", "Game-state machine: start, playing, game over and win transitions", {
+        "resetGame()": "Reset every world field for a new game and set world.player = createPlayer(). Leaves world.state = 'start'.",
+        "updateGameState()": "Called every frame. Switch world.state to 'gameover' or 'won' when the design's conditions are met; update world.level.",
+        "stateKeyPressed(pressedKey, pressedKeyCode)": "Handle start (from 'start') and restart (from 'gameover'/'won', call resetGame()) keys.",
+    }),
+    GameModule("player", "The player character: creation, movement, actions and drawing", {
+        "createPlayer()": "Return a new player object with at least x, y and size.",
+        "updatePlayer()": "Called every frame while playing. Move world.player from held keys (keyIsDown) and update world.projectiles.",
+        "drawPlayer()": "Draw world.player and world.projectiles.",
+        "playerKeyPressed(pressedKey, pressedKeyCode)": "One-shot player actions while playing, e.g. jump or shoot.",
+    }),
+    GameModule("enemies", "Enemies and hazards: spawning, movement and drawing", {
+        "updateEnemies()": "Called every frame while playing. Spawn, move and remove entries of world.enemies (each with x, y, size).",
+        "drawEnemies()": "Draw world.enemies.",
+    }),
+    GameModule("collisions", "Collision detection and its consequences", {
+        "checkCollisions()": "Called every frame while playing after movement. Resolve player/enemy/projectile overlaps; update world.score and world.lives.",
+    }),
+    GameModule("ui", "HUD and full-screen messages", {
+        "drawHud()": "Draw score, lives, level and any other HUD values every frame.",
+        "drawScreens()": "Draw the overlay for world.state 'start' (title + how to start), 'gameover' and 'won'. Draw nothing while 'playing'.",
+    }),
+]
+
+
+def get_module(name: str) -> GameModule:
+    """Look up a module by name."""
+    for module in MODULES:
+        if module.name == name:
+            return module
+    raise KeyError(name)
+
+
+def interface_contract() -> str:
+    """The shared contract every module is generated against."""
+    sections = []
+    for module in MODULES:
+        functions = "\n".join(f"  function {signature}  // {doc}" for signature, doc in module.exports.items())
+        sections.append(f"[{module.name}] {module.description}\n{functions}")
+    modules = "\n\n".join(sections)
+    return f"""A p5.js game is assembled from independent modules in one <script>. The stitcher provides:
+
+  const world = {{ title, width: 800, height: 600, state: 'start', score: 0, lives: 3, level: 1,
+                  player: null, enemies: [], projectiles: [], effects: [], background: '#111111' }};
+  setup(): createCanvas(world.width, world.height); resetGame();
+  draw(): background(world.background);
+          if (world.state === 'playing') {{ updatePlayer(); updateEnemies(); checkCollisions(); }}
+          updateGameState(); drawEnemies(); drawPlayer(); drawHud(); drawScreens();
+  keyPressed(): stateKeyPressed(key, keyCode); if (world.state === 'playing') playerKeyPressed(key, keyCode);
+
+Modules and the functions each must define:
+
+{modules}
+
+Rules:
+- All shared state lives in `world`; add new fields to it rather than declaring shared globals.
+- Any other top-level function or variable must be prefixed with _<module>_ (e.g. _enemies_spawnTimer).
+- Never define setup, draw, keyPressed, mousePressed or world, and never load libraries."""
+
+
+def clean_module_code(code: str) -> str:
+    """Strip markdown fences and script tags from a generated module."""
+    code = re.sub(r'```[a-zA-Z]*\n?', '', code or "")
+    code = re.sub(r'</?script[^>]*>', '', code)
+    return textwrap.dedent(code).strip()
+
+
+def top_level_names(code: str) -> List[str]:
+    """Names declared at column 0 of a module."""
+    return _TOP_LEVEL_NAME.findall(code)
+
+
+def check_module(module: GameModule, code: str) -> List[str]:
+    """
+    Check a module against the interface contract.
+
+    Returns a list of problems; an empty list means the module can be
+    stitched without clashing with the runtime or other modules.
+    """
+    if not code:
+        return ["Module is empty"]
+
+    problems = []
+    names = top_level_names(code)
+    for name in module.export_names:
+        if name not in names:
+            problems.append(f"Missing required function {name}()")
+    for name in names:
+        if name in RESERVED_NAMES:
+            problems.append(f"Defines '{name}', which is owned by the stitcher")
+        elif name not in module.export_names and not name.startswith(module.helper_prefix):
+            problems.append(f"Top-level name '{name}' must be prefixed with {module.helper_prefix}")
+    # Braces inside strings, templates and comments do not count
+    problems.extend(str(issue) for issue in check_javascript(code))
+    return problems
+
+
+def stitch_modules(title: str, module_code: Dict[str, str]) -> str:
+    """Merge module sources into a single HTML game in a fixed order."""
+    # Keep "</script>" in the title from closing the script tag
+    title_js = json.dumps(title).replace("</", "<\\/")
+    body = "\n\n".join(
+        f"// ===== Module: {module.name} =====\n{module_code[module.name]}"
+        for module in MODULES
+    )
+    body = textwrap.indent(body, " " * 8)
+
+    return f"""<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="UTF-8">
+    <title>{html.escape(title)}</title>
+    <script src="https://cdnjs.cloudflare.com/ajax/libs/p5.js/1.7.0/p5.min.js"></script>
+    <style>
+        body {{
+            margin: 0;
+            display: flex;
+            justify-content: center;
+            align-items: center;
+            min-height: 100vh;
+            background-color: #111;
+            font-family: Arial, sans-serif;
+        }}
+    </style>
+</head>
+<body>
+    <main id="game-container"></main>
+
+    <script>
+        // Shared world state - every module reads and writes this object
+        const world = {{
+            title: {title_js},
+            width: 800,
+            height: 600,
+            state: 'start',
+            score: 0,
+            lives: 3,
+            level: 1,
+            player: null,
+            enemies: [],
+            projectiles: [],
+            effects: [],
+            background: '#111111'
+        }};
+
+{body}
+
+        // ===== Runtime =====
+        function setup() {{
+            let canvas = createCanvas(world.width, world.height);
+            canvas.parent('game-container');
+            resetGame();
+        }}
+
+        function draw() {{
+            background(world.background);
+            if (world.state === 'playing') {{
+                updatePlayer();
+                updateEnemies();
+                checkCollisions();
+            }}
+            updateGameState();
+            drawEnemies();
+            if (world.player) {{
+                drawPlayer();
+            }}
+            drawHud();
+            drawScreens();
+        }}
+
+        function keyPressed() {{
+            stateKeyPressed(key, keyCode);
+            if (world.state === 'playing') {{
+                playerKeyPressed(key, keyCode);
+            }}
+        }}
+    </script>
+</body>
+</html>
+"""
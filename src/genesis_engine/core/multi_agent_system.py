@@ -13,41 +13,28 @@ import asyncio
 import json
 import logging
 from dataclasses import dataclass
-from enum import Enum
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple, Any
 from datetime import datetime
 
 from .logger import EngineLogger
 from .ai_client import AIClient
-from .sentry_agent import get_sentry_agent
+from .task_graph import AgentRole, AgentTask, TaskFailed, TaskGraphExecutor
+from .context_builder import (
+    ContextBuilder, compact_test_results, dedupe_lines, estimate_tokens, render_code_excerpt, strip_markdown
+)
+from .documents import compact_context, render_gdd_markdown, render_tech_plan_markdown
+from .incremental import IncrementCache, extract_features
+from .modules import MODULES, GameModule, check_module, clean_module_code, get_module, interface_contract, stitch_modules
+from .retry_policy import RetryAccount, get_retry_policy, use_retry_account
+from .skeletons import classify_genre, get_skeleton
+from .sentry_agent import SENTRY_METRIC_KEYS, get_sentry_agent
+from ..config import settings
 from ..utils.cloud_storage import get_cloud_storage
+from ..utils.game_index import get_game_index
 
-class AgentRole(Enum):
-    ARCHITECT = "architect"
-    ENGINEER = "engineer"
-    SENTRY = "sentry"
-    DEBUGGER = "debugger"
-
-class TaskStatus(Enum):
-    PENDING = "pending"
-    IN_PROGRESS = "in_progress"
-    SUCCESS = "success"
-    ERROR = "error"
-
-@dataclass
-class AgentTask:
-    """Represents a task for a specific agent."""
-    id: str
-    agent_role: AgentRole
-    task_type: str
-    description: str
-    input_data: Dict[str, Any]
-    status: TaskStatus = TaskStatus.PENDING
-    output_data: Optional[Dict[str, Any]] = None
-    error_message: Optional[str] = None
-    retry_count: int = 0
-    max_retries: int = 3
+# Engineer → Sentry → Debugger cycles before a game is given up on
+MAX_DEBUG_CYCLES = 3
 
 @dataclass
 class GameGenerationSession:
@@ -58,6 +45,7 @@ class GameGenerationSession:
     current_phase: str = "initialization"
     tasks: List[AgentTask] = None
     game_design_document: Optional[str] = None
+    game_design: Optional[Dict[str, Any]] = None
     technical_plan: Optional[Dict[str, Any]] = None
     generated_code: Optional[str] = None
     test_results: Optional[Dict[str, Any]] = None
@@ -65,10 +53,36 @@ class GameGenerationSession:
     is_complete: bool = False
     error_count: int = 0
     debug_cycles: int = 0
+    sentry_failures: int = 0
+    task_graph: Optional[Dict[str, Any]] = None
+    generation_mode: str = "standard"
+    features: List[str] = None
+    completed_features: int = 0
+    reference_game: Optional[str] = None
+    reference_html: Optional[str] = None
+    skeleton_genre: Optional[str] = None
+    skeleton_config: Optional[Dict[str, Any]] = None
+    module_code: Dict[str, str] = None
+    fallback_modules: List[str] = None
+    variant_count: int = 1
+    variant_number: Optional[int] = None
+    variant_temperature: Optional[float] = None
+    variants: Dict[int, "GameGenerationSession"] = None
+    retry_account: Optional[RetryAccount] = None
     
     def __post_init__(self):
         if self.tasks is None:
             self.tasks = []
+        if self.features is None:
+            self.features = []
+        if self.module_code is None:
+            self.module_code = {}
+        if self.fallback_modules is None:
+            self.fallback_modules = []
+        if self.variants is None:
+            self.variants = {}
+        if self.retry_account is None:
+            self.retry_account = get_retry_policy().new_account()
 
 class MultiAgentOrchestrator:
     """
@@ -101,16 +115,39 @@ class MultiAgentOrchestrator:
                 "system_prompt": self._get_debugger_system_prompt()
             }
         }
+        
+        # Per-role concurrency limits for the task graph executor
+        self.role_concurrency = {
+            AgentRole.ARCHITECT: 2,
+            AgentRole.ENGINEER: 2,
+            AgentRole.SENTRY: 1,
+            AgentRole.DEBUGGER: 2
+        }
     
-    async def start_generation_session(self, prompt: str, project_path: Path, session_id: str) -> GameGenerationSession:
-        """Initialize a new multi-agent game generation session."""
+    async def start_generation_session(self, prompt: str, project_path: Path, session_id: str,
+                                       generation_mode: Optional[str] = None,
+                                       variants: int = 1) -> GameGenerationSession:
+        """
+        Initialize a new multi-agent game generation session.
+        
+        With ``variants`` above one the Architect runs once and that many
+        Engineer takes are generated, tested and debugged concurrently.
+        """
         self.logger.header(f"🤖 MULTI-AGENT SYSTEM v2.3 - Session: {session_id}")
         self.logger.info(f"Prompt: '{prompt}'")
         
+        generation_mode = generation_mode or settings.generation_mode
+        variant_count = max(1, min(variants, settings.max_variants))
+        if variant_count > 1 and generation_mode != "standard":
+            self.logger.warning(f"Variants are only supported in standard mode - ignoring for {generation_mode}")
+            variant_count = 1
+        
         session = GameGenerationSession(
             session_id=session_id,
             prompt=prompt,
-            project_path=project_path
+            project_path=project_path,
+            generation_mode=generation_mode,
+            variant_count=variant_count
         )
         
         self.active_sessions[session_id] = session
@@ -123,13 +160,23 @@ class MultiAgentOrchestrator:
             self.logger.error(f"Session {session_id} not found")
             return False
         
+        role_concurrency = dict(self.role_concurrency)
+        if session.generation_mode == "modular":
+            # Every module is its own Engineer task and they should all run at once
+            role_concurrency[AgentRole.ENGINEER] = max(role_concurrency[AgentRole.ENGINEER], len(MODULES) + 1)
+        elif session.variant_count > 1:
+            role_concurrency[AgentRole.ENGINEER] = max(role_concurrency[AgentRole.ENGINEER], session.variant_count)
+        
+        executor = TaskGraphExecutor(self.logger, role_concurrency=role_concurrency)
         try:
-            # Phase 1: Architect - High-level design
-            if not await self._execute_architect_phase(session):
-                return False
+            executor.add_tasks(self._build_session_tasks(session, executor))
+            session.tasks = list(executor.tasks.values())
             
-            # Phase 2: Enter the autonomous loop
-            success = await self._execute_autonomous_loop(session)
+            # Architect → Engineer/Sentry/Debugger loop, independent steps run concurrently
+            # Every agent call in this session, variants included, retries against one account
+            with use_retry_account(session.retry_account):
+                success = await executor.run()
+            self._record_task_graph(session, executor)
             
             if success:
                 session.is_complete = True
@@ -144,69 +191,366 @@ class MultiAgentOrchestrator:
             self.logger.error(f"Session processing failed: {str(e)}")
             return False
     
-    async def _execute_architect_phase(self, session: GameGenerationSession) -> bool:
-        """Execute the Architect agent phase."""
+    def _build_session_tasks(self, session: GameGenerationSession,
+                             executor: TaskGraphExecutor) -> List[AgentTask]:
+        """
+        Describe a generation session as a graph of agent tasks.
+        
+        In standard mode each Engineer, Sentry and Debugger step is its own
+        task: every step adds the next one to ``executor`` as it finishes,
+        so the cycle unfolds in the graph instead of inside one task.
+        """
+        prompt_input = {"prompt": session.prompt}
+        
+        async def design(task: AgentTask) -> Dict[str, Any]:
+            await self._generate_design_document(session)
+            return {"chars": len(session.game_design_document or "")}
+        
+        async def plan(task: AgentTask) -> Dict[str, Any]:
+            if session.generation_mode == "skeleton" and await self._generate_skeleton_plan(session):
+                return {"genre": session.skeleton_genre}
+            await self._generate_technical_plan(session)
+            return {"chars": len(session.technical_plan["content"])}
+        
+        async def save_planning(task: AgentTask) -> Dict[str, Any]:
+            await self._save_planning_documents(session)
+            return {"files": ["GDD.md", "TECH_PLAN.md"]}
+        
+        async def autonomous_loop(task: AgentTask) -> Dict[str, Any]:
+            if session.generation_mode == "incremental":
+                loop = self._execute_incremental_loop
+            elif session.generation_mode == "modular":
+                loop = self._execute_modular_loop
+            elif session.skeleton_genre:
+                loop = self._execute_skeleton_loop
+            else:
+                loop = self._execute_autonomous_loop
+            if not await loop(session):
+                raise TaskFailed(f"Autonomous loop failed after {session.debug_cycles} cycles")
+            return {"debug_cycles": session.debug_cycles}
+        
+        def engineer_task(cycle: int, dependencies: List[str]) -> AgentTask:
+            # A failed attempt uses up a cycle, so retries are bounded by the cycles left
+            return AgentTask(
+                id=f"engineer_{cycle}",
+                agent_role=AgentRole.ENGINEER,
+                task_type="code_generation",
+                description=f"Generate the game code (cycle {cycle})",
+                input_data=prompt_input,
+                dependencies=dependencies,
+                handler=engineer,
+                max_retries=MAX_DEBUG_CYCLES - cycle
+            )
+        
+        async def engineer(task: AgentTask) -> Dict[str, Any]:
+            session.debug_cycles += 1
+            cycle = session.debug_cycles
+            session.current_phase = "engineer"
+            self.logger.phase("ENGINEER", f"Generating JavaScript game code (Cycle {cycle})")
+            self.logger.agent_action("ENGINEER", f"Starting code generation", f"Debug cycle {cycle}")
+            if not await self._execute_engineer_phase(session):
+                self.logger.agent_action("ENGINEER", "Code generation failed - triggering retry")
+                session.error_count += 1
+                raise TaskFailed(f"Code generation failed in cycle {cycle}")
+            
+            executor.add_task(AgentTask(
+                id=f"sentry_{cycle}",
+                agent_role=AgentRole.SENTRY,
+                task_type="validation",
+                description=f"Test the game code (cycle {cycle})",
+                input_data={"cycle": cycle},
+                dependencies=[task.id],
+                handler=sentry,
+                max_retries=0
+            ))
+            return {"cycle": cycle, "chars": len(session.generated_code or "")}
+        
+        async def sentry(task: AgentTask) -> Dict[str, Any]:
+            cycle = task.input_data["cycle"]
+            session.current_phase = "sentry"
+            self.logger.phase("SENTRY", "Testing generated JavaScript code...")
+            self.logger.agent_action("SENTRY", "Analyzing generated code for errors")
+            test_results = await self._execute_sentry_phase(session)
+            session.test_results = test_results
+            if test_results["success"]:
+                self.logger.agent_action("SENTRY", "Code validation passed - no errors found!")
+                await self._save_final_game(session)
+                return {"passed": True}
+            
+            error_count = len(test_results.get("errors", []))
+            if session.debug_cycles >= MAX_DEBUG_CYCLES:
+                # No cycle left to use a Debugger fix in
+                raise TaskFailed(f"Autonomous loop failed after {MAX_DEBUG_CYCLES} cycles")
+            self.logger.agent_action("SENTRY", f"Found {error_count} errors - calling Debugger")
+            executor.add_task(AgentTask(
+                id=f"debugger_{cycle}",
+                agent_role=AgentRole.DEBUGGER,
+                task_type="debug_fix",
+                description=f"Fix the errors Sentry found (cycle {cycle})",
+                input_data={"cycle": cycle, "errors": error_count},
+                dependencies=[task.id],
+                handler=debugger,
+                max_retries=0
+            ))
+            return {"passed": False, "errors": error_count}
+        
+        async def debugger(task: AgentTask) -> Dict[str, Any]:
+            cycle = task.input_data["cycle"]
+            session.current_phase = "debugger"
+            self.logger.phase("DEBUGGER", f"Fixing errors (Debug cycle {cycle})")
+            self.logger.agent_action("DEBUGGER", "Analyzing error report from Sentry")
+            fixed = await self._execute_debugger_phase(session, session.test_results)
+            if not fixed:
+                # The next cycle regenerates the code either way
+                self.logger.agent_action("DEBUGGER", "Debug attempt failed - will retry")
+                session.error_count += 1
+            executor.add_task(engineer_task(cycle + 1, [task.id]))
+            return {"fixed": fixed}
+        
+        async def generate_module(task: AgentTask) -> Dict[str, Any]:
+            return await self._generate_module(session, get_module(task.input_data["module"]))
+        
+        async def generate_variant(task: AgentTask) -> Dict[str, Any]:
+            variant = self._create_variant_session(session, task.input_data["variant"])
+            try:
+                variant.is_complete = await self._execute_autonomous_loop(variant)
+            except Exception as e:
+                # One broken take must not sink the others
+                self.logger.error(f"Variant {variant.variant_number} failed: {str(e)}")
+            return {"passed": variant.is_complete, "debug_cycles": variant.debug_cycles}
+        
+        async def select_variant(task: AgentTask) -> Dict[str, Any]:
+            primary = await self._select_primary_variant(session)
+            if primary is None:
+                raise TaskFailed(f"None of the {session.variant_count} variants passed Sentry")
+            return {"primary": primary.variant_number}
+        
+        module_tasks = []
+        if session.generation_mode == "modular":
+            module_tasks = [
+                AgentTask(
+                    id=f"module_{module.name}",
+                    agent_role=AgentRole.ENGINEER,
+                    task_type="code_module",
+                    description=f"Generate the {module.name} module",
+                    input_data={"module": module.name},
+                    dependencies=["technical_plan"],
+                    handler=generate_module,
+                    max_retries=0
+                )
+                for module in MODULES
+            ]
+        
+        if session.variant_count > 1:
+            variant_tasks = [
+                AgentTask(
+                    id=f"variant_{number}",
+                    agent_role=AgentRole.ENGINEER,
+                    task_type="engineer_sentry_debugger_loop",
+                    description=f"Generate, test and debug variant {number}",
+                    input_data={"variant": number},
+                    dependencies=["technical_plan"],
+                    handler=generate_variant,
+                    max_retries=0
+                )
+                for number in range(1, session.variant_count + 1)
+            ]
+            output_tasks = variant_tasks + [
+                AgentTask(
+                    id="select_variant",
+                    agent_role=AgentRole.SENTRY,
+                    task_type="select_variant",
+                    description="Pick the primary game among the passing variants",
+                    input_data=prompt_input,
+                    dependencies=[task.id for task in variant_tasks],
+                    handler=select_variant,
+                    max_retries=0
+                )
+            ]
+        elif session.generation_mode == "standard":
+            output_tasks = [engineer_task(1, ["technical_plan"])]
+        else:
+            output_tasks = [
+                AgentTask(
+                    id="autonomous_loop",
+                    agent_role=AgentRole.ENGINEER,
+                    task_type="engineer_sentry_debugger_loop",
+                    description="Generate, test and debug the game code",
+                    input_data=prompt_input,
+                    dependencies=["technical_plan"] + [task.id for task in module_tasks],
+                    handler=autonomous_loop,
+                    max_retries=0
+                )
+            ]
+        
+        return module_tasks + [
+            AgentTask(
+                id="design_document",
+                agent_role=AgentRole.ARCHITECT,
+                task_type="game_design_document",
+                description="Create the Game Design Document",
+                input_data=prompt_input,
+                handler=design,
+                max_retries=2
+            ),
+            AgentTask(
+                id="technical_plan",
+                agent_role=AgentRole.ARCHITECT,
+                task_type="technical_plan",
+                description="Create the technical implementation plan",
+                input_data=prompt_input,
+                dependencies=["design_document"],
+                handler=plan,
+                max_retries=2
+            ),
+            AgentTask(
+                id="save_planning_documents",
+                agent_role=AgentRole.ARCHITECT,
+                task_type="save_documents",
+                description="Write GDD.md and TECH_PLAN.md",
+                input_data={"project_path": str(session.project_path)},
+                dependencies=["technical_plan"],
+                handler=save_planning,
+                max_retries=1
+            ),
+        ] + output_tasks
+    
+    def _record_task_graph(self, session: GameGenerationSession, executor: TaskGraphExecutor):
+        """Keep the executed task graph on the session and optionally write it out."""
+        session.task_graph = executor.export()
+        critical_path = " → ".join(session.task_graph["critical_path"])
+        self.logger.info(
+            f"Task graph: {session.task_graph['wall_time']:.2f}s wall time, "
+            f"critical path {critical_path} ({session.task_graph['critical_path_duration']:.2f}s)"
+        )
+        
+        if settings.export_task_graph:
+            try:
+                profile_path = executor.write_profile(session.project_path / "task_graph.json")
+                self.logger.file_created(profile_path.name, "Task graph profile")
+            except OSError as e:
+                self.logger.warning(f"Could not write task graph profile: {str(e)}")
+    
+    async def _generate_design_document(self, session: GameGenerationSession):
+        """Architect step: create the Game Design Document."""
         session.current_phase = "architect"
         self.logger.phase("ARCHITECT", "Creating game design and technical plan...")
         self.logger.agent_action("ARCHITECT", "Analyzing game concept", f"'{session.prompt}'")
         
         # Generate Game Design Document
         self.logger.agent_action("ARCHITECT", "Creating Game Design Document")
-        gdd_prompt = f"""As the ARCHITECT agent, create a comprehensive Game Design Document for this prompt:
-            
-Prompt: "{session.prompt}"
-
-Generate a detailed GDD that includes:
-1. Game Overview & Core Concept
-2. Target Platform: Browser/JavaScript with p5.js
-3. Core Gameplay Mechanics (detailed)
-4. Player Controls and Interactions
-5. Visual Style (geometric shapes, colors)
-6. Technical Constraints (single HTML file)
-7. Success/Failure Conditions
-
-Focus on creating a game that can be implemented in JavaScript/p5.js with simple geometric graphics."""
-        
-        gdd_content = self.ai_client.generate_game_design_document(session.prompt)
+        # Skeleton mode takes its genre from the structured GDD
+        if settings.structured_planning or session.generation_mode == "skeleton":
+            try:
+                session.game_design = await asyncio.to_thread(
+                    self.ai_client.generate_game_design_document, session.prompt, True
+                )
+                session.game_design_document = render_gdd_markdown(session.game_design)
+            except Exception as e:
+                self.logger.warning(f"Structured GDD failed, falling back to markdown: {str(e)}")
         
-        session.game_design_document = gdd_content
+        if session.game_design is None:
+            session.game_design_document = await asyncio.to_thread(
+                self.ai_client.generate_game_design_document, session.prompt
+            )
         self.logger.agent_action("ARCHITECT", "Game Design Document completed")
         self.logger.file_created("GDD.md", "Game Design Document")
-        
-        # Generate Technical Plan
+    
+    async def _generate_technical_plan(self, session: GameGenerationSession):
+        """Architect step: create the technical implementation plan."""
         self.logger.agent_action("ARCHITECT", "Creating Technical Implementation Plan")
-        tech_prompt = f"""As the ARCHITECT agent, create a detailed technical implementation plan.
-
-Game Concept: "{session.prompt}"
-
-Game Design Document:
-{gdd_content}
-
-Create a technical plan with:
-1. Technology Stack: JavaScript + p5.js
-2. File Structure: Single HTML file with embedded JS/CSS
-3. Core Classes/Objects to implement
-4. Implementation Sequence (features to build in order)
-5. Testing Checkpoints (what Sentry agent should verify)
-
-Break down into small, testable features that Engineer can implement one at a time."""
-        
-        tech_content = self.ai_client.generate_technical_plan(gdd_content)
+        session.technical_plan = None
+        if session.game_design is not None:
+            try:
+                plan = await asyncio.to_thread(
+                    self.ai_client.generate_technical_plan, session.game_design, True
+                )
+                session.technical_plan = {"content": render_tech_plan_markdown(plan), "structured": plan}
+            except Exception as e:
+                self.logger.warning(f"Structured technical plan failed, falling back to markdown: {str(e)}")
         
-        session.technical_plan = {"content": tech_content}
+        if session.technical_plan is None:
+            tech_content = await asyncio.to_thread(
+                self.ai_client.generate_technical_plan, self._design_context(session)
+            )
+            session.technical_plan = {"content": tech_content}
         self.logger.agent_action("ARCHITECT", "Technical Plan completed")
         self.logger.file_created("TECH_PLAN.md", "Technical Implementation Plan")
+        self.logger.agent_action("ARCHITECT", "Planning phase complete - handing off to Engineer")
+    
+    def _design_context(self, session: GameGenerationSession) -> str:
+        """The GDD as handed to downstream agents: compact JSON when structured."""
+        if session.game_design is not None:
+            return compact_context(session.game_design)
+        return session.game_design_document
+    
+    def _plan_context(self, session: GameGenerationSession) -> str:
+        """The technical plan as handed to downstream agents: compact JSON when structured."""
+        structured = session.technical_plan.get("structured")
+        if structured is not None:
+            return compact_context(structured)
+        return session.technical_plan["content"]
+    
+    def _planning_sections(self, session: GameGenerationSession) -> Tuple[str, str]:
+        """Design and plan context without markdown decoration or lines repeated across both."""
+        design, plan = self._design_context(session), self._plan_context(session)
+        if session.game_design is None:
+            design = strip_markdown(design)
+        if session.technical_plan.get("structured") is None:
+            plan = strip_markdown(plan)
+        design, plan = dedupe_lines([design, plan])
+        return design, plan
+    
+    async def _generate_skeleton_plan(self, session: GameGenerationSession) -> bool:
+        """Architect step for skeleton mode: pick a genre skeleton and fill in its config."""
+        if session.game_design is not None:
+            genre, action = session.game_design.get("genre"), "Picked game genre"
+        else:
+            # Only a markdown GDD came back, so match keywords instead
+            genre, action = classify_genre(session.prompt, session.game_design_document or ""), "Classified game genre"
+        skeleton = get_skeleton(genre)
+        if not skeleton:
+            self.logger.agent_action("ARCHITECT", "No matching genre skeleton - planning a free-form game")
+            return False
         
-        # Save documents
-        await self._save_planning_documents(session)
+        self.logger.agent_action("ARCHITECT", action, skeleton.genre)
+        try:
+            raw_config = await asyncio.to_thread(
+                self.ai_client.generate_skeleton_config,
+                session.prompt,
+                self._design_context(session),
+                skeleton.description,
+                skeleton.schema(),
+                skeleton.defaults()
+            )
+        except Exception as e:
+            self.logger.warning(f"Skeleton config generation failed, using defaults: {str(e)}")
+            raw_config = {}
+        
+        config = skeleton.validate_config(raw_config)
+        session.skeleton_genre = skeleton.genre
+        session.skeleton_config = config
+        session.technical_plan = {
+            "content": f"""# Technical Implementation Plan
+
+## Genre Skeleton
+**{skeleton.genre}**: {skeleton.description}
+
+## Configuration
+```json
+{json.dumps(config, indent=2)}
+```
+""",
+            "genre": skeleton.genre,
+            "config": config
+        }
+        self.logger.file_created("TECH_PLAN.md", "Skeleton configuration")
         self.logger.agent_action("ARCHITECT", "Planning phase complete - handing off to Engineer")
         return True
     
     async def _execute_autonomous_loop(self, session: GameGenerationSession) -> bool:
         """Execute the autonomous Engineer → Sentry → Debugger loop."""
-        max_debug_cycles = 3
-        
-        while session.debug_cycles < max_debug_cycles:
+        while session.debug_cycles < MAX_DEBUG_CYCLES:
             session.debug_cycles += 1
             
             # Engineer Phase: Generate/Update JavaScript code
@@ -245,42 +589,243 @@ Break down into small, testable features that Engineer can implement one at a ti
                     session.error_count += 1
                     continue
         
-        self.logger.error(f"Autonomous loop failed after {max_debug_cycles} cycles")
+        self.logger.error(f"Autonomous loop failed after {MAX_DEBUG_CYCLES} cycles")
         return False
     
+    async def _execute_incremental_loop(self, session: GameGenerationSession) -> bool:
+        """Build the game feature by feature, checking each increment with a fast Sentry pass."""
+        tech_plan = session.technical_plan["content"]
+        features = extract_features(tech_plan, settings.incremental_max_features)
+        session.features = [feature.title for feature in features]
+        
+        cache = IncrementCache(session.project_path, tech_plan)
+        if cache.load():
+            self.logger.agent_action(
+                "ENGINEER", "Resuming from last green increment",
+                f"{cache.completed_features}/{len(features)} features done"
+            )
+        session.completed_features = cache.completed_features
+        sentry = await get_sentry_agent()
+        
+        for index in range(cache.completed_features, len(features)):
+            feature = features[index]
+            number = index + 1
+            session.current_phase = "engineer"
+            self.logger.phase("ENGINEER", f"Feature {number}/{len(features)}: {feature.title}")
+            
+            error_report = None
+            for attempt in range(settings.incremental_feature_retries + 1):
+                if attempt > 0:
+                    session.debug_cycles += 1
+                    self.logger.agent_action("ENGINEER", f"Retrying feature {number}", f"attempt {attempt + 1}")
+                
+                try:
+                    candidate = await asyncio.to_thread(
+                        self.ai_client.generate_feature_increment,
+                        self._design_context(session),
+                        self._plan_context(session),
+                        feature.describe(),
+                        number,
+                        len(features),
+                        cache.code,
+                        error_report,
+                        session.sentry_failures
+                    )
+                except Exception as e:
+                    self.logger.error(f"Feature {number} generation failed: {str(e)}")
+                    session.error_count += 1
+                    error_report = str(e)
+                    continue
+                
+                session.current_phase = "sentry"
+                quick_results = await sentry.validate_game(candidate, session.project_path.name, static_only=True)
+                if quick_results["success"]:
+                    cache.store(candidate, number, feature.title)
+                    session.generated_code = candidate
+                    session.completed_features = number
+                    self.logger.agent_action("SENTRY", f"Feature {number} increment is green")
+                    break
+                
+                session.error_count += 1
+                session.sentry_failures += 1
+                error_report = "\n".join(f"- {error}" for error in quick_results["errors"])
+                self.logger.agent_action("SENTRY", f"Feature {number} failed quick checks", error_report)
+            else:
+                self.logger.error(f"Feature '{feature.title}' failed after {settings.incremental_feature_retries + 1} attempts")
+                return False
+        
+        # Full Sentry pass on the finished game, falling back to the Debugger
+        session.generated_code = cache.code
+        if await self._validate_assembled_game(session, "incremental", settings.incremental_debug_cycles):
+            return True
+        
+        self.logger.error("Incremental build failed final validation")
+        return False
+    
+    async def _validate_assembled_game(self, session: GameGenerationSession, build: str, debug_cycles: int) -> bool:
+        """Full Sentry pass on an assembled game, with up to ``debug_cycles`` Debugger rounds."""
+        for cycle in range(debug_cycles + 1):
+            session.current_phase = "sentry"
+            self.logger.phase("SENTRY", f"Testing the completed {build} build...")
+            test_results = await self._execute_sentry_phase(session)
+            session.test_results = test_results
+            if test_results["success"]:
+                await self._save_final_game(session)
+                return True
+            if cycle == debug_cycles:
+                break
+            
+            session.debug_cycles += 1
+            session.current_phase = "debugger"
+            self.logger.phase("DEBUGGER", f"Fixing errors in the completed build (Debug cycle {session.debug_cycles})")
+            if not await self._execute_debugger_phase(session, test_results):
+                session.error_count += 1
+        return False
+    
+    async def _generate_module(self, session: GameGenerationSession, module: GameModule) -> Dict[str, Any]:
+        """Engineer step for modular mode: generate one module against the interface contract."""
+        self.logger.agent_action("ENGINEER", f"Generating {module.name} module")
+        error_report = None
+        for attempt in range(settings.modular_module_retries + 1):
+            try:
+                code = await asyncio.to_thread(
+                    self.ai_client.generate_code_module,
+                    self._design_context(session),
+                    self._plan_context(session),
+                    interface_contract(),
+                    module.name,
+                    module.description,
+                    error_report
+                )
+            except Exception as e:
+                self.logger.warning(f"Module {module.name} generation failed: {str(e)}")
+                session.error_count += 1
+                error_report = str(e)
+                continue
+            
+            code = clean_module_code(code)
+            if not code:
+                # Nothing to correct, go straight to the fallback
+                break
+            problems = check_module(module, code)
+            if not problems:
+                session.module_code[module.name] = code
+                self.logger.agent_action("ENGINEER", f"{module.name} module ready", f"{len(code)} chars")
+                return {"source": "generated", "chars": len(code), "attempts": attempt + 1}
+            
+            session.error_count += 1
+            error_report = "\n".join(f"- {problem}" for problem in problems)
+            self.logger.agent_action("ENGINEER", f"{module.name} module breaks the contract", error_report)
+        
+        self.logger.warning(f"Using the built-in {module.name} module")
+        session.module_code[module.name] = module.fallback_code()
+        session.fallback_modules.append(module.name)
+        return {"source": "fallback"}
+    
+    async def _execute_modular_loop(self, session: GameGenerationSession) -> bool:
+        """Stitch the generated modules into one game and validate it."""
+        session.current_phase = "engineer"
+        self.logger.phase("ENGINEER", "Stitching game modules")
+        if session.game_design is not None:
+            title = session.game_design["title"]
+        else:
+            title = session.prompt[:60]
+        session.generated_code = stitch_modules(title, session.module_code)
+        self.logger.file_created("game.html", "JavaScript/HTML5 Game")
+        
+        if await self._validate_assembled_game(session, "modular", settings.modular_debug_cycles):
+            return True
+        
+        self.logger.error("Modular build failed final validation")
+        return False
+    
+    async def _execute_skeleton_loop(self, session: GameGenerationSession) -> bool:
+        """Render the configured genre skeleton, falling back to free-form generation if it fails."""
+        skeleton = get_skeleton(session.skeleton_genre)
+        session.current_phase = "engineer"
+        self.logger.phase("ENGINEER", f"Rendering the {skeleton.genre} skeleton")
+        session.generated_code = skeleton.render(session.skeleton_config)
+        self.logger.file_created("game.html", "JavaScript/HTML5 Game")
+        
+        session.current_phase = "sentry"
+        self.logger.phase("SENTRY", "Testing the rendered skeleton...")
+        test_results = await self._execute_sentry_phase(session)
+        session.test_results = test_results
+        if test_results["success"]:
+            await self._save_final_game(session)
+            return True
+        
+        self.logger.warning("Skeleton game failed validation - falling back to free-form generation")
+        session.error_count += 1
+        session.skeleton_genre = None
+        await self._generate_technical_plan(session)
+        await self._save_planning_documents(session)
+        return await self._execute_autonomous_loop(session)
+    
+    def _create_variant_session(self, session: GameGenerationSession, number: int) -> GameGenerationSession:
+        """Child session for one Engineer take, sharing the parent's Architect output."""
+        count = session.variant_count
+        low, high = settings.variant_temperature_min, settings.variant_temperature_max
+        temperature = low + (high - low) * (number - 1) / (count - 1) if count > 1 else low
+        
+        project_path = session.project_path / f"{session.project_path.name}_v{number}"
+        project_path.mkdir(parents=True, exist_ok=True)
+        variant = GameGenerationSession(
+            session_id=f"{session.session_id}-v{number}",
+            prompt=session.prompt,
+            project_path=project_path,
+            game_design_document=session.game_design_document,
+            game_design=session.game_design,
+            technical_plan=session.technical_plan,
+            variant_count=count,
+            variant_number=number,
+            variant_temperature=round(temperature, 2)
+        )
+        session.variants[number] = variant
+        self.logger.agent_action("ENGINEER", f"Starting variant {number}/{count}", f"temperature {variant.variant_temperature}")
+        return variant
+    
+    async def _select_primary_variant(self, session: GameGenerationSession) -> Optional[GameGenerationSession]:
+        """Promote the passing variant that needed the fewest debug cycles to the session's game."""
+        passed = [variant for _, variant in sorted(session.variants.items()) if variant.is_complete]
+        self.logger.agent_action("SENTRY", f"{len(passed)}/{session.variant_count} variants passed")
+        if not passed:
+            session.test_results = {"success": False, "variants": [
+                variant.test_results for _, variant in sorted(session.variants.items())
+            ]}
+            return None
+        
+        primary = min(passed, key=lambda variant: variant.debug_cycles)
+        session.generated_code = primary.generated_code
+        session.test_results = primary.test_results
+        session.debug_cycles = primary.debug_cycles
+        session.reference_game = primary.reference_game
+        await self._save_final_game(session)
+        self.logger.success(f"Variant {primary.variant_number} is the primary game")
+        return primary
+    
     async def _execute_engineer_phase(self, session: GameGenerationSession) -> bool:
         """Execute the Engineer agent phase."""
-        engineer_prompt = f"""As the ENGINEER agent, generate complete JavaScript game code.
-
-Game Concept: "{session.prompt}"
-
-Technical Plan:
-{session.technical_plan['content']}
-
-Previous Code (if any):
-{session.generated_code or 'None - first implementation'}
-
-Generate a COMPLETE, SINGLE HTML file with:
-1. HTML structure with canvas element
-2. Embedded p5.js from CDN
-3. Complete JavaScript game implementation
-4. CSS styling
-5. All game features from the technical plan
-
-Requirements:
-- Use p5.js library for graphics and interaction
-- Implement ALL features from the technical plan
-- Include proper error handling
-- Use simple geometric shapes for graphics
-- Ensure code is syntactically correct
-
-Output only the complete HTML file content."""
-        
         try:
+            reference_html = await self._find_reference_game(session)
+            design, plan = self._planning_sections(session)
+            context = (ContextBuilder(settings.context_token_budget)
+                       .add("plan", plan, priority=2, min_tokens=1500)
+                       .add("design", design, priority=1, min_tokens=1000)
+                       .add("reference", reference_html, priority=0, atomic=True)
+                       .build())
+            if reference_html and not context["reference"]:
+                self.logger.info("Reference game dropped to fit the context budget")
             self.logger.agent_action("ENGINEER", "Generating JavaScript/HTML5 code")
-            code_content = self.ai_client.generate_javascript_game(
-                session.game_design_document,
-                session.technical_plan["content"]
+            code_content = await asyncio.to_thread(
+                self.ai_client.generate_javascript_game,
+                context["design"],
+                context["plan"],
+                context["reference"] or None,
+                "engineer",
+                session.sentry_failures,
+                session.variant_temperature,
+                (session.variant_number, session.variant_count) if session.variant_number else None
             )
             
             session.generated_code = code_content
@@ -291,6 +836,41 @@ Output only the complete HTML file content."""
             self.logger.error(f"Engineer phase failed: {str(e)}")
             return False
     
+    async def _find_reference_game(self, session: GameGenerationSession) -> Optional[str]:
+        """Look up the closest previously validated game to warm-start the Engineer."""
+        if not settings.enable_warm_start:
+            return None
+        if session.reference_html is not None:
+            return session.reference_html or None
+        
+        session.reference_html = ""
+        try:
+            match = await asyncio.to_thread(
+                get_game_index().best_match,
+                session.prompt,
+                session.game_design_document or "",
+                settings.warm_start_min_similarity
+            )
+            if not match:
+                return None
+            
+            reference_html = match.read_html()
+            if len(reference_html) > settings.warm_start_max_chars:
+                self.logger.info(f"Reference game {match.game.name} too large for warm start - skipping")
+                return None
+        except Exception as e:
+            # Warm start is optional, never let it fail the Engineer step
+            self.logger.warning(f"Warm start lookup failed: {str(e)}")
+            return None
+        
+        session.reference_game = match.game.name
+        session.reference_html = reference_html
+        self.logger.agent_action(
+            "ENGINEER", "Warm start from validated game",
+            f"{match.game.name} (similarity {match.score:.2f})"
+        )
+        return reference_html
+    
     async def _execute_sentry_phase(self, session: GameGenerationSession) -> Dict[str, Any]:
         """Execute the Sentry agent phase (simplified testing)."""
         # Get or create Sentry agent instance
@@ -311,6 +891,7 @@ Output only the complete HTML file content."""
         if validation_results["success"]:
             self.logger.success("✅ SENTRY: All tests passed!")
         else:
+            session.sentry_failures += 1
             self.logger.warning(f"⚠️ SENTRY: Found {len(validation_results['errors'])} errors")
             for error in validation_results["errors"]:
                 self.logger.error(f"  - {error}")
@@ -318,6 +899,9 @@ Output only the complete HTML file content."""
         return {
             "success": validation_results["success"],
             "errors": validation_results["errors"],
+            "runtime_errors": validation_results.get("runtime_errors", []),
+            "console_errors": validation_results.get("console_errors", []),
+            **{key: validation_results.get(key) for key in SENTRY_METRIC_KEYS},
             "error_count": len(validation_results["errors"]),
             "validation_type": "comprehensive",
             "browser_tested": validation_results.get("browser_test_passed", False)
@@ -325,30 +909,30 @@ Output only the complete HTML file content."""
     
     async def _execute_debugger_phase(self, session: GameGenerationSession, test_results: Dict[str, Any]) -> bool:
         """Execute the Debugger agent phase."""
-        debugger_prompt = f"""As the DEBUGGER agent, fix the errors in this JavaScript game code.
-
-Original Goal: "{session.prompt}"
-
-Broken Code:
-{session.generated_code}
-
-Error Report from Sentry:
-{json.dumps(test_results, indent=2)}
-
-Your task:
-1. Analyze the specific errors reported
-2. Identify the root cause
-3. Generate the corrected, complete HTML file
-4. Ensure all errors are fixed
-5. Do NOT add new features, only fix existing code
-
-Output only the corrected complete HTML file content."""
-        
         try:
-            self.logger.agent_action("DEBUGGER", "Applying code corrections")
-            fixed_code = self.ai_client.generate_javascript_game(
-                session.game_design_document,
-                session.technical_plan["content"]
+            current_code = session.generated_code or ""
+            error_report = compact_test_results(test_results)
+            design, plan = self._planning_sections(session)
+            context = (ContextBuilder(settings.context_token_budget)
+                       .add("errors", error_report, priority=3, min_tokens=500)
+                       .add("code", render_code_excerpt(current_code, error_report.splitlines(),
+                                                        settings.debugger_context_lines),
+                            priority=2, min_tokens=2000)
+                       .add("plan", plan, priority=1, min_tokens=800)
+                       .add("design", design, priority=0, min_tokens=400)
+                       .build())
+            self.logger.agent_action(
+                "DEBUGGER", "Applying code corrections",
+                f"~{sum(estimate_tokens(text) for text in context.values())} context tokens"
+            )
+            fixed_code = await asyncio.to_thread(
+                self.ai_client.generate_debug_fix,
+                context["design"],
+                context["plan"],
+                current_code,
+                context["code"],
+                context["errors"],
+                session.sentry_failures
             )
             
             session.generated_code = fixed_code
@@ -398,7 +982,23 @@ Output only the corrected complete HTML file content."""
             self.logger.info("Cloud storage not configured - game saved locally")
             session.final_html_file = str(game_path)
         
+        # Keep Sentry's runtime measurements next to the game
+        metrics = {key: (session.test_results or {}).get(key) for key in SENTRY_METRIC_KEYS}
+        if any(metrics.values()):
+            with open(session.project_path / "sentry_metrics.json", 'w', encoding='utf-8') as f:
+                json.dump(metrics, f, indent=2)
+        
         # Save README
+        reference_line = f"\n- **Reference Game**: {session.reference_game}" if session.reference_game else ""
+        skeleton_line = f"\n- **Genre Skeleton**: {session.skeleton_genre}" if session.skeleton_genre else ""
+        if session.variant_number:
+            variant_line = (f"\n- **Variant**: {session.variant_number} of {session.variant_count} "
+                            f"(temperature {session.variant_temperature})")
+        elif session.variants:
+            passed = sum(1 for variant in session.variants.values() if variant.is_complete)
+            variant_line = f"\n- **Variants**: {passed} of {session.variant_count} passed, in the *_v<N> folders"
+        else:
+            variant_line = ""
         readme_content = f"""# Generated Game: {session.prompt}
 
 ## Play the Game
@@ -406,7 +1006,7 @@ Output only the corrected complete HTML file content."""
 
 ## Generation Summary
 - **Prompt**: {session.prompt}
-- **Debug Cycles**: {session.debug_cycles}
+- **Debug Cycles**: {session.debug_cycles}{reference_line}{skeleton_line}{variant_line}
 - **Technology**: JavaScript + p5.js
 - **Generated by**: AI Genesis Engine v2.3 Multi-Agent System
 
@@ -423,6 +1023,9 @@ This game was created entirely by autonomous AI agents working together!
         with open(readme_path, 'w', encoding='utf-8') as f:
             f.write(readme_content)
         
+        # Make the new game available as a warm-start reference
+        get_game_index().add(session.project_path)
+        
         self.logger.success(f"🎮 Final game saved: {cloud_url or game_path}")
     
     def get_session_status(self, session_id: str) -> Dict[str, Any]:
@@ -437,9 +1040,33 @@ This game was created entirely by autonomous AI agents working together!
             "current_phase": session.current_phase,
             "debug_cycles": session.debug_cycles,
             "error_count": session.error_count,
+            "sentry_failures": session.sentry_failures,
+            "generation_mode": session.generation_mode,
+            "structured_planning": session.game_design is not None,
+            "features": session.features,
+            "completed_features": session.completed_features,
+            "reference_game": session.reference_game,
+            "skeleton_genre": session.skeleton_genre,
+            "fallback_modules": session.fallback_modules,
+            "variants": [
+                {
+                    "variant": number,
+                    "temperature": variant.variant_temperature,
+                    "passed": variant.is_complete,
+                    "debug_cycles": variant.debug_cycles,
+                    "final_html_file": variant.final_html_file,
+                    "errors": (variant.test_results or {}).get("errors", [])
+                }
+                for number, variant in sorted(session.variants.items())
+            ],
+            "retries": session.retry_account.snapshot(),
             "is_complete": session.is_complete,
             "final_html_file": session.final_html_file,
-            "test_results": session.test_results
+            "test_results": session.test_results,
+            "tasks": [
+                {"id": task.id, "role": task.agent_role.value, "status": task.status.value}
+                for task in session.tasks
+            ]
         }
     
     def _get_architect_system_prompt(self) -> str:
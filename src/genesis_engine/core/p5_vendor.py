@@ -0,0 +1,174 @@
+"""
+Offline p5.js Cache for the Sentry Agent
+Serves p5.js requests for known CDN URLs (cdnjs and jsdelivr) from a local,
+versioned cache so browser tests do not depend on the network. Every file
+is recorded with its SHA-256 in a manifest and verified before it is served;
+a missing or corrupted file is downloaded again when downloads are allowed.
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import re
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+MANIFEST = "manifest.json"
+CDNJS_SOURCE = "https://cdnjs.cloudflare.com/ajax/libs/p5.js"
+
+# p5.js, p5.min.js and the addons (p5.sound) shipped with each release
+_FILE = r"(?P<file>(?:addons/)?p5(?:\.sound)?(?:\.min)?\.js)"
+_VERSION = r"(?P<version>\d+\.\d+\.\d+)"
+CDN_PATTERNS = (
+    re.compile(rf"^https?://cdnjs\.cloudflare\.com/ajax/libs/p5\.js/{_VERSION}/{_FILE}(?:\?.*)?$"),
+    re.compile(rf"^https?://cdn\.jsdelivr\.net/npm/p5@{_VERSION}/lib/{_FILE}(?:\?.*)?$"),
+)
+
+# Matches any URL the cache may answer, for Playwright's route()
+ROUTE_PATTERN = re.compile(r"^https?://(cdnjs\.cloudflare\.com/ajax/libs/p5\.js/|cdn\.jsdelivr\.net/npm/p5@)")
+
+
+def parse_p5_url(url: str) -> Optional[Tuple[str, str]]:
+    """(version, file) for a p5.js CDN URL, e.g. ("1.7.0", "p5.min.js"); None for anything else."""
+    for pattern in CDN_PATTERNS:
+        match = pattern.match(url)
+        if match:
+            return match.group("version"), match.group("file")
+    return None
+
+
+class P5Cache:
+    """
+    Versioned, checksum-verified p5.js files under ``cache_dir/<version>/<file>``.
+
+    ``manifest.json`` maps "<version>/<file>" to the SHA-256 recorded when
+    the file was first vendored; files that no longer match are discarded.
+    Verified files are kept in memory for the life of the process. Misses
+    are downloaded from ``source`` (``<source>/<version>/<file>``).
+    """
+
+    def __init__(self, cache_dir: Path, allow_download: bool = True, source: str = CDNJS_SOURCE,
+                 timeout: Optional[aiohttp.ClientTimeout] = None):
+        self.cache_dir = Path(cache_dir)
+        self.allow_download = allow_download
+        self.source = source.rstrip("/")
+        self.timeout = timeout or aiohttp.ClientTimeout(total=30)
+        self._memory: Dict[str, bytes] = {}
+        self._locks: Dict[str, asyncio.Lock] = {}
+        self.hits = 0
+        self.misses = 0
+        self.downloads = 0
+        self.checksum_failures = 0
+
+    def _manifest(self) -> Dict[str, str]:
+        try:
+            return json.loads((self.cache_dir / MANIFEST).read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+
+    def _write_manifest(self, manifest: Dict[str, str]):
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        (self.cache_dir / MANIFEST).write_text(json.dumps(manifest, indent=2, sort_keys=True), encoding="utf-8")
+
+    def load(self, version: str, file: str) -> Optional[bytes]:
+        """The cached file if it is on disk and matches its recorded checksum."""
+        key = f"{version}/{file}"
+        if key in self._memory:
+            return self._memory[key]
+        path = self.cache_dir / version / file
+        expected = self._manifest().get(key)
+        if expected is None or not path.is_file():
+            return None
+        body = path.read_bytes()
+        if hashlib.sha256(body).hexdigest() != expected:
+            self.checksum_failures += 1
+            logger.warning(f"Cached p5.js {key} failed checksum verification - discarding")
+            path.unlink(missing_ok=True)
+            return None
+        self._memory[key] = body
+        return body
+
+    def store(self, version: str, file: str, body: bytes) -> str:
+        """Vendor a file and record its checksum; returns the SHA-256."""
+        key = f"{version}/{file}"
+        path = self.cache_dir / version / file
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_bytes(body)
+        digest = hashlib.sha256(body).hexdigest()
+        manifest = self._manifest()
+        manifest[key] = digest
+        self._write_manifest(manifest)
+        self._memory[key] = body
+        return digest
+
+    async def get(self, version: str, file: str) -> Optional[bytes]:
+        """The file from the cache, downloading and vendoring it on a miss if allowed."""
+        key = f"{version}/{file}"
+        body = self.load(version, file)
+        if body is not None:
+            self.hits += 1
+            return body
+
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            body = self.load(version, file)
+            if body is not None:
+                self.hits += 1
+                return body
+            self.misses += 1
+            if not self.allow_download:
+                return None
+            try:
+                async with aiohttp.ClientSession(timeout=self.timeout) as session:
+                    async with session.get(f"{self.source}/{version}/{file}") as response:
+                        if response.status != 200:
+                            logger.warning(f"Could not download p5.js {key}: HTTP {response.status}")
+                            return None
+                        body = await response.read()
+            except (aiohttp.ClientError, TimeoutError) as e:
+                logger.warning(f"Could not download p5.js {key}: {e}")
+                return None
+            self.downloads += 1
+            logger.info(f"Vendored p5.js {key} ({len(body)} bytes)")
+            self.store(version, file, body)
+            return body
+
+    async def handle_route(self, route):
+        """Playwright route handler: fulfill p5.js CDN requests from the cache."""
+        parsed = parse_p5_url(route.request.url)
+        body = await self.get(*parsed) if parsed else None
+        if body is None:
+            await route.continue_()
+            return
+        await route.fulfill(
+            status=200,
+            body=body,
+            headers={
+                "Content-Type": "application/javascript; charset=utf-8",
+                "Access-Control-Allow-Origin": "*"
+            }
+        )
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            "files": sorted(self._manifest()),
+            "hits": self.hits,
+            "misses": self.misses,
+            "downloads": self.downloads,
+            "checksum_failures": self.checksum_failures
+        }
+
+
+if __name__ == "__main__":
+    # Vendor p5.js ahead of an offline build: python -m genesis_engine.core.p5_vendor 1.7.0 [file ...]
+    import sys
+    from ..config import settings
+
+    cache = P5Cache(settings.p5_cache_dir)
+    version, files = sys.argv[1], sys.argv[2:] or ["p5.min.js"]
+    for name in files:
+        print(f"{version}/{name}: {'ok' if asyncio.run(cache.get(version, name)) else 'FAILED'}")
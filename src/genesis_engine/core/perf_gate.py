@@ -0,0 +1,65 @@
+"""
+Frame-Time Performance Gate for the Sentry Agent
+Turns the per-frame timings of a game measured under load (after minutes
+of simulated play have spawned its enemies, bullets and particles) into
+percentiles and long-frame counts, and fails games whose frames do not
+fit a configurable budget. Timings cover the game's own work per frame
+(timers, ``draw()`` and the canvas calls it makes); compositing and GPU
+time are not included.
+"""
+import math
+from typing import Any, Dict, List, Optional
+
+# Runs the virtual clock's simulate() with each frame timed on the real clock
+PROFILE = "(options) => window.__virtualTime ? window.__virtualTime.simulate({ ...options, timings: true }) : null"
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an ascending list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def frame_time_report(frame_ms: List[float], budget_ms: float, long_frame_ms: float,
+                      max_long_frames: int) -> Dict[str, Any]:
+    """Percentiles, long frames and the budget verdict for a run of frame timings."""
+    ordered = sorted(frame_ms)
+    long_frames = [ms for ms in frame_ms if ms >= long_frame_ms]
+    report = {
+        "frames": len(frame_ms),
+        "p50_ms": round(percentile(ordered, 0.50), 2),
+        "p95_ms": round(percentile(ordered, 0.95), 2),
+        "p99_ms": round(percentile(ordered, 0.99), 2),
+        "max_ms": round(ordered[-1], 2) if ordered else 0.0,
+        "mean_ms": round(sum(ordered) / len(ordered), 2) if ordered else 0.0,
+        "long_frames": len(long_frames),
+        "budget_ms": budget_ms,
+        "long_frame_ms": long_frame_ms,
+        "max_long_frames": max_long_frames
+    }
+    report["within_budget"] = report["p95_ms"] <= budget_ms and len(long_frames) <= max_long_frames
+    return report
+
+
+def perf_errors(report: Optional[Dict[str, Any]], played_seconds: Optional[float] = None) -> List[str]:
+    """Validation errors for a report that is over budget, worded for the Debugger."""
+    if not report or report["within_budget"] or not report["frames"]:
+        return []
+    load = f" after {played_seconds:g}s of play" if played_seconds else ""
+    errors = []
+    if report["p95_ms"] > report["budget_ms"]:
+        errors.append(
+            f"Frames too slow under load{load}: p95 frame time {report['p95_ms']}ms exceeds the "
+            f"{report['budget_ms']:g}ms budget (p50 {report['p50_ms']}ms, p99 {report['p99_ms']}ms, "
+            f"max {report['max_ms']}ms over {report['frames']} frames). Avoid nested loops over entity "
+            f"arrays (compare squared distances, skip far pairs early), remove off-screen entities and "
+            f"do not allocate objects every frame"
+        )
+    if report["long_frames"] > report["max_long_frames"]:
+        errors.append(
+            f"{report['long_frames']} frames took longer than {report['long_frame_ms']:g}ms "
+            f"(worst {report['max_ms']}ms); the game would visibly stutter"
+        )
+    return errors
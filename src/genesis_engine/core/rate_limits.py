@@ -0,0 +1,86 @@
+"""
+Rate Limit Tracking for AI Genesis Engine
+Records the rate-limit headers Anthropic sends with every response so
+background work can tell how much request and token headroom is left
+before it competes with users for capacity.
+"""
+import threading
+import time
+from datetime import datetime
+from typing import Dict, Mapping, Optional, Tuple
+
+HEADER_PREFIX = "anthropic-ratelimit-"
+LIMIT_KINDS = ("requests", "tokens", "input-tokens", "output-tokens")
+
+
+def _parse_reset(value: Optional[str]) -> Optional[float]:
+    """Epoch seconds of an RFC 3339 reset timestamp, or None if unparseable."""
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value.replace("Z", "+00:00")).timestamp()
+    except ValueError:
+        return None
+
+
+class RateLimitTracker:
+    """
+    Remaining fraction of each rate limit, as last reported by the API.
+
+    A bucket whose reset time has passed counts as full again, and a 429
+    blocks all headroom until its Retry-After has elapsed.
+    """
+
+    def __init__(self):
+        self._buckets: Dict[str, Tuple[float, Optional[float]]] = {}
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def observe(self, headers: Mapping[str, str], status: int = 200):
+        """Record the rate-limit headers of an API response."""
+        now = time.time()
+        with self._lock:
+            for kind in LIMIT_KINDS:
+                limit = headers.get(f"{HEADER_PREFIX}{kind}-limit")
+                remaining = headers.get(f"{HEADER_PREFIX}{kind}-remaining")
+                try:
+                    fraction = int(remaining) / int(limit)
+                except (TypeError, ValueError, ZeroDivisionError):
+                    continue
+                reset = _parse_reset(headers.get(f"{HEADER_PREFIX}{kind}-reset"))
+                self._buckets[kind] = (max(0.0, min(1.0, fraction)), reset)
+
+            if status == 429:
+                try:
+                    retry_after = float(headers.get("Retry-After", 10))
+                except ValueError:
+                    retry_after = 10.0
+                self._blocked_until = max(self._blocked_until, now + retry_after)
+
+    def headroom(self) -> float:
+        """Smallest remaining fraction across all limits, 1.0 when nothing is known."""
+        now = time.time()
+        with self._lock:
+            if now < self._blocked_until:
+                return 0.0
+            fractions = [
+                fraction for fraction, reset in self._buckets.values()
+                if reset is None or reset > now
+            ]
+        return min(fractions, default=1.0)
+
+    def snapshot(self) -> Dict[str, float]:
+        """Remaining fraction per limit kind, for metrics."""
+        with self._lock:
+            buckets = dict(self._buckets)
+        return {kind: round(fraction, 3) for kind, (fraction, _) in buckets.items()}
+
+
+_rate_limit_tracker_instance = None
+
+def get_rate_limit_tracker() -> RateLimitTracker:
+    """Get the singleton rate limit tracker shared by all AI clients."""
+    global _rate_limit_tracker_instance
+    if _rate_limit_tracker_instance is None:
+        _rate_limit_tracker_instance = RateLimitTracker()
+    return _rate_limit_tracker_instance
@@ -0,0 +1,166 @@
+"""
+Retry Policy for AI Genesis Engine
+One retry policy for every LLM call: backoff with full jitter so sessions
+do not retry in lockstep, a process-wide retry budget that keeps retries
+to a fraction of requests, and per-session retry accounting so a single
+generation cannot fan out into dozens of calls during an upstream incident.
+"""
+import contextlib
+import contextvars
+import logging
+import random
+import threading
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Optional
+
+from ..config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def full_jitter(attempt: int, base: float, cap: float, rng: Optional[random.Random] = None) -> float:
+    """Backoff before retry ``attempt`` (1-based): uniform over [0, min(cap, base * 2**attempt)]."""
+    return (rng or random).uniform(0, min(cap, base * 2 ** attempt))
+
+
+@dataclass
+class RetryAccount:
+    """Calls and retries spent by one generation session."""
+    limit: int
+    requests: int = 0
+    retries: int = 0
+    denied: int = 0
+    backoff_seconds: float = 0.0
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {**asdict(self), "backoff_seconds": round(self.backoff_seconds, 2)}
+
+
+class RetryBudget:
+    """
+    Token bucket shared by every session in the process.
+
+    Each request deposits ``ratio`` tokens and each retry spends one, so
+    retries stay within ``ratio`` of requests over time. The bucket starts
+    full at ``reserve`` tokens (also its cap) so a quiet process can still
+    ride out a transient error.
+    """
+
+    def __init__(self, ratio: float = 0.1, reserve: float = 10):
+        self.ratio = ratio
+        self.reserve = reserve
+        self.tokens = reserve
+        self.requests = 0
+        self.retries = 0
+        self.denied = 0
+        self._lock = threading.Lock()
+
+    def record_request(self):
+        with self._lock:
+            self.requests += 1
+            self.tokens = min(self.reserve, self.tokens + self.ratio)
+
+    def try_spend(self) -> bool:
+        """Take a token for one retry; False once the budget is exhausted."""
+        with self._lock:
+            if self.tokens < 1:
+                self.denied += 1
+                return False
+            self.tokens -= 1
+            self.retries += 1
+            return True
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "tokens": round(self.tokens, 2),
+                "ratio": self.ratio,
+                "requests": self.requests,
+                "retries": self.retries,
+                "denied": self.denied
+            }
+
+
+class RetryPolicy:
+    """
+    Decides whether and when a failed LLM call is retried.
+
+    A retry needs room in the session's account and a token from the
+    shared budget. Waits use full jitter, or the server's Retry-After plus
+    a jittered spread; a Retry-After longer than ``max_delay`` is not
+    waited out.
+    """
+
+    def __init__(self, budget: RetryBudget, attempts_per_model: int = 3, base_delay: float = 1.0,
+                 max_delay: float = 30.0, session_limit: int = 8, rng: Optional[random.Random] = None):
+        self.budget = budget
+        self.attempts_per_model = attempts_per_model
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.session_limit = session_limit
+        self.rng = rng or random.Random()
+
+    def new_account(self) -> RetryAccount:
+        return RetryAccount(self.session_limit)
+
+    def record_request(self, account: Optional[RetryAccount]):
+        self.budget.record_request()
+        if account is not None:
+            account.requests += 1
+
+    def allow_retry(self, account: Optional[RetryAccount]) -> bool:
+        """Charge one retry to the session and the shared budget, if both allow it."""
+        if account is not None and account.retries >= account.limit:
+            account.denied += 1
+            return False
+        if not self.budget.try_spend():
+            if account is not None:
+                account.denied += 1
+            return False
+        if account is not None:
+            account.retries += 1
+        return True
+
+    def delay(self, attempt: int, retry_after: Optional[float] = None) -> Optional[float]:
+        """Seconds to wait before retry ``attempt``; None if the server asks for longer than ``max_delay``."""
+        if retry_after is not None:
+            if retry_after > self.max_delay:
+                return None
+            return retry_after + self.rng.uniform(0, self.base_delay)
+        return full_jitter(attempt, self.base_delay, self.max_delay, self.rng)
+
+
+_retry_policy_instance: Optional[RetryPolicy] = None
+
+# The account of the session whose agent is making calls; asyncio.to_thread copies it into worker threads
+_current_account: contextvars.ContextVar[Optional[RetryAccount]] = contextvars.ContextVar(
+    "retry_account", default=None
+)
+
+
+def get_retry_policy() -> RetryPolicy:
+    """Get the process-wide retry policy."""
+    global _retry_policy_instance
+    if _retry_policy_instance is None:
+        _retry_policy_instance = RetryPolicy(
+            RetryBudget(settings.retry_budget_ratio, settings.retry_budget_reserve),
+            attempts_per_model=max(1, settings.max_retries),
+            base_delay=settings.retry_base_delay,
+            max_delay=settings.retry_max_delay,
+            session_limit=settings.session_max_retries
+        )
+    return _retry_policy_instance
+
+
+def current_retry_account() -> Optional[RetryAccount]:
+    return _current_account.get()
+
+
+@contextlib.contextmanager
+def use_retry_account(account: Optional[RetryAccount]):
+    """Charge LLM retries made inside the block (and tasks or threads it starts) to ``account``."""
+    token = _current_account.set(account)
+    try:
+        yield account
+    finally:
+        _current_account.reset(token)
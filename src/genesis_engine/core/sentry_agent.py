@@ -4,19 +4,84 @@ Performs automated testing of generated JavaScript/HTML5 games using headless br
 Reports errors and success status back to the multi-agent orchestrator.
 """
 import asyncio
+import functools
 import json
 import logging
 import tempfile
 from pathlib import Path
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Tuple
 import subprocess
 import time
-import re
 import os
+from contextlib import asynccontextmanager
+
+from .browser_pool import BrowserContextPool
+from .heap_monitor import HeapSampler, heap_errors, heap_report, retained_type_growth
+from .hot_pages import HOT_PAGE_URL, LOAD_GAME, RESET_PAGE, HotGame, hot_game, open_hot_page
+from .input_fuzzer import (
+    REPLAY, fuzz_failure_summary, fuzz_script, generate_trace, minimize_trace, replay_options
+)
+from .p5_vendor import ROUTE_PATTERN, P5Cache
+from .perf_gate import PROFILE, frame_time_report, perf_errors
+from .sentry_harness import (
+    READY_SCRIPT, READY_SNAPSHOT, SIMULATE, VIRTUAL_TIME_SCRIPT, WAIT_FOR_READY,
+    merge_simulations, readiness_errors, simulation_errors, simulation_options
+)
+from .sentry_workers import BrowserTester, SentryWorkerPool, process_tree_rss
+from .static_analyzer import RULES, RULESET_VERSION, Analysis, analyze_game
+from .validation_cache import ValidationCache, validation_key
+from ..config import settings
 
 # Set up logger at module level
 logger = logging.getLogger(__name__)
 
+# Runtime measurements from a browser test that are kept with the game
+SENTRY_METRIC_KEYS = ("simulation", "performance", "heap", "fuzz")
+
+# Bump when the browser checks change what they report, so cached validations are not reused
+SENTRY_CHECKS_VERSION = 1
+
+# Settings that change the outcome of a browser test
+SENTRY_CHECK_SETTINGS = (
+    "sentry_ready_frames", "sentry_ready_timeout",
+    "sentry_simulation_seconds", "sentry_simulation_fps", "sentry_simulation_wall_limit",
+    "sentry_fuzz_seconds", "sentry_fuzz_seed", "sentry_fuzz_events_per_second",
+    "sentry_perf_frames", "sentry_perf_budget_ms", "sentry_perf_long_frame_ms", "sentry_perf_max_long_frames",
+    "sentry_heap_max_growth_mb_per_min", "sentry_heap_samples"
+)
+
+# Settings of how the browser is kept warm and healthy, passed on to worker processes
+SENTRY_BROWSER_POLICY_SETTINGS = (
+    "sentry_probe_interval", "sentry_browser_max_tests", "sentry_browser_max_age", "sentry_browser_max_rss_mb",
+    "sentry_hot_pages", "sentry_hot_page_max_uses"
+)
+
+# Run once on every newly launched browser so the first real test finds p5.js, the harness and a context warm
+WARM_UP_GAME = """<!DOCTYPE html>
+<html>
+<head>
+    <meta charset="utf-8">
+    <title>Sentry warm-up</title>
+    <script src="https://cdnjs.cloudflare.com/ajax/libs/p5.js/1.7.0/p5.min.js"></script>
+</head>
+<body>
+<script>
+let x = 0;
+
+function setup() {
+    createCanvas(200, 200);
+}
+
+function draw() {
+    background(20);
+    x = (x + 2) % width;
+    circle(x, height / 2, 20);
+}
+</script>
+</body>
+</html>
+"""
+
 # Try to import playwright, but gracefully handle if not installed
 try:
     from playwright.async_api import async_playwright, Page, Browser, Error as PlaywrightError
@@ -41,30 +106,238 @@ class SentryAgent:
         self.logger = logger
         self.test_timeout = 10  # seconds
         self.max_console_errors = 5
-        self.browser: Optional[Browser] = None
+        self.pool: Optional[BrowserContextPool] = None
+        self.workers: Optional[SentryWorkerPool] = None
         self.playwright = None
+        self.p5_cache = P5Cache(settings.p5_cache_dir, settings.p5_cache_download)
+        self.cache = (
+            ValidationCache(settings.sentry_cache_size, settings.sentry_cache_dir)
+            if settings.sentry_cache_size > 0 else None
+        )
+        self._init_lock = asyncio.Lock()
+        self._maintenance: Optional[asyncio.Task] = None
+        self._warmed_launch: Optional[float] = None
+        self.warm_up_ms: Optional[float] = None
+    
+    @property
+    def browser(self) -> Optional["Browser"]:
+        """The pool's current browser; it changes when a dead browser is relaunched."""
+        return self.pool.browser if self.pool else None
+    
+    @property
+    def browser_version(self) -> Optional[str]:
+        """Version of the browser that runs the tests, here or in the worker processes; None without one."""
+        if self.workers:
+            return self.workers.browser_version  # Tests queue while a crashed worker restarts
+        return self.browser.version if self.browser else None
         
     async def initialize(self):
-        """Initialize Playwright browser for testing."""
-        if PLAYWRIGHT_AVAILABLE:
+        """Initialize the Playwright browser and its pool of test slots, or the worker processes that own them."""
+        if not PLAYWRIGHT_AVAILABLE:
+            return
+        async with self._init_lock:
+            if self.pool or self.workers:
+                return  # Another session finished initializing while this one waited
+            if settings.sentry_workers > 0:
+                await self._start_workers()
+                return
             try:
-                self.playwright = await async_playwright().start()
-                self.browser = await self.playwright.chromium.launch(
-                    headless=True,
-                    args=['--no-sandbox', '--disable-setuid-sandbox']
+                self.playwright = self.playwright or await async_playwright().start()
+                pool = BrowserContextPool(
+                    self._launch_browser, settings.sentry_browser_slots or None, prepare=self._prepare_context,
+                    hot_page_uses=settings.sentry_hot_page_max_uses
                 )
-                self.logger.info("Playwright browser initialized successfully")
+                await pool.start()
+                self.pool = pool
+                self.logger.info(f"Playwright browser initialized successfully with {pool.slots} test slots")
             except Exception as e:
                 self.logger.error(f"Failed to initialize Playwright: {str(e)}")
-                self.browser = None
+                self.pool = None
+    
+    async def _start_workers(self):
+        """Start the out-of-process browser workers; without them tests fall back to static analysis."""
+        overrides = {name: getattr(settings, name) for name in SENTRY_CHECK_SETTINGS + SENTRY_BROWSER_POLICY_SETTINGS}
+        overrides.update(
+            sentry_browser_slots=settings.sentry_worker_slots,
+            p5_cache_dir=settings.p5_cache_dir.resolve(), p5_cache_download=settings.p5_cache_download
+        )
+        workers = SentryWorkerPool(
+            settings.sentry_workers, settings.sentry_worker_slots,
+            max_tests=settings.sentry_worker_max_tests, max_rss_mb=settings.sentry_worker_max_rss_mb,
+            test_timeout=settings.sentry_worker_test_timeout, max_age=settings.sentry_worker_max_age,
+            queue_timeout=settings.sentry_worker_queue_timeout,
+            tester_factory=functools.partial(BrowserTester, overrides)
+        )
+        if await workers.start():
+            self.workers = workers
+            self.logger.info(
+                f"Sentry browser workers started: {settings.sentry_workers} processes "
+                f"x {settings.sentry_worker_slots} slots"
+            )
+        else:
+            self.logger.error("No Sentry browser worker could start its browser")
+            await workers.close()
+    
+    async def _launch_browser(self) -> "Browser":
+        return await self.playwright.chromium.launch(
+            headless=True,
+            args=['--no-sandbox', '--disable-setuid-sandbox', '--enable-precise-memory-info']
+        )
+    
+    async def _prepare_context(self, context):
+        """Serve p5.js from the local cache and instrument the game in every test context."""
+        await context.route(ROUTE_PATTERN, self.p5_cache.handle_route)
+        await context.add_init_script(READY_SCRIPT)
+        uses_virtual_time = (settings.sentry_simulation_seconds > 0 or settings.sentry_fuzz_seconds > 0
+                             or settings.sentry_perf_frames > 0)
+        if uses_virtual_time:
+            await context.add_init_script(VIRTUAL_TIME_SCRIPT)
+        if settings.sentry_fuzz_seconds > 0:
+            await context.add_init_script(fuzz_script(settings.sentry_fuzz_seed))
+    
+    async def warm_up(self) -> bool:
+        """
+        Start the browser and run a throwaway game on it, so the first real
+        test pays neither the launch nor the first page load.
+
+        Worker processes warm their own browsers before they report ready.
+        Returns False when no browser could be started.
+        """
+        await self.initialize()
+        if self.workers:
+            return True
+        if not self.pool:
+            return False
+        await self._warm_browser()
+        return True
+    
+    async def _warm_browser(self):
+        """
+        Run WARM_UP_GAME in the current browser, once per slot with hot
+        pages so every slot has one ready; failures are logged, not raised.
+        """
+        launched = self.pool.launched_at
+        started = time.perf_counter()
+        hot = hot_game(WARM_UP_GAME) if settings.sentry_hot_pages else None
+        outcomes = await asyncio.gather(
+            *(self._warm_slot(hot) for _ in range(self.pool.slots if hot else 1)), return_exceptions=True
+        )
+        error = next((outcome for outcome in outcomes if outcome is not None), None)
+        self._warmed_launch = launched
+        self.warm_up_ms = round((time.perf_counter() - started) * 1000, 1)
+        if error is None:
+            self.logger.info(f"Sentry browser warmed up in {self.warm_up_ms}ms")
+        else:
+            self.logger.warning(f"Sentry warm-up game did not run: {error!r}")
+    
+    async def _warm_slot(self, hot: Optional[HotGame]):
+        async with self._open_game(WARM_UP_GAME, None, hot) as (page, load):
+            await load()
+            await asyncio.wait_for(page.evaluate(WAIT_FOR_READY, settings.sentry_ready_frames),
+                                   settings.sentry_ready_timeout)
+    
+    @asynccontextmanager
+    async def _open_game(self, html_content: str, html_path: Optional[str], hot: Optional[HotGame]):
+        """
+        Yield ``(page, load)`` for one run of a game; ``load()`` brings the
+        game up once the caller has attached its listeners.
+        
+        With ``hot`` (see hot_pages.py) the page is a slot's hot page with
+        p5.js already loaded, and load() injects the game into it. Otherwise
+        the page is new, in a fresh context, and load() navigates to
+        ``html_path`` (or sets ``html_content`` without one).
+        """
+        if hot is not None:
+            opener = functools.partial(open_hot_page, p5_src=hot.p5_src)
+            async with self.pool.hot_page(hot.p5_src, opener, self._reset_hot_page) as page:
+                if page is not None:
+                    yield page, functools.partial(page.evaluate, LOAD_GAME, hot.payload())
+                    return
+        async with self.pool.context() as context:
+            page = await context.new_page()
+            if html_path:
+                load = functools.partial(page.goto, f"file://{html_path}", wait_until="domcontentloaded")
+            else:
+                load = functools.partial(page.set_content, html_content, wait_until="domcontentloaded")
+            yield page, load
+    
+    async def _reset_hot_page(self, page: "Page") -> bool:
+        return bool(await asyncio.wait_for(page.evaluate(RESET_PAGE, settings.sentry_fuzz_seed), 5))
+    
+    def start_maintenance(self, interval: float):
+        """Probe the browser every ``interval`` seconds, relaunching or recycling it when due."""
+        if self._maintenance is None and interval > 0 and self.pool:
+            self._maintenance = asyncio.create_task(self._maintain(interval))
+    
+    async def stop_maintenance(self):
+        if self._maintenance:
+            self._maintenance.cancel()
+            try:
+                await self._maintenance
+            except asyncio.CancelledError:
+                pass
+            self._maintenance = None
+    
+    async def _maintain(self, interval: float):
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.maintain()
+            except Exception as e:
+                self.logger.error(f"Sentry browser maintenance failed: {e}")
+    
+    async def maintain(self) -> Optional[str]:
+        """
+        One liveness probe and recycling check of the in-process browser.
+
+        A browser that fails the probe is relaunched; one past its test
+        count, age or memory limit is replaced while its running tests
+        finish. Either way the new browser is warmed up before tests reach
+        it. Returns the reason the browser was recycled, if it was.
+        """
+        if not self.pool or not await self.pool.check_health():
+            return None
+        reason = await self._recycle_reason()
+        if reason and not await self.pool.recycle(reason):
+            reason = None
+        if self.pool.launched_at != self._warmed_launch:
+            await self._warm_browser()
+        return reason
+    
+    async def _recycle_reason(self) -> Optional[str]:
+        if settings.sentry_browser_max_tests and self.pool.tests_since_launch >= settings.sentry_browser_max_tests:
+            return "max_tests"
+        if settings.sentry_browser_max_age and self.pool.age >= settings.sentry_browser_max_age:
+            return "max_age"
+        if settings.sentry_browser_max_rss_mb:
+            # The browser runs under the Playwright driver, a child of this process
+            rss = await asyncio.to_thread(process_tree_rss, os.getpid(), False)
+            if rss and rss > settings.sentry_browser_max_rss_mb * 1024 * 1024:
+                return "max_rss"
+        return None
     
     async def cleanup(self):
         """Clean up browser resources."""
-        if self.browser:
-            await self.browser.close()
+        await self.stop_maintenance()
+        if self.workers:
+            await self.workers.close()
+            self.workers = None
+        if self.pool:
+            await self.pool.close()
+            self.pool = None
         if self.playwright:
             await self.playwright.stop()
     
+    def metrics(self) -> Dict[str, Any]:
+        """Browser pool slot, queueing and health metrics, and cache hit rates."""
+        return {
+            "browser": self.pool.metrics() if self.pool else None,
+            "warm_up_ms": self.warm_up_ms,
+            "workers": self.workers.metrics() if self.workers else None,
+            "p5_cache": self.p5_cache.metrics(),
+            "validation_cache": self.cache.metrics() if self.cache else None
+        }
+    
     async def test_javascript_code(self, html_content: str) -> Dict[str, Any]:
         """
         Test JavaScript/HTML5 game code in a headless browser environment.
@@ -78,29 +351,38 @@ class SentryAgent:
         self.logger.info("🔍 SENTRY: Starting automated code testing...")
         
         try:
-            # First, do basic syntax validation
-            basic_errors = self._validate_basic_syntax(html_content)
-            if basic_errors:
+            analysis = analyze_game(html_content)
+            errors = analysis.messages("error")
+            warnings = analysis.messages("warning")
+            if not analysis.syntax_valid:
                 return {
                     "success": False,
-                    "errors": basic_errors,
-                    "error_count": len(basic_errors),
+                    "errors": errors,
+                    "error_count": len(errors),
+                    "findings": [finding.to_dict() for finding in analysis.findings],
                     "validation_type": "basic_syntax",
                     "test_method": "static_analysis"
                 }
             
-            # Try to run in a simulated browser environment
-            # For now, we'll do enhanced static analysis until Puppeteer is set up
-            advanced_results = await self._advanced_static_testing(html_content)
+            result = {
+                "success": not errors,
+                "errors": errors,
+                "warnings": warnings,
+                "error_count": len(errors),
+                "warning_count": len(warnings),
+                "findings": [finding.to_dict() for finding in analysis.findings],
+                "validation_type": "advanced_static",
+                "test_method": "static_analysis_enhanced"
+            }
             
-            if advanced_results["success"]:
+            if result["success"]:
                 self.logger.success("✅ SENTRY: All tests passed - code appears functional")
             else:
-                self.logger.warning(f"⚠️ SENTRY: Found {advanced_results['error_count']} issues")
-                for error in advanced_results.get("errors", []):
+                self.logger.warning(f"⚠️ SENTRY: Found {result['error_count']} issues")
+                for error in errors:
                     self.logger.error(f"  - {error}")
             
-            return advanced_results
+            return result
             
         except Exception as e:
             self.logger.error(f"SENTRY: Testing failed with exception: {str(e)}")
@@ -112,224 +394,6 @@ class SentryAgent:
                 "test_method": "exception"
             }
     
-    def _validate_basic_syntax(self, html_content: str) -> List[str]:
-        """Perform basic syntax validation on the HTML/JavaScript code."""
-        errors = []
-        
-        # Check for empty or very short content
-        if not html_content or len(html_content.strip()) < 100:
-            errors.append("Generated code is too short or empty")
-            return errors
-        
-        # Check HTML structure
-        if not html_content.strip().startswith("<!DOCTYPE html>") and not html_content.strip().startswith("<html"):
-            errors.append("Missing proper HTML document structure")
-        
-        if "</html>" not in html_content:
-            errors.append("HTML document appears incomplete - missing closing </html> tag")
-        
-        # Check for p5.js library inclusion
-        if "p5.js" not in html_content and "p5.min.js" not in html_content:
-            errors.append("Missing p5.js library reference")
-        
-        # Check for required p5.js functions
-        if "function setup()" not in html_content and "function setup (" not in html_content:
-            errors.append("Missing required p5.js setup() function")
-        
-        if "function draw()" not in html_content and "function draw (" not in html_content:
-            errors.append("Missing required p5.js draw() function")
-        
-        # Check for basic JavaScript syntax issues
-        javascript_errors = self._check_javascript_syntax(html_content)
-        errors.extend(javascript_errors)
-        
-        return errors
-    
-    def _check_javascript_syntax(self, html_content: str) -> List[str]:
-        """Check for common JavaScript syntax errors."""
-        errors = []
-        
-        # Extract JavaScript content
-        js_content = self._extract_javascript(html_content)
-        if not js_content:
-            errors.append("No JavaScript content found in HTML")
-            return errors
-        
-        # Check for common syntax issues
-        lines = js_content.split('\n')
-        
-        # Track brackets and parentheses
-        bracket_count = 0
-        paren_count = 0
-        brace_count = 0
-        
-        for i, line in enumerate(lines, 1):
-            line = line.strip()
-            if not line or line.startswith('//'):
-                continue
-            
-            # Count brackets
-            bracket_count += line.count('[') - line.count(']')
-            paren_count += line.count('(') - line.count(')')
-            brace_count += line.count('{') - line.count('}')
-            
-            # Check for common syntax errors
-            if line.endswith('{') and not any(keyword in line for keyword in ['function', 'if', 'for', 'while', 'else', '{']):
-                errors.append(f"Line {i}: Unexpected opening brace")
-            
-            # Check for missing semicolons on simple statements
-            if (line.endswith(')') and not line.strip().startswith('if') and 
-                not line.strip().startswith('for') and not line.strip().startswith('while') and
-                not line.strip().startswith('function') and ';' not in line):
-                pass  # This is often OK in modern JavaScript
-        
-        # Check final bracket balance
-        if bracket_count != 0:
-            errors.append(f"Unbalanced square brackets (missing {abs(bracket_count)} {'[' if bracket_count < 0 else ']'})")
-        
-        if paren_count != 0:
-            errors.append(f"Unbalanced parentheses (missing {abs(paren_count)} {'(' if paren_count < 0 else ')'})")
-        
-        if brace_count != 0:
-            errors.append(f"Unbalanced curly braces (missing {abs(brace_count)} {'{' if brace_count < 0 else '}'})")
-        
-        return errors
-    
-    def _extract_javascript(self, html_content: str) -> str:
-        """Extract JavaScript content from HTML."""
-        js_content = ""
-        
-        # Look for script tags
-        script_pattern = r'<script[^>]*>(.*?)</script>'
-        matches = re.findall(script_pattern, html_content, re.DOTALL | re.IGNORECASE)
-        
-        for match in matches:
-            js_content += match + "\n"
-        
-        return js_content
-    
-    async def _advanced_static_testing(self, html_content: str) -> Dict[str, Any]:
-        """Perform advanced static analysis of the game code."""
-        errors = []
-        warnings = []
-        
-        # Extract JavaScript for detailed analysis
-        js_content = self._extract_javascript(html_content)
-        
-        # Check for game-specific requirements
-        game_errors = self._validate_game_logic(js_content)
-        errors.extend(game_errors)
-        
-        # Check for p5.js specific issues
-        p5_errors = self._validate_p5js_usage(js_content)
-        errors.extend(p5_errors)
-        
-        # Check for performance issues
-        perf_warnings = self._check_performance_issues(js_content)
-        warnings.extend(perf_warnings)
-        
-        success = len(errors) == 0
-        
-        result = {
-            "success": success,
-            "errors": errors,
-            "warnings": warnings,
-            "error_count": len(errors),
-            "warning_count": len(warnings),
-            "validation_type": "advanced_static",
-            "test_method": "static_analysis_enhanced"
-        }
-        
-        return result
-    
-    def _validate_game_logic(self, js_content: str) -> List[str]:
-        """Validate basic game logic structure."""
-        errors = []
-        
-        # Check if canvas is created
-        if "createCanvas(" not in js_content:
-            errors.append("Game doesn't create a canvas - missing createCanvas() call")
-        
-        # Check if draw loop exists and has content
-        draw_match = self._find_function_body(js_content, "draw")
-        if draw_match:
-            draw_body = draw_match.strip()
-            if len(draw_body) < 20:  # Very minimal draw function
-                errors.append("Draw function appears to be empty or too minimal")
-        
-        # Check for basic game elements (very basic validation)
-        if "rect(" not in js_content and "ellipse(" not in js_content and "circle(" not in js_content:
-            errors.append("Game doesn't appear to draw any visible elements")
-        
-        return errors
-    
-    def _validate_p5js_usage(self, js_content: str) -> List[str]:
-        """Validate proper p5.js API usage."""
-        errors = []
-        
-        # Check for setup function content
-        setup_body = self._find_function_body(js_content, "setup")
-        if setup_body and "createCanvas(" not in setup_body:
-            errors.append("setup() function missing createCanvas() call")
-        
-        # Check for common p5.js mistakes
-        if "width" in js_content and "createCanvas(" not in js_content:
-            errors.append("Code references 'width' but canvas may not be created")
-        
-        if "height" in js_content and "createCanvas(" not in js_content:
-            errors.append("Code references 'height' but canvas may not be created")
-        
-        # Check for proper color usage
-        if "fill(" in js_content:
-            # Basic validation - could be enhanced
-            pass
-        
-        return errors
-    
-    def _check_performance_issues(self, js_content: str) -> List[str]:
-        """Check for potential performance issues."""
-        warnings = []
-        
-        # Check for infinite loops (basic detection)
-        if "while(true)" in js_content or "while (true)" in js_content:
-            warnings.append("Potential infinite loop detected - may cause browser freeze")
-        
-        # Check for excessive object creation in draw loop
-        draw_body = self._find_function_body(js_content, "draw")
-        if draw_body:
-            if draw_body.count("new ") > 5:
-                warnings.append("High object creation in draw loop - may cause performance issues")
-        
-        return warnings
-    
-    def _find_function_body(self, js_content: str, function_name: str) -> Optional[str]:
-        """Extract the body of a specific function."""
-        import re
-        
-        # Pattern to match function definition and its body
-        pattern = rf'function\s+{function_name}\s*\([^)]*\)\s*\{{'
-        match = re.search(pattern, js_content)
-        
-        if not match:
-            return None
-        
-        start_pos = match.end() - 1  # Position of the opening brace
-        brace_count = 1
-        i = start_pos + 1
-        
-        # Find the matching closing brace
-        while i < len(js_content) and brace_count > 0:
-            if js_content[i] == '{':
-                brace_count += 1
-            elif js_content[i] == '}':
-                brace_count -= 1
-            i += 1
-        
-        if brace_count == 0:
-            return js_content[start_pos + 1:i - 1]  # Return function body without braces
-        
-        return None
-    
     async def _run_in_headless_browser(self, html_content: str) -> Dict[str, Any]:
         """
         Run the HTML content in a headless browser (placeholder for future Puppeteer integration).
@@ -362,17 +426,47 @@ class SentryAgent:
             self.logger.warning(f"Browser testing setup failed: {str(e)}")
             return False
     
-    async def validate_game(self, html_content: str, game_name: str) -> Dict[str, any]:
+    async def validate_game(self, html_content: str, game_name: str, static_only: bool = False) -> Dict[str, any]:
         """
         Validate a generated HTML/JavaScript game.
         
         Args:
             html_content: The complete HTML content of the game
             game_name: Name of the game being tested
+            static_only: Skip the browser test for a fast static pass
             
         Returns:
-            Dictionary with validation results
+            Dictionary with validation results; ``cached`` is True when they
+            were stored for the same HTML, rule set and browser
         """
+        if not static_only and PLAYWRIGHT_AVAILABLE and not self.browser_version:
+            await self.initialize()
+        key = None
+        if self.cache:
+            browser = f"chromium/{self.browser_version}" if self.browser_version and not static_only else "static"
+            key = validation_key(html_content, self.ruleset(), browser)
+            cached = self.cache.get(key)
+            if cached is not None:
+                self.logger.info(f"Sentry cache hit for {game_name}")
+                cached["cached"] = True
+                return cached
+        
+        results = await self._validate(html_content, game_name, static_only)
+        # A browser that failed to run the game says nothing about the game itself
+        if key and not results.get("infrastructure_error"):
+            self.cache.put(key, results)
+        return results
+    
+    def ruleset(self) -> str:
+        """The static rules and browser check settings that validation results depend on."""
+        return json.dumps({
+            "static": [RULESET_VERSION, sorted(RULES)],
+            "checks": SENTRY_CHECKS_VERSION,
+            "settings": {name: getattr(settings, name) for name in SENTRY_CHECK_SETTINGS}
+        }, sort_keys=True, default=str)
+    
+    async def _validate(self, html_content: str, game_name: str, static_only: bool) -> Dict[str, Any]:
+        """Run the static rules and, unless ``static_only``, the browser test."""
         results = {
             "success": False,
             "errors": [],
@@ -380,152 +474,70 @@ class SentryAgent:
             "syntax_valid": False,
             "browser_test_passed": False,
             "console_errors": [],
-            "runtime_errors": []
+            "runtime_errors": [],
+            "cached": False
         }
         
-        # Step 1: Basic syntax validation
-        syntax_results = self._validate_syntax(html_content)
-        results["syntax_valid"] = syntax_results["valid"]
-        results["errors"].extend(syntax_results["errors"])
-        results["warnings"].extend(syntax_results["warnings"])
+        # Step 1: Basic syntax validation (one parse serves every static rule)
+        analysis = analyze_game(html_content)
+        results["syntax_valid"] = analysis.syntax_valid
+        results["errors"].extend(analysis.messages("error", "syntax"))
+        results["warnings"].extend(analysis.messages("warning", "syntax"))
+        results["findings"] = [finding.to_dict() for finding in analysis.select(stage="syntax")]
         
         if not results["syntax_valid"]:
             self.logger.error(f"Syntax validation failed for {game_name}")
             return results
         
         # Step 2: Browser-based testing (if available)
-        if PLAYWRIGHT_AVAILABLE:
+        browser_tested = False
+        if static_only:
+            self._add_static_findings(results, analysis)
+        elif PLAYWRIGHT_AVAILABLE:
             # Initialize browser if not already done
-            if not self.browser:
+            if not self.browser_version:
                 await self.initialize()
             
-            if self.browser:
-                browser_results = await self._test_in_browser(html_content, game_name)
+            if self.browser_version:
+                browser_tested = True
+                if self.workers:
+                    browser_results = await self.workers.test_in_browser(html_content, game_name)
+                else:
+                    browser_results = await self._test_in_browser(html_content, game_name)
                 results["browser_test_passed"] = browser_results["passed"]
                 results["console_errors"].extend(browser_results["console_errors"])
                 results["runtime_errors"].extend(browser_results["runtime_errors"])
                 results["errors"].extend(browser_results["errors"])
+                results["ready_ms"] = browser_results.get("ready_ms")
+                results["simulation"] = browser_results.get("simulation")
+                results["fuzz"] = browser_results.get("fuzz")
+                results["performance"] = browser_results.get("performance")
+                results["heap"] = browser_results.get("heap")
+                if browser_results.get("infrastructure_error"):
+                    results["infrastructure_error"] = True
             else:
                 # Fallback: enhanced static analysis
                 self.logger.warning("Browser initialization failed, using static analysis")
-                static_results = self._enhanced_static_analysis(html_content)
-                results["errors"].extend(static_results["errors"])
-                results["warnings"].extend(static_results["warnings"])
+                self._add_static_findings(results, analysis)
         else:
             # Fallback: enhanced static analysis
             self.logger.info("Playwright not available, using static analysis")
-            static_results = self._enhanced_static_analysis(html_content)
-            results["errors"].extend(static_results["errors"])
-            results["warnings"].extend(static_results["warnings"])
+            self._add_static_findings(results, analysis)
         
         # Determine overall success
         results["success"] = (
             results["syntax_valid"] and 
             len(results["errors"]) == 0 and
-            (results["browser_test_passed"] if PLAYWRIGHT_AVAILABLE and self.browser else len(results["errors"]) == 0)
+            (results["browser_test_passed"] if browser_tested else len(results["errors"]) == 0)
         )
         
         return results
     
-    def _validate_syntax(self, html_content: str) -> Dict[str, any]:
-        """Perform basic syntax validation on HTML/JS content."""
-        results = {
-            "valid": True,
-            "errors": [],
-            "warnings": []
-        }
-        
-        # Check HTML structure
-        if not html_content or len(html_content.strip()) < 100:
-            results["errors"].append("Generated content is too short or empty")
-            results["valid"] = False
-            return results
-        
-        # Essential HTML tags
-        required_tags = [
-            ("<!DOCTYPE html>", "Missing DOCTYPE declaration"),
-            ("<html", "Missing <html> tag"),
-            ("</html>", "Missing closing </html> tag"),
-            ("<head>", "Missing <head> tag"),
-            ("</head>", "Missing closing </head> tag"),
-            ("<body>", "Missing <body> tag"),
-            ("</body>", "Missing closing </body> tag")
-        ]
-        
-        for tag, error_msg in required_tags:
-            if tag not in html_content:
-                results["errors"].append(error_msg)
-                results["valid"] = False
-        
-        # Check for p5.js library
-        if "p5.js" not in html_content and "p5.min.js" not in html_content:
-            results["errors"].append("Missing p5.js library reference")
-            results["valid"] = False
-        
-        # Check for required p5.js functions
-        if "function setup()" not in html_content and "setup = function()" not in html_content:
-            results["errors"].append("Missing p5.js setup() function")
-            results["valid"] = False
-        
-        if "function draw()" not in html_content and "draw = function()" not in html_content:
-            results["errors"].append("Missing p5.js draw() function")
-            results["valid"] = False
-        
-        # Check for balanced braces
-        open_braces = html_content.count('{')
-        close_braces = html_content.count('}')
-        if open_braces != close_braces:
-            results["errors"].append(f"Unbalanced braces: {open_braces} open, {close_braces} close")
-            results["valid"] = False
-        
-        # Check for canvas element
-        if "<canvas" not in html_content and "createCanvas" not in html_content:
-            results["warnings"].append("No canvas element or createCanvas call found")
-        
-        return results
-    
-    def _enhanced_static_analysis(self, html_content: str) -> Dict[str, any]:
-        """Enhanced static analysis when browser testing is not available."""
-        results = {
-            "errors": [],
-            "warnings": []
-        }
-        
-        # Extract JavaScript code
-        js_matches = re.findall(r'<script[^>]*>(.*?)</script>', html_content, re.DOTALL)
-        if not js_matches:
-            results["errors"].append("No JavaScript code found in HTML")
-            return results
-        
-        js_code = '\n'.join(js_matches)
-        
-        # Common JavaScript errors
-        error_patterns = [
-            (r'}\s*}\s*}', "Multiple closing braces - possible syntax error"),
-            (r';\s*;', "Double semicolon detected"),
-            (r'function\s+function', "Double 'function' keyword"),
-            (r'const\s+const', "Double 'const' keyword"),
-            (r'let\s+let', "Double 'let' keyword"),
-            (r'var\s+var', "Double 'var' keyword")
-        ]
-        
-        for pattern, msg in error_patterns:
-            if re.search(pattern, js_code):
-                results["errors"].append(msg)
-        
-        # Check for undefined variables (basic)
-        common_undefined = [
-            (r'\bplayer\b(?!\.)', "Reference to 'player' without definition"),
-            (r'\benemy\b(?!\.)', "Reference to 'enemy' without definition"),
-            (r'\bscore\b(?!\.)', "Reference to 'score' without definition")
-        ]
-        
-        for pattern, msg in common_undefined:
-            matches = re.findall(pattern, js_code)
-            if matches and f"let {pattern[2:-6]}" not in js_code and f"var {pattern[2:-6]}" not in js_code:
-                results["warnings"].append(msg)
-        
-        return results
+    def _add_static_findings(self, results: Dict[str, Any], analysis: Analysis):
+        """Report the static-stage findings that stand in for a browser test."""
+        results["errors"].extend(analysis.messages("error", "static"))
+        results["warnings"].extend(analysis.messages("warning", "static"))
+        results["findings"].extend(finding.to_dict() for finding in analysis.select(stage="static"))
     
     async def _test_in_browser(self, html_content: str, game_name: str) -> Dict[str, any]:
         """Test the game in an actual browser using Playwright."""
@@ -538,9 +550,13 @@ class SentryAgent:
         
         if not self.browser:
             results["errors"].append("Browser not initialized")
+            results["infrastructure_error"] = True
+            return results
+        if not self.browser.is_connected() and not await self.pool.check_health():
+            results["errors"].append("Browser is down and could not be relaunched")
+            results["infrastructure_error"] = True
             return results
         
-        page = None
         temp_file = None
         
         try:
@@ -554,75 +570,271 @@ class SentryAgent:
             temp_file.write(html_content)
             temp_file.close()
             
-            # Create new page
-            page = await self.browser.new_page()
+            # Wait for a test slot; the game runs in a reset hot page or a fresh, isolated context
+            hot = hot_game(html_content) if settings.sentry_hot_pages else None
+            async with self._open_game(html_content, temp_file.name, hot) as (page, load):
+                results["hot_page"] = page.url.startswith(HOT_PAGE_URL)
+                await self._run_browser_checks(page, load, results)
             
-            # Set up console message listener
-            console_messages = []
-            page.on("console", lambda msg: console_messages.append({
-                "type": msg.type,
-                "text": msg.text
-            }))
-            
-            # Set up error listener
-            page_errors = []
-            page.on("pageerror", lambda error: page_errors.append(str(error)))
-            
-            # Navigate to the game
-            await page.goto(f"file://{temp_file.name}", wait_until="networkidle")
-            
-            # Wait for p5.js to initialize
-            await asyncio.sleep(2)
-            
-            # Check for JavaScript errors
-            for msg in console_messages:
-                if msg["type"] == "error":
-                    results["console_errors"].append(msg["text"])
-            
-            results["runtime_errors"].extend(page_errors)
-            
-            # Test basic p5.js functionality
-            try:
-                # Check if canvas exists
-                canvas_exists = await page.evaluate("() => document.querySelector('canvas') !== null")
-                if not canvas_exists:
-                    results["errors"].append("No canvas element found after initialization")
-                
-                # Check if p5 is defined
-                p5_defined = await page.evaluate("() => typeof window.p5 !== 'undefined' || typeof p5 !== 'undefined'")
-                if not p5_defined:
-                    results["errors"].append("p5.js library not loaded properly")
-                
-                # Check if setup and draw functions exist
-                setup_exists = await page.evaluate("() => typeof setup === 'function'")
-                draw_exists = await page.evaluate("() => typeof draw === 'function'")
-                
-                if not setup_exists:
-                    results["errors"].append("setup() function not defined")
-                if not draw_exists:
-                    results["errors"].append("draw() function not defined")
-                
-                # If no critical errors, mark as passed
-                if (canvas_exists and p5_defined and setup_exists and draw_exists and
-                    len(results["console_errors"]) == 0 and len(results["runtime_errors"]) == 0):
-                    results["passed"] = True
-                    
-            except PlaywrightError as e:
-                results["errors"].append(f"Browser evaluation error: {str(e)}")
+            # Drive a game that passed with seeded input; replays take their own slots
+            if results["passed"] and settings.sentry_fuzz_seconds > 0:
+                results["fuzz"] = await self._fuzz_game(html_content, temp_file.name, hot, results)
             
         except Exception as e:
             results["errors"].append(f"Browser testing failed: {str(e)}")
+            results["infrastructure_error"] = True
             self.logger.error(f"Browser test error for {game_name}: {str(e)}")
+            if not self.browser.is_connected():
+                await self.pool.check_health()
         
         finally:
             # Cleanup
-            if page:
-                await page.close()
             if temp_file and os.path.exists(temp_file.name):
                 os.unlink(temp_file.name)
         
         return results
     
+    async def _run_browser_checks(self, page: "Page", load, results: Dict[str, Any]):
+        """Load the game in ``page`` with ``load()`` and record errors and p5.js checks into ``results``."""
+        # Set up console message listener
+        console_messages = []
+        on_console = lambda msg: console_messages.append({
+            "type": msg.type,
+            "text": msg.text
+        })
+        page.on("console", on_console)
+        
+        # Set up error listener
+        page_errors = []
+        on_page_error = lambda error: page_errors.append(str(error))
+        page.on("pageerror", on_page_error)
+        try:
+            await self._check_game(page, load, console_messages, page_errors, results)
+        finally:
+            # A hot page outlives this test
+            page.remove_listener("console", on_console)
+            page.remove_listener("pageerror", on_page_error)
+    
+    async def _check_game(self, page: "Page", load, console_messages: List[Dict[str, str]],
+                          page_errors: List[str], results: Dict[str, Any]):
+        """The checks of ``_run_browser_checks``, with its listeners attached."""
+        # Load the game; p5.js starts the sketch on the load event, or right away in a hot page
+        await load()
+        
+        # Wait until setup() and the first draw() frames have run, or the game throws
+        frames, timeout = settings.sentry_ready_frames, settings.sentry_ready_timeout
+        try:
+            readiness = await asyncio.wait_for(page.evaluate(WAIT_FOR_READY, frames), timeout)
+        except asyncio.TimeoutError:
+            readiness = await page.evaluate(READY_SNAPSHOT)
+            results["errors"].extend(readiness_errors(readiness, frames, timeout))
+        results["ready_ms"] = readiness.get("readyMs") if readiness else None
+        
+        # Check for JavaScript errors
+        for msg in console_messages:
+            if msg["type"] == "error":
+                results["console_errors"].append(msg["text"])
+        
+        results["runtime_errors"].extend(page_errors)
+        if not page_errors and readiness:
+            # The pageerror event can trail the harness signal
+            results["runtime_errors"].extend(
+                f"{error['message']} (frame {error['frame']})" for error in readiness["errors"]
+            )
+        
+        # Play minutes of game time on the virtual clock to reach bugs that only show up later
+        if settings.sentry_simulation_seconds > 0 and readiness and not readiness["errors"] and not page_errors:
+            results["simulation"] = await self._simulate_gameplay(page, results)
+        
+        # Time frames with the entities that play has built up; slow games fail validation
+        if settings.sentry_perf_frames > 0 and readiness and not readiness["errors"] and not results["runtime_errors"]:
+            results["performance"] = await self._measure_frame_times(page, results)
+        
+        # Test basic p5.js functionality
+        try:
+            # Check if canvas exists
+            canvas_exists = await page.evaluate("() => document.querySelector('canvas') !== null")
+            if not canvas_exists:
+                results["errors"].append("No canvas element found after initialization")
+            
+            # Check if p5 is defined
+            p5_defined = await page.evaluate("() => typeof window.p5 !== 'undefined' || typeof p5 !== 'undefined'")
+            if not p5_defined:
+                results["errors"].append("p5.js library not loaded properly")
+            
+            # Check if setup and draw functions exist
+            setup_exists = await page.evaluate("() => typeof setup === 'function'")
+            draw_exists = await page.evaluate("() => typeof draw === 'function'")
+            
+            if not setup_exists:
+                results["errors"].append("setup() function not defined")
+            if not draw_exists:
+                results["errors"].append("draw() function not defined")
+            
+            # If no critical errors, mark as passed
+            if (canvas_exists and p5_defined and setup_exists and draw_exists and
+                len(results["console_errors"]) == 0 and len(results["runtime_errors"]) == 0):
+                results["passed"] = True
+                
+        except PlaywrightError as e:
+            results["errors"].append(f"Browser evaluation error: {str(e)}")
+    
+    async def _simulate_gameplay(self, page: "Page", results: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Run the configured stretch of virtual play; errors go into ``results`` with their frame.
+        
+        With heap tracking on, play runs in parts with the JS heap sampled
+        in between, and the growth trend is recorded as ``results["heap"]``.
+        """
+        seconds, fps = settings.sentry_simulation_seconds, settings.sentry_simulation_fps
+        track_heap = settings.sentry_heap_max_growth_mb_per_min > 0
+        parts = max(1, settings.sentry_heap_samples - 1) if track_heap else 1
+        wall_limit = settings.sentry_simulation_wall_limit / parts
+        options = simulation_options(seconds / parts, fps, wall_limit)
+        sampler = await HeapSampler.attach(page) if track_heap else None
+        summaries, samples = [], []
+        try:
+            for _ in range(parts):
+                if sampler:
+                    samples.append((sum(part["simulatedSeconds"] for part in summaries), await sampler.sample()))
+                try:
+                    part = await asyncio.wait_for(page.evaluate(SIMULATE, options), wall_limit + 5)
+                except asyncio.TimeoutError:
+                    results["errors"].append(
+                        f"Game hung during simulated play (no frame finished within {wall_limit + 5:g}s)"
+                    )
+                    return None
+                if not part:
+                    break
+                summaries.append(part)
+                if part["errors"] or part["idle"] or part["truncated"]:
+                    break
+            summary = merge_simulations(summaries)
+            if sampler and summary and not summary["errors"]:
+                samples.append((summary["simulatedSeconds"], await sampler.sample()))
+                results["heap"] = await self._check_heap_growth(page, sampler, samples, options, results)
+        finally:
+            if sampler:
+                await sampler.close()
+        if summary:
+            results["runtime_errors"].extend(simulation_errors(summary))
+            self.logger.info(
+                f"🎮 SENTRY: Simulated {summary['simulatedSeconds']}s of play "
+                f"({summary['frames']} frames) in {summary['wallMs']}ms"
+            )
+        return summary
+    
+    async def _check_heap_growth(self, page: "Page", sampler: HeapSampler,
+                                 samples: List[Tuple[float, Optional[int]]], options: Dict[str, Any],
+                                 results: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Fit the heap samples; for a leak, diff heap snapshots across one more stretch of play."""
+        report = heap_report(samples, settings.sentry_heap_max_growth_mb_per_min, sampler.source)
+        if report and report["leaking"]:
+            try:
+                before = await sampler.type_counts()
+                if before is not None:
+                    await asyncio.wait_for(page.evaluate(SIMULATE, options), options["wallLimitMs"] / 1000 + 5)
+                    report["retained_types"] = retained_type_growth(before, await sampler.type_counts())
+            except Exception as e:
+                self.logger.warning(f"Heap snapshot comparison failed: {str(e)}")
+            results["errors"].extend(heap_errors(report))
+        if report:
+            self.logger.info(
+                f"🧠 SENTRY: JS heap {report['start_mb']}MB -> {report['end_mb']}MB "
+                f"({report['growth_mb_per_min']}MB/min, R² {report['fit_r2']})"
+            )
+        return report
+    
+    async def _measure_frame_times(self, page: "Page", results: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Time the configured number of frames and record budget violations in ``results``."""
+        wall_limit = settings.sentry_simulation_wall_limit
+        options = simulation_options(settings.sentry_perf_frames / settings.sentry_simulation_fps,
+                                     settings.sentry_simulation_fps, wall_limit)
+        try:
+            summary = await asyncio.wait_for(page.evaluate(PROFILE, options), wall_limit + 5)
+        except asyncio.TimeoutError:
+            results["errors"].append(f"Game hung while measuring frame times (no result within {wall_limit + 5:g}s)")
+            return None
+        if not summary:
+            return None
+        results["runtime_errors"].extend(simulation_errors(summary))
+        report = frame_time_report(
+            summary["frameMs"], settings.sentry_perf_budget_ms,
+            settings.sentry_perf_long_frame_ms, settings.sentry_perf_max_long_frames
+        )
+        played = (results.get("simulation") or {}).get("simulatedSeconds")
+        results["errors"].extend(perf_errors(report, played))
+        self.logger.info(
+            f"⏱️ SENTRY: Frame times p50 {report['p50_ms']}ms, p95 {report['p95_ms']}ms, "
+            f"p99 {report['p99_ms']}ms, {report['long_frames']} long frames"
+        )
+        return report
+    
+    async def _fuzz_game(self, html_content: str, html_path: str, hot: Optional[HotGame],
+                         results: Dict[str, Any]) -> Dict[str, Any]:
+        """Play the game under a seeded input trace; a failing trace is minimized and recorded in ``results``."""
+        fps, seed = settings.sentry_simulation_fps, settings.sentry_fuzz_seed
+        frames = int(settings.sentry_fuzz_seconds * fps)
+        trace = generate_trace(seed, frames, fps, settings.sentry_fuzz_events_per_second)
+        report = {"seed": seed, "fps": fps, "frames": frames, "events": len(trace), "failure": None}
+        
+        summary = await self._replay_input(html_content, html_path, hot, trace, frames)
+        if summary is None:
+            report["skipped"] = True
+            return report
+        if not summary["errors"]:
+            self.logger.info(f"🎮 SENTRY: Survived {len(trace)} random inputs over {summary['simulatedSeconds']}s")
+            return report
+        
+        error = summary["errors"][0]
+        # Input after the failing frame cannot have caused it; replays stop a second after it
+        relevant = [entry for entry in trace if entry["frame"] < error["step"]]
+        replay_frames = min(frames, error["step"] + fps)
+        
+        async def fails(candidate):
+            outcome = await self._replay_input(html_content, html_path, hot, candidate, replay_frames)
+            return bool(outcome) and any(e["message"] == error["message"] for e in outcome["errors"])
+        
+        reproduced = await fails(relevant)
+        minimized, runs = (
+            await minimize_trace(relevant, fails, settings.sentry_fuzz_minimize_runs) if reproduced else (relevant, 0)
+        )
+        report["failure"] = {
+            "message": error["message"],
+            "frame": error["frame"],
+            "seconds": error["seconds"],
+            "trace": minimized,
+            "original_events": len(relevant),
+            "reproduced": reproduced,
+            "replays": runs + 1
+        }
+        results["runtime_errors"].append(
+            f"{error['message']} (frame {error['frame']}, {error['seconds']}s into play with random input, seed {seed})"
+        )
+        results["passed"] = False
+        self.logger.warning(
+            f"🎮 SENTRY: Input fuzzing hit \"{error['message']}\" - "
+            f"reduced {len(relevant)} events to {len(minimized)} in {runs + 1} replays"
+        )
+        return report
+    
+    async def _replay_input(self, html_content: str, html_path: str, hot: Optional[HotGame],
+                            trace: List[Dict[str, Any]], frames: int) -> Optional[Dict[str, Any]]:
+        """Load the game in a hot page or fresh context and replay ``trace``; None if it never became ready."""
+        fps, wall_limit = settings.sentry_simulation_fps, settings.sentry_simulation_wall_limit
+        options = replay_options(trace, frames, fps, wall_limit, settings.sentry_fuzz_seed)
+        async with self._open_game(html_content, html_path, hot) as (page, load):
+            await load()
+            try:
+                readiness = await asyncio.wait_for(
+                    page.evaluate(WAIT_FOR_READY, settings.sentry_ready_frames), settings.sentry_ready_timeout
+                )
+                if not readiness or readiness["errors"]:
+                    return None
+                return await asyncio.wait_for(page.evaluate(REPLAY, options), wall_limit + 5)
+            except asyncio.TimeoutError:
+                return None
+    
     def generate_test_report(self, validation_results: Dict[str, any]) -> str:
         """Generate a detailed test report."""
         report = []
@@ -637,6 +849,37 @@ class SentryAgent:
             browser_status = '✅ Yes' if validation_results['browser_test_passed'] else '❌ No'
             report.append(f"Browser Test Passed: {browser_status}")
         
+        simulation = validation_results.get("simulation")
+        if simulation:
+            report.append(
+                f"Simulated Play: {simulation['simulatedSeconds']}s ({simulation['frames']} frames) "
+                f"in {simulation['wallMs']}ms"
+            )
+        
+        performance = validation_results.get("performance")
+        if performance:
+            verdict = "✅" if performance["within_budget"] else "❌"
+            report.append(
+                f"Frame Time: {verdict} p50 {performance['p50_ms']}ms, p95 {performance['p95_ms']}ms "
+                f"(budget {performance['budget_ms']:g}ms), {performance['long_frames']} long frames"
+            )
+        
+        heap = validation_results.get("heap")
+        if heap:
+            verdict = "❌ Growing" if heap["leaking"] else "✅ Stable"
+            report.append(
+                f"JS Heap: {verdict} {heap['start_mb']}MB -> {heap['end_mb']}MB "
+                f"({heap['growth_mb_per_min']}MB/min, {heap['source']})"
+            )
+        
+        fuzz = validation_results.get("fuzz")
+        if fuzz and not fuzz.get("skipped"):
+            outcome = "❌ Failed" if fuzz["failure"] else "✅ Passed"
+            report.append(f"Input Fuzzing: {outcome} ({fuzz['events']} events, seed {fuzz['seed']})")
+            summary = fuzz_failure_summary(fuzz)
+            if summary:
+                report.append("  " + summary.replace("\n", "\n    "))
+        
         # Errors
         if validation_results["errors"]:
             report.append("\n🔴 Errors:")
@@ -667,10 +910,21 @@ class SentryAgent:
 # Singleton instance
 _sentry_instance = None
 
+def get_sentry_metrics() -> Optional[Dict[str, Any]]:
+    """Metrics of the Sentry agent, or None if no game has been validated yet."""
+    return _sentry_instance.metrics() if _sentry_instance is not None else None
+
 async def get_sentry_agent() -> SentryAgent:
     """Get or create the singleton Sentry agent instance."""
     global _sentry_instance
     if _sentry_instance is None:
         _sentry_instance = SentryAgent(logger)
         await _sentry_instance.initialize()
-    return _sentry_instance 
\ No newline at end of file
+    return _sentry_instance
+
+async def shutdown_sentry_agent():
+    """Stop the singleton Sentry agent's browser or workers, if it was created."""
+    global _sentry_instance
+    if _sentry_instance is not None:
+        await _sentry_instance.cleanup()
+        _sentry_instance = None 
\ No newline at end of file
@@ -0,0 +1,291 @@
+"""
+Browser Harness for the Sentry Agent
+Instrumentation injected into every test page before the game's scripts
+run. It wraps the game's p5.js ``setup()`` and ``draw()`` so Sentry can
+wait for real readiness signals instead of sleeping for a fixed time, and
+puts the page on a virtual clock so minutes of gameplay can be simulated
+in a fraction of a second. Long sessions can be simulated in several runs
+(e.g. to sample the heap in between) and merged into one summary.
+"""
+from typing import Any, Dict, List, Optional
+
+# Runs as a context init script, i.e. before any of the page's own scripts.
+# window.__sentry.whenReady(frames) resolves once setup() has returned and
+# ``frames`` draw() calls have completed (or the sketch called noLoop()),
+# or as soon as an uncaught error or unhandled rejection occurs.
+READY_SCRIPT = r"""
+(() => {
+  if (window.__sentry) return;
+  const state = {
+    setupDone: false,
+    frames: 0,
+    errors: [],
+    startedAt: performance.now(),
+    readyAt: null,
+    waiters: []
+  };
+
+  const settle = () => {
+    state.waiters = state.waiters.filter((waiter) => {
+      const stopped = typeof window.isLooping === 'function' && state.frames > 0 && !window.isLooping();
+      const ready = state.setupDone && (state.frames >= waiter.frames || stopped);
+      if (!ready && state.errors.length === 0) return true;
+      if (ready && state.readyAt === null) state.readyAt = performance.now();
+      waiter.resolve(state.snapshot());
+      return false;
+    });
+  };
+
+  state.snapshot = () => ({
+    setupDone: state.setupDone,
+    frames: state.frames,
+    errors: state.errors.slice(),
+    readyMs: state.readyAt === null ? null : Math.round(state.readyAt - state.startedAt)
+  });
+
+  // ``frame`` is the draw() call that threw (1-based), or the frames completed so far
+  state.recordError = (message, frame) => {
+    state.errors.push({ message: String(message), frame: frame === undefined ? state.frames : frame });
+    settle();
+  };
+
+  state.whenReady = (frames) => new Promise((resolve) => {
+    state.waiters.push({ frames, resolve });
+    settle();
+  });
+
+  window.addEventListener('error', (event) => {
+    const error = event.error;
+    state.recordError(error && error.stack ? error.stack.split('\n')[0] : event.message, error && error.__sentryFrame);
+  });
+  window.addEventListener('unhandledrejection', (event) => {
+    state.recordError('Unhandled promise rejection: ' + (event.reason && event.reason.message || event.reason));
+  });
+
+  // Function declarations are writable globals, and p5 global mode looks
+  // setup/draw up on window when it calls them, so wrapping here is enough.
+  const wrap = (name, after) => {
+    const original = window[name];
+    if (typeof original !== 'function' || original.__sentryWrapped) return;
+    const wrapped = function (...args) {
+      let result;
+      try {
+        result = original.apply(this, args);
+      } catch (error) {
+        if (error && typeof error === 'object' && name === 'draw') error.__sentryFrame = state.frames + 1;
+        throw error;
+      }
+      after();
+      return result;
+    };
+    wrapped.__sentryWrapped = true;
+    window[name] = wrapped;
+  };
+
+  state.instrument = () => {
+    wrap('setup', () => { state.setupDone = true; settle(); });
+    wrap('draw', () => { state.frames += 1; settle(); });
+  };
+  document.addEventListener('DOMContentLoaded', state.instrument, { capture: true });
+
+  // Starts over for another game in the same page (see hot_pages.py)
+  state.reset = () => {
+    state.setupDone = false;
+    state.frames = 0;
+    state.errors = [];
+    state.startedAt = performance.now();
+    state.readyAt = null;
+    state.waiters = [];
+  };
+
+  window.__sentry = state;
+})();
+"""
+
+WAIT_FOR_READY = "(frames) => window.__sentry ? window.__sentry.whenReady(frames) : null"
+READY_SNAPSHOT = "() => window.__sentry ? window.__sentry.snapshot() : null"
+
+
+def readiness_errors(snapshot: Optional[Dict[str, Any]], frames: int, timeout: float) -> List[str]:
+    """Errors for a page that did not become ready; ``snapshot`` is the harness state at the deadline."""
+    if snapshot is None:
+        return ["Sentry instrumentation did not load"]
+    if not snapshot["setupDone"]:
+        return [f"setup() did not finish within {timeout:g}s"]
+    if snapshot["frames"] < frames and not snapshot["errors"]:
+        return [f"draw() ran only {snapshot['frames']} of {frames} frames within {timeout:g}s"]
+    return []
+
+
+# Replaces requestAnimationFrame, performance.now (and so p5's millis() and
+# deltaTime), Date.now and the timer functions with a virtual clock. Until
+# __virtualTime.simulate() is called the clock follows real time, driven by
+# the browser's own animation frames; simulate() then steps frames back to
+# back as fast as the game's code allows. Errors are tagged with p5's
+# frameCount at the point of failure and the simulated frame (``step``,
+# 1-based) it happened in.
+VIRTUAL_TIME_SCRIPT = r"""
+(() => {
+  if (window.__virtualTime) return;
+  const real = {
+    raf: window.requestAnimationFrame.bind(window),
+    now: performance.now.bind(performance),
+    dateNow: Date.now.bind(Date)
+  };
+  const start = real.now();
+  const epoch = real.dateNow();
+  const vt = { clock: start, lastReal: start, frame: 0, nextId: 1, rafQueue: [], timers: new Map(), pumping: true };
+
+  const report = (error) => {
+    if (typeof window.reportError === 'function') window.reportError(error);
+    else console.error(error);
+  };
+  const describe = (error) => error && error.stack ? error.stack.split('\n')[0] : String(error);
+  const frameOf = (error) => (error && error.__sentryFrame)
+    || (typeof window.frameCount === 'number' && window.frameCount > 0 ? window.frameCount : vt.frame);
+
+  const addTimer = (fn, delay, args, repeat) => {
+    const id = vt.nextId++;
+    const wait = Math.max(repeat ? 4 : 0, Number(delay) || 0);
+    const callback = typeof fn === 'function' ? fn : new Function(String(fn));
+    vt.timers.set(id, { at: vt.clock + wait, wait, callback, args, repeat });
+    return id;
+  };
+
+  window.requestAnimationFrame = (callback) => {
+    const id = vt.nextId++;
+    vt.rafQueue.push({ id, callback });
+    return id;
+  };
+  window.cancelAnimationFrame = (id) => { vt.rafQueue = vt.rafQueue.filter((entry) => entry.id !== id); };
+  window.setTimeout = (fn, delay, ...args) => addTimer(fn, delay, args, false);
+  window.setInterval = (fn, delay, ...args) => addTimer(fn, delay, args, true);
+  window.clearTimeout = window.clearInterval = (id) => { vt.timers.delete(id); };
+  performance.now = () => vt.clock;
+  Date.now = () => epoch + (vt.clock - start);
+
+  // Advances the clock by ``dt`` ms, runs due timers, then one round of animation frames.
+  // ``guard`` decides what happens to an exception thrown by a callback.
+  const step = (dt, guard) => {
+    vt.clock += dt;
+    vt.frame += 1;
+    for (let fired = 0; fired < 1000; fired++) {
+      let dueId = null;
+      let due = null;
+      for (const [id, timer] of vt.timers) {
+        if (timer.at <= vt.clock && (due === null || timer.at < due.at)) { dueId = id; due = timer; }
+      }
+      if (due === null) break;
+      if (due.repeat) due.at += due.wait; else vt.timers.delete(dueId);
+      guard(() => due.callback.apply(window, due.args));
+    }
+    const queue = vt.rafQueue;
+    vt.rafQueue = [];
+    for (const entry of queue) guard(() => entry.callback(vt.clock));
+  };
+
+  const pump = () => {
+    if (vt.pumping) {
+      const now = real.now();
+      step(now - vt.lastReal, (run) => { try { run(); } catch (error) { report(error); } });
+      vt.lastReal = now;
+    }
+    real.raf(pump);
+  };
+  real.raf(pump);
+
+  // ``beforeFrame(index)``, if given, runs ahead of each simulated frame (e.g. to dispatch input);
+  // with ``timings`` the real time each frame took is returned in ``frameMs``
+  vt.simulate = ({ frames, stepMs, wallLimitMs, beforeFrame, timings }) => {
+    vt.pumping = false;
+    const began = real.now();
+    const errors = [];
+    const frameMs = [];
+    let simulated = 0;
+    let idle = false;
+    let truncated = false;
+    try {
+      for (; simulated < frames; simulated++) {
+        if (vt.rafQueue.length === 0 && vt.timers.size === 0) { idle = true; break; }
+        if (beforeFrame) beforeFrame(simulated);
+        const frameStart = real.now();
+        step(stepMs, (run) => run());
+        if (timings) frameMs.push(+(real.now() - frameStart).toFixed(3));
+        if (simulated % 64 === 0 && real.now() - began > wallLimitMs) { truncated = true; simulated++; break; }
+      }
+    } catch (error) {
+      simulated++;
+      errors.push({
+        message: describe(error),
+        frame: frameOf(error),
+        step: simulated,
+        seconds: +(simulated * stepMs / 1000).toFixed(2)
+      });
+    } finally {
+      vt.lastReal = real.now();
+      vt.pumping = true;
+    }
+    const wallMs = real.now() - began;
+    return {
+      frames: simulated,
+      simulatedSeconds: +(simulated * stepMs / 1000).toFixed(2),
+      wallMs: Math.round(wallMs),
+      framesPerSecond: wallMs > 0 ? Math.round(simulated * 1000 / wallMs) : null,
+      errors,
+      idle,
+      truncated,
+      frameMs: timings ? frameMs : undefined
+    };
+  };
+
+  // Drops the timers and animation frames of a game whose page is reused
+  vt.reset = () => {
+    vt.timers.clear();
+    vt.rafQueue = [];
+    vt.frame = 0;
+  };
+
+  window.__virtualTime = vt;
+})();
+"""
+
+SIMULATE = "(options) => window.__virtualTime ? window.__virtualTime.simulate(options) : null"
+
+
+def simulation_options(seconds: float, fps: int, wall_limit: float) -> Dict[str, Any]:
+    """Arguments for ``SIMULATE``: ``seconds`` of play at ``fps``, stopping after ``wall_limit`` real seconds."""
+    return {"frames": int(seconds * fps), "stepMs": 1000 / fps, "wallLimitMs": wall_limit * 1000}
+
+
+def simulation_errors(summary: Optional[Dict[str, Any]]) -> List[str]:
+    """Runtime errors from a simulated play session, with where in the session they happened."""
+    if not summary:
+        return []
+    return [
+        f"{error['message']} (frame {error['frame']}, {error['seconds']}s into simulated play)"
+        for error in summary["errors"]
+    ]
+
+
+def merge_simulations(summaries: List[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """One summary for a session simulated in consecutive runs; error times are made session-relative."""
+    if not summaries:
+        return None
+    frames, seconds, wall_ms, errors = 0, 0.0, 0, []
+    for summary in summaries:
+        errors.extend(
+            {**error, "step": error["step"] + frames, "seconds": round(error["seconds"] + seconds, 2)}
+            for error in summary["errors"]
+        )
+        frames += summary["frames"]
+        seconds += summary["simulatedSeconds"]
+        wall_ms += summary["wallMs"]
+    return {
+        "frames": frames,
+        "simulatedSeconds": round(seconds, 2),
+        "wallMs": wall_ms,
+        "framesPerSecond": round(frames * 1000 / wall_ms) if wall_ms > 0 else None,
+        "errors": errors,
+        "idle": summaries[-1]["idle"],
+        "truncated": summaries[-1]["truncated"]
+    }
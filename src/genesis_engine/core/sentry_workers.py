@@ -0,0 +1,472 @@
+"""
+Out-of-Process Sentry Workers
+Runs Sentry's browser tests in separate worker processes, each owning its
+own Chromium, so a hung or bloated browser cannot take the web server down
+with it and rendering can use more cores than one Python process gets.
+
+Tests go out over a shared IPC job queue and results come back over an
+event queue. Each worker runs several tests at once, so capacity is
+``processes * slots`` and is sized apart from the web server's own workers.
+The server side watches its workers:
+- it retires a worker after ``max_tests`` tests, ``max_age`` seconds or once
+  the worker and its browser use more than ``max_rss_mb``, starting the
+  replacement first; workers warm their browser up before reporting ready,
+  so the replacement takes tests without a cold start;
+- it restarts a worker that crashed and retries that worker's tests once;
+- it kills a worker whose test runs past ``test_timeout``;
+- it fails a test no worker started within ``queue_timeout``, and fails
+  every queued test at once while no worker is up or starting, so callers
+  never wait on a pool that cannot run their tests.
+"""
+import asyncio
+import itertools
+import logging
+import multiprocessing
+import os
+import queue
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Seconds between checks of worker liveness, memory and test deadlines
+WATCH_INTERVAL = 0.5
+MAX_SPAWN_DELAY = 30.0
+
+# In the worker: builds the object that runs tests, with async start() -> browser version, test(html, name), close()
+TesterFactory = Callable[[], Any]
+
+
+def process_tree_rss(pid: int, include_root: bool = True) -> Optional[int]:
+    """
+    Resident memory in bytes of ``pid`` and all its descendants (the browser); None without /proc.
+
+    With ``include_root=False`` only the descendants are counted.
+    """
+    try:
+        parents: Dict[int, List[int]] = {}
+        for entry in os.listdir("/proc"):
+            if not entry.isdigit():
+                continue
+            try:
+                with open(f"/proc/{entry}/stat", "rb") as stat:
+                    # The command name may contain spaces; fields resume after its closing parenthesis
+                    ppid = int(stat.read().rsplit(b")", 1)[1].split()[1])
+            except (OSError, IndexError, ValueError):
+                continue
+            parents.setdefault(ppid, []).append(int(entry))
+    except OSError:
+        return None
+
+    total, stack = 0, [pid]
+    page = os.sysconf("SC_PAGE_SIZE")
+    while stack:
+        current = stack.pop()
+        if current == pid and not include_root:
+            stack.extend(parents.get(current, []))
+            continue
+        try:
+            with open(f"/proc/{current}/statm", "rb") as statm:
+                total += int(statm.read().split()[1]) * page
+        except (OSError, IndexError, ValueError):
+            continue
+        stack.extend(parents.get(current, []))
+    return total
+
+
+def _failure(message: str) -> Dict[str, Any]:
+    """Browser test results for a test the workers could not run."""
+    return {
+        "passed": False, "console_errors": [], "runtime_errors": [],
+        "errors": [message], "infrastructure_error": True
+    }
+
+
+class BrowserTester:
+    """Runs browser tests with an in-process Sentry agent; the default tester in each worker."""
+
+    def __init__(self, overrides: Optional[Dict[str, Any]] = None):
+        self.overrides = overrides or {}
+        self.agent = None
+
+    async def start(self) -> Optional[str]:
+        from ..config import settings
+        from .sentry_agent import SentryAgent
+
+        for name, value in self.overrides.items():
+            setattr(settings, name, value)
+        settings.sentry_workers = 0  # this process is the worker
+        self.agent = SentryAgent(logger)
+        await self.agent.warm_up()
+        self.agent.start_maintenance(settings.sentry_probe_interval)
+        return self.agent.browser.version if self.agent.browser else None
+
+    async def test(self, html_content: str, game_name: str) -> Dict[str, Any]:
+        return await self.agent._test_in_browser(html_content, game_name)
+
+    async def close(self):
+        if self.agent:
+            await self.agent.cleanup()
+
+
+def _worker_main(number: int, tester_factory: TesterFactory, slots: int, jobs, events, stop):
+    """Worker process entry point."""
+    try:
+        asyncio.run(_serve(number, tester_factory, slots, jobs, events, stop))
+    except KeyboardInterrupt:
+        pass
+
+
+async def _serve(number: int, tester_factory: TesterFactory, slots: int, jobs, events, stop):
+    """Start the tester, then run tests from ``jobs`` on ``slots`` concurrent slots until ``stop`` is set."""
+    tester = tester_factory()
+    try:
+        version = await tester.start()
+    except Exception as e:
+        version = None
+        logger.error(f"Sentry worker {number} could not start its browser: {e}")
+    if not version:
+        events.put(("failed", number))
+        await tester.close()
+        return
+    events.put(("ready", number, os.getpid(), version))
+    loop = asyncio.get_running_loop()
+
+    async def slot():
+        while not stop.is_set():
+            try:
+                job_id, html_content, game_name = await loop.run_in_executor(None, jobs.get, True, 0.2)
+            except queue.Empty:
+                continue
+            events.put(("start", number, job_id))
+            try:
+                results = await tester.test(html_content, game_name)
+            except Exception as e:
+                results = _failure(f"Browser testing failed: {str(e)}")
+            events.put(("done", number, job_id, results))
+
+    try:
+        await asyncio.gather(*(slot() for _ in range(slots)))
+    finally:
+        await tester.close()
+        events.put(("exit", number))
+
+
+@dataclass
+class _Job:
+    id: int
+    html_content: str
+    game_name: str
+    future: asyncio.Future
+    attempts: int = 0
+    worker: Optional[int] = None
+    started: Optional[float] = None
+    queued: float = field(default_factory=time.monotonic)
+
+
+@dataclass
+class _Worker:
+    number: int
+    process: Any
+    stop: Any
+    spawned: float = field(default_factory=time.monotonic)
+    pid: Optional[int] = None
+    version: Optional[str] = None
+    tests: int = 0
+    rss: Optional[int] = None
+    retiring: Optional[str] = None
+
+
+class SentryWorkerPool:
+    """
+    Browser tests in ``processes`` worker processes with ``slots`` concurrent tests each.
+
+    ``start()`` returns once a worker is ready (False if none could start);
+    ``test_in_browser()`` queues a test and waits for its results, which
+    have the same shape as ``SentryAgent._test_in_browser``'s.
+    """
+
+    def __init__(self, processes: int, slots: int = 1, max_tests: int = 200, max_rss_mb: float = 0,
+                 test_timeout: float = 180.0, tester_factory: Optional[TesterFactory] = None,
+                 startup_timeout: float = 60.0, max_age: float = 0, queue_timeout: float = 600.0):
+        self.processes = processes
+        self.slots = slots
+        self.max_tests = max_tests
+        self.max_rss_mb = max_rss_mb
+        self.max_age = max_age
+        self.test_timeout = test_timeout
+        self.queue_timeout = queue_timeout
+        self.tester_factory = tester_factory or BrowserTester
+        self.startup_timeout = startup_timeout
+        self._mp = multiprocessing.get_context("spawn")
+        self._jobs = self._mp.Queue()
+        # Written synchronously, so a worker's last events are not lost when it crashes right after
+        self._events = self._mp.SimpleQueue()
+        self._workers: Dict[int, _Worker] = {}
+        self._pending: Dict[int, _Job] = {}
+        self._job_ids = itertools.count(1)
+        self._worker_numbers = itertools.count(1)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._reader: Optional[threading.Thread] = None
+        self._watcher: Optional[asyncio.Task] = None
+        self._ready = asyncio.Event()
+        self._closing = False
+        self._spawn_delay = 0.0
+        self._next_spawn = 0.0
+
+        self.browser_version: Optional[str] = None
+        self.tests = 0
+        self.retries = 0
+        self.crashes = 0
+        self.timeouts = 0
+        self.queue_timeouts = 0
+        self.start_failures = 0
+        self.recycled: Dict[str, int] = {}
+
+    async def start(self) -> bool:
+        """Spawn the workers and wait for the first to be ready."""
+        self._loop = asyncio.get_running_loop()
+        self._ready = asyncio.Event()
+        self._reader = threading.Thread(target=self._read_events, name="sentry-worker-events", daemon=True)
+        self._reader.start()
+        for _ in range(self.processes):
+            self._spawn()
+        self._watcher = asyncio.create_task(self._watch())
+        deadline = time.monotonic() + self.startup_timeout
+        while not self._ready.is_set() and time.monotonic() < deadline:
+            if self.start_failures >= self.processes:
+                break
+            try:
+                await asyncio.wait_for(self._ready.wait(), WATCH_INTERVAL)
+            except asyncio.TimeoutError:
+                pass
+        if self._ready.is_set():
+            logger.info(f"Sentry worker pool started: {self.processes} processes x {self.slots} slots")
+        return self._ready.is_set()
+
+    async def close(self):
+        """Stop the workers, failing any tests still waiting."""
+        self._closing = True
+        if self._watcher:
+            self._watcher.cancel()
+            try:
+                await self._watcher
+            except asyncio.CancelledError:
+                pass
+        for worker in self._workers.values():
+            worker.stop.set()
+        for worker in list(self._workers.values()):
+            await asyncio.to_thread(worker.process.join, 10)
+            if worker.process.is_alive():
+                worker.process.kill()
+                await asyncio.to_thread(worker.process.join, 5)
+        self._workers.clear()
+        for job in list(self._pending.values()):
+            self._finish(job, _failure("Sentry worker pool shut down"))
+        self._events.put(None)
+        if self._reader:
+            await asyncio.to_thread(self._reader.join, 5)
+
+    @property
+    def ready_workers(self) -> int:
+        return sum(1 for worker in self._workers.values() if worker.version and not worker.retiring)
+
+    async def test_in_browser(self, html_content: str, game_name: str) -> Dict[str, Any]:
+        """Queue one browser test and wait for a worker's results."""
+        job = _Job(next(self._job_ids), html_content, game_name, self._loop.create_future())
+        self._pending[job.id] = job
+        self._jobs.put((job.id, html_content, game_name))
+        return await job.future
+
+    def retire(self, number: int, reason: str):
+        """Let a worker finish its tests and exit; its replacement starts right away."""
+        worker = self._workers.get(number)
+        if worker is None or worker.retiring:
+            return
+        worker.retiring = reason
+        worker.stop.set()
+        self.recycled[reason] = self.recycled.get(reason, 0) + 1
+        logger.info(f"Recycling Sentry worker {number} ({reason}) after {worker.tests} tests")
+        if not self._closing:
+            self._spawn()
+
+    def _spawn(self):
+        number = next(self._worker_numbers)
+        stop = self._mp.Event()
+        process = self._mp.Process(
+            target=_worker_main, name=f"sentry-worker-{number}", daemon=True,
+            args=(number, self.tester_factory, self.slots, self._jobs, self._events, stop)
+        )
+        process.start()
+        self._workers[number] = _Worker(number, process, stop)
+
+    def _read_events(self):
+        """Forward worker events to the event loop (runs in a thread)."""
+        while True:
+            try:
+                event = self._events.get()
+            except (EOFError, OSError):
+                return
+            if event is None:
+                return
+            try:
+                self._loop.call_soon_threadsafe(self._on_event, event)
+            except RuntimeError:
+                return  # The loop has closed
+
+    def _on_event(self, event: Tuple):
+        kind, number = event[0], event[1]
+        worker = self._workers.get(number)
+        if kind == "ready" and worker:
+            worker.pid, worker.version = event[2], event[3]
+            self.browser_version = worker.version
+            self._spawn_delay = 0.0
+            self._ready.set()
+        elif kind == "failed":
+            self._start_failed()
+            if worker:
+                worker.retiring = "start_failed"
+        elif kind == "start":
+            job = self._pending.get(event[2])
+            if job:
+                job.worker, job.started = number, time.monotonic()
+                if worker is None:
+                    self._orphaned(job, "worker exited")  # Reaped before this event arrived
+        elif kind == "done":
+            job = self._pending.get(event[2])
+            if worker:
+                worker.tests += 1
+                if self.max_tests and worker.tests >= self.max_tests:
+                    self.retire(number, "max_tests")
+            if job:
+                self.tests += 1
+                self._finish(job, event[3])
+
+    def _start_failed(self):
+        self.start_failures += 1
+        self._spawn_delay = min(MAX_SPAWN_DELAY, max(1.0, self._spawn_delay * 2))
+
+    def _finish(self, job: _Job, results: Dict[str, Any]):
+        self._pending.pop(job.id, None)
+        if not job.future.done():
+            job.future.set_result(results)
+
+    async def _watch(self):
+        while True:
+            await asyncio.sleep(WATCH_INTERVAL)
+            try:
+                await self._check_workers()
+            except Exception as e:
+                logger.error(f"Sentry worker watch failed: {e}")
+
+    async def _check_workers(self):
+        now = time.monotonic()
+        for number, worker in list(self._workers.items()):
+            if not worker.process.is_alive():
+                self._reap(worker)
+                continue
+            running = [job for job in self._pending.values() if job.worker == number]
+            if any(now - job.started > self.test_timeout for job in running):
+                self.timeouts += 1
+                logger.error(f"Sentry worker {number} exceeded {self.test_timeout:g}s on a test - killing it")
+                for job in running:
+                    self._finish(job, _failure(f"Browser test timed out after {self.test_timeout:g}s"))
+                worker.retiring = "test_timeout"
+                worker.process.kill()
+                continue
+            if self.max_age and worker.version and not worker.retiring and now - worker.spawned > self.max_age:
+                self.retire(number, "max_age")
+                continue
+            if self.max_rss_mb and worker.pid and not worker.retiring:
+                worker.rss = await asyncio.to_thread(process_tree_rss, worker.pid)
+                if worker.rss and worker.rss > self.max_rss_mb * 1024 * 1024:
+                    self.retire(number, "max_rss")
+        # Keep the configured number of live workers, backing off while they fail to start
+        live = sum(1 for worker in self._workers.values() if not worker.retiring)
+        if not self._closing and live < self.processes and now >= self._next_spawn:
+            self._next_spawn = now + self._spawn_delay
+            self._spawn()
+        self._check_queue(now)
+
+    def _check_queue(self, now: float):
+        """Fail queued tests past ``queue_timeout``, or all of them while no worker is up or starting."""
+        queued = [job for job in self._pending.values() if job.started is None]
+        if not queued:
+            return
+        available = any(
+            worker.process.is_alive() and not worker.retiring for worker in self._workers.values()
+        )
+        if not available:
+            logger.error(f"No Sentry worker is running or starting - failing {len(queued)} queued tests")
+            self._drain_jobs()
+        for job in queued:
+            if not available:
+                self._finish(job, _failure("No Sentry worker could be started to run the browser test"))
+            elif self.queue_timeout and now - job.queued > self.queue_timeout:
+                # Also catches a test lost by a worker that crashed right after taking it
+                self.queue_timeouts += 1
+                self._finish(job, _failure(f"No Sentry worker started the test within {self.queue_timeout:g}s"))
+
+    def _drain_jobs(self):
+        """Drop queued tests nobody waits for any more, so a later worker does not run them."""
+        try:
+            while True:
+                self._jobs.get_nowait()
+        except queue.Empty:
+            pass
+
+    def _reap(self, worker: _Worker):
+        """Handle a worker process that has exited; a crash restarts it and retries its tests once."""
+        del self._workers[worker.number]
+        worker.process.join(0)
+        orphans = [job for job in self._pending.values() if job.worker == worker.number]
+        if worker.retiring is None and worker.version is None:
+            self._start_failed()  # Died before its browser was up; respawned with backoff
+        elif worker.retiring is None:
+            self.crashes += 1
+            logger.error(f"Sentry worker {worker.number} died (exit code {worker.process.exitcode}) - restarting")
+            if not self._closing:
+                self._spawn()
+        for job in orphans:
+            self._orphaned(job, f"exit code {worker.process.exitcode}")
+
+    def _orphaned(self, job: _Job, cause: str):
+        """Retry a test whose worker died under it once on another worker, then give up."""
+        if job.attempts == 0 and not self._closing:
+            job.attempts += 1
+            job.worker = job.started = None
+            job.queued = time.monotonic()
+            self.retries += 1
+            self._jobs.put((job.id, job.html_content, job.game_name))
+        else:
+            self._finish(job, _failure(f"Sentry worker crashed while testing ({cause})"))
+
+    def metrics(self) -> Dict[str, Any]:
+        """Workers, queue depth, and recycling and crash counts."""
+        now = time.monotonic()
+        return {
+            "processes": self.processes,
+            "slots_per_process": self.slots,
+            "ready_workers": self.ready_workers,
+            "queued": sum(1 for job in self._pending.values() if job.worker is None),
+            "running": sum(1 for job in self._pending.values() if job.worker is not None),
+            "tests": self.tests,
+            "retries": self.retries,
+            "crashes": self.crashes,
+            "timeouts": self.timeouts,
+            "queue_timeouts": self.queue_timeouts,
+            "start_failures": self.start_failures,
+            "recycled": dict(self.recycled),
+            "browser_version": self.browser_version,
+            "workers": [
+                {
+                    "number": worker.number, "pid": worker.pid, "tests": worker.tests,
+                    "age_s": round(now - worker.spawned, 1),
+                    "rss_mb": round(worker.rss / 1024 / 1024, 1) if worker.rss else None,
+                    "retiring": worker.retiring
+                }
+                for worker in self._workers.values()
+            ]
+        }
@@ -0,0 +1,307 @@
+"""
+Genre Skeletons for AI Genesis Engine
+Pre-validated p5.js game skeletons for common genres. Instead of writing a
+whole game, the Engineer fills in a compact JSON config (speeds, colors,
+counts, title) which is range-checked and rendered into the skeleton.
+"""
+import html
+import json
+import re
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+SKELETON_DIR = Path(__file__).parent.parent / "templates" / "skeletons"
+
+_COLOR = re.compile(r'^#(?:[0-9a-fA-F]{3}|[0-9a-fA-F]{6})$')
+_MAX_TITLE_LENGTH = 60
+
+
+@dataclass
+class SkeletonParam:
+    """A single tunable value of a skeleton, addressed by a dotted path."""
+    path: str
+    kind: str  # int, float, color, colors or text
+    default: Any
+    minimum: Optional[float] = None
+    maximum: Optional[float] = None
+    description: str = ""
+
+    def coerce(self, value: Any) -> Any:
+        """Return the value clamped to the allowed range, or the default if unusable."""
+        if self.kind in ("int", "float"):
+            if isinstance(value, bool):
+                return self.default
+            try:
+                number = float(value)
+            except (TypeError, ValueError):
+                return self.default
+            if number != number:  # NaN
+                return self.default
+            if self.minimum is not None:
+                number = max(self.minimum, number)
+            if self.maximum is not None:
+                number = min(self.maximum, number)
+            return int(round(number)) if self.kind == "int" else round(number, 3)
+
+        if self.kind == "color":
+            if isinstance(value, str) and _COLOR.match(value.strip()):
+                return value.strip()
+            return self.default
+
+        if self.kind == "colors":
+            if not isinstance(value, list):
+                return list(self.default)
+            colors = [c.strip() for c in value if isinstance(c, str) and _COLOR.match(c.strip())]
+            limit = int(self.maximum) if self.maximum is not None else len(colors)
+            colors = colors[:limit]
+            return colors if len(colors) >= (self.minimum or 1) else list(self.default)
+
+        # Free text ends up on the canvas, keep it short and single-line
+        if not isinstance(value, str) or not value.strip():
+            return self.default
+        return " ".join(value.split())[:_MAX_TITLE_LENGTH]
+
+    def schema(self) -> Dict[str, Any]:
+        """JSON schema fragment for this parameter."""
+        if self.kind in ("int", "float"):
+            entry: Dict[str, Any] = {"type": "integer" if self.kind == "int" else "number"}
+            if self.minimum is not None:
+                entry["minimum"] = self.minimum
+            if self.maximum is not None:
+                entry["maximum"] = self.maximum
+        elif self.kind == "colors":
+            entry = {"type": "array", "items": {"type": "string", "pattern": _COLOR.pattern},
+                     "minItems": int(self.minimum or 1)}
+            if self.maximum is not None:
+                entry["maxItems"] = int(self.maximum)
+        elif self.kind == "color":
+            entry = {"type": "string", "pattern": _COLOR.pattern}
+        else:
+            entry = {"type": "string", "maxLength": _MAX_TITLE_LENGTH}
+        if self.description:
+            entry["description"] = self.description
+        return entry
+
+
+@dataclass
+class GameSkeleton:
+    """A genre template plus the parameters the LLM is allowed to set."""
+    genre: str
+    description: str
+    template: str
+    keywords: List[str]
+    params: List[SkeletonParam] = field(default_factory=list)
+
+    @property
+    def template_path(self) -> Path:
+        return SKELETON_DIR / self.template
+
+    def defaults(self) -> Dict[str, Any]:
+        """The default config as a nested dict."""
+        config: Dict[str, Any] = {}
+        for param in self.params:
+            _set_path(config, param.path, list(param.default) if isinstance(param.default, list) else param.default)
+        return config
+
+    def schema(self) -> Dict[str, Any]:
+        """JSON schema for the config object, nested like the config itself."""
+        root: Dict[str, Any] = {"type": "object", "properties": {}, "additionalProperties": False}
+        for param in self.params:
+            node = root
+            parts = param.path.split(".")
+            for part in parts[:-1]:
+                node = node["properties"].setdefault(
+                    part, {"type": "object", "properties": {}, "additionalProperties": False}
+                )
+            node["properties"][parts[-1]] = param.schema()
+        return root
+
+    def validate_config(self, raw: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Merge an LLM config onto the defaults.
+
+        Unknown keys are dropped, numbers are clamped to their range and
+        malformed values fall back to the default, so every config renders
+        a game that behaves like the pre-validated skeleton.
+        """
+        raw = raw if isinstance(raw, dict) else {}
+        config: Dict[str, Any] = {}
+        for param in self.params:
+            value = _get_path(raw, param.path)
+            if value is _MISSING:
+                value = list(param.default) if isinstance(param.default, list) else param.default
+            else:
+                value = param.coerce(value)
+            _set_path(config, param.path, value)
+        return config
+
+    def render(self, config: Dict[str, Any]) -> str:
+        """Render a validated config into the skeleton HTML."""
+        config = self.validate_config(config)
+        # Keep "</script>" and friends in strings from closing the script tag
+        config_json = json.dumps(config, indent=4).replace("</", "<\\/")
+        config_json = config_json.replace("\n", "\n        ")
+        template = self.template_path.read_text(encoding="utf-8")
+        return (template
+                .replace("__GAME_TITLE__", html.escape(config.get("title", "Genesis Game")))
+                .replace("__GAME_CONFIG__", config_json))
+
+
+_MISSING = object()
+
+
+def _get_path(data: Dict[str, Any], path: str) -> Any:
+    node: Any = data
+    for part in path.split("."):
+        if not isinstance(node, dict) or part not in node:
+            return _MISSING
+        node = node[part]
+    return node
+
+
+def _set_path(data: Dict[str, Any], path: str, value: Any):
+    parts = path.split(".")
+    for part in parts[:-1]:
+        data = data.setdefault(part, {})
+    data[parts[-1]] = value
+
+
+def _p(path, kind, default, minimum=None, maximum=None, description=""):
+    return SkeletonParam(path, kind, default, minimum, maximum, description)
+
+
+SKELETONS: Dict[str, GameSkeleton] = {
+    "space_shooter": GameSkeleton(
+        genre="space_shooter",
+        description="Top-down shooter: the player ship moves and fires upward at descending enemies.",
+        template="space_shooter.html",
+        keywords=["space", "shooter", "shoot", "shooting", "spaceship", "ship", "alien", "aliens",
+                  "invader", "invaders", "asteroid", "asteroids", "laser", "lasers", "galaxy", "bullet hell"],
+        params=[
+            _p("title", "text", "Space Shooter", description="Game title shown on screen"),
+            _p("canvas.width", "int", 800, 400, 1200),
+            _p("canvas.height", "int", 600, 300, 900),
+            _p("player.speed", "float", 5, 1, 15, "Ship speed in pixels per frame"),
+            _p("player.size", "int", 30, 10, 80),
+            _p("player.lives", "int", 3, 1, 10),
+            _p("bullet.speed", "float", 8, 2, 25),
+            _p("bullet.size", "int", 6, 2, 20),
+            _p("bullet.cooldown_frames", "int", 12, 2, 60, "Frames between shots"),
+            _p("enemies.spawn_interval_frames", "int", 60, 15, 240),
+            _p("enemies.min_speed", "float", 1.5, 0.5, 8),
+            _p("enemies.max_speed", "float", 3, 0.5, 12),
+            _p("enemies.size", "int", 28, 10, 80),
+            _p("enemies.max_on_screen", "int", 12, 1, 40),
+            _p("enemies.points", "int", 10, 1, 1000),
+            _p("difficulty.points_per_level", "int", 100, 10, 10000),
+            _p("difficulty.speed_increase_per_level", "float", 0.3, 0, 3),
+            _p("colors.background", "color", "#0b0d2a"),
+            _p("colors.player", "color", "#4fc3f7"),
+            _p("colors.bullet", "color", "#ffeb3b"),
+            _p("colors.enemy", "color", "#ef5350"),
+            _p("colors.text", "color", "#ffffff"),
+        ]
+    ),
+    "platformer": GameSkeleton(
+        genre="platformer",
+        description="Side-view platformer: run and jump between platforms collecting coins while avoiding patrolling enemies.",
+        template="platformer.html",
+        keywords=["platformer", "platform", "platforms", "jump", "jumping", "jumper", "runner",
+                  "coins", "ledge", "mario", "climb"],
+        params=[
+            _p("title", "text", "Platform Jumper", description="Game title shown on screen"),
+            _p("canvas.width", "int", 800, 400, 1200),
+            _p("canvas.height", "int", 600, 300, 900),
+            _p("lives", "int", 3, 1, 10),
+            _p("physics.gravity", "float", 0.6, 0.1, 2),
+            _p("physics.jump_strength", "float", 12, 4, 25),
+            _p("physics.move_speed", "float", 4, 1, 12),
+            _p("level.platform_count", "int", 6, 2, 12),
+            _p("level.coin_count", "int", 8, 1, 30),
+            _p("level.enemy_count", "int", 2, 0, 8),
+            _p("level.enemy_speed", "float", 1.5, 0.2, 6),
+            _p("level.points_per_coin", "int", 10, 1, 1000),
+            _p("colors.background", "color", "#87ceeb"),
+            _p("colors.player", "color", "#e53935"),
+            _p("colors.platform", "color", "#6d4c41"),
+            _p("colors.coin", "color", "#fdd835"),
+            _p("colors.enemy", "color", "#5e35b1"),
+            _p("colors.text", "color", "#1a1a1a"),
+        ]
+    ),
+    "puzzle": GameSkeleton(
+        genre="puzzle",
+        description="Falling-block match puzzle: steer colored blocks into a grid and clear lines of matching colors.",
+        template="puzzle.html",
+        keywords=["puzzle", "match", "match-3", "match three", "tetris", "blocks", "grid", "tiles",
+                  "gems", "jewels", "falling blocks", "columns"],
+        params=[
+            _p("title", "text", "Block Matcher", description="Game title shown on screen"),
+            _p("grid.columns", "int", 8, 4, 16),
+            _p("grid.rows", "int", 12, 6, 20),
+            _p("grid.cell_size", "int", 40, 20, 64),
+            _p("rules.min_match", "int", 3, 2, 5, "Blocks in a row needed to clear"),
+            _p("rules.fall_interval_frames", "int", 30, 5, 120),
+            _p("rules.points_per_block", "int", 10, 1, 1000),
+            _p("rules.speed_up_every", "int", 15, 3, 200, "Cleared blocks before the fall speeds up"),
+            _p("colors.background", "color", "#1e1e2e"),
+            _p("colors.grid", "color", "#44475a"),
+            _p("colors.text", "color", "#f8f8f2"),
+            _p("colors.blocks", "colors", ["#ff5555", "#50fa7b", "#8be9fd", "#f1fa8c"], 2, 6,
+               "Block colors, one per block type"),
+        ]
+    ),
+    "bouncing_ball": GameSkeleton(
+        genre="bouncing_ball",
+        description="Physics toy: balls bounce under adjustable gravity; clicking adds balls.",
+        template="bouncing_ball.html",
+        keywords=["bouncing", "bounce", "bounces", "ball", "balls", "physics", "gravity", "sandbox",
+                  "ricochet", "elastic"],
+        params=[
+            _p("title", "text", "Bouncing Balls", description="Game title shown on screen"),
+            _p("canvas.width", "int", 800, 400, 1200),
+            _p("canvas.height", "int", 600, 300, 900),
+            _p("physics.gravity", "float", 0.4, -2, 2),
+            _p("physics.restitution", "float", 0.85, 0.1, 1, "Fraction of speed kept per bounce"),
+            _p("physics.friction", "float", 0.995, 0.9, 1),
+            _p("balls.initial_count", "int", 5, 1, 50),
+            _p("balls.max_count", "int", 40, 1, 200),
+            _p("balls.min_radius", "int", 10, 4, 60),
+            _p("balls.max_radius", "int", 30, 4, 100),
+            _p("trail_length", "int", 8, 0, 40),
+            _p("colors.background", "color", "#202030"),
+            _p("colors.text", "color", "#ffffff"),
+            _p("colors.balls", "colors", ["#ff6b6b", "#feca57", "#48dbfb", "#1dd1a1", "#5f27cd"], 1, 8),
+        ]
+    ),
+}
+
+
+def get_skeleton(genre: Optional[str]) -> Optional[GameSkeleton]:
+    """Look up a skeleton by genre id."""
+    return SKELETONS.get(genre or "")
+
+
+def _keyword_hits(keywords: List[str], text: str) -> int:
+    return sum(1 for keyword in keywords
+               if re.search(r'\b' + re.escape(keyword) + r'\b', text))
+
+
+def classify_genre(prompt: str, gdd_content: str = "", min_score: int = 3) -> Optional[str]:
+    """
+    Pick the skeleton genre for a game concept.
+
+    Keyword hits in the user prompt weigh three times as much as hits in the
+    GDD. Returns None when no genre clears ``min_score`` so the caller can
+    fall back to free-form generation.
+    """
+    prompt_text = (prompt or "").lower()
+    gdd_text = (gdd_content or "").lower()
+
+    best_genre, best_score = None, 0
+    for genre, skeleton in SKELETONS.items():
+        score = 3 * _keyword_hits(skeleton.keywords, prompt_text) + _keyword_hits(skeleton.keywords, gdd_text)
+        if score > best_score:
+            best_genre, best_score = genre, score
+    return best_genre if best_score >= min_score else None
@@ -0,0 +1,305 @@
+"""
+Static Analyzer for the Sentry Agent
+One pass over a generated game: the HTML is scanned once, its inline
+scripts are tokenized once (see ``js_tokenizer``), and every registered
+rule reads the shared parse to report findings with a severity and, where
+it has one, the line and column in the HTML file.
+
+Rules in the "syntax" stage decide whether a game is worth running at all;
+rules in the "static" stage stand in for the browser test when there is no
+browser (or for the quick per-feature checks) and are skipped when the game
+is actually run.
+"""
+import re
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+from .js_tokenizer import SourceMap, Token, bracket_problems, script_ranges, tokenize
+
+_TAG = re.compile(r'<(/?)([a-zA-Z][\w-]*)|<!doctype\s+html\b', re.IGNORECASE)
+_DECLARATIONS = frozenset(("let", "const", "var", "function", "class"))
+
+# Bump when a rule changes what it reports; cached validation results are keyed by it
+RULESET_VERSION = 1
+
+SEVERITIES = ("error", "warning")
+STAGES = ("syntax", "static")
+
+# A rule yields messages, or (message, offset in the HTML) pairs when it can point at the code
+RuleResult = Iterable[Union[str, Tuple[str, int]]]
+
+
+@dataclass
+class Finding:
+    """One problem reported by a rule."""
+    rule: str
+    severity: str
+    stage: str
+    message: str
+    line: Optional[int] = None
+    column: Optional[int] = None
+
+    def __str__(self) -> str:
+        if self.line is None:
+            return self.message
+        return f"Line {self.line}, column {self.column}: {self.message}"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "rule": self.rule, "severity": self.severity, "stage": self.stage,
+            "message": self.message, "line": self.line, "column": self.column
+        }
+
+
+@dataclass
+class Rule:
+    """A named check over a parsed game."""
+    name: str
+    severity: str
+    stage: str
+    check: Callable[["ParsedGame"], RuleResult]
+
+
+RULES: Dict[str, Rule] = {}
+
+
+def rule(name: str, severity: str = "error", stage: str = "syntax"):
+    """Register the decorated ``check(game)`` function as a rule."""
+    assert severity in SEVERITIES and stage in STAGES
+
+    def register(check: Callable[["ParsedGame"], RuleResult]):
+        RULES[name] = Rule(name, severity, stage, check)
+        return check
+    return register
+
+
+class ParsedGame:
+    """An HTML game parsed once: its tags, inline script tokens and function bodies."""
+
+    def __init__(self, html: str):
+        self.html = html
+        self.source = SourceMap(html)
+        self.tags: Set[str] = set()
+        self.doctype = False
+        for match in _TAG.finditer(html):
+            if match.group(2) is None:
+                self.doctype = True
+            else:
+                self.tags.add(match.group(1) + match.group(2).lower())
+        self.scripts = script_ranges(html)
+        self.tokens: List[Token] = []
+        self.syntax_problems: List[Tuple[str, int]] = []
+        for start, end in self.scripts:
+            tokens, problems = tokenize(html, start, end)
+            self.tokens += tokens
+            self.syntax_problems += problems + bracket_problems(tokens, self.source)
+        self.names = {token.text for token in self.tokens if token.kind == "name"}
+        self._closers = self._match_brackets()
+
+    def _match_brackets(self) -> Dict[int, int]:
+        """Index of the closing token for each opening (), [], {} token that has one."""
+        closers, stack = {}, []
+        for index, token in enumerate(self.tokens):
+            if token.kind != "punct":
+                continue
+            if token.text in "([{":
+                stack.append(index)
+            elif token.text in ")]}" and stack:
+                closers[stack.pop()] = index
+        return closers
+
+    def calls(self, name: str, span: Optional[Tuple[int, int]] = None) -> bool:
+        """Whether the scripts (or the token range ``span`` of them) call ``name(...)``."""
+        tokens = self.tokens
+        start, end = span or (0, len(tokens))
+        return any(
+            tokens[i].kind == "name" and tokens[i].text == name and tokens[i + 1].text == "("
+            for i in range(start, min(end, len(tokens) - 1))
+        )
+
+    def defines(self, name: str) -> bool:
+        """Whether the scripts declare ``function name`` or assign a function to ``name``."""
+        tokens = self.tokens
+        for i in range(len(tokens) - 2):
+            if tokens[i].kind != "name":
+                continue
+            if tokens[i].text == "function" and tokens[i + 1].text == name:
+                return True
+            if tokens[i].text == name and tokens[i + 1].text == "=" and (
+                tokens[i + 2].text in ("function", "(", "async") or tokens[i + 2].kind == "name"
+            ):
+                return True
+        return False
+
+    def declares(self, name: str) -> bool:
+        """Whether ``name`` is declared with let, const, var, function or class."""
+        tokens = self.tokens
+        return any(
+            tokens[i].text in _DECLARATIONS and tokens[i].kind == "name" and tokens[i + 1].text == name
+            for i in range(len(tokens) - 1)
+        )
+
+    def function_body(self, name: str) -> Optional[Tuple[int, int]]:
+        """Token index range inside the braces of ``function name(...) { ... }``."""
+        tokens = self.tokens
+        for i in range(len(tokens) - 2):
+            if tokens[i].text == "function" and tokens[i + 1].text == name and tokens[i + 2].text == "(":
+                close_paren = self._closers.get(i + 2)
+                if close_paren is None or close_paren + 1 >= len(tokens) or tokens[close_paren + 1].text != "{":
+                    return None
+                close_brace = self._closers.get(close_paren + 1)
+                return None if close_brace is None else (close_paren + 2, close_brace)
+        return None
+
+    def text_between(self, start: int, end: int) -> str:
+        """Source text of tokens ``start`` up to (not including) ``end``."""
+        if start >= end:
+            return ""
+        return self.html[self.tokens[start].start:self.tokens[end - 1].start + len(self.tokens[end - 1].text)]
+
+
+@dataclass
+class Analysis:
+    """All findings for one game."""
+    findings: List[Finding]
+
+    def select(self, severity: Optional[str] = None, stage: Optional[str] = None) -> List[Finding]:
+        return [
+            finding for finding in self.findings
+            if (severity is None or finding.severity == severity) and (stage is None or finding.stage == stage)
+        ]
+
+    def messages(self, severity: str, stage: Optional[str] = None) -> List[str]:
+        return [str(finding) for finding in self.select(severity, stage)]
+
+    @property
+    def syntax_valid(self) -> bool:
+        return not self.select("error", "syntax")
+
+
+def analyze_game(html: str, rules: Optional[Iterable[Rule]] = None) -> Analysis:
+    """Run ``rules`` (every registered rule by default) over one parse of ``html``."""
+    if not html or len(html.strip()) < 100:
+        return Analysis([Finding("document", "error", "syntax", "Generated content is too short or empty")])
+    game = ParsedGame(html)
+    findings = []
+    for current in rules if rules is not None else RULES.values():
+        for result in current.check(game):
+            if isinstance(result, tuple):
+                message, offset = result
+                line, column = game.source.locate(offset)
+            else:
+                message, line, column = result, None, None
+            findings.append(Finding(current.name, current.severity, current.stage, message, line, column))
+    return Analysis(findings)
+
+
+# Syntax stage: the document, p5.js entry points and the scripts' tokens
+
+@rule("html-structure")
+def _html_structure(game: ParsedGame) -> RuleResult:
+    if not game.doctype:
+        yield "Missing DOCTYPE declaration"
+    for tag in ("html", "head", "body"):
+        if tag not in game.tags:
+            yield f"Missing <{tag}> tag"
+        if "/" + tag not in game.tags:
+            yield f"Missing closing </{tag}> tag"
+
+
+@rule("p5-library")
+def _p5_library(game: ParsedGame) -> RuleResult:
+    if "p5.js" not in game.html and "p5.min.js" not in game.html:
+        yield "Missing p5.js library reference"
+
+
+@rule("inline-script")
+def _inline_script(game: ParsedGame) -> RuleResult:
+    if not game.scripts:
+        yield "No JavaScript code found in HTML"
+
+
+@rule("p5-entry-points")
+def _p5_entry_points(game: ParsedGame) -> RuleResult:
+    for name in ("setup", "draw"):
+        if not game.defines(name):
+            yield f"Missing p5.js {name}() function"
+
+
+@rule("js-syntax")
+def _js_syntax(game: ParsedGame) -> RuleResult:
+    return sorted(game.syntax_problems, key=lambda problem: problem[1])
+
+
+@rule("canvas", severity="warning")
+def _canvas(game: ParsedGame) -> RuleResult:
+    if "canvas" not in game.tags and not game.calls("createCanvas"):
+        yield "No canvas element or createCanvas call found"
+
+
+# Static stage: likely mistakes that a browser run would show for certain
+
+@rule("repeated-keyword", stage="static")
+def _repeated_keyword(game: ParsedGame) -> RuleResult:
+    tokens = game.tokens
+    for first, second in zip(tokens, tokens[1:]):
+        if first.kind == "name" and first.text in ("function", "const", "let", "var") and second.text == first.text:
+            yield f"Double '{first.text}' keyword", second.start
+
+
+@rule("empty-statement", severity="warning", stage="static")
+def _empty_statement(game: ParsedGame) -> RuleResult:
+    # for (;;) headers are fine; a stray ;; elsewhere usually marks an edit gone wrong
+    depth = 0
+    previous = None
+    for token in game.tokens:
+        if token.kind == "punct":
+            if token.text == "(":
+                depth += 1
+            elif token.text == ")":
+                depth = max(0, depth - 1)
+            elif token.text == ";" and previous == ";" and depth == 0:
+                yield "Double semicolon detected", token.start
+        previous = token.text
+
+
+@rule("undeclared-global", severity="warning", stage="static")
+def _undeclared_global(game: ParsedGame) -> RuleResult:
+    for name in ("player", "enemy", "score"):
+        if name in game.names and not game.declares(name):
+            first = next(token for token in game.tokens if token.kind == "name" and token.text == name)
+            yield f"Reference to '{name}' without definition", first.start
+
+
+@rule("setup-canvas", severity="warning", stage="static")
+def _setup_canvas(game: ParsedGame) -> RuleResult:
+    body = game.function_body("setup")
+    if body and not game.calls("createCanvas", body):
+        yield "setup() function missing createCanvas() call", game.tokens[body[0] - 1].start
+
+
+@rule("draw-content", severity="warning", stage="static")
+def _draw_content(game: ParsedGame) -> RuleResult:
+    body = game.function_body("draw")
+    if body and len(game.text_between(*body)) < 20:
+        yield "Draw function appears to be empty or too minimal", game.tokens[body[0] - 1].start
+    if not any(game.calls(shape) for shape in ("rect", "ellipse", "circle", "square", "triangle", "image", "text")):
+        yield "Game doesn't appear to draw any visible elements"
+
+
+@rule("infinite-loop", severity="warning", stage="static")
+def _infinite_loop(game: ParsedGame) -> RuleResult:
+    tokens = game.tokens
+    for i in range(len(tokens) - 3):
+        if tokens[i].text == "while" and tokens[i + 1].text == "(" and tokens[i + 2].text == "true" \
+                and tokens[i + 3].text == ")":
+            yield "Potential infinite loop detected - may cause browser freeze", tokens[i].start
+
+
+@rule("draw-allocations", severity="warning", stage="static")
+def _draw_allocations(game: ParsedGame) -> RuleResult:
+    body = game.function_body("draw")
+    if body:
+        count = sum(1 for token in game.tokens[body[0]:body[1]] if token.kind == "name" and token.text == "new")
+        if count > 5:
+            yield "High object creation in draw loop - may cause performance issues", game.tokens[body[0] - 1].start
@@ -0,0 +1,288 @@
+"""
+Task Graph Executor for AI Genesis Engine
+Runs agent steps as AgentTask nodes with declared dependencies, retries,
+per-role concurrency limits and timing. The executed graph and its critical
+path can be exported for profiling. Handlers may add follow-up tasks while
+the graph runs, so loops can unfold one step at a time.
+"""
+import asyncio
+import json
+import time
+from dataclasses import dataclass, field
+from enum import Enum
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+
+class AgentRole(Enum):
+    ARCHITECT = "architect"
+    ENGINEER = "engineer"
+    SENTRY = "sentry"
+    DEBUGGER = "debugger"
+
+
+class TaskStatus(Enum):
+    PENDING = "pending"
+    IN_PROGRESS = "in_progress"
+    SUCCESS = "success"
+    ERROR = "error"
+    SKIPPED = "skipped"
+
+
+# A handler receives its task and returns the task's output data
+TaskHandler = Callable[["AgentTask"], Awaitable[Optional[Dict[str, Any]]]]
+
+
+@dataclass
+class AgentTask:
+    """Represents a task for a specific agent."""
+    id: str
+    agent_role: AgentRole
+    task_type: str
+    description: str
+    input_data: Dict[str, Any]
+    status: TaskStatus = TaskStatus.PENDING
+    output_data: Optional[Dict[str, Any]] = None
+    error_message: Optional[str] = None
+    retry_count: int = 0
+    max_retries: int = 3
+    dependencies: List[str] = field(default_factory=list)
+    handler: Optional[TaskHandler] = field(default=None, repr=False)
+    timeout: Optional[float] = None
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    @property
+    def duration(self) -> float:
+        """Wall-clock seconds spent in the task, including retries."""
+        if self.started_at is None or self.finished_at is None:
+            return 0.0
+        return self.finished_at - self.started_at
+
+
+class TaskFailed(Exception):
+    """Raised by a handler to fail its task with a readable message."""
+
+
+class TaskGraphExecutor:
+    """
+    Executes a DAG of AgentTasks.
+
+    Tasks start as soon as all of their dependencies succeeded, so independent
+    tasks run concurrently. Each role has its own concurrency limit, failed
+    tasks are retried up to ``max_retries`` times and tasks whose dependencies
+    failed are marked as skipped. Tasks added while the graph runs are
+    scheduled right away and ``run()`` waits for them too.
+    """
+
+    def __init__(self, logger=None, role_concurrency: Optional[Dict[AgentRole, int]] = None):
+        self.logger = logger
+        self.tasks: Dict[str, AgentTask] = {}
+        self.role_concurrency = role_concurrency or {}
+        self._semaphores: Dict[AgentRole, asyncio.Semaphore] = {}
+        self._runners: Optional[Dict[str, asyncio.Task]] = None
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+
+    def add_task(self, task: AgentTask) -> AgentTask:
+        """Register a task with the graph."""
+        if task.id in self.tasks:
+            raise ValueError(f"Duplicate task id: {task.id}")
+        if self._runners is not None:
+            for dep in task.dependencies:
+                if dep not in self.tasks:
+                    raise ValueError(f"Task '{task.id}' depends on unknown task '{dep}'")
+        self.tasks[task.id] = task
+        if self._runners is not None:
+            self._schedule(task)
+        return task
+
+    def add_tasks(self, tasks: List[AgentTask]) -> None:
+        """Register several tasks with the graph."""
+        for task in tasks:
+            self.add_task(task)
+
+    def topological_order(self) -> List[AgentTask]:
+        """Return tasks in dependency order, validating the graph."""
+        for task in self.tasks.values():
+            for dep in task.dependencies:
+                if dep not in self.tasks:
+                    raise ValueError(f"Task '{task.id}' depends on unknown task '{dep}'")
+
+        ordered: List[AgentTask] = []
+        state: Dict[str, str] = {}
+
+        def visit(task_id: str):
+            if state.get(task_id) == "done":
+                return
+            if state.get(task_id) == "visiting":
+                raise ValueError(f"Dependency cycle detected at task '{task_id}'")
+            state[task_id] = "visiting"
+            for dep in self.tasks[task_id].dependencies:
+                visit(dep)
+            state[task_id] = "done"
+            ordered.append(self.tasks[task_id])
+
+        for task_id in self.tasks:
+            visit(task_id)
+        return ordered
+
+    async def run(self) -> bool:
+        """Execute the whole graph. Returns True if every task succeeded."""
+        ordered = self.topological_order()
+        self._semaphores = {
+            role: asyncio.Semaphore(limit)
+            for role, limit in self.role_concurrency.items()
+            if limit and limit > 0
+        }
+
+        self.started_at = time.perf_counter()
+        self._runners = {}
+        for task in ordered:
+            self._schedule(task)
+
+        try:
+            # Handlers may add tasks while we wait, so wait until no new ones appear
+            waited = 0
+            while waited < len(self._runners):
+                runners = list(self._runners.values())
+                await asyncio.gather(*runners)
+                waited = len(runners)
+            return all(runner.result() for runner in self._runners.values())
+        finally:
+            self._runners = None
+            self.finished_at = time.perf_counter()
+
+    def _schedule(self, task: AgentTask):
+        """Start a runner that executes ``task`` once its dependencies are done."""
+        deps = [self._runners[dep] for dep in task.dependencies]
+        self._runners[task.id] = asyncio.ensure_future(self._run_when_ready(task, deps))
+
+    async def _run_when_ready(self, task: AgentTask, deps: List[asyncio.Task]) -> bool:
+        """Wait for dependencies, then run the task unless one of them failed."""
+        if deps and not all(await asyncio.gather(*deps)):
+            task.status = TaskStatus.SKIPPED
+            task.error_message = "Skipped because a dependency failed"
+            self._log("warning", f"Task '{task.id}' skipped - dependency failed")
+            return False
+
+        semaphore = self._semaphores.get(task.agent_role)
+        if semaphore:
+            async with semaphore:
+                return await self._execute(task)
+        return await self._execute(task)
+
+    async def _execute(self, task: AgentTask) -> bool:
+        """Run a single task with retries and timing."""
+        if task.handler is None:
+            task.status = TaskStatus.ERROR
+            task.error_message = "No handler registered for task"
+            return False
+
+        task.status = TaskStatus.IN_PROGRESS
+        task.started_at = time.perf_counter()
+        try:
+            while True:
+                try:
+                    if task.timeout:
+                        output = await asyncio.wait_for(task.handler(task), timeout=task.timeout)
+                    else:
+                        output = await task.handler(task)
+                    task.output_data = output or {}
+                    task.status = TaskStatus.SUCCESS
+                    task.error_message = None
+                    return True
+                except asyncio.TimeoutError:
+                    task.error_message = f"Timed out after {task.timeout}s"
+                except Exception as e:
+                    task.error_message = str(e)
+
+                if task.retry_count >= task.max_retries:
+                    task.status = TaskStatus.ERROR
+                    self._log("error", f"Task '{task.id}' failed: {task.error_message}")
+                    return False
+                task.retry_count += 1
+                self._log(
+                    "warning",
+                    f"Task '{task.id}' failed ({task.error_message}) - "
+                    f"retry {task.retry_count}/{task.max_retries}"
+                )
+        finally:
+            task.finished_at = time.perf_counter()
+
+    def critical_path(self) -> List[AgentTask]:
+        """Longest chain of dependent tasks by duration."""
+        best: Dict[str, float] = {}
+        previous: Dict[str, Optional[str]] = {}
+        for task in self.topological_order():
+            best_dep = max(task.dependencies, key=lambda dep: best[dep], default=None)
+            previous[task.id] = best_dep
+            best[task.id] = task.duration + (best[best_dep] if best_dep else 0.0)
+
+        if not best:
+            return []
+        task_id = max(best, key=best.get)
+        path = []
+        while task_id:
+            path.append(self.tasks[task_id])
+            task_id = previous[task_id]
+        return list(reversed(path))
+
+    def export(self) -> Dict[str, Any]:
+        """Export the executed graph, its critical path and a Chrome trace."""
+        origin = self.started_at or 0.0
+
+        def offset(value: Optional[float]) -> Optional[float]:
+            return round(value - origin, 6) if value is not None else None
+
+        tasks = []
+        trace_events = []
+        for task in self.tasks.values():
+            tasks.append({
+                "id": task.id,
+                "role": task.agent_role.value,
+                "type": task.task_type,
+                "description": task.description,
+                "status": task.status.value,
+                "dependencies": list(task.dependencies),
+                "start": offset(task.started_at),
+                "end": offset(task.finished_at),
+                "duration": round(task.duration, 6),
+                "retries": task.retry_count,
+                "error": task.error_message,
+            })
+            if task.started_at is not None and task.finished_at is not None:
+                trace_events.append({
+                    "name": task.id,
+                    "cat": task.agent_role.value,
+                    "ph": "X",
+                    "ts": int((task.started_at - origin) * 1_000_000),
+                    "dur": int(task.duration * 1_000_000),
+                    "pid": 1,
+                    "tid": task.agent_role.value,
+                    "args": {"status": task.status.value, "retries": task.retry_count},
+                })
+
+        critical = self.critical_path()
+        wall_time = (
+            self.finished_at - self.started_at
+            if self.started_at is not None and self.finished_at is not None else 0.0
+        )
+        return {
+            "tasks": tasks,
+            "critical_path": [task.id for task in critical],
+            "critical_path_duration": round(sum(task.duration for task in critical), 6),
+            "wall_time": round(wall_time, 6),
+            "traceEvents": trace_events,
+        }
+
+    def write_profile(self, path: Path) -> Path:
+        """Write the exported graph as JSON (loadable in chrome://tracing)."""
+        path = Path(path)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.export(), f, indent=2)
+        return path
+
+    def _log(self, level: str, message: str):
+        if self.logger:
+            getattr(self.logger, level)(message)
@@ -0,0 +1,108 @@
+"""
+Validation Result Cache for the Sentry Agent
+Identical HTML is validated again and again: fallback games, cached LLM
+responses, re-runs after a restart, batch checks of ``generated_games/``.
+Results are kept in an in-memory LRU and, optionally, as JSON files on disk,
+keyed by the SHA-256 of the HTML together with the Sentry rule set and the
+browser that ran the test, so changing either invalidates old entries.
+"""
+import copy
+import hashlib
+import json
+import logging
+import os
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+def validation_key(html: str, ruleset: str, browser: str) -> str:
+    """Cache key for validating ``html`` under ``ruleset`` with ``browser`` ("static" when no browser runs)."""
+    digest = hashlib.sha256()
+    for part in (ruleset, browser, html):
+        digest.update(part.encode("utf-8"))
+        digest.update(b"\0")
+    return digest.hexdigest()
+
+
+class ValidationCache:
+    """
+    Validation results by key: an LRU of ``max_entries`` in memory, backed
+    by ``cache_dir/<key[:2]>/<key>.json`` when a directory is given.
+
+    Entries are copied on the way in and out, so callers may modify the
+    results they get.
+    """
+
+    def __init__(self, max_entries: int = 256, cache_dir: Optional[Path] = None):
+        self.max_entries = max_entries
+        self.cache_dir = Path(cache_dir) if cache_dir else None
+        self._memory: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / key[:2] / f"{key}.json"
+
+    def _remember(self, key: str, results: Dict[str, Any]):
+        self._memory[key] = results
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_entries:
+            self._memory.popitem(last=False)
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """A copy of the stored results, or None."""
+        results = self._memory.get(key)
+        if results is not None:
+            self._memory.move_to_end(key)
+            self.hits += 1
+            return copy.deepcopy(results)
+        if self.cache_dir:
+            try:
+                results = json.loads(self._path(key).read_text(encoding="utf-8"))
+            except FileNotFoundError:
+                results = None
+            except (OSError, ValueError) as e:
+                logger.warning(f"Discarding unreadable validation cache entry {key[:12]}: {e}")
+                self._path(key).unlink(missing_ok=True)
+                results = None
+            if results is not None:
+                self._remember(key, results)
+                self.hits += 1
+                self.disk_hits += 1
+                return copy.deepcopy(results)
+        self.misses += 1
+        return None
+
+    def put(self, key: str, results: Dict[str, Any]):
+        """Store a copy of ``results``; disk write failures only cost the persistence."""
+        results = json.loads(json.dumps(results, default=str))
+        self._remember(key, results)
+        if not self.cache_dir:
+            return
+        path = self._path(key)
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            temp = path.with_suffix(f".{os.getpid()}.tmp")
+            temp.write_text(json.dumps(results), encoding="utf-8")
+            os.replace(temp, path)
+        except OSError as e:
+            logger.warning(f"Could not persist validation cache entry {key[:12]}: {e}")
+
+    def clear(self):
+        self._memory.clear()
+
+    def metrics(self) -> Dict[str, Any]:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._memory),
+            "max_entries": self.max_entries,
+            "persistent": self.cache_dir is not None,
+            "hits": self.hits,
+            "disk_hits": self.disk_hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else None
+        }
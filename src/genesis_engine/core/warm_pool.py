@@ -0,0 +1,256 @@
+"""
+Warm Pool for AI Genesis Engine
+Keeps pre-validated games for popular prompts and genres on disk so
+first-time visitors get a playable game instantly. A background loop
+refills the pool only while no user generation is running and the API
+rate limits have headroom to spare.
+"""
+import asyncio
+import json
+import logging
+import re
+import shutil
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from .rate_limits import get_rate_limit_tracker
+from .skeletons import classify_genre, get_skeleton
+
+logger = logging.getLogger(__name__)
+
+POOL_METADATA = "pool.json"
+
+# (prompt, output_dir, generation_mode) -> engine result with success, project_path and game_file
+GenerateFn = Callable[[str, Path, Optional[str]], Awaitable[Dict[str, Any]]]
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Lowercase a prompt and drop punctuation and repeated whitespace."""
+    return " ".join(re.sub(r"[^\w\s]", " ", prompt.lower()).split())
+
+
+@dataclass
+class PoolTarget:
+    """A prompt or genre the pool keeps games ready for."""
+    key: str
+    prompt: str
+    generation_mode: Optional[str] = None
+    genre: Optional[str] = None
+
+
+@dataclass
+class PoolEntry:
+    """A validated game waiting in the pool."""
+    target: str
+    path: Path
+    created_at: float
+    game_file: str
+
+    def age(self, now: Optional[float] = None) -> float:
+        return (now or time.time()) - self.created_at
+
+
+class WarmPool:
+    """
+    Pre-generated games per target, refilled in the background.
+
+    Prompt targets match requests with the same normalized prompt; genre
+    targets are built from the genre skeleton and match any request the
+    skeleton classifier assigns to that genre. Claiming a game moves its
+    directory into the output directory, so it is served like any other.
+    """
+
+    def __init__(self, pool_dir: Path, output_dir: Path, generate: GenerateFn,
+                 prompts: Optional[List[str]] = None, genres: Optional[List[str]] = None,
+                 size: int = 1, max_age: float = 86400, min_headroom: float = 0.5,
+                 is_busy: Optional[Callable[[], bool]] = None):
+        self.pool_dir = Path(pool_dir)
+        self.output_dir = Path(output_dir)
+        self.generate = generate
+        self.size = size
+        self.max_age = max_age
+        self.min_headroom = min_headroom
+        self.is_busy = is_busy or (lambda: False)
+
+        self.targets: Dict[str, PoolTarget] = {}
+        for prompt in prompts or []:
+            self.targets[normalize_prompt(prompt)] = PoolTarget(normalize_prompt(prompt), prompt)
+        for genre in genres or []:
+            skeleton = get_skeleton(genre)
+            if skeleton is None:
+                logger.warning(f"Unknown warm pool genre '{genre}' - skipping")
+                continue
+            key = f"genre:{genre}"
+            self.targets[key] = PoolTarget(key, skeleton.description, "skeleton", genre)
+
+        self.entries: Dict[str, List[PoolEntry]] = {key: [] for key in self.targets}
+        self.hits = 0
+        self.misses = 0
+        self.refills = 0
+        self.refill_failures = 0
+        self.stale_evictions = 0
+        self.last_skip: Optional[str] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def load(self):
+        """Pick up games a previous process left in the pool directory."""
+        if not self.pool_dir.is_dir():
+            return
+        for game_dir in sorted(self.pool_dir.iterdir()):
+            try:
+                metadata = json.loads((game_dir / POOL_METADATA).read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                continue
+            target = metadata.get("target")
+            if target in self.entries and (game_dir / "game.html").is_file():
+                self.entries[target].append(PoolEntry(
+                    target, game_dir, float(metadata.get("created_at", 0)), metadata.get("game_file", "")
+                ))
+        self.evict_stale()
+
+    def match(self, prompt: str) -> Optional[PoolTarget]:
+        """The target a request prompt is served from, if any."""
+        target = self.targets.get(normalize_prompt(prompt))
+        if target:
+            return target
+        if any(t.genre for t in self.targets.values()):
+            return self.targets.get(f"genre:{classify_genre(prompt)}")
+        return None
+
+    def claim(self, prompt: str) -> Optional[PoolEntry]:
+        """Take a ready game for this prompt out of the pool, counting hits and misses."""
+        self.evict_stale()
+        target = self.match(prompt)
+        entries = self.entries.get(target.key, []) if target else []
+        if not entries:
+            self.misses += 1
+            return None
+
+        entry = entries.pop(0)
+        destination = self.output_dir / entry.path.name
+        suffix = 1
+        while destination.exists():
+            suffix += 1
+            destination = self.output_dir / f"{entry.path.name}_{suffix}"
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        shutil.move(str(entry.path), str(destination))
+        (destination / POOL_METADATA).unlink(missing_ok=True)
+
+        game_file = entry.game_file
+        if not game_file.startswith(("http://", "https://")):
+            game_file = str(destination / "game.html")
+        self.hits += 1
+        logger.info(f"Warm pool hit for '{prompt}' - served {destination.name}")
+        return PoolEntry(entry.target, destination, entry.created_at, game_file)
+
+    def evict_stale(self):
+        """Delete games older than the maximum age so they get regenerated."""
+        now = time.time()
+        for key, entries in self.entries.items():
+            for entry in [e for e in entries if e.age(now) > self.max_age]:
+                entries.remove(entry)
+                shutil.rmtree(entry.path, ignore_errors=True)
+                self.stale_evictions += 1
+
+    def next_target(self) -> Optional[PoolTarget]:
+        """The emptiest target that is below the pool size."""
+        missing = [(len(self.entries[key]), key) for key in self.targets if len(self.entries[key]) < self.size]
+        return self.targets[min(missing)[1]] if missing else None
+
+    async def refill_once(self) -> bool:
+        """Generate one game for the emptiest target if capacity allows; True if one was added."""
+        self.evict_stale()
+        target = self.next_target()
+        if target is None:
+            self.last_skip = "full"
+            return False
+        if self.is_busy():
+            self.last_skip = "busy"
+            return False
+        headroom = get_rate_limit_tracker().headroom()
+        if headroom < self.min_headroom:
+            self.last_skip = f"rate limit headroom {headroom:.0%}"
+            return False
+
+        self.last_skip = None
+        self.pool_dir.mkdir(parents=True, exist_ok=True)
+        logger.info(f"Warm pool refill for '{target.prompt}'")
+        try:
+            result = await self.generate(target.prompt, self.pool_dir, target.generation_mode)
+        except Exception as e:
+            result = {"success": False, "error": str(e)}
+
+        project_path = Path(result["project_path"]) if result.get("project_path") else None
+        if not result.get("success") or project_path is None or not (project_path / "game.html").is_file():
+            self.refill_failures += 1
+            logger.warning(f"Warm pool refill for '{target.prompt}' failed: {result.get('error', 'no game')}")
+            if project_path is not None:
+                shutil.rmtree(project_path, ignore_errors=True)
+            return False
+
+        entry = PoolEntry(target.key, project_path, time.time(), result.get("game_file") or "")
+        (project_path / POOL_METADATA).write_text(json.dumps({
+            "target": entry.target,
+            "prompt": target.prompt,
+            "created_at": entry.created_at,
+            "game_file": entry.game_file
+        }), encoding="utf-8")
+        self.entries[target.key].append(entry)
+        self.refills += 1
+        return True
+
+    async def run(self, interval: float):
+        """Refill back to back while there is work and capacity, otherwise poll every ``interval`` seconds."""
+        while True:
+            try:
+                added = await self.refill_once()
+            except Exception as e:
+                logger.error(f"Warm pool refill crashed: {str(e)}")
+                added = False
+            if not added:
+                await asyncio.sleep(interval)
+
+    def start(self, interval: float):
+        """Load existing games and start the background refill loop."""
+        self.load()
+        if self._task is None:
+            self._task = asyncio.create_task(self.run(interval))
+
+    async def stop(self):
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    def metrics(self) -> Dict[str, Any]:
+        """Pool size, staleness and hit rate."""
+        now = time.time()
+        lookups = self.hits + self.misses
+        ages = [entry.age(now) for entries in self.entries.values() for entry in entries]
+        return {
+            "size": len(ages),
+            "capacity": self.size * len(self.targets),
+            "targets": {
+                key: {
+                    "prompt": target.prompt,
+                    "games": len(self.entries[key]),
+                    "oldest_age_seconds": round(max((e.age(now) for e in self.entries[key]), default=0), 1)
+                }
+                for key, target in self.targets.items()
+            },
+            "oldest_age_seconds": round(max(ages, default=0), 1),
+            "max_age_seconds": self.max_age,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 3) if lookups else None,
+            "refills": self.refills,
+            "refill_failures": self.refill_failures,
+            "stale_evictions": self.stale_evictions,
+            "rate_limit_headroom": round(get_rate_limit_tracker().headroom(), 3),
+            "last_skip": self.last_skip
+        }
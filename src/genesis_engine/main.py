@@ -30,13 +30,16 @@ class GenesisEngine:
         self.file_manager = FileManager()
         self.multi_agent_orchestrator = MultiAgentOrchestrator(self.logger)
         
-    async def run_async(self, prompt: str, output_dir: Optional[str] = None) -> bool:
+    async def run_async(self, prompt: str, output_dir: Optional[str] = None,
+                        generation_mode: Optional[str] = None, variants: int = 1) -> bool:
         """
         Execute the complete Genesis Engine v2.3 workflow with multi-agent system.
         
         Args:
             prompt: The game concept description
             output_dir: Optional custom output directory
+            generation_mode: Optional override of the configured generation mode
+            variants: Number of Engineer takes sharing one Architect pass
             
         Returns:
             bool: True if successful, False otherwise
@@ -62,7 +65,9 @@ class GenesisEngine:
             session = await self.multi_agent_orchestrator.start_generation_session(
                 prompt=prompt,
                 project_path=project_path,
-                session_id=session_id
+                session_id=session_id,
+                generation_mode=generation_mode,
+                variants=variants
             )
             
             # Process the session through all agents
@@ -76,6 +81,9 @@ class GenesisEngine:
                 # Print session summary
                 status = self.multi_agent_orchestrator.get_session_status(session_id)
                 self.logger.info(f"Debug cycles: {status['debug_cycles']}")
+                for variant in status["variants"]:
+                    outcome = variant["final_html_file"] if variant["passed"] else "failed Sentry"
+                    self.logger.info(f"Variant {variant['variant']}: {outcome}")
                 self.logger.info(f"Multi-agent autonomous system demonstrated!")
                 
                 return True
@@ -89,13 +97,15 @@ class GenesisEngine:
             self.logger.error(f"Full traceback: {traceback.format_exc()}")
             return False
     
-    def run(self, prompt: str, output_dir: Optional[str] = None) -> bool:
+    def run(self, prompt: str, output_dir: Optional[str] = None, generation_mode: Optional[str] = None,
+            variants: int = 1) -> bool:
         """
         Synchronous wrapper for the async run method.
         """
-        return asyncio.run(self.run_async(prompt, output_dir))
+        return asyncio.run(self.run_async(prompt, output_dir, generation_mode, variants))
     
-    async def run_with_websocket(self, prompt: str, output_dir: Optional[str] = None, websocket_logger=None) -> dict:
+    async def run_with_websocket(self, prompt: str, output_dir: Optional[str] = None, websocket_logger=None,
+                                 generation_mode: Optional[str] = None, variants: int = 1) -> dict:
         """
         Execute the Genesis Engine with WebSocket logging for real-time updates.
         
@@ -134,7 +144,9 @@ class GenesisEngine:
             session = await self.multi_agent_orchestrator.start_generation_session(
                 prompt=prompt,
                 project_path=project_path,
-                session_id=session_id
+                session_id=session_id,
+                generation_mode=generation_mode,
+                variants=variants
             )
             
             self.logger.set_progress(0.3)
@@ -166,6 +178,7 @@ class GenesisEngine:
                     "game_file": game_file,
                     "cloud_url": game_file if is_cloud_url else None,
                     "debug_cycles": final_status.get("debug_cycles", 0),
+                    "variants": final_status.get("variants", []),
                     "multi_agent_demo": True,
                     "output_format": "javascript_html5"
                 }
@@ -175,7 +188,8 @@ class GenesisEngine:
                     "success": False,
                     "error": "Multi-agent generation failed",
                     "session_id": session_id,
-                    "debug_cycles": final_status.get("debug_cycles", 0)
+                    "debug_cycles": final_status.get("debug_cycles", 0),
+                    "variants": final_status.get("variants", [])
                 }
                 
         except Exception as e:
@@ -246,6 +260,19 @@ Cloud Storage: Games are uploaded to persistent cloud storage
         help="Output directory for generated games (default: ./generated_games)"
     )
     
+    parser.add_argument(
+        "--mode", "-m",
+        choices=["standard", "incremental", "skeleton", "modular"],
+        help="Generation mode (default: GENERATION_MODE setting)"
+    )
+    
+    parser.add_argument(
+        "--variants", "-n",
+        type=int,
+        default=1,
+        help="Number of game variants built from one design (standard mode, default: 1)"
+    )
+    
     parser.add_argument(
         "--verbose", "-v",
         action="store_true",
@@ -260,7 +287,7 @@ Cloud Storage: Games are uploaded to persistent cloud storage
     
     # Initialize and run the Genesis Engine v2.3
     engine = GenesisEngine()
-    success = engine.run(args.prompt, args.output)
+    success = engine.run(args.prompt, args.output, args.mode, args.variants)
     
     sys.exit(0 if success else 1)
 
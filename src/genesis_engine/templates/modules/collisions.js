@@ -0,0 +1,28 @@
+// Fallback collisions: projectiles destroy enemies, enemies cost a life
+function _collisions_touching(a, b) {
+    let reach = (a.size + b.size) / 2;
+    let dx = a.x - b.x;
+    let dy = a.y - b.y;
+    return dx * dx + dy * dy < reach * reach;
+}
+
+function checkCollisions() {
+    for (let i = world.enemies.length - 1; i >= 0; i--) {
+        let enemy = world.enemies[i];
+        let destroyed = false;
+        for (let j = world.projectiles.length - 1; j >= 0; j--) {
+            if (_collisions_touching(enemy, world.projectiles[j])) {
+                world.projectiles.splice(j, 1);
+                destroyed = true;
+                break;
+            }
+        }
+        if (destroyed) {
+            world.enemies.splice(i, 1);
+            world.score += 10;
+        } else if (world.player && _collisions_touching(enemy, world.player)) {
+            world.enemies.splice(i, 1);
+            world.lives--;
+        }
+    }
+}
@@ -0,0 +1,25 @@
+// Fallback enemies: circles that fall from the top, faster each level
+function updateEnemies() {
+    if (frameCount % max(15, 60 - world.level * 5) === 0) {
+        world.enemies.push({
+            x: random(20, world.width - 20),
+            y: -20,
+            size: random(20, 36),
+            speed: random(1.5, 3) + world.level * 0.3
+        });
+    }
+    for (let i = world.enemies.length - 1; i >= 0; i--) {
+        world.enemies[i].y += world.enemies[i].speed;
+        if (world.enemies[i].y > world.height + 40) {
+            world.enemies.splice(i, 1);
+        }
+    }
+}
+
+function drawEnemies() {
+    noStroke();
+    fill('#ef5350');
+    for (let enemy of world.enemies) {
+        ellipse(enemy.x, enemy.y, enemy.size);
+    }
+}
@@ -0,0 +1,53 @@
+// Fallback player: ship moved with arrows/WASD, space fires upward
+function createPlayer() {
+    return { x: world.width / 2, y: world.height - 60, size: 28, speed: 5, cooldown: 0 };
+}
+
+function updatePlayer() {
+    let player = world.player;
+    if (keyIsDown(LEFT_ARROW) || keyIsDown(65)) {
+        player.x -= player.speed;
+    }
+    if (keyIsDown(RIGHT_ARROW) || keyIsDown(68)) {
+        player.x += player.speed;
+    }
+    if (keyIsDown(UP_ARROW) || keyIsDown(87)) {
+        player.y -= player.speed;
+    }
+    if (keyIsDown(DOWN_ARROW) || keyIsDown(83)) {
+        player.y += player.speed;
+    }
+    player.x = constrain(player.x, player.size / 2, world.width - player.size / 2);
+    player.y = constrain(player.y, player.size / 2, world.height - player.size / 2);
+
+    if (player.cooldown > 0) {
+        player.cooldown--;
+    }
+    for (let i = world.projectiles.length - 1; i >= 0; i--) {
+        world.projectiles[i].y -= world.projectiles[i].speed;
+        if (world.projectiles[i].y < 0) {
+            world.projectiles.splice(i, 1);
+        }
+    }
+}
+
+function drawPlayer() {
+    let player = world.player;
+    noStroke();
+    fill('#4fc3f7');
+    triangle(player.x, player.y - player.size / 2,
+             player.x - player.size / 2, player.y + player.size / 2,
+             player.x + player.size / 2, player.y + player.size / 2);
+    fill('#ffeb3b');
+    for (let projectile of world.projectiles) {
+        ellipse(projectile.x, projectile.y, projectile.size);
+    }
+}
+
+function playerKeyPressed(pressedKey, pressedKeyCode) {
+    let player = world.player;
+    if (pressedKey === ' ' && player.cooldown === 0) {
+        world.projectiles.push({ x: player.x, y: player.y - player.size / 2, size: 6, speed: 8 });
+        player.cooldown = 8;
+    }
+}
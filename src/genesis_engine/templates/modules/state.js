@@ -0,0 +1,32 @@
+// Fallback game-state machine: start -> playing -> gameover / won
+function resetGame() {
+    world.state = 'start';
+    world.score = 0;
+    world.lives = 3;
+    world.level = 1;
+    world.enemies = [];
+    world.projectiles = [];
+    world.effects = [];
+    world.player = createPlayer();
+}
+
+function updateGameState() {
+    if (world.state !== 'playing') {
+        return;
+    }
+    if (world.lives <= 0) {
+        world.state = 'gameover';
+    } else if (world.score >= 500) {
+        world.state = 'won';
+    }
+    world.level = 1 + floor(world.score / 100);
+}
+
+function stateKeyPressed(pressedKey, pressedKeyCode) {
+    if (world.state === 'start' && (pressedKey === ' ' || pressedKeyCode === ENTER)) {
+        world.state = 'playing';
+    } else if ((world.state === 'gameover' || world.state === 'won') && (pressedKey === 'r' || pressedKey === 'R')) {
+        resetGame();
+        world.state = 'playing';
+    }
+}
@@ -0,0 +1,35 @@
+// Fallback HUD and full-screen messages for each game state
+function drawHud() {
+    noStroke();
+    fill(255);
+    textAlign(LEFT, TOP);
+    textSize(18);
+    text('Score: ' + world.score, 12, 12);
+    text('Lives: ' + world.lives, 12, 36);
+    text('Level: ' + world.level, 12, 60);
+}
+
+function drawScreens() {
+    let title = '';
+    let hint = '';
+    if (world.state === 'start') {
+        title = world.title;
+        hint = 'Press SPACE to start';
+    } else if (world.state === 'gameover') {
+        title = 'GAME OVER';
+        hint = 'Press R to restart';
+    } else if (world.state === 'won') {
+        title = 'YOU WIN!';
+        hint = 'Press R to play again';
+    } else {
+        return;
+    }
+    fill(0, 0, 0, 160);
+    rect(0, 0, world.width, world.height);
+    fill(255);
+    textAlign(CENTER, CENTER);
+    textSize(40);
+    text(title, world.width / 2, world.height / 2 - 30);
+    textSize(20);
+    text(hint, world.width / 2, world.height / 2 + 20);
+}
@@ -0,0 +1,229 @@
+"""
+Game Index Utility for AI Genesis Engine
+Local similarity index over previously validated games, used to give the
+Engineer a passing game.html as a reference for similar prompts.
+"""
+import hashlib
+import re
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+
+_NUM_PERM = 64
+_MERSENNE_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+# Words that say nothing about which game a prompt describes
+_STOP_WORDS = {
+    "a", "an", "the", "and", "or", "with", "where", "you", "your", "of", "to", "in",
+    "on", "for", "that", "this", "is", "are", "be", "it", "as", "at", "by", "from",
+    "create", "make", "build", "simple", "game", "games", "using", "p5", "js", "p5js",
+    "mock", "player", "players"
+}
+
+
+def _permutations(num_perm: int):
+    """Deterministic (a, b) coefficients for the MinHash permutations."""
+    coefficients = []
+    for i in range(num_perm):
+        digest = hashlib.sha256(f"genesis-minhash-{i}".encode()).digest()
+        a = int.from_bytes(digest[:8], "big") % (_MERSENNE_PRIME - 1) + 1
+        b = int.from_bytes(digest[8:16], "big") % _MERSENNE_PRIME
+        coefficients.append((a, b))
+    return coefficients
+
+
+_PERMUTATIONS = _permutations(_NUM_PERM)
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase content words of a text."""
+    words = re.findall(r"[a-z0-9]+", (text or "").lower())
+    return [w for w in words if w not in _STOP_WORDS and len(w) > 1]
+
+
+def shingles(text: str) -> Set[str]:
+    """Unigram and bigram shingles of the content words."""
+    words = tokenize(text)
+    result = set(words)
+    result.update(f"{a} {b}" for a, b in zip(words, words[1:]))
+    return result
+
+
+def minhash(features: Iterable[str]) -> List[int]:
+    """MinHash signature of a shingle set."""
+    hashes = [
+        int.from_bytes(hashlib.blake2b(f.encode("utf-8"), digest_size=4).digest(), "big")
+        for f in features
+    ]
+    if not hashes:
+        return [_MAX_HASH] * _NUM_PERM
+    return [
+        min(((a * h + b) % _MERSENNE_PRIME) & _MAX_HASH for h in hashes)
+        for a, b in _PERMUTATIONS
+    ]
+
+
+def signature_similarity(sig_a: List[int], sig_b: List[int]) -> float:
+    """Estimated Jaccard similarity of two MinHash signatures."""
+    if not sig_a or not sig_b:
+        return 0.0
+    if all(v == _MAX_HASH for v in sig_a) or all(v == _MAX_HASH for v in sig_b):
+        return 0.0
+    return sum(1 for a, b in zip(sig_a, sig_b) if a == b) / len(sig_a)
+
+
+@dataclass
+class IndexedGame:
+    """A validated game and its similarity signatures."""
+    name: str
+    path: Path
+    prompt: str
+    prompt_signature: List[int]
+    document_signature: List[int]
+    mtime: float
+
+    @property
+    def game_file(self) -> Path:
+        return self.path / "game.html"
+
+
+@dataclass
+class GameMatch:
+    """A retrieval hit with its similarity score."""
+    game: IndexedGame
+    score: float
+
+    def read_html(self) -> str:
+        return self.game.game_file.read_text(encoding="utf-8")
+
+
+class GameIndex:
+    """
+    Similarity index over past successful sessions.
+
+    A game directory counts as validated when it holds a ``game.html``, which
+    the orchestrator only writes after Sentry passed. Prompts come from the
+    README, and the GDD adds genre vocabulary. Sessions search from worker
+    threads while new games are added, so ``games`` is only touched under a
+    lock and scanned through snapshots.
+    """
+
+    def __init__(self, roots: Optional[List[Path]] = None):
+        if roots is None:
+            from ..config import settings
+            roots = [settings.output_dir]
+        self.roots = [Path(root) for root in roots]
+        self.games: Dict[str, IndexedGame] = {}
+        self._lock = threading.Lock()
+
+    def refresh(self):
+        """Index new or changed game directories and drop removed ones."""
+        with self._lock:
+            known = dict(self.games)
+        seen, updates = set(), {}
+        for root in self.roots:
+            if not root.is_dir():
+                continue
+            for game_dir in root.iterdir():
+                if not (game_dir / "game.html").is_file():
+                    continue
+                key = str(game_dir.resolve())
+                seen.add(key)
+                try:
+                    mtime = (game_dir / "game.html").stat().st_mtime
+                except OSError:
+                    continue
+                cached = known.get(key)
+                if cached is None or cached.mtime != mtime:
+                    game = self._index_game(game_dir, mtime)
+                    if game:
+                        updates[key] = game
+
+        with self._lock:
+            self.games.update(updates)
+            # Only drop games this scan knew about; add() may have run meanwhile
+            for key in known:
+                if key not in seen:
+                    self.games.pop(key, None)
+
+    def add(self, game_dir: Path):
+        """Index a freshly validated game without rescanning."""
+        try:
+            mtime = (Path(game_dir) / "game.html").stat().st_mtime
+        except OSError:
+            return
+        game = self._index_game(Path(game_dir), mtime)
+        if game:
+            with self._lock:
+                self.games[str(Path(game_dir).resolve())] = game
+
+    def _index_game(self, game_dir: Path, mtime: float) -> Optional[IndexedGame]:
+        prompt = self._read_prompt(game_dir)
+        try:
+            design_document = (game_dir / "GDD.md").read_text(encoding="utf-8")
+        except OSError:
+            design_document = ""
+
+        if not prompt and not design_document:
+            return None
+
+        return IndexedGame(
+            name=game_dir.name,
+            path=game_dir,
+            prompt=prompt,
+            prompt_signature=minhash(shingles(prompt)),
+            document_signature=minhash(shingles(prompt + "\n" + design_document)),
+            mtime=mtime
+        )
+
+    @staticmethod
+    def _read_prompt(game_dir: Path) -> str:
+        try:
+            readme = (game_dir / "README.md").read_text(encoding="utf-8")
+        except OSError:
+            return ""
+        for line in readme.splitlines():
+            if "**Prompt**:" in line:
+                return line.split("**Prompt**:", 1)[1].strip()
+        return ""
+
+    def search(self, prompt: str, design_document: str = "", limit: int = 3) -> List[GameMatch]:
+        """Rank indexed games by similarity to a prompt and its GDD."""
+        self.refresh()
+        prompt_sig = minhash(shingles(prompt))
+        document_sig = minhash(shingles(prompt + "\n" + (design_document or "")))
+
+        with self._lock:
+            games = list(self.games.values())
+        matches = []
+        for game in games:
+            score = (
+                0.6 * signature_similarity(prompt_sig, game.prompt_signature) +
+                0.4 * signature_similarity(document_sig, game.document_signature)
+            )
+            if score > 0:
+                matches.append(GameMatch(game, score))
+
+        matches.sort(key=lambda match: match.score, reverse=True)
+        return matches[:limit]
+
+    def best_match(self, prompt: str, design_document: str = "",
+                   min_score: float = 0.0) -> Optional[GameMatch]:
+        """Closest validated game, if it clears ``min_score``."""
+        matches = self.search(prompt, design_document, limit=1)
+        if matches and matches[0].score >= min_score:
+            return matches[0]
+        return None
+
+
+# Singleton instance
+_game_index_instance = None
+
+def get_game_index() -> GameIndex:
+    """Get the singleton game index instance."""
+    global _game_index_instance
+    if _game_index_instance is None:
+        _game_index_instance = GameIndex()
+    return _game_index_instance
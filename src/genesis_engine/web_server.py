@@ -15,6 +15,7 @@ from typing import Dict, List, Optional
 from collections import defaultdict
 import time
 import sys
+from contextlib import asynccontextmanager
 
 from fastapi import FastAPI, HTTPException, WebSocket, WebSocketDisconnect, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
@@ -23,7 +24,12 @@ from pydantic import BaseModel, validator
 from fastapi.staticfiles import StaticFiles
 
 from .main import GenesisEngine
+from .config import settings
 from .core.logger import EngineLogger
+from .core.warm_pool import PoolEntry, WarmPool
+from .core.llm_providers import provider_metrics
+from .core.retry_policy import get_retry_policy
+from .core.sentry_agent import get_sentry_agent, get_sentry_metrics, shutdown_sentry_agent
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -32,11 +38,59 @@ logger = logging.getLogger(__name__)
 # Add src to path
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+# User generations currently running; the warm pool only refills while this is zero
+foreground_generations = 0
+
+async def run_generation(engine: GenesisEngine, **kwargs) -> dict:
+    """Run a user-requested generation, keeping warm pool refills out of its way."""
+    global foreground_generations
+    foreground_generations += 1
+    try:
+        return await engine.run_with_websocket(**kwargs)
+    finally:
+        foreground_generations -= 1
+
+async def _generate_for_pool(prompt: str, output_dir: Path, generation_mode: Optional[str]) -> dict:
+    """Warm pool refill: a regular generation into the pool directory."""
+    return await GenesisEngine().run_with_websocket(
+        prompt=prompt,
+        output_dir=str(output_dir),
+        generation_mode=generation_mode
+    )
+
+warm_pool = WarmPool(
+    pool_dir=settings.warm_pool_dir,
+    output_dir=settings.output_dir,
+    generate=_generate_for_pool,
+    prompts=settings.warm_pool_prompts,
+    genres=settings.warm_pool_genres,
+    size=settings.warm_pool_size,
+    max_age=settings.warm_pool_max_age,
+    min_headroom=settings.warm_pool_min_headroom,
+    is_busy=lambda: foreground_generations > 0
+)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """Start background services with the server and stop them on shutdown."""
+    if settings.sentry_warm_up:
+        # Launch and warm the test browser before the first request, and keep it healthy from here on
+        sentry = await get_sentry_agent()
+        await sentry.warm_up()
+        sentry.start_maintenance(settings.sentry_probe_interval)
+    if settings.enable_warm_pool:
+        warm_pool.start(settings.warm_pool_interval)
+        logger.info(f"Warm pool started for {len(warm_pool.targets)} prompts/genres")
+    yield
+    await warm_pool.stop()
+    await shutdown_sentry_agent()
+
 # FastAPI app initialization
 app = FastAPI(
     title="AI Genesis Engine v2.3 API",
     description="Transform single-sentence prompts into complete, playable JavaScript/HTML5 games using autonomous multi-agent AI",
-    version="2.3.0"
+    version="2.3.0",
+    lifespan=lifespan
 )
 
 # Configure CORS with WebSocket support
@@ -120,9 +174,15 @@ async def add_security_headers(request: Request, call_next):
     return response
 
 # Request/Response models with validation
+GENERATION_MODES = ("standard", "incremental", "skeleton", "modular")
+
 class GameGenerationRequest(BaseModel):
     prompt: str
     output_dir: Optional[str] = None
+    generation_mode: Optional[str] = None
+    variants: int = 1
+    use_warm_pool: bool = True  # serve a ready game for popular prompts
+    personalize: bool = False  # with a warm pool hit, also start a fresh generation
     
     @validator('prompt')
     def validate_prompt(cls, v):
@@ -149,6 +209,18 @@ class GameGenerationRequest(BaseModel):
                 raise ValueError('Invalid characters in prompt')
         
         return v
+    
+    @validator('generation_mode')
+    def validate_generation_mode(cls, v):
+        if v is not None and v not in GENERATION_MODES:
+            raise ValueError(f"generation_mode must be one of: {', '.join(GENERATION_MODES)}")
+        return v
+    
+    @validator('variants')
+    def validate_variants(cls, v):
+        if not 1 <= v <= settings.max_variants:
+            raise ValueError(f"variants must be between 1 and {settings.max_variants}")
+        return v
 
 class GameGenerationResponse(BaseModel):
     success: bool
@@ -158,13 +230,47 @@ class GameGenerationResponse(BaseModel):
     game_file: Optional[str] = None
     cloud_url: Optional[str] = None
     debug_cycles: Optional[int] = None
+    variants: Optional[List[Dict]] = None
     multi_agent_demo: Optional[bool] = None
     output_format: Optional[str] = None
+    from_warm_pool: Optional[bool] = None
+    personalization_id: Optional[str] = None
     error: Optional[str] = None
 
 # Global storage for WebSocket connections and active generations
 active_connections: Dict[str, WebSocket] = {}
 active_generations: Dict[str, Dict] = {}
+background_generations: Dict[str, asyncio.Task] = {}
+
+def claim_warm_game(prompt: str) -> Optional[dict]:
+    """Result of serving a prompt from the warm pool, or None on a miss."""
+    if not settings.enable_warm_pool:
+        return None
+    entry: Optional[PoolEntry] = warm_pool.claim(prompt)
+    if entry is None:
+        return None
+    is_cloud_url = entry.game_file.startswith(("http://", "https://"))
+    return {
+        "success": True,
+        "project_path": str(entry.path),
+        "project_name": entry.path.name,
+        "game_file": entry.game_file,
+        "cloud_url": entry.game_file if is_cloud_url else None,
+        "debug_cycles": 0,
+        "from_warm_pool": True,
+        "multi_agent_demo": True,
+        "output_format": "javascript_html5"
+    }
+
+async def _run_personalized_generation(personalization_id: str, **kwargs):
+    """Background generation started alongside a warm pool hit; polled via the session status endpoint."""
+    try:
+        active_generations[personalization_id] = await run_generation(GenesisEngine(), **kwargs)
+    except Exception as e:
+        logger.error(f"Personalized generation {personalization_id} failed: {str(e)}")
+        active_generations[personalization_id] = {"success": False, "error": str(e)}
+    finally:
+        background_generations.pop(personalization_id, None)
 
 class WebSocketLogger:
     """Logger that sends real-time updates via WebSocket."""
@@ -227,14 +333,24 @@ async def generate_game(request: GameGenerationRequest):
         if not request.prompt or len(request.prompt.strip()) < 10:
             raise HTTPException(status_code=400, detail="Prompt too short")
         
-        # Initialize Genesis Engine
-        engine = GenesisEngine()
+        generation_kwargs = {
+            "prompt": request.prompt,
+            "output_dir": request.output_dir,
+            "generation_mode": request.generation_mode,
+            "variants": request.variants
+        }
         
-        # Run generation (this will be synchronous for this endpoint)
-        result = await engine.run_with_websocket(
-            prompt=request.prompt,
-            output_dir=request.output_dir
-        )
+        result = claim_warm_game(request.prompt) if request.use_warm_pool else None
+        if result is not None:
+            if request.personalize:
+                personalization_id = str(uuid.uuid4())[:8]
+                background_generations[personalization_id] = asyncio.create_task(
+                    _run_personalized_generation(personalization_id, **generation_kwargs)
+                )
+                result["personalization_id"] = personalization_id
+        else:
+            # Run generation (this will be synchronous for this endpoint)
+            result = await run_generation(GenesisEngine(), **generation_kwargs)
         
         return GameGenerationResponse(
             success=result.get("success", False),
@@ -244,8 +360,11 @@ async def generate_game(request: GameGenerationRequest):
             game_file=result.get("game_file"),
             cloud_url=result.get("cloud_url"),
             debug_cycles=result.get("debug_cycles", 0),
+            variants=result.get("variants"),
             multi_agent_demo=result.get("multi_agent_demo", True),
             output_format=result.get("output_format", "javascript_html5"),
+            from_warm_pool=result.get("from_warm_pool", False),
+            personalization_id=result.get("personalization_id"),
             error=result.get("error")
         )
         
@@ -253,6 +372,24 @@ async def generate_game(request: GameGenerationRequest):
         logger.error(f"Generation failed: {str(e)}")
         raise HTTPException(status_code=500, detail=str(e))
 
+def _result_message(result: dict) -> dict:
+    """WebSocket message carrying a generation result."""
+    return {
+        "type": "result",
+        "success": result.get("success", False),
+        "project_name": result.get("project_name"),
+        "project_path": result.get("project_path"),
+        "session_id": result.get("session_id"),
+        "game_file": result.get("game_file"),
+        "cloud_url": result.get("cloud_url"),
+        "debug_cycles": result.get("debug_cycles", 0),
+        "variants": result.get("variants", []),
+        "from_warm_pool": result.get("from_warm_pool", False),
+        "multi_agent_demo": result.get("multi_agent_demo", True),
+        "output_format": result.get("output_format", "javascript_html5"),
+        "error": result.get("error")
+    }
+
 @app.websocket("/ws/generate")
 async def websocket_generate(websocket: WebSocket):
     """
@@ -289,9 +426,34 @@ async def websocket_generate(websocket: WebSocket):
             }))
             return
         
+        generation_mode = request_data.get("generation_mode")
+        if generation_mode is not None and generation_mode not in GENERATION_MODES:
+            await websocket.send_text(json.dumps({
+                "type": "error",
+                "message": f"generation_mode must be one of: {', '.join(GENERATION_MODES)}"
+            }))
+            return
+        
+        variants = request_data.get("variants", 1)
+        if not isinstance(variants, int) or not 1 <= variants <= settings.max_variants:
+            await websocket.send_text(json.dumps({
+                "type": "error",
+                "message": f"variants must be between 1 and {settings.max_variants}"
+            }))
+            return
+        
         # Create WebSocket logger
         ws_logger = WebSocketLogger(websocket, connection_id)
         
+        # Popular prompts are answered from the warm pool right away
+        warm_result = claim_warm_game(prompt) if request_data.get("use_warm_pool", True) else None
+        if warm_result is not None:
+            await websocket.send_text(json.dumps(_result_message(warm_result)))
+            if not request_data.get("personalize", False):
+                active_generations[connection_id] = warm_result
+                return
+            await ws_logger.send_update("info", "⚡ Served a ready-made game - now generating your personalized version")
+        
         # Send initial update
         await ws_logger.send_update("info", f"🚀 Starting multi-agent generation for: '{prompt}'")
         await ws_logger.send_update("info", "🤖 Initializing Architect, Engineer, Sentry, and Debugger agents...")
@@ -303,26 +465,17 @@ async def websocket_generate(websocket: WebSocket):
         engine.logger.add_websocket_logger = lambda logger_obj: setattr(logger_obj, 'ws_logger', ws_logger)
         
         # Run generation with WebSocket logging
-        result = await engine.run_with_websocket(
+        result = await run_generation(
+            engine,
             prompt=prompt,
             output_dir=request_data.get("output_dir"),
-            websocket_logger=ws_logger
+            websocket_logger=ws_logger,
+            generation_mode=generation_mode,
+            variants=variants
         )
         
         # Send final result
-        await websocket.send_text(json.dumps({
-            "type": "result",
-            "success": result.get("success", False),
-            "project_name": result.get("project_name"),
-            "project_path": result.get("project_path"),
-            "session_id": result.get("session_id"),
-            "game_file": result.get("game_file"),
-            "cloud_url": result.get("cloud_url"),
-            "debug_cycles": result.get("debug_cycles", 0),
-            "multi_agent_demo": result.get("multi_agent_demo", True),
-            "output_format": result.get("output_format", "javascript_html5"),
-            "error": result.get("error")
-        }))
+        await websocket.send_text(json.dumps(_result_message(result)))
         
         # Store generation info
         active_generations[connection_id] = result
@@ -486,6 +639,12 @@ async def get_generation_status(session_id: str):
                 "result": result
             }
         
+        if session_id in background_generations:
+            return {
+                "status": "processing",
+                "message": "Personalized game generation in progress..."
+            }
+        
         # Check if it's still processing
         for conn_id, conn in active_connections.items():
             # This is a simplified check - in production you'd track session-to-connection mapping
@@ -515,9 +674,19 @@ async def get_server_status():
         "multi_agent_system": True,
         "output_format": "javascript_html5",
         "autonomous_debugging": True,
-        "cloud_storage_enabled": True
+        "cloud_storage_enabled": True,
+        "warm_pool_enabled": settings.enable_warm_pool,
+        "warm_pool_size": warm_pool.metrics()["size"],
+        "llm_providers": provider_metrics(),
+        "retry_budget": get_retry_policy().budget.snapshot(),
+        "sentry": get_sentry_metrics()
     }
 
+@app.get("/api/warm-pool")
+async def get_warm_pool_metrics():
+    """Warm pool metrics: size, staleness, hit rate and refill activity."""
+    return {"enabled": settings.enable_warm_pool, **warm_pool.metrics()}
+
 @app.delete("/api/games/{game_name}/files/{file_name}")
 async def delete_game_file(game_name: str, file_name: str):
     """Delete a specific game file."""
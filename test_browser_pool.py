@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Test script for the Sentry browser context pool.
+Uses the in-memory Playwright stand-ins from playwright_fakes.py to verify
+slot limits, per-test context isolation, queue metrics, health-check
+relaunches of dead or hung browsers, and recycling a browser under running
+tests.
+"""
+import asyncio
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from genesis_engine.core import browser_pool
+from genesis_engine.core.browser_pool import BrowserContextPool
+from playwright_fakes import launcher
+
+def test_slots_limit_concurrency():
+    """No more tests run at once than there are slots; the rest queue."""
+    print("🧪 Testing slot limits")
+
+    async def run():
+        pool = BrowserContextPool(launcher([]), slots=2)
+        await pool.start()
+        running, peak = [0], [0]
+
+        async def one_test():
+            async with pool.context():
+                running[0] += 1
+                peak[0] = max(peak[0], running[0])
+                await asyncio.sleep(0.02)
+                running[0] -= 1
+
+        await asyncio.gather(*(one_test() for _ in range(6)))
+        await asyncio.sleep(0)
+        metrics = pool.metrics()
+        await pool.close()
+        return peak[0], metrics
+
+    peak, metrics = asyncio.run(run())
+    assert peak == 2
+    assert metrics["tests"] == 6 and metrics["max_waiting"] == 4
+    assert metrics["wait_ms_p95"] >= metrics["wait_ms_avg"] > 0
+    print(f"✅ Peak concurrency {peak}, p95 wait {metrics['wait_ms_p95']}ms")
+
+def test_fresh_precreated_context_per_test():
+    """Each test gets its own context, created ahead of time and closed afterwards."""
+    print("🧪 Testing context isolation")
+
+    async def run():
+        browsers = []
+        pool = BrowserContextPool(launcher(browsers), slots=1)
+        await pool.start()
+        assert pool.contexts_created == 1
+        used = []
+        for _ in range(3):
+            async with pool.context() as context:
+                assert not context.closed
+                used.append(context)
+            await asyncio.sleep(0)
+        await pool.close()
+        return browsers[0], used
+
+    browser, used = asyncio.run(run())
+    assert len({id(context) for context in used}) == 3
+    assert all(context.closed for context in used)
+    # The next test's context already existed when the previous one finished
+    assert [c.number for c in used] == [0, 1, 2]
+    print("✅ One fresh context per test")
+
+def test_health_check_relaunches_dead_browser():
+    """A browser that stops responding is relaunched and tests continue."""
+    print("🧪 Testing health checks")
+
+    async def run():
+        browsers = []
+        pool = BrowserContextPool(launcher(browsers), slots=2)
+        await pool.start()
+        assert await pool.check_health() and pool.restarts == 0
+
+        browsers[0].connected = False
+        assert await pool.check_health()
+        assert pool.restarts == 1 and len(browsers) == 2
+
+        async with pool.context() as context:
+            assert context.browser is browsers[1]
+        metrics = pool.metrics()
+        await pool.close()
+        return metrics
+
+    metrics = asyncio.run(run())
+    assert metrics["healthy"] and metrics["restarts"] == 1 and metrics["last_health_check"]
+    print("✅ Dead browser relaunched")
+
+def test_hung_browser_relaunched():
+    """A browser that is connected but never answers fails the probe within the timeout."""
+    print("🧪 Testing hung browsers")
+
+    async def run():
+        browsers = []
+        pool = BrowserContextPool(launcher(browsers), slots=1)
+        await pool.start()
+        browsers[0].hung = True
+        timeout, browser_pool.PROBE_TIMEOUT = browser_pool.PROBE_TIMEOUT, 0.1
+        try:
+            assert await asyncio.wait_for(pool.check_health(), 2)
+        finally:
+            browser_pool.PROBE_TIMEOUT = timeout
+        await pool.close()
+        return pool, browsers
+
+    pool, browsers = asyncio.run(run())
+    assert pool.restarts == 1 and len(browsers) == 2
+    print("✅ Hung browser relaunched")
+
+def test_recycle_under_running_tests():
+    """Recycling swaps in a new browser; the old one closes after its last test."""
+    print("🧪 Testing recycling")
+
+    async def run():
+        browsers = []
+        pool = BrowserContextPool(launcher(browsers), slots=2)
+        await pool.start()
+        release = asyncio.Event()
+
+        async def long_test():
+            async with pool.context() as context:
+                await release.wait()
+                return context.browser
+
+        running = asyncio.create_task(long_test())
+        await asyncio.sleep(0.01)
+        assert pool.tests_since_launch == 1
+        assert await pool.recycle("max_tests")
+        assert pool.browser is browsers[1] and pool.tests_since_launch == 0
+        assert browsers[0].connected and pool.metrics()["retired_browsers"] == 1
+
+        async with pool.context() as context:
+            assert context.browser is browsers[1]
+        release.set()
+        old = await running
+        metrics = pool.metrics()
+        await pool.close()
+        return browsers, old, metrics
+
+    browsers, old, metrics = asyncio.run(run())
+    assert old is browsers[0] and not browsers[0].connected
+    assert metrics["recycles"] == {"max_tests": 1} and metrics["retired_browsers"] == 0
+    assert metrics["tests_since_launch"] == 1 and metrics["browser_age_s"] >= 0
+    print("✅ Old browser closed after its running test")
+
+def main():
+    """Run all browser pool tests."""
+    print("🚀 Browser Pool Test Suite")
+    print("=" * 50)
+    test_slots_limit_concurrency()
+    test_fresh_precreated_context_per_test()
+    test_health_check_relaunches_dead_browser()
+    test_hung_browser_relaunched()
+    test_recycle_under_running_tests()
+    print("\n✅ All browser pool tests passed!")
+
+if __name__ == "__main__":
+    main()
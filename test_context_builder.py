@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Test script for the AI Genesis Engine prompt context builder.
+Verifies markdown stripping, error-anchored code excerpts, patch application
+and token budget enforcement.
+"""
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from genesis_engine.core.context_builder import (
+    ContextBuilder, apply_patches, code_outline, compact_test_results, dedupe_lines,
+    estimate_tokens, render_code_excerpt, strip_markdown
+)
+
+GAME = "\n".join(
+    ["<script>", "let player;", "function setup() {", "  createCanvas(400, 400);", "}"]
+    + [line for i in range(20) for line in (
+        f"function helper{i}() {{", "  let total = 0;", f"  for (let j = 0; j < {i}; j++) {{",
+        f"    total += j * {i};", "  }", "  return total;", "}"
+    )]
+    + ["function draw() {", "  updatePlayer();", "}", "</script>"]
+)
+
+def test_strip_and_dedupe():
+    """Markdown decoration goes, content and repeated lines are kept once."""
+    print("🧪 Testing markdown stripping and deduplication")
+    text = "# Game Design\n\n---\n\n## Core Mechanics\n\n- **Move** with the arrow keys\n\n\n\nScore * 2"
+    assert strip_markdown(text) == "Game Design\n\nCore Mechanics\n\n- Move with the arrow keys\n\nScore * 2"
+
+    design, plan = dedupe_lines([
+        "Player moves with the arrow keys\nshort",
+        "Player moves with the arrow keys!\nshort\nEnemies spawn every second"
+    ])
+    assert design == "Player moves with the arrow keys\nshort"
+    assert plan == "short\nEnemies spawn every second"
+    print("✅ Markdown stripped and duplicates removed")
+
+def test_code_excerpt():
+    """Only regions named by the errors are shown in full, the rest as an outline."""
+    print("🧪 Testing error-anchored code excerpts")
+    outline = dict(code_outline(GAME))
+    assert outline[3] == "function setup()"
+
+    excerpt = render_code_excerpt(GAME, ["ReferenceError: updatePlayer is not defined"], context=2)
+    draw_line = GAME.splitlines().index("  updatePlayer();") + 1
+    assert f"--- lines {draw_line - 2}-{draw_line + 2} ---" in excerpt
+    assert "3: function setup()" in excerpt
+    assert "j * 5;" not in excerpt
+    assert estimate_tokens(excerpt) < estimate_tokens(GAME) / 2
+
+    excerpt = render_code_excerpt(GAME, ["Line 4: Unexpected opening brace"], context=1)
+    assert excerpt.startswith("--- lines 3-5 ---\nfunction setup() {")
+
+    # Without anything to anchor on the whole file is relevant
+    assert "j * 5;" in render_code_excerpt(GAME, ["Validation failed"])
+    print("✅ Code excerpts anchored on errors")
+
+def test_compact_test_results():
+    """Errors from all Sentry channels are listed once each."""
+    print("🧪 Testing test result compaction")
+    report = compact_test_results({
+        "errors": ["Runtime error: x is not defined", "Missing   draw()"],
+        "runtime_errors": ["Runtime error: x is not defined"]
+    })
+    assert report == "- Runtime error: x is not defined\n- Missing draw()"
+    print("✅ Test results compacted")
+
+def test_apply_patches():
+    """SEARCH/REPLACE blocks apply only when every search text is unique."""
+    print("🧪 Testing patch application")
+    fix = "<<<<<<< SEARCH\n  updatePlayer();\n=======\n  if (player) player.update();\n>>>>>>> REPLACE"
+    patched = apply_patches(GAME, "Here is the fix:\n" + fix)
+    assert "player.update()" in patched and "updatePlayer" not in patched
+
+    ambiguous = "<<<<<<< SEARCH\n}\n=======\n};\n>>>>>>> REPLACE"
+    assert apply_patches(GAME, ambiguous) is None
+    assert apply_patches(GAME, "<!DOCTYPE html><html></html>") is None
+    print("✅ Patches applied")
+
+def test_budget():
+    """Low-priority sections shrink first; atomic sections are dropped whole."""
+    print("🧪 Testing token budget enforcement")
+    long_text = "\n".join(f"line {i} with some words" for i in range(200))
+    context = (ContextBuilder(600)
+               .add("errors", "- x is not defined", priority=3)
+               .add("plan", long_text, priority=2, min_tokens=300)
+               .add("design", long_text, priority=1, min_tokens=100)
+               .add("reference", GAME, priority=0, atomic=True)
+               .build())
+    assert context["errors"] == "- x is not defined"
+    assert context["reference"] == ""
+    assert context["design"].endswith("[... truncated to fit the context budget ...]")
+    assert sum(estimate_tokens(text) for text in context.values()) <= 620
+
+    context = ContextBuilder(10000).add("reference", GAME, priority=0, atomic=True).build()
+    assert context["reference"] == GAME
+    print("✅ Budget enforced")
+
+def main():
+    """Run all context builder tests."""
+    print("🚀 Context Builder Test Suite")
+    print("=" * 50)
+    test_strip_and_dedupe()
+    test_code_excerpt()
+    test_compact_test_results()
+    test_apply_patches()
+    test_budget()
+    print("\n✅ All context builder tests passed!")
+
+if __name__ == "__main__":
+    main()
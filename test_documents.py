@@ -0,0 +1,74 @@
+#!/usr/bin/env python3
+"""
+Test script for the AI Genesis Engine structured planning documents.
+Verifies schema validation, markdown rendering and compact context.
+"""
+import json
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from genesis_engine.core.ai_client import AIClient
+from genesis_engine.core.documents import (
+    GameDesign, TechnicalPlan, compact_context, parse_document,
+    render_gdd_markdown, render_tech_plan_markdown, tool_definition
+)
+from genesis_engine.core.incremental import extract_features
+
+PLAN = {
+    "architecture": "Single p5.js sketch with global game state",
+    "components": [{"name": "Player", "responsibility": "Movement", "members": ["update()", "draw()"]}],
+    "implementation_order": [
+        {"title": "Canvas and player", "details": ["createCanvas(800, 600)", "Arrow key movement"]},
+        {"title": "Enemies"},
+        {"title": "Score and game over"}
+    ]
+}
+
+def test_parse_document():
+    """Valid output is normalized, invalid output raises ValueError."""
+    print("🧪 Testing document schema validation")
+    plan = parse_document(TechnicalPlan, json.dumps(PLAN))
+    assert plan["components"][0]["kind"] == "class"
+    assert plan["libraries"] == ["p5.js"]
+
+    for bad in ({"architecture": "x", "components": [], "implementation_order": []}, "not json"):
+        try:
+            parse_document(TechnicalPlan, bad)
+            assert False, "invalid plan accepted"
+        except ValueError:
+            pass
+
+    tool = tool_definition(GameDesign, "record_game_design", "Record the GDD")
+    assert "core_mechanics" in tool["input_schema"]["required"]
+    assert "space_shooter" in tool["input_schema"]["properties"]["genre"]["description"]
+    print("✅ Documents validated against their schemas")
+
+def test_render_markdown():
+    """Rendered plans keep the implementation order parseable."""
+    print("🧪 Testing markdown rendering")
+    plan = parse_document(TechnicalPlan, PLAN)
+    markdown = render_tech_plan_markdown(plan)
+    features = extract_features(markdown)
+    assert [f.title for f in features] == ["Canvas and player", "Enemies", "Score and game over"]
+    assert features[0].details == ["createCanvas(800, 600)", "Arrow key movement"]
+
+    design = parse_document(GameDesign, AIClient._get_mock_structured_response(None, "record_game_design"))
+    gdd = render_gdd_markdown(design)
+    assert gdd.startswith("# Game Design Document: MOCK Space Adventure")
+    assert "- Arrow keys: move" in gdd
+    assert len(compact_context(design)) < len(gdd)
+    print("✅ Markdown rendered")
+
+def main():
+    """Run all structured document tests."""
+    print("🚀 Structured Documents Test Suite")
+    print("=" * 50)
+    test_parse_document()
+    test_render_markdown()
+    print("\n✅ All structured document tests passed!")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Test script for the AI Genesis Engine warm-start game index.
+Verifies that validated games are indexed and ranked by prompt similarity,
+and that searches from worker threads are safe while games are added.
+"""
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from genesis_engine.utils.game_index import GameIndex, minhash, shingles, signature_similarity
+
+def _write_game(root: Path, name: str, prompt: str, gdd: str, validated: bool = True):
+    game_dir = root / name
+    game_dir.mkdir()
+    (game_dir / "README.md").write_text(f"# Generated Game\n- **Prompt**: {prompt}\n", encoding="utf-8")
+    (game_dir / "GDD.md").write_text(gdd, encoding="utf-8")
+    if validated:
+        (game_dir / "game.html").write_text(f"<!DOCTYPE html><html>{name}</html>", encoding="utf-8")
+
+def test_minhash_similarity():
+    """Identical texts match exactly, unrelated texts barely."""
+    print("🧪 Testing MinHash similarity estimates")
+    a = minhash(shingles("space shooter with alien invaders and lasers"))
+    b = minhash(shingles("space shooter with alien invaders and lasers"))
+    c = minhash(shingles("bouncing ball physics sandbox"))
+    assert signature_similarity(a, b) == 1.0
+    assert signature_similarity(a, c) < 0.2
+    assert signature_similarity(a, minhash(shingles(""))) == 0.0
+    print("✅ Similarity estimates behave")
+
+def test_index_ranks_closest_game():
+    """The closest validated game wins, unvalidated ones are ignored."""
+    print("🧪 Testing game index retrieval")
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        _write_game(root, "shooter", "A space shooter where you fight alien invaders",
+                    "Ship fires lasers at alien waves. Enemies descend.")
+        _write_game(root, "bouncer", "A bouncing ball animation",
+                    "Balls bounce with gravity and friction.")
+        _write_game(root, "unfinished_shooter", "A space shooter with alien invaders",
+                    "Never validated.", validated=False)
+
+        index = GameIndex([root])
+        match = index.best_match("Space shooter against alien invaders", min_score=0.1)
+        assert match is not None
+        assert match.game.name == "shooter"
+        assert "shooter" in match.read_html()
+        assert "unfinished_shooter" not in [g.name for g in index.games.values()]
+
+        assert index.best_match("Underwater fishing simulator", min_score=0.1) is None
+    print("✅ Closest validated game retrieved")
+
+def test_index_refresh_picks_up_new_games():
+    """Games saved after the first search are found on the next one."""
+    print("🧪 Testing incremental index refresh")
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        index = GameIndex([root])
+        assert index.search("platformer collecting coins") == []
+
+        _write_game(root, "platformer", "A platformer collecting coins", "Jump between platforms.")
+        results = index.search("platformer collecting coins")
+        assert results and results[0].game.name == "platformer"
+    print("✅ New games indexed on refresh")
+
+def test_concurrent_search_and_add():
+    """Searches in threads never see the index change size under them."""
+    print("🧪 Testing concurrent searches and adds")
+    with tempfile.TemporaryDirectory() as tmp:
+        root = Path(tmp)
+        for number in range(20):
+            _write_game(root, f"shooter{number}", f"A space shooter number {number}", "Lasers and aliens.")
+        index = GameIndex([root])
+        index.refresh()
+        errors = []
+
+        def search():
+            try:
+                for _ in range(20):
+                    index.search("space shooter with aliens")
+            except Exception as e:
+                errors.append(e)
+
+        # Switch threads as often as possible so a scan and an add overlap
+        interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        try:
+            threads = [threading.Thread(target=search) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for number in range(40):
+                _write_game(root, f"racer{number}", f"A racing game number {number}", "Cars on a track.")
+                index.add(root / f"racer{number}")
+            for thread in threads:
+                thread.join()
+        finally:
+            sys.setswitchinterval(interval)
+
+        assert not errors, errors
+        assert len(index.games) == 60
+    print("✅ Index stayed consistent under concurrent use")
+
+def main():
+    """Run all game index tests."""
+    print("🚀 Game Index Test Suite")
+    print("=" * 50)
+    test_minhash_similarity()
+    test_index_ranks_closest_game()
+    test_index_refresh_picks_up_new_games()
+    test_concurrent_search_and_add()
+    print("\n✅ All game index tests passed!")
+
+if __name__ == "__main__":
+    main()
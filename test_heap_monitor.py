@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+Test script for Sentry's JS heap growth monitor.
+Checks trend fitting and leak verdicts on synthetic heap samples, merging
+of a simulation run in parts, snapshot diffing through a stand-in CDP
+session, and (when Node.js is installed) aggregation of real V8 heap
+snapshots.
+"""
+import asyncio
+import json
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from genesis_engine.core.heap_monitor import (
+    HeapSampler, aggregate_snapshot, fit_trend, heap_errors, heap_report, retained_type_growth
+)
+from genesis_engine.core.sentry_harness import merge_simulations
+
+MB = 1024 * 1024
+
+def _snapshot(objects):
+    """A minimal V8 heap snapshot holding ``objects``: (type, name, self_size) triples."""
+    strings = sorted({name for _, name, _ in objects})
+    kinds = ["hidden", "array", "string", "object", "code", "closure"]
+    nodes = []
+    for number, (kind, name, size) in enumerate(objects):
+        nodes += [kinds.index(kind), strings.index(name), number, size, 0, 0, 0]
+    return {
+        "snapshot": {"meta": {
+            "node_fields": ["type", "name", "id", "self_size", "edge_count", "trace_node_id", "detachedness"],
+            "node_types": [kinds, "string", "number", "number", "number", "number", "number"]
+        }},
+        "nodes": nodes,
+        "strings": strings
+    }
+
+class FakeCDP:
+    """Answers heap requests from a scripted sequence of heap sizes and snapshots."""
+
+    def __init__(self, sizes, snapshots):
+        self.sizes = list(sizes)
+        self.snapshots = list(snapshots)
+        self.listeners = {}
+        self.collected = 0
+
+    def on(self, event, handler):
+        self.listeners.setdefault(event, []).append(handler)
+
+    def remove_listener(self, event, handler):
+        self.listeners[event].remove(handler)
+
+    async def send(self, method, params=None):
+        if method == "HeapProfiler.collectGarbage":
+            self.collected += 1
+        elif method == "Runtime.getHeapUsage":
+            return {"usedSize": self.sizes.pop(0), "totalSize": 64 * MB}
+        elif method == "HeapProfiler.takeHeapSnapshot":
+            text = json.dumps(self.snapshots.pop(0))
+            for start in range(0, len(text), 100):
+                for handler in self.listeners.get("HeapProfiler.addHeapSnapshotChunk", []):
+                    handler({"chunk": text[start:start + 100]})
+        return {}
+
+def test_trend_fit():
+    """Slope and R² of a clean line, a flat series and a noisy one."""
+    print("🧪 Testing trend fitting")
+    slope, r2 = fit_trend([(0, 1.0), (10, 2.0), (20, 3.0)])
+    assert abs(slope - 0.1) < 1e-9 and abs(r2 - 1.0) < 1e-9
+    assert fit_trend([(0, 5.0), (10, 5.0), (20, 5.0)]) == (0.0, 0.0)
+    assert fit_trend([(0, 1.0)]) == (0.0, 0.0)
+    _, noisy_r2 = fit_trend([(0, 1.0), (10, 9.0), (20, 2.0), (30, 8.0), (40, 1.5)])
+    assert noisy_r2 < 0.7
+    print("✅ Trends fitted")
+
+def test_leak_verdicts():
+    """Steady growth is a leak; a sawtooth from garbage collection or a small rise is not."""
+    print("🧪 Testing leak verdicts")
+    leaking = heap_report([(s, 10 * MB + s * MB // 10) for s in range(0, 121, 15)], 2.0, "cdp")
+    assert leaking["leaking"] and leaking["growth_mb_per_min"] == 6.0 and leaking["fit_r2"] == 1.0
+    errors = heap_errors(leaking)
+    assert len(errors) == 1 and errors[0].startswith("JS heap grows without bound: 10.0MB to 22.0MB over 120s")
+
+    sawtooth = heap_report([(s, (10 + (s // 15) % 2 * 3) * MB) for s in range(0, 121, 15)], 2.0, "cdp")
+    assert not sawtooth["leaking"] and heap_errors(sawtooth) == []
+
+    small = heap_report([(s, 10 * MB + s * 4000) for s in range(0, 121, 15)], 0.1, "cdp")
+    assert small["growth_mb_per_min"] > 0.1 and small["growth_mb"] < 1.0 and not small["leaking"]
+
+    assert heap_report([(0, None), (60, None), (120, 5 * MB)], 2.0, "performance.memory") is None
+    print("✅ Leaks flagged, noise ignored")
+
+def test_retained_types():
+    """Snapshot aggregation and the types that grew between two snapshots."""
+    print("🧪 Testing retained type diff")
+    before = aggregate_snapshot(_snapshot(
+        [("object", "Bullet", 40)] * 3 + [("object", "Enemy", 64)] * 2 + [("array", "Array", 16)]
+        + [("string", "hello", 24), ("closure", "draw", 32)]
+    ))
+    assert before == {"Bullet": (3, 120), "Enemy": (2, 128), "Array": (1, 16), "(closure)": (1, 32)}
+    after = aggregate_snapshot(_snapshot(
+        [("object", "Bullet", 40)] * 300 + [("object", "Enemy", 64)] * 2 + [("array", "Array", 16)] * 5
+    ))
+    growth = retained_type_growth(before, after)
+    assert [entry["type"] for entry in growth] == ["Bullet", "Array"]
+    assert growth[0] == {"type": "Bullet", "added": 297, "bytes": 297 * 40, "count": 300}
+
+    report = heap_report([(s, 10 * MB + s * MB // 10) for s in range(0, 121, 15)], 2.0, "cdp")
+    report["retained_types"] = growth
+    assert heap_errors(report)[0].endswith("Objects piling up: Bullet +297, Array +4")
+    print("✅ Growing types identified")
+
+def test_sampler_over_cdp():
+    """Samples are taken after a forced GC; snapshots arrive in chunks and are aggregated."""
+    print("🧪 Testing the CDP heap sampler")
+
+    async def run():
+        cdp = FakeCDP([12 * MB, 13 * MB], [_snapshot([("object", "Particle", 48)] * 10)])
+        sampler = HeapSampler(page=None, cdp=cdp)
+        sizes = [await sampler.sample(), await sampler.sample()]
+        counts = await sampler.type_counts()
+        return cdp, sampler, sizes, counts
+
+    cdp, sampler, sizes, counts = asyncio.run(run())
+    assert sizes == [12 * MB, 13 * MB] and cdp.collected == 2
+    assert counts == {"Particle": (10, 480)} and not cdp.listeners["HeapProfiler.addHeapSnapshotChunk"]
+    assert sampler.source == "cdp"
+    print("✅ Sampled over CDP")
+
+def test_merge_simulations():
+    """A session simulated in parts reads like one run."""
+    print("🧪 Testing merged simulation summaries")
+    part = {"frames": 600, "simulatedSeconds": 10.0, "wallMs": 40, "errors": [], "idle": False, "truncated": False}
+    failing = {**part, "frames": 120, "simulatedSeconds": 2.0, "wallMs": 10,
+               "errors": [{"message": "TypeError: x", "frame": 1330, "step": 120, "seconds": 2.0}]}
+    merged = merge_simulations([part, part, failing])
+    assert merged["frames"] == 1320 and merged["simulatedSeconds"] == 22.0 and merged["wallMs"] == 90
+    assert merged["errors"] == [{"message": "TypeError: x", "frame": 1330, "step": 1320, "seconds": 22.0}]
+    assert merge_simulations([]) is None
+    print("✅ Parts merged")
+
+def test_real_v8_snapshot():
+    """A real V8 snapshot with a leaked array of Bullet instances."""
+    print("🧪 Testing a real V8 heap snapshot")
+    script = """
+        class Bullet { constructor(i) { this.x = i; this.y = i; } }
+        globalThis.bullets = [];
+        for (let i = 0; i < 5000; i++) globalThis.bullets.push(new Bullet(i));
+        require('v8').getHeapSnapshot().pipe(process.stdout);
+    """
+    result = subprocess.run(["node", "-e", script], capture_output=True, text=True, timeout=60)
+    assert result.returncode == 0, result.stderr
+    counts = aggregate_snapshot(json.loads(result.stdout))
+    assert counts["Bullet"][0] == 5000 and counts["Bullet"][1] > 0
+    print(f"✅ {counts['Bullet'][0]} Bullet objects found among {len(counts)} types")
+
+def main():
+    """Run all heap monitor tests."""
+    print("🚀 Heap Monitor Test Suite")
+    print("=" * 50)
+    test_trend_fit()
+    test_leak_verdicts()
+    test_retained_types()
+    test_sampler_over_cdp()
+    test_merge_simulations()
+    if shutil.which("node") is None:
+        print("⚠️  Node.js not found - skipping the real heap snapshot test")
+    else:
+        test_real_v8_snapshot()
+    print("\n✅ All heap monitor tests passed!")
+
+if __name__ == "__main__":
+    main()
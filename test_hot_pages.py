@@ -0,0 +1,217 @@
+#!/usr/bin/env python3
+"""
+Test script for Sentry's hot pages.
+Checks how games are split up for a page that already has p5.js loaded,
+which games keep using fresh pages, that (when Node.js is installed) the
+wrapped scripts keep their top-level declarations to themselves so the
+same page can run a game again, and, with the Playwright stand-ins from
+playwright_fakes.py, that Sentry reuses a slot's hot page across tests,
+drops one that cannot be reset, and warms one up for every slot.
+"""
+import asyncio
+import json
+import logging
+import shutil
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from genesis_engine.config import settings
+from genesis_engine.core.browser_pool import BrowserContextPool
+from genesis_engine.core.hot_pages import HOT_PAGE_URL, hot_game
+from genesis_engine.core.sentry_agent import WARM_UP_GAME, SentryAgent
+from playwright_fakes import launcher
+
+ROOT = Path(__file__).parent
+CORPUS = sorted(ROOT.glob("generated_games/*/game.html")) + sorted(ROOT.glob("src/generated_games/*/game.html"))
+P5 = "https://cdnjs.cloudflare.com/ajax/libs/p5.js/1.7.0/p5.min.js"
+
+def _game(script, head="", body='<div id="score">0</div>'):
+    return f"""<!DOCTYPE html>
+<html>
+<head>
+<title>Test &amp; Game</title>
+<style>body {{ margin: 0; }}</style>
+<script src="{P5}"></script>{head}
+</head>
+<body class="dark">
+{body}
+<script>{script}</script>
+</body>
+</html>
+"""
+
+SKETCH = """
+let score = 0;
+const speed = 2;
+function setup() { createCanvas(400, 400); }
+function draw() { background(0); score += speed; }
+function restart() { score = 0; }
+const keyPressed = () => restart();
+class Ball { move() { function inner() {} } }
+"""
+
+def test_split():
+    """A global-mode game is split into title, styles, markup and wrapped code."""
+    print("🧪 Testing how games are split")
+    game = hot_game(_game(SKETCH))
+    assert game.p5_src == P5 and game.title == "Test &amp; Game"
+    assert game.head == "<style>body { margin: 0; }</style>"
+    assert game.body_attributes == [["class", "dark"]]
+    assert game.body.strip() == '<div id="score">0</div>' and "<script" not in game.body
+    assert game.code.startswith("(function () {\n") and game.code.endswith("}).call(window);\n")
+    assert "restart: typeof restart === 'function' ? restart : undefined" in game.code
+    assert "keyPressed: typeof keyPressed" in game.code and "inner:" not in game.code
+    assert set(json.loads(json.dumps(game.payload()))) == {"title", "head", "bodyAttributes", "body", "code"}
+    for path in CORPUS:
+        assert hot_game(path.read_text(encoding="utf-8")) is not None, path
+    assert hot_game(WARM_UP_GAME).p5_src == P5
+    print(f"✅ {len(CORPUS) + 1} stored games fit a hot page")
+
+def test_fresh_page_games():
+    """Games that would behave differently in a shared page are left to fresh pages."""
+    print("🧪 Testing fallbacks")
+    sound = '<script src="https://cdnjs.cloudflare.com/ajax/libs/p5.js/1.7.0/addons/p5.sound.min.js"></script>'
+    other = '<script src="https://example.com/physics.js"></script>'
+    rejected = {
+        "instance mode": _game("new p5((p) => { p.setup = () => p.createCanvas(10, 10); });"),
+        "addon": _game(SKETCH, head=sound),
+        "other library": _game(SKETCH, head=other),
+        "second p5": _game(SKETCH, head=f'<script src="{P5}"></script>'),
+        "module": _game(SKETCH).replace("<script>", '<script type="module">'),
+        "shader block": _game(SKETCH, body='<script type="x-shader/x-fragment">void main() {}</script>'),
+        "document.write": _game(SKETCH + "document.write('hi');"),
+        "no p5": _game(SKETCH).replace(f'<script src="{P5}"></script>', ""),
+    }
+    for reason, html in rejected.items():
+        assert hot_game(html) is None, reason
+    assert hot_game(_game(SKETCH).replace("<script>", '<script type="text/javascript">')) is not None
+    print(f"✅ {len(rejected)} kinds of game load fresh")
+
+def test_scope_in_node():
+    """The wrapped code defines p5 hooks and functions on window and nothing else, twice over."""
+    print("🧪 Testing script scope in node")
+    runner = """
+const vm = require('vm');
+const code = require('fs').readFileSync(process.argv[2], 'utf8');
+const window = {};
+const defined = [];
+window.window = window;
+window.document = { addEventListener() {}, getElementById() { return null; } };
+window.__hotPage = { define: (functions) => {
+  for (const [name, value] of Object.entries(functions)) if (typeof value === 'function') { window[name] = value; defined.push(name); }
+} };
+vm.createContext(window);
+vm.runInContext(code, window);
+for (const name of defined) delete window[name];
+vm.runInContext(code, window);
+console.log(JSON.stringify({ defined, globals: Object.keys(window).sort() }));
+"""
+    games = {"sketch": hot_game(_game(SKETCH)).code}
+    games.update({path.parent.name: hot_game(path.read_text(encoding="utf-8")).code for path in CORPUS})
+    with tempfile.TemporaryDirectory() as directory:
+        runner_path = Path(directory) / "run.js"
+        runner_path.write_text(runner, encoding="utf-8")
+        for name, code in games.items():
+            code_path = Path(directory) / f"{name}.js"
+            code_path.write_text(code, encoding="utf-8")
+            output = subprocess.run(["node", str(runner_path), str(code_path)], capture_output=True, text=True)
+            assert output.returncode == 0, (name, output.stderr[-500:])
+            result = json.loads(output.stdout)
+            assert {"setup", "draw"} <= set(result["defined"]), name
+            assert set(result["globals"]) == {"window", "document", "__hotPage"} | set(result["defined"]), name
+            if name == "sketch":
+                assert sorted(result["defined"]) == sorted(["draw", "keyPressed", "restart", "setup"] * 2)
+    print(f"✅ {len(games)} games ran twice in one context")
+
+def _with_sentry(scenario, slots=1):
+    """Run ``scenario(sentry, browser)`` against a fake browser with the costly browser checks off."""
+    names = ("sentry_simulation_seconds", "sentry_perf_frames", "sentry_fuzz_seconds", "sentry_hot_pages")
+    saved = {name: getattr(settings, name) for name in names}
+
+    async def run():
+        browsers = []
+        sentry = SentryAgent(logging.getLogger("test"))
+        sentry.pool = BrowserContextPool(launcher(browsers), slots, prepare=sentry._prepare_context, hot_page_uses=3)
+        await sentry.pool.start()
+        try:
+            return await scenario(sentry, browsers[0])
+        finally:
+            await sentry.cleanup()
+
+    settings.sentry_simulation_seconds = settings.sentry_perf_frames = settings.sentry_fuzz_seconds = 0
+    settings.sentry_hot_pages = True
+    try:
+        return asyncio.run(run())
+    finally:
+        for name, value in saved.items():
+            setattr(settings, name, value)
+
+def test_sentry_reuses_hot_pages():
+    """Consecutive tests share one hot page until its use limit; other games load fresh."""
+    print("🧪 Testing hot page reuse")
+    html = _game(SKETCH)
+
+    async def scenario(sentry, browser):
+        results = [await sentry._test_in_browser(html, f"game{i}") for i in range(4)]
+        fresh = await sentry._test_in_browser(_game("new p5((p) => {});"), "instance")
+        return results, fresh, sentry.metrics()["browser"]
+
+    results, fresh, metrics = _with_sentry(scenario)
+    assert all(result["passed"] and result["hot_page"] for result in results)
+    assert fresh["passed"] and not fresh["hot_page"]
+    assert metrics["hot_pages_opened"] == 2 and metrics["hot_page_reuses"] == 2
+    assert metrics["hot_pages"] == 1 and metrics["tests"] == 5
+    print("✅ One hot page served three tests before it was replaced")
+
+def test_unresettable_page_dropped():
+    """A page whose reset reports leftovers is closed, and the next test opens a new one."""
+    print("🧪 Testing dirty hot pages")
+
+    async def scenario(sentry, browser):
+        browser.resettable = False
+        first = await sentry._test_in_browser(_game(SKETCH), "first")
+        second = await sentry._test_in_browser(_game(SKETCH), "second")
+        return first, second, browser, sentry.metrics()["browser"]
+
+    first, second, browser, metrics = _with_sentry(scenario)
+    assert first["hot_page"] and second["hot_page"] and browser.resets == 2
+    assert metrics["hot_pages_opened"] == 2 and metrics["hot_pages_discarded"] == 2 and metrics["hot_pages"] == 0
+    hot_contexts = [context for context in browser.contexts if HOT_PAGE_URL in context.routes]
+    assert len(hot_contexts) == 2 and all(context.closed for context in hot_contexts)
+    print("✅ Dirty pages closed")
+
+def test_warm_up_fills_slots():
+    """Warm-up leaves every slot with a hot page that already ran a game."""
+    print("🧪 Testing hot warm-up")
+
+    async def scenario(sentry, browser):
+        await sentry.warm_up()
+        return browser, sentry.metrics()["browser"]
+
+    browser, metrics = _with_sentry(scenario, slots=3)
+    assert browser.loaded == [("hot", "Sentry warm-up")] * 3
+    assert metrics["hot_pages"] == 3 and metrics["hot_pages_opened"] == 3
+    print("✅ Three slots warmed")
+
+def main():
+    """Run all hot page tests."""
+    print("🚀 Hot Page Test Suite")
+    print("=" * 50)
+    test_split()
+    test_fresh_page_games()
+    if shutil.which("node") is None:
+        print("⚠️  Node.js not found - skipping script scope check")
+    else:
+        test_scope_in_node()
+    test_sentry_reuses_hot_pages()
+    test_unresettable_page_dropped()
+    test_warm_up_fills_slots()
+    print("\n✅ All hot page tests passed!")
+
+if __name__ == "__main__":
+    main()
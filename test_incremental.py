@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Test script for the AI Genesis Engine incremental build support.
+Verifies feature extraction from technical plans and the last-green increment cache.
+"""
+import sys
+import tempfile
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from genesis_engine.core.incremental import IncrementCache, extract_features
+
+PHASED_PLAN = """# Technical Implementation Plan: Bounce Lab
+
+## 2. Core Classes and Functions
+
+```python
+# ball.py
+class Ball:
+    pass
+```
+
+## 3. Implementation Order
+
+### Phase 1: Core Foundation
+1. Set up the canvas and game loop
+2. Implement the Ball class
+
+### Phase 2: Physics Engine
+1. Implement gravity
+2. Add ball-to-ball collisions
+
+## 4. Key Technical Challenges
+- Collision tunnelling
+"""
+
+FLAT_PLAN = """## Implementation Sequence
+1. Player movement
+2. **Enemies** that chase the player
+3. Score display
+"""
+
+def test_phased_plan():
+    """Phase sub-headings become features with their items as details."""
+    print("🧪 Testing feature extraction from a phased plan")
+    features = extract_features(PHASED_PLAN)
+    assert [f.title for f in features] == ["Phase 1: Core Foundation", "Phase 2: Physics Engine"]
+    assert features[1].details == ["Implement gravity", "Add ball-to-ball collisions"]
+    print(f"✅ Extracted {len(features)} features")
+
+def test_flat_plan_and_cap():
+    """Numbered items become features and the list is capped."""
+    print("🧪 Testing feature extraction from a flat plan")
+    features = extract_features(FLAT_PLAN)
+    assert [f.title for f in features] == ["Player movement", "Enemies that chase the player", "Score display"]
+
+    capped = extract_features(FLAT_PLAN, max_features=2)
+    assert len(capped) == 2
+    assert capped[1].title == "Enemies that chase the player + Score display"
+    print("✅ Flat plan extracted and capped")
+
+def test_plan_without_order():
+    """Plans without any list still produce one buildable feature."""
+    print("🧪 Testing fallback feature")
+    features = extract_features("Just make a fun game.")
+    assert len(features) == 1
+    print("✅ Fallback feature produced")
+
+def test_increment_cache_roundtrip():
+    """The last green increment survives a restart for the same plan only."""
+    print("🧪 Testing increment cache")
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = IncrementCache(Path(tmp), PHASED_PLAN)
+        assert not cache.load()
+        cache.store("<html>feature 1</html>", 1, "Phase 1: Core Foundation")
+
+        resumed = IncrementCache(Path(tmp), PHASED_PLAN)
+        assert resumed.load()
+        assert resumed.completed_features == 1
+        assert resumed.code == "<html>feature 1</html>"
+
+        other_plan = IncrementCache(Path(tmp), FLAT_PLAN)
+        assert not other_plan.load()
+    print("✅ Increment cache resumes only for the same plan")
+
+def main():
+    """Run all incremental build tests."""
+    print("🚀 Incremental Build Test Suite")
+    print("=" * 50)
+    test_phased_plan()
+    test_flat_plan_and_cap()
+    test_plan_without_order()
+    test_increment_cache_roundtrip()
+    print("\n✅ All incremental build tests passed!")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Test script for Sentry's seeded input fuzzing.
+Checks that input traces are reproducible, that delta debugging shrinks a
+failing trace to the events that matter, and (under Node's vm module, as
+in test_sentry_harness.py) that replayed input reaches a crashing key
+handler. The in-page tests are skipped when Node.js is not installed.
+"""
+import asyncio
+import json
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from genesis_engine.core.context_builder import compact_test_results
+from genesis_engine.core.input_fuzzer import (
+    FUZZ_KEYS, describe_trace, fuzz_script, generate_trace, minimize_trace, replay_options
+)
+from genesis_engine.core.sentry_harness import VIRTUAL_TIME_SCRIPT
+from test_sentry_harness import NODE_RUNNER, P5_LOOP
+
+# A p5-style game: key handlers run from the window's keydown listener, and
+# restarting with R after firing with space reads a bullet that is gone.
+GAME = P5_LOOP + """
+let bullets = [], fired = false, x = 200;
+const held = new Set();
+function draw() { if (held.has(37)) x -= 2; if (held.has(39)) x += 2; }
+function keyPressed(event) {
+  if (event.key === ' ') { bullets.push({ x }); fired = true; }
+  if (event.key === 'r' && fired) { bullets = []; bullets[0].x = x; }
+}
+addEventListener('keydown', (event) => {
+  held.add(event.keyCode);
+  try { keyPressed(event); } catch (e) { const error = new Event('error'); error.error = e; dispatchEvent(error); }
+});
+addEventListener('keyup', (event) => held.delete(event.keyCode));
+"""
+
+def _replay(trace, frames, seed=7):
+    harness = VIRTUAL_TIME_SCRIPT + fuzz_script(seed)
+    options = replay_options(trace, frames, fps=60, wall_limit=10, seed=seed)
+    scenario = GAME + f"setTimeout(() => report(window.__fuzz.replay({json.dumps(options)})), 20);"
+    result = subprocess.run(
+        ["node", "-e", NODE_RUNNER], input=json.dumps([harness, scenario]),
+        capture_output=True, text=True, timeout=30
+    )
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def test_trace_is_reproducible():
+    """The same seed always gives the same schedule; events stay inside the session."""
+    print("🧪 Testing trace generation")
+    trace = generate_trace(42, frames=1800, fps=60, events_per_second=4)
+    assert trace == generate_trace(42, frames=1800, fps=60, events_per_second=4)
+    assert trace != generate_trace(43, frames=1800, fps=60, events_per_second=4)
+    assert 80 <= len(trace) <= 160
+    assert all(0 < entry["frame"] < 1800 for entry in trace)
+    assert {entry["key"] for entry in trace if entry["type"] == "key"} == set(FUZZ_KEYS)
+    assert {entry["type"] for entry in trace} == {"key", "move", "click"}
+    print(f"✅ {len(trace)} events, identical for identical seeds")
+
+def test_minimize_trace():
+    """Delta debugging keeps just the events the failure needs."""
+    print("🧪 Testing trace minimization")
+    trace = [{"frame": i, "type": "key", "key": "a", "keyCode": 65, "hold": 1} for i in range(64)]
+
+    async def fails(candidate):
+        frames = {entry["frame"] for entry in candidate}
+        return 10 in frames and 50 in frames
+
+    minimized, runs = asyncio.run(minimize_trace(trace, fails, max_runs=100))
+    assert [entry["frame"] for entry in minimized] == [10, 50]
+    assert runs < 64
+
+    # The replay budget is respected even when the trace is not fully reduced
+    partial, spent = asyncio.run(minimize_trace(trace, fails, max_runs=6))
+    assert spent == 6 and len(partial) == 32 and asyncio.run(fails(partial))
+    print(f"✅ 64 events reduced to 2 in {runs} replays")
+
+def test_fuzzing_finds_key_handler_crash():
+    """Replayed input reaches the R-after-space crash and the minimized trace still triggers it."""
+    print("🧪 Testing replay and minimization in-page")
+    frames = 1800
+    trace = generate_trace(7, frames, fps=60, events_per_second=4)
+    summary = _replay(trace, frames)
+    assert summary["errors"], summary
+    error = summary["errors"][0]
+    assert "TypeError" in error["message"] and error["step"] < frames
+    assert _replay(trace, frames)["errors"] == summary["errors"]
+
+    relevant = [entry for entry in trace if entry["frame"] < error["step"]]
+
+    async def fails(candidate):
+        outcome = _replay(candidate, error["step"] + 60)
+        return any(e["message"] == error["message"] for e in outcome["errors"])
+
+    minimized, runs = asyncio.run(minimize_trace(relevant, fails, max_runs=40))
+    assert [entry["key"] for entry in minimized] == [" ", "r"], minimized
+    assert _replay([], frames)["errors"] == []
+    print(f"✅ {len(relevant)} events reduced to {describe_trace(minimized, 60)!r} in {runs} replays")
+
+def test_debugger_report():
+    """The Debugger sees the error and the minimized input that reproduces it."""
+    print("🧪 Testing Debugger report")
+    trace = [
+        {"frame": 30, "type": "key", "key": " ", "keyCode": 32, "hold": 4},
+        {"frame": 90, "type": "click", "x": 0.25, "y": 0.5}
+    ]
+    report = compact_test_results({
+        "runtime_errors": ["TypeError: bullets[0] is undefined (frame 95, 1.5s into play with random input, seed 7)"],
+        "fuzz": {"seed": 7, "fps": 60, "failure": {"message": "TypeError: bullets[0] is undefined",
+                                                    "trace": trace, "reproduced": True}}
+    })
+    assert report.splitlines() == [
+        "- TypeError: bullets[0] is undefined (frame 95, 1.5s into play with random input, seed 7)",
+        "- Input that triggers \"TypeError: bullets[0] is undefined\" (seed 7, minimized):",
+        "    frame 30 (0.50s): hold Space for 4 frames",
+        "    frame 90 (1.50s): click at (25%, 50%) of the canvas"
+    ]
+    print("✅ Failing input included in the Debugger report")
+
+def main():
+    """Run all input fuzzing tests."""
+    print("🚀 Input Fuzzer Test Suite")
+    print("=" * 50)
+    test_trace_is_reproducible()
+    test_minimize_trace()
+    test_debugger_report()
+    if shutil.which("node") is None:
+        print("⚠️  Node.js not found - skipping in-page fuzzing tests")
+    else:
+        test_fuzzing_finds_key_handler_crash()
+    print("\n✅ All input fuzzer tests passed!")
+
+if __name__ == "__main__":
+    main()
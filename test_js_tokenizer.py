@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Test script for the JavaScript tokenizer behind Sentry's static checks.
+Verifies that braces inside strings, template literals, regexes, comments
+and CSS are ignored, that real bracket and string errors are reported at
+their exact line and column, that the games in generated_games/ pass, and
+(when Node.js is installed) that the verdicts agree with ``node --check``
+on broken copies of those games.
+"""
+import asyncio
+import logging
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from genesis_engine.core.js_tokenizer import check_html_scripts, check_javascript, script_ranges, tokenize
+from genesis_engine.core.sentry_agent import SentryAgent
+
+ROOT = Path(__file__).parent
+CORPUS = sorted(ROOT.glob("generated_games/*/game.html")) + sorted(ROOT.glob("src/generated_games/*/game.html"))
+
+TRICKY = r"""
+const open = '{', close = "}";
+const label = `score: ${ {points: 1}.points } ${`nested ${"}"}`}`;
+const pattern = /[{}]+\}/g, half = width / 2 / scale;
+// a stray } in a comment
+/* and { in a block comment */
+if (ready) { draw(); }
+"""
+
+def test_tokens():
+    """Token kinds for strings, templates, regexes and division."""
+    print("🧪 Testing token kinds")
+    tokens, problems = tokenize(TRICKY)
+    assert problems == []
+    kinds = [token.kind for token in tokens]
+    assert kinds.count("string") == 3 and kinds.count("regex") == 1
+    assert {"template_head", "template_middle", "template_tail"} <= set(kinds)
+    assert [token.text for token in tokens if token.kind == "punct"].count("/") == 2
+    assert check_javascript(TRICKY) == []
+    print(f"✅ {len(tokens)} tokens, no false positives")
+
+def test_exact_positions():
+    """Real errors are reported once, at the exact line and column."""
+    print("🧪 Testing error positions")
+    cases = {
+        "function f() {\n  if (x) {\n    y();\n}\n": ["Line 1, column 14: Unclosed '{' (missing '}')"],
+        "function f() {}\n}\n": ["Line 2, column 1: Unexpected '}' with no open '{'"],
+        "let a = [1, 2);\n": ["Line 1, column 14: ')' does not match '[' opened at line 1, column 9"],
+        "let a = 'abc;\nlet b = (1);": ["Line 1, column 9: Unterminated string literal"],
+        "let a = `abc ${x}": ["Line 1, column 17: Unterminated template literal"],
+        "let a; /* abc": ["Line 1, column 8: Unterminated block comment"],
+    }
+    for source, expected in cases.items():
+        assert [str(issue) for issue in check_javascript(source)] == expected, source
+    print("✅ Errors located exactly")
+
+def test_html_positions():
+    """Only inline scripts are scanned, and positions are lines of the HTML file."""
+    print("🧪 Testing HTML script extraction")
+    html = (
+        "<!DOCTYPE html>\n<html>\n<head>\n<style>body { margin: 0; } .a { color: red;</style>\n"
+        '<script src="https://cdn.jsdelivr.net/npm/p5@1.7.0/lib/p5.min.js"></script>\n'
+        '<script type="application/json">{"unclosed": [</script>\n'
+        "</head>\n<body>\n<script>\nfunction setup() {\n  createCanvas(400, 400);\n\nfunction draw() {}\n</script>\n"
+        "</body>\n</html>\n"
+    )
+    assert len(script_ranges(html)) == 1
+    assert [str(issue) for issue in check_html_scripts(html)] == ["Line 10, column 18: Unclosed '{' (missing '}')"]
+    print("✅ Only JavaScript checked, HTML line numbers reported")
+
+def test_corpus_is_clean():
+    """Every stored game passes, and each scan is fast."""
+    print("🧪 Testing the generated_games corpus")
+    for path in CORPUS:
+        html = path.read_text(encoding="utf-8")
+        started = time.perf_counter()
+        issues = check_html_scripts(html)
+        elapsed = (time.perf_counter() - started) * 1000
+        assert issues == [], (path, issues)
+        print(f"   {path.parent.name}: clean in {elapsed:.1f}ms")
+    print(f"✅ {len(CORPUS)} games clean")
+
+def test_linear_time():
+    """Ten times the code takes roughly ten times as long."""
+    print("🧪 Testing scaling")
+    small = TRICKY * 200
+    large = TRICKY * 2000
+
+    def timed(source):
+        started = time.perf_counter()
+        check_javascript(source)
+        return time.perf_counter() - started
+
+    ratio = min(timed(large) for _ in range(3)) / min(timed(small) for _ in range(3))
+    assert ratio < 20, ratio
+    print(f"✅ 10x input took {ratio:.1f}x as long")
+
+def test_sentry_ignores_braces_in_strings_and_css():
+    """A healthy game with braces in CSS and strings passes syntax validation; a broken one fails with a position."""
+    print("🧪 Testing Sentry syntax validation")
+    html = (
+        "<!DOCTYPE html>\n<html>\n<head>\n"
+        '<script src="https://cdnjs.cloudflare.com/ajax/libs/p5.js/1.7.0/p5.min.js"></script>\n'
+        "<style>body { margin: 0; } main { display: flex; } h1 { color: white; }</style>\n"
+        "</head>\n<body>\n<script>\n"
+        "let message = 'Press { to start';\n"
+        "function setup() {\n  createCanvas(400, 400);\n}\n"
+        "function draw() {\n  background(0);\n  text(`Score: ${score} }`, 10, 10);\n  rect(1, 1, 5, 5);\n}\n"
+        "</script>\n</body>\n</html>\n"
+    )
+    sentry = SentryAgent(logging.getLogger("test"))
+    results = asyncio.run(sentry.validate_game(html, "braces", static_only=True))
+    assert results["syntax_valid"] and results["errors"] == [], results
+
+    broken = html.replace("  rect(1, 1, 5, 5);\n}\n", "  rect(1, 1, 5, 5);\n")
+    results = asyncio.run(sentry.validate_game(broken, "braces", static_only=True))
+    assert not results["syntax_valid"]
+    assert results["errors"] == ["Line 13, column 17: Unclosed '{' (missing '}')"]
+    print("✅ No false 'Unbalanced braces'; real errors located")
+
+def test_agrees_with_node():
+    """Broken copies of stored games are rejected by both the tokenizer and node --check."""
+    print("🧪 Testing agreement with node --check")
+    html = CORPUS[0].read_text(encoding="utf-8")
+    start, end = script_ranges(html)[-1]
+    script = html[start:end]
+    tokens, _ = tokenize(script)
+    positions = [token.start for token in tokens if token.kind == "punct" and token.text in "{}()[]"]
+    with tempfile.TemporaryDirectory() as directory:
+        js_path = Path(directory) / "game.js"
+        for index in positions[::max(1, len(positions) // 25)]:
+            mutated = script[:index] + script[index + 1:]
+            js_path.write_text(mutated, encoding="utf-8")
+            node_ok = subprocess.run(["node", "--check", str(js_path)], capture_output=True).returncode == 0
+            assert not node_ok
+            assert check_javascript(mutated), f"missed deletion at offset {index}"
+    print("✅ Agrees with node on bracket deletions")
+
+def main():
+    """Run all JavaScript tokenizer tests."""
+    print("🚀 JavaScript Tokenizer Test Suite")
+    print("=" * 50)
+    test_tokens()
+    test_exact_positions()
+    test_html_positions()
+    test_corpus_is_clean()
+    test_linear_time()
+    test_sentry_ignores_braces_in_strings_and_css()
+    if shutil.which("node") is None:
+        print("⚠️  Node.js not found - skipping node --check comparison")
+    else:
+        test_agrees_with_node()
+    print("\n✅ All JavaScript tokenizer tests passed!")
+
+if __name__ == "__main__":
+    main()
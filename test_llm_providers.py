@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+"""
+Test script for the AI Genesis Engine LLM provider transport.
+Runs Anthropic- and OpenAI-format stand-in servers locally and verifies
+response normalization, failover, cooldown and latency-based routing.
+"""
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+from aiohttp import web
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from genesis_engine.core.llm_providers import (
+    AnthropicProvider, LLMRequest, LocalStubProvider, OpenAICompatibleProvider,
+    ProviderError, ProviderRouter
+)
+
+TOOL = {
+    "name": "record_design",
+    "description": "Record the game design",
+    "input_schema": {"type": "object", "properties": {"title": {"type": "string"}}}
+}
+
+def _request(tool=None):
+    return LLMRequest([{"role": "user", "content": "Make a game"}], "claude-3-5-haiku-20241022", 1000, 0.5, tool)
+
+async def _anthropic(request):
+    body = await request.json()
+    if body.get("tools"):
+        content = [{"type": "tool_use", "name": body["tool_choice"]["name"], "input": {"title": "Anthropic"}}]
+    else:
+        content = [{"type": "text", "text": "hello from "}, {"type": "text", "text": "anthropic"}]
+    return web.json_response({
+        "model": body["model"], "content": content,
+        "usage": {"input_tokens": 12, "output_tokens": 34}
+    })
+
+async def _openai(request):
+    body = await request.json()
+    assert request.headers["Authorization"] == "Bearer test-key"
+    if body.get("tools"):
+        message = {"content": None, "tool_calls": [{"type": "function", "function": {
+            "name": body["tool_choice"]["function"]["name"], "arguments": json.dumps({"title": "OpenAI"})
+        }}]}
+    else:
+        message = {"content": f"hello from {body['model']}"}
+    return web.json_response({
+        "model": body["model"], "choices": [{"message": message}],
+        "usage": {"prompt_tokens": 5, "completion_tokens": 7}
+    })
+
+async def _overloaded(request):
+    return web.json_response({"error": "overloaded"}, status=529)
+
+async def _rate_limited(request):
+    return web.json_response({"error": "slow down"}, status=429, headers={"Retry-After": "7"})
+
+async def _unauthorized(request):
+    return web.json_response({"error": "invalid x-api-key"}, status=401)
+
+async def _slow(request):
+    await asyncio.sleep(0.3)
+    return await _anthropic(request)
+
+async def _serve(handlers):
+    """Start a local server with one POST route per handler; returns (runner, base URL)."""
+    app = web.Application()
+    for name, handler in handlers.items():
+        app.router.add_post(f"/{name}", handler)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}"
+
+HANDLERS = {"anthropic": _anthropic, "openai": _openai, "overloaded": _overloaded,
+            "rate_limited": _rate_limited, "unauthorized": _unauthorized, "slow": _slow}
+
+def test_normalization():
+    """Both wire formats come back as the same text and tool input."""
+    print("🧪 Testing response normalization")
+
+    async def run():
+        runner, url = await _serve(HANDLERS)
+        try:
+            anthropic = AnthropicProvider("test-key", f"{url}/anthropic")
+            openai = OpenAICompatibleProvider("test-key", f"{url}/openai")
+
+            response = await anthropic.complete(_request())
+            assert (response.text, response.provider) == ("hello from anthropic", "anthropic")
+            assert (response.input_tokens, response.output_tokens) == (12, 34)
+            assert (await anthropic.complete(_request(TOOL))).tool_input == {"title": "Anthropic"}
+
+            response = await openai.complete(_request())
+            assert response.text == "hello from gpt-4o-mini" and response.output_tokens == 7
+            assert (await openai.complete(_request(TOOL))).tool_input == {"title": "OpenAI"}
+
+            try:
+                await AnthropicProvider("test-key", f"{url}/rate_limited").complete(_request())
+                assert False, "429 should raise"
+            except ProviderError as e:
+                assert (e.status, e.retry_after, e.affects_health, e.retryable) == (429, 7.0, True, True)
+        finally:
+            await runner.cleanup()
+
+    asyncio.run(run())
+    stub = LocalStubProvider(lambda r: json.dumps({"title": "Stub"}) if r.tool else "stubbed")
+    assert asyncio.run(stub.complete(_request())).text == "stubbed"
+    assert asyncio.run(stub.complete(_request(TOOL))).tool_input == {"title": "Stub"}
+    print("✅ Responses normalized")
+
+def test_failover_and_cooldown():
+    """A failing provider is skipped for the next one and benched after repeated failures."""
+    print("🧪 Testing failover and cooldown")
+
+    async def run():
+        runner, url = await _serve(HANDLERS)
+        try:
+            broken = AnthropicProvider("test-key", f"{url}/overloaded")
+            backup = OpenAICompatibleProvider("test-key", f"{url}/openai")
+            router = ProviderRouter([broken, backup], failure_threshold=2, cooldown=60, stats={})
+
+            assert (await router.complete(_request())).provider == "openai"
+            assert not router.metrics()["anthropic"]["cooling_down"]
+            # Its error now counts against it, so the backup goes first
+            assert (await router.complete(_request())).provider == "openai"
+            assert router.stats["anthropic"].requests == 1
+
+            try:
+                await ProviderRouter([broken], failure_threshold=2, stats=router.stats).complete(_request())
+                assert False, "a lone failing provider should raise"
+            except ProviderError:
+                pass
+            assert router.stats["anthropic"].consecutive_failures == 2
+            assert [p.name for p in router.order()] == ["openai", "anthropic"]
+            assert router.metrics()["anthropic"]["cooling_down"]
+
+            # The benched provider is still a last resort
+            router.stats["openai"].cooldown_until = router.stats["anthropic"].cooldown_until + 1
+            assert [p.name for p in router.order()] == ["anthropic", "openai"]
+
+            alone = ProviderRouter([broken], stats={})
+            try:
+                await alone.complete(_request())
+                assert False, "all providers failing should raise"
+            except ProviderError as e:
+                assert e.status == 529
+        finally:
+            await runner.cleanup()
+
+    asyncio.run(run())
+    print("✅ Failover and cooldown work")
+
+def test_latency_routing():
+    """Once measured, the faster provider is preferred."""
+    print("🧪 Testing latency-based routing")
+
+    async def run():
+        runner, url = await _serve(HANDLERS)
+        try:
+            slow = AnthropicProvider("test-key", f"{url}/slow")
+            fast = OpenAICompatibleProvider("test-key", f"{url}/openai")
+            router = ProviderRouter([slow, fast], stats={})
+
+            assert (await router.complete(_request())).provider == "anthropic"
+            # The unmeasured provider scores best, so it gets tried next
+            assert (await router.complete(_request())).provider == "openai"
+            assert router.stats["anthropic"].latency > router.stats["openai"].latency
+            for _ in range(3):
+                assert (await router.complete(_request())).provider == "openai"
+        finally:
+            await runner.cleanup()
+
+    asyncio.run(run())
+    print("✅ Faster provider preferred")
+
+def test_unmeasured_provider_errors_count():
+    """A provider that has only ever failed ranks below a healthy one, even unmeasured."""
+    print("🧪 Testing unmeasured provider scoring")
+
+    async def run():
+        runner, url = await _serve(HANDLERS)
+        try:
+            rejected = AnthropicProvider("bad-key", f"{url}/unauthorized")
+            healthy = OpenAICompatibleProvider("test-key", f"{url}/openai")
+            router = ProviderRouter([rejected, healthy], stats={})
+
+            assert (await router.complete(_request())).provider == "openai"
+            assert router.stats["anthropic"].latency is None
+            assert router.stats["anthropic"].failures == 1
+            assert [p.name for p in router.order()] == ["openai", "anthropic"]
+            assert (await router.complete(_request())).provider == "openai"
+            assert router.stats["anthropic"].requests == 1
+        finally:
+            await runner.cleanup()
+
+    asyncio.run(run())
+    print("✅ Failing unmeasured provider ranked last")
+
+def main():
+    """Run all LLM provider tests."""
+    print("🚀 LLM Provider Test Suite")
+    print("=" * 50)
+    test_normalization()
+    test_failover_and_cooldown()
+    test_latency_routing()
+    test_unmeasured_provider_errors_count()
+    print("\n✅ All LLM provider tests passed!")
+
+if __name__ == "__main__":
+    main()
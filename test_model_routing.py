@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Test script for the AI Genesis Engine model routing policy.
+Verifies phase routes, escalation and live reload of the policy file.
+"""
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from genesis_engine.core.model_routing import FAST_MODEL, STRONGEST_MODEL, ModelRouter
+
+HIERARCHY = ["claude-sonnet-4-20250514", "claude-3-5-haiku-20241022"]
+
+def test_default_policy():
+    """Cheap phases use the fast model, unrouted phases the default hierarchy."""
+    print("🧪 Testing default routing policy")
+    router = ModelRouter()
+    assert router.route("design").candidates(HIERARCHY)[0] == FAST_MODEL
+    assert router.route("design").params() == {"max_tokens": 4096}
+    assert router.route("plan").candidates(HIERARCHY) == HIERARCHY
+    assert router.route("plan").params() == {}
+    print("✅ Default routes resolved")
+
+def test_escalation():
+    """After the threshold of Sentry failures the stronger models go first."""
+    print("🧪 Testing escalation")
+    router = ModelRouter()
+    assert not router.route("engineer", failures=1).escalated
+    route = router.route("engineer", failures=router.escalation_threshold)
+    assert route.escalated
+    assert route.candidates(HIERARCHY) == [STRONGEST_MODEL] + HIERARCHY
+    # Phases without escalation targets never escalate
+    assert not router.route("design", failures=10).escalated
+    print("✅ Escalation applied")
+
+def test_policy_file_live_reload():
+    """Edits to the policy file apply on the next lookup; broken edits are ignored."""
+    print("🧪 Testing policy file reload")
+    with tempfile.TemporaryDirectory() as tmp:
+        policy_path = Path(tmp) / "policy.json"
+        policy_path.write_text(json.dumps({
+            "escalation_threshold": 1,
+            "phases": {"engineer": {"models": ["model-a"], "temperature": 0.1}}
+        }))
+        router = ModelRouter(policy_path)
+        assert router.route("engineer").candidates(HIERARCHY) == ["model-a"]
+        assert router.route("engineer").params() == {"temperature": 0.1}
+        assert router.route("design").candidates(HIERARCHY) == HIERARCHY
+
+        policy_path.write_text(json.dumps({"phases": {"engineer": {"models": ["model-b"]}}}))
+        os.utime(policy_path, (1, 1))
+        assert router.route("engineer").candidates(HIERARCHY) == ["model-b"]
+        assert router.escalation_threshold == 2
+
+        policy_path.write_text(json.dumps({"phases": {"engineer": {"models": "model-c"}}}))
+        os.utime(policy_path, (2, 2))
+        assert router.route("engineer").candidates(HIERARCHY) == ["model-b"]
+    print("✅ Policy file reloaded")
+
+def main():
+    """Run all model routing tests."""
+    print("🚀 Model Routing Test Suite")
+    print("=" * 50)
+    test_default_policy()
+    test_escalation()
+    test_policy_file_live_reload()
+    print("\n✅ All model routing tests passed!")
+
+if __name__ == "__main__":
+    main()
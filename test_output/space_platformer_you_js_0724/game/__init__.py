@@ -0,0 +1 @@
+"""Generated by Genesis Engine."""
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Test script for the Sentry offline p5.js cache.
+Verifies CDN URL recognition, checksum-verified vendoring, downloads from
+a local stand-in CDN, offline misses and the Playwright route handler.
+"""
+import asyncio
+import hashlib
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+from aiohttp import web
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from genesis_engine.core.p5_vendor import ROUTE_PATTERN, P5Cache, parse_p5_url
+
+LIBRARY = b"/*! p5.js v1.7.0 */ window.p5 = function () {};"
+
+class FakeRequest:
+    def __init__(self, url):
+        self.url = url
+
+class FakeRoute:
+    def __init__(self, url):
+        self.request = FakeRequest(url)
+        self.fulfilled = None
+        self.continued = False
+
+    async def fulfill(self, **response):
+        self.fulfilled = response
+
+    async def continue_(self):
+        self.continued = True
+
+def test_url_recognition():
+    """cdnjs and jsdelivr p5 URLs map to (version, file); other scripts are left alone."""
+    print("🧪 Testing CDN URL recognition")
+    assert parse_p5_url("https://cdnjs.cloudflare.com/ajax/libs/p5.js/1.7.0/p5.min.js") == ("1.7.0", "p5.min.js")
+    assert parse_p5_url("https://cdnjs.cloudflare.com/ajax/libs/p5.js/1.9.4/addons/p5.sound.min.js") == (
+        "1.9.4", "addons/p5.sound.min.js"
+    )
+    assert parse_p5_url("https://cdn.jsdelivr.net/npm/p5@1.11.1/lib/p5.js") == ("1.11.1", "p5.js")
+    assert parse_p5_url("https://cdn.jsdelivr.net/npm/p5@latest/lib/p5.js") is None
+    assert parse_p5_url("https://cdnjs.cloudflare.com/ajax/libs/jquery/3.7.1/jquery.min.js") is None
+    assert ROUTE_PATTERN.match("https://cdn.jsdelivr.net/npm/p5@1.11.1/lib/p5.js")
+    print("✅ CDN URLs recognized")
+
+def test_checksum_verification():
+    """Vendored files are served only while they match the manifest checksum."""
+    print("🧪 Testing checksum verification")
+    with tempfile.TemporaryDirectory() as tmp:
+        cache = P5Cache(Path(tmp), allow_download=False)
+        digest = cache.store("1.7.0", "p5.min.js", LIBRARY)
+        assert digest == hashlib.sha256(LIBRARY).hexdigest()
+        assert json.loads((Path(tmp) / "manifest.json").read_text()) == {"1.7.0/p5.min.js": digest}
+
+        fresh = P5Cache(Path(tmp), allow_download=False)
+        assert asyncio.run(fresh.get("1.7.0", "p5.min.js")) == LIBRARY and fresh.hits == 1
+
+        (Path(tmp) / "1.7.0" / "p5.min.js").write_bytes(b"tampered")
+        tampered = P5Cache(Path(tmp), allow_download=False)
+        assert asyncio.run(tampered.get("1.7.0", "p5.min.js")) is None
+        assert tampered.checksum_failures == 1 and tampered.misses == 1
+        assert not (Path(tmp) / "1.7.0" / "p5.min.js").exists()
+    print("✅ Corrupted files rejected")
+
+def test_download_and_route():
+    """A miss is downloaded once and vendored; routed requests are fulfilled locally."""
+    print("🧪 Testing downloads and request interception")
+    downloads = []
+
+    async def serve(request):
+        downloads.append(request.match_info["file"])
+        return web.Response(body=LIBRARY, content_type="application/javascript")
+
+    async def run(tmp):
+        app = web.Application()
+        app.router.add_get("/{version}/{file}", serve)
+        runner = web.AppRunner(app)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = site._server.sockets[0].getsockname()[1]
+        try:
+            cache = P5Cache(Path(tmp), source=f"http://127.0.0.1:{port}")
+            routes = [FakeRoute("https://cdnjs.cloudflare.com/ajax/libs/p5.js/1.7.0/p5.min.js") for _ in range(3)]
+            await asyncio.gather(*(cache.handle_route(route) for route in routes))
+            other = FakeRoute("https://cdnjs.cloudflare.com/ajax/libs/p5.js/1.7.0/not-p5.js")
+            await cache.handle_route(other)
+            return cache, routes, other
+        finally:
+            await runner.cleanup()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        cache, routes, other = asyncio.run(run(tmp))
+        assert downloads == ["p5.min.js"]
+        assert all(route.fulfilled["body"] == LIBRARY and route.fulfilled["status"] == 200 for route in routes)
+        assert other.continued and other.fulfilled is None
+        assert (Path(tmp) / "1.7.0" / "p5.min.js").read_bytes() == LIBRARY
+        metrics = cache.metrics()
+        assert metrics["files"] == ["1.7.0/p5.min.js"]
+        assert (metrics["downloads"], metrics["misses"], metrics["hits"]) == (1, 1, 2)
+
+        offline = P5Cache(Path(tmp) / "empty", allow_download=False)
+        route = FakeRoute("https://cdn.jsdelivr.net/npm/p5@1.7.0/lib/p5.min.js")
+        asyncio.run(offline.handle_route(route))
+        assert route.continued
+    print("✅ p5.js served from the local cache")
+
+def main():
+    """Run all p5.js cache tests."""
+    print("🚀 p5.js Cache Test Suite")
+    print("=" * 50)
+    test_url_recognition()
+    test_checksum_verification()
+    test_download_and_route()
+    print("\n✅ All p5.js cache tests passed!")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Test script for Sentry's frame-time performance gate.
+Checks percentile and budget reporting, and (under Node's vm module, as in
+test_sentry_harness.py) that a game whose frames slow down as entities pile
+up fails the gate after simulated play while a light game passes. The
+in-page test is skipped when Node.js is not installed.
+"""
+import json
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from genesis_engine.core.perf_gate import PROFILE, frame_time_report, percentile, perf_errors
+from genesis_engine.core.sentry_harness import VIRTUAL_TIME_SCRIPT, simulation_options
+from test_sentry_harness import NODE_RUNNER, P5_LOOP
+
+# One enemy every 200ms of game time, and every pair compared each frame
+CROWDED_GAME = P5_LOOP + """
+const enemies = [];
+setInterval(() => enemies.push({ x: Math.random() * 800, y: Math.random() * 600 }), 200);
+function draw() {
+  let hits = 0;
+  for (const a of enemies) for (const b of enemies) if (Math.hypot(a.x - b.x, a.y - b.y) < 20) hits++;
+  window.hits = hits;
+}
+"""
+
+LIGHT_GAME = P5_LOOP + """
+let x = 0;
+function draw() { x = (x + 3) % 800; }
+"""
+
+def _profile(game):
+    """Play 60 simulated seconds (at 2 fps to keep the test quick), then time 60 frames."""
+    play = simulation_options(seconds=60, fps=2, wall_limit=20)
+    timed = simulation_options(seconds=1, fps=60, wall_limit=20)
+    scenario = game + f"""
+        setTimeout(() => {{
+          window.__virtualTime.simulate({json.dumps(play)});
+          report(({PROFILE})({json.dumps(timed)}));
+        }}, 50);
+    """
+    result = subprocess.run(
+        ["node", "-e", NODE_RUNNER], input=json.dumps([VIRTUAL_TIME_SCRIPT, scenario]),
+        capture_output=True, text=True, timeout=60
+    )
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def test_frame_time_report():
+    """Nearest-rank percentiles, long frames and the budget verdict."""
+    print("🧪 Testing frame time reports")
+    assert percentile([1, 2, 3, 4], 0.5) == 2 and percentile([1, 2, 3, 4], 0.95) == 4
+    assert percentile([], 0.5) == 0.0
+
+    smooth = frame_time_report([4.0] * 95 + [10.0] * 5, budget_ms=16.7, long_frame_ms=50, max_long_frames=3)
+    assert smooth["p50_ms"] == 4.0 and smooth["p95_ms"] == 4.0 and smooth["p99_ms"] == 10.0
+    assert smooth["within_budget"] and perf_errors(smooth) == []
+
+    slow = frame_time_report([20.0] * 90 + [60.0] * 10, budget_ms=16.7, long_frame_ms=50, max_long_frames=3)
+    assert not slow["within_budget"] and slow["long_frames"] == 10 and slow["max_ms"] == 60.0
+    errors = perf_errors(slow, played_seconds=120)
+    assert len(errors) == 2
+    assert errors[0].startswith("Frames too slow under load after 120s of play: p95 frame time 60.0ms")
+    assert errors[1].startswith("10 frames took longer than 50ms")
+    print("✅ Reports and budget errors")
+
+def test_gate_catches_slowdown_under_load():
+    """Frame times grow with the entities spawned during play; a light game stays fast."""
+    print("🧪 Testing the gate on simulated games")
+    crowded = _profile(CROWDED_GAME)
+    light = _profile(LIGHT_GAME)
+    assert crowded["errors"] == [] and len(crowded["frameMs"]) == 60 and len(light["frameMs"]) == 60
+
+    budget = dict(budget_ms=1.0, long_frame_ms=50, max_long_frames=3)
+    crowded_report = frame_time_report(crowded["frameMs"], **budget)
+    light_report = frame_time_report(light["frameMs"], **budget)
+    assert not crowded_report["within_budget"] and perf_errors(crowded_report, 60)
+    assert light_report["within_budget"]
+    assert crowded_report["p50_ms"] > 10 * max(light_report["p50_ms"], 0.01)
+    print(f"✅ Crowded p95 {crowded_report['p95_ms']}ms vs light p95 {light_report['p95_ms']}ms")
+
+def main():
+    """Run all performance gate tests."""
+    print("🚀 Performance Gate Test Suite")
+    print("=" * 50)
+    test_frame_time_report()
+    if shutil.which("node") is None:
+        print("⚠️  Node.js not found - skipping in-page frame timing tests")
+    else:
+        test_gate_catches_slowdown_under_load()
+    print("\n✅ All performance gate tests passed!")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Test script for the AI Genesis Engine retry policy.
+Verifies full-jitter backoff, the process-wide retry budget, per-session
+retry accounting and how AIClient retries and falls back under them.
+"""
+import asyncio
+import random
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from genesis_engine.core import retry_policy
+from genesis_engine.core.ai_client import AIClient
+from genesis_engine.core.llm_providers import LLMProvider, LLMResponse, ProviderError, ProviderRouter
+from genesis_engine.core.retry_policy import RetryBudget, RetryPolicy, full_jitter, use_retry_account
+
+class FlakyProvider(LLMProvider):
+    """Fails with the given statuses in turn, then answers."""
+
+    name = "flaky"
+
+    def __init__(self, statuses, retry_after=None):
+        self.statuses = list(statuses)
+        self.retry_after = retry_after
+        self.calls = []
+
+    async def complete(self, request):
+        self.calls.append(request.model)
+        if self.statuses:
+            raise ProviderError("upstream trouble", self.name, self.statuses.pop(0), self.retry_after)
+        return LLMResponse("recovered", self.name, request.model)
+
+def _client(provider, policy):
+    retry_policy._retry_policy_instance = policy
+    client = AIClient()
+    client.providers = ProviderRouter([provider], failure_threshold=100, stats={})
+    client.use_mock = False
+    client.model_hierarchy = ["model-a", "model-b"]
+    return client
+
+def _call(client):
+    return asyncio.run(client._make_api_call([{"role": "user", "content": "Make a game"}]))
+
+def test_full_jitter():
+    """Backoff is spread over the whole window, which doubles per attempt up to the cap."""
+    print("🧪 Testing full-jitter backoff")
+    rng = random.Random(7)
+    delays = [full_jitter(3, 1.0, 30.0, rng) for _ in range(500)]
+    assert all(0 <= d <= 8.0 for d in delays)
+    assert min(delays) < 1.0 and max(delays) > 7.0
+    assert all(full_jitter(10, 1.0, 30.0, rng) <= 30.0 for _ in range(100))
+
+    policy = RetryPolicy(RetryBudget(), base_delay=1.0, max_delay=30.0, rng=random.Random(1))
+    assert 5.0 <= policy.delay(1, retry_after=5.0) <= 6.0
+    assert policy.delay(1, retry_after=120.0) is None
+    print("✅ Backoff jittered")
+
+def test_budget_bounds_retries():
+    """Over many requests retries stay within the ratio plus the reserve."""
+    print("🧪 Testing retry budget")
+    budget = RetryBudget(ratio=0.1, reserve=5)
+    granted = 0
+    for _ in range(1000):
+        budget.record_request()
+        # Every request wants two retries, as during an outage
+        granted += sum(budget.try_spend() for _ in range(2))
+    assert granted <= 0.1 * 1000 + 5
+    assert granted >= 0.1 * 1000
+    snapshot = budget.snapshot()
+    assert snapshot["retries"] == granted and snapshot["denied"] == 2000 - granted
+    print(f"✅ {granted} retries granted for 1000 requests")
+
+def test_session_accounting():
+    """A session stops retrying at its own limit even with budget left."""
+    print("🧪 Testing per-session accounting")
+    policy = RetryPolicy(RetryBudget(reserve=100), session_limit=2)
+    account = policy.new_account()
+    assert policy.allow_retry(account) and policy.allow_retry(account)
+    assert not policy.allow_retry(account)
+    assert (account.retries, account.denied) == (2, 1)
+    assert policy.allow_retry(policy.new_account())
+    print("✅ Session retries capped")
+
+def test_client_retries_then_recovers():
+    """Overload errors are retried on the same model with backoff, charged to the session."""
+    print("🧪 Testing client retries")
+    provider = FlakyProvider([503, 529])
+    policy = RetryPolicy(RetryBudget(reserve=10), attempts_per_model=3, base_delay=0.01, max_delay=0.05)
+    client = _client(provider, policy)
+    account = policy.new_account()
+    with use_retry_account(account):
+        assert _call(client) == "recovered"
+    assert provider.calls == ["model-a"] * 3
+    assert (account.requests, account.retries) == (1, 2)
+    assert account.backoff_seconds > 0
+    print("✅ Recovered after two retries")
+
+def test_client_bad_request_skips_model():
+    """A bad request moves straight to the next model without backing off."""
+    print("🧪 Testing model fallback on bad requests")
+    provider = FlakyProvider([400])
+    policy = RetryPolicy(RetryBudget(reserve=10), attempts_per_model=3, base_delay=5.0)
+    client = _client(provider, policy)
+    assert _call(client) == "recovered"
+    assert provider.calls == ["model-a", "model-b"]
+    print("✅ Bad request skipped the model")
+
+def test_client_stops_when_budget_exhausted():
+    """With no budget left a failing call falls back to mock data after one attempt."""
+    print("🧪 Testing exhausted budget")
+    provider = FlakyProvider([503] * 10)
+    policy = RetryPolicy(RetryBudget(ratio=0.1, reserve=0), attempts_per_model=3, base_delay=0.01)
+    client = _client(provider, policy)
+    account = policy.new_account()
+    with use_retry_account(account):
+        response = _call(client)
+    assert response != "recovered" and provider.calls == ["model-a"]
+    assert (account.retries, account.denied) == (0, 1)
+    assert policy.budget.snapshot()["denied"] == 1
+    print("✅ No retries without budget")
+
+def main():
+    """Run all retry policy tests."""
+    print("🚀 Retry Policy Test Suite")
+    print("=" * 50)
+    try:
+        test_full_jitter()
+        test_budget_bounds_retries()
+        test_session_accounting()
+        test_client_retries_then_recovers()
+        test_client_bad_request_skips_model()
+        test_client_stops_when_budget_exhausted()
+    finally:
+        retry_policy._retry_policy_instance = None
+    print("\n✅ All retry policy tests passed!")
+
+if __name__ == "__main__":
+    main()
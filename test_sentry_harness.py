@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Test script for the Sentry browser harness.
+Runs the injected instrumentation under Node's vm module with a minimal
+window/document stand-in (no browser needed) and checks the readiness
+signals Sentry waits on and virtual-time gameplay simulation. Skipped when
+Node.js is not installed.
+"""
+import json
+import shutil
+import subprocess
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from genesis_engine.core.sentry_harness import (
+    READY_SCRIPT, VIRTUAL_TIME_SCRIPT, readiness_errors, simulation_errors, simulation_options
+)
+
+# Builds a vm context that looks enough like a browser window for the harness,
+# runs the harness and then the scenario, and prints the scenario's JSON result.
+NODE_RUNNER = r"""
+const vm = require('vm');
+const [harness, scenario] = JSON.parse(require('fs').readFileSync(0, 'utf8'));
+const win = new EventTarget();
+const doc = new EventTarget();
+const clock = { now: () => performance.now() };
+const sandbox = {
+  performance: clock, console, setTimeout, clearTimeout, setInterval, clearInterval, Promise, Event,
+  requestAnimationFrame: (callback) => setTimeout(() => callback(clock.now()), 16),
+  document: doc,
+  addEventListener: win.addEventListener.bind(win),
+  removeEventListener: win.removeEventListener.bind(win),
+  dispatchEvent: win.dispatchEvent.bind(win),
+  report: (value) => { console.log(JSON.stringify(value)); process.exit(0); }
+};
+sandbox.window = sandbox;
+vm.createContext(sandbox);
+vm.runInContext(harness, sandbox);
+vm.runInContext(scenario, sandbox);
+"""
+
+def _run(scenario: str, harness: str = READY_SCRIPT):
+    result = subprocess.run(
+        ["node", "-e", NODE_RUNNER], input=json.dumps([harness, scenario]),
+        capture_output=True, text=True, timeout=30
+    )
+    assert result.returncode == 0, result.stderr
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+# p5 global mode in miniature: user functions are globals, the library calls them after DOMContentLoaded
+GAME = """
+function setup() { window.setupCalls = (window.setupCalls || 0) + 1; }
+function draw() { if (window.crashAt && window.__sentry.frames + 1 === window.crashAt) throw new Error('enemy is undefined'); }
+function runFrames(n) {
+  setup();
+  for (let i = 0; i < n; i++) {
+    try { draw(); } catch (e) { const event = new Event('error'); event.error = e; dispatchEvent(event); return; }
+  }
+}
+document.dispatchEvent(new Event('DOMContentLoaded'));
+"""
+
+def test_ready_after_frames():
+    """whenReady resolves once setup() and the requested draw() frames have run."""
+    print("🧪 Testing readiness signal")
+    state = _run(GAME + """
+        let resolved = null;
+        window.__sentry.whenReady(3).then((s) => { resolved = s; });
+        runFrames(2);
+        setTimeout(() => {
+          const early = resolved;
+          runFrames(1);
+          setTimeout(() => report({ early, resolved }), 0);
+        }, 0);
+    """)
+    assert state["early"] is None
+    assert state["resolved"]["setupDone"] and state["resolved"]["frames"] == 3
+    assert state["resolved"]["errors"] == [] and state["resolved"]["readyMs"] is not None
+    print("✅ Ready after three frames")
+
+def test_errors_resolve_immediately():
+    """An uncaught error settles the wait at once, tagged with the frame that threw."""
+    print("🧪 Testing early failure")
+    state = _run(GAME + """
+        window.crashAt = 2;
+        window.__sentry.whenReady(60).then((s) => report(s));
+        runFrames(60);
+    """)
+    assert state["frames"] == 1 and state["readyMs"] is None
+    assert state["errors"] == [{"message": "Error: enemy is undefined", "frame": 2}]
+    print("✅ Failure reported without waiting")
+
+# A p5-style loop: frameCount, millis() from performance.now(), draw() per animation frame
+P5_LOOP = """
+window.frameCount = 0;
+const startedAt = performance.now();
+function millis() { return performance.now() - startedAt; }
+function loop() { window.frameCount += 1; draw(); requestAnimationFrame(loop); }
+requestAnimationFrame(loop);
+"""
+
+def test_simulation_reaches_late_bugs():
+    """Two minutes of play run in well under a second; a bug at 30s is found with its frame."""
+    print("🧪 Testing virtual-time simulation")
+    harness = READY_SCRIPT + VIRTUAL_TIME_SCRIPT
+    options = simulation_options(seconds=120, fps=60, wall_limit=10)
+    summary = _run(P5_LOOP + """
+        let level = 1, spawned = 0, ticks = 0;
+        const enemies = [{ speed: 2 }];
+        setInterval(() => { ticks += 1; }, 1000);
+        function draw() {
+          if (millis() > spawned * 2000) { spawned += 1; enemies.push({ speed: 2 }); }
+          if (millis() >= 30000) level = 2;
+          const boss = enemies[level * 100];
+          if (level === 2) boss.speed += 1;
+        }
+        setTimeout(() => {
+          const summary = window.__virtualTime.simulate(OPTIONS);
+          summary.ticks = ticks;
+          report(summary);
+        }, 50);
+    """.replace("OPTIONS", json.dumps(options)), harness)
+    assert summary["errors"], summary
+    error = summary["errors"][0]
+    assert "TypeError" in error["message"]
+    # 30 simulated seconds at 60 fps, plus the few real frames before simulate()
+    assert 1795 <= error["frame"] <= 1810 and 29.5 <= error["seconds"] <= 30.2
+    assert summary["wallMs"] < 2000 and not summary["truncated"]
+    assert 28 <= summary["ticks"] <= 31
+    assert simulation_errors(summary)[0].endswith(f"(frame {error['frame']}, {error['seconds']}s into simulated play)")
+    print(f"✅ Bug at frame {error['frame']} found in {summary['wallMs']}ms")
+
+def test_simulation_of_healthy_game():
+    """A game without bugs plays the full session; a stopped loop ends it early without errors."""
+    print("🧪 Testing healthy and idle simulations")
+    harness = READY_SCRIPT + VIRTUAL_TIME_SCRIPT
+    options = simulation_options(seconds=60, fps=60, wall_limit=10)
+    summary = _run(P5_LOOP + """
+        let x = 0;
+        function draw() { x = (x + 3) % 400; }
+        setTimeout(() => report(window.__virtualTime.simulate(OPTIONS)), 50);
+    """.replace("OPTIONS", json.dumps(options)), harness)
+    assert summary["errors"] == [] and summary["frames"] == 3600 and summary["simulatedSeconds"] == 60
+    assert summary["framesPerSecond"] > 1000
+    assert simulation_errors(summary) == []
+
+    idle = _run("setTimeout(() => report(window.__virtualTime.simulate(OPTIONS)), 50);".replace(
+        "OPTIONS", json.dumps(options)
+    ), harness)
+    assert idle["idle"] and idle["frames"] == 0
+    print(f"✅ 60s simulated at {summary['framesPerSecond']} frames per second")
+
+def test_readiness_errors():
+    """Timeouts are explained by how far the game got."""
+    print("🧪 Testing timeout reporting")
+    assert readiness_errors(None, 3, 5) == ["Sentry instrumentation did not load"]
+    assert readiness_errors({"setupDone": False, "frames": 0, "errors": []}, 3, 5) == [
+        "setup() did not finish within 5s"
+    ]
+    assert readiness_errors({"setupDone": True, "frames": 1, "errors": []}, 3, 2.5) == [
+        "draw() ran only 1 of 3 frames within 2.5s"
+    ]
+    assert readiness_errors({"setupDone": True, "frames": 3, "errors": []}, 3, 5) == []
+    print("✅ Timeouts explained")
+
+def main():
+    """Run all Sentry harness tests."""
+    print("🚀 Sentry Harness Test Suite")
+    print("=" * 50)
+    test_readiness_errors()
+    if shutil.which("node") is None:
+        print("⚠️  Node.js not found - skipping in-page harness tests")
+    else:
+        test_ready_after_frames()
+        test_errors_resolve_immediately()
+        test_simulation_reaches_late_bugs()
+        test_simulation_of_healthy_game()
+    print("\n✅ All Sentry harness tests passed!")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Test script for Sentry's browser warm-up and maintenance.
+Uses the Playwright stand-ins from playwright_fakes.py to check that warm_up()
+runs the warm-up game before any real test, that maintain() relaunches a
+dead browser and recycles one past its test count or age and warms the new
+one, each with hot pages on and off, and that the web server's lifespan starts, probes and shuts down the
+Sentry agent.
+"""
+import asyncio
+import logging
+import sys
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from genesis_engine.config import settings
+from genesis_engine.core import sentry_agent
+from genesis_engine.core.browser_pool import BrowserContextPool
+from genesis_engine.core.sentry_agent import WARM_UP_GAME, SentryAgent
+from playwright_fakes import launcher
+
+async def _agent(browsers):
+    """A SentryAgent whose pool launches fake browsers into ``browsers``."""
+    sentry = SentryAgent(logging.getLogger("test"))
+    sentry.pool = BrowserContextPool(launcher(browsers), 1, prepare=sentry._prepare_context)
+    await sentry.pool.start()
+    return sentry
+
+# How the warm-up game reaches the page, by SENTRY_HOT_PAGES
+WARM_UP_LOADS = {
+    False: [("content", WARM_UP_GAME)],
+    True: [("hot", "Sentry warm-up")],
+}
+
+def _run(run, hot_pages=False):
+    """``asyncio.run(run())`` with hot pages pinned on or off."""
+    saved = settings.sentry_hot_pages
+    settings.sentry_hot_pages = hot_pages
+    try:
+        return asyncio.run(run())
+    finally:
+        settings.sentry_hot_pages = saved
+
+def test_warm_up():
+    """warm_up() loads the warm-up game once in the browser that will run the tests."""
+    print("🧪 Testing warm-up")
+
+    async def run():
+        browsers = []
+        sentry = await _agent(browsers)
+        assert await sentry.warm_up()
+        metrics = sentry.metrics()
+        await sentry.cleanup()
+        return browsers, metrics
+
+    for hot_pages, loads in WARM_UP_LOADS.items():
+        browsers, metrics = _run(run, hot_pages)
+        assert browsers[0].loaded == loads, hot_pages
+        assert metrics["warm_up_ms"] is not None and metrics["browser"]["tests_since_launch"] == 1
+    print(f"✅ Warmed up in {metrics['warm_up_ms']}ms")
+
+def test_maintain_recycles_and_rewarms():
+    """Browsers past their test count or age are replaced and the replacement is warmed."""
+    print("🧪 Testing recycling policies")
+    saved = settings.sentry_browser_max_tests, settings.sentry_browser_max_age, settings.sentry_browser_max_rss_mb
+
+    async def run():
+        browsers = []
+        sentry = await _agent(browsers)
+        await sentry.warm_up()
+        reasons = [await sentry.maintain()]
+
+        settings.sentry_browser_max_tests = 1
+        reasons.append(await sentry.maintain())
+        settings.sentry_browser_max_tests = 0
+        settings.sentry_browser_max_age = 0.01
+        await asyncio.sleep(0.02)
+        reasons.append(await sentry.maintain())
+        metrics = sentry.metrics()["browser"]
+        await sentry.cleanup()
+        return browsers, reasons, metrics
+
+    settings.sentry_browser_max_rss_mb = 0
+    try:
+        browsers, reasons, metrics = _run(run)
+    finally:
+        settings.sentry_browser_max_tests, settings.sentry_browser_max_age, settings.sentry_browser_max_rss_mb = saved
+    assert reasons == [None, "max_tests", "max_age"]
+    assert len(browsers) == 3 and all(browser.loaded == WARM_UP_LOADS[False] for browser in browsers)
+    assert metrics["recycles"] == {"max_tests": 1, "max_age": 1} and metrics["restarts"] == 0
+    print("✅ Recycled by test count and age")
+
+def test_maintain_relaunches_dead_browser():
+    """A browser that died between tests is relaunched and warmed before the next test."""
+    print("🧪 Testing liveness probes")
+
+    async def run():
+        browsers = []
+        sentry = await _agent(browsers)
+        await sentry.warm_up()
+        browsers[0].connected = False
+        reason = await sentry.maintain()
+        metrics = sentry.metrics()["browser"]
+        await sentry.cleanup()
+        return browsers, reason, metrics
+
+    for hot_pages, loads in WARM_UP_LOADS.items():
+        browsers, reason, metrics = _run(run, hot_pages)
+        assert reason is None and metrics["restarts"] == 1
+        assert len(browsers) == 2 and browsers[1].loaded == loads, hot_pages
+    print("✅ Dead browser relaunched and warmed")
+
+def test_server_lifespan():
+    """The server warms the agent up on startup, probes it while running and shuts it down."""
+    print("🧪 Testing the server lifespan")
+    from genesis_engine.web_server import app, lifespan
+    saved = settings.sentry_warm_up, settings.sentry_probe_interval
+
+    async def run():
+        browsers = []
+        sentry = await _agent(browsers)
+        sentry_agent._sentry_instance = sentry
+        async with lifespan(app):
+            assert browsers[0].loaded == WARM_UP_LOADS[False]
+            await asyncio.sleep(0.2)
+            probed = sentry.pool.last_health_check
+        return browsers, probed, sentry_agent._sentry_instance
+
+    settings.sentry_warm_up, settings.sentry_probe_interval = True, 0.05
+    try:
+        browsers, probed, instance = _run(run)
+    finally:
+        settings.sentry_warm_up, settings.sentry_probe_interval = saved
+        sentry_agent._sentry_instance = None
+    assert probed is not None and instance is None and not browsers[0].connected
+    print("✅ Sentry started with the server")
+
+def main():
+    """Run all Sentry warm-up tests."""
+    print("🚀 Sentry Warm-up Test Suite")
+    print("=" * 50)
+    test_warm_up()
+    test_maintain_recycles_and_rewarms()
+    test_maintain_relaunches_dead_browser()
+    test_server_lifespan()
+    print("\n✅ All Sentry warm-up tests passed!")
+
+if __name__ == "__main__":
+    main()
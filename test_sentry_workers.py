@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+Test script for the out-of-process Sentry worker pool.
+Runs real worker processes with a stand-in tester (no browser needed) to
+check that tests spread over the workers, that workers are recycled after
+a number of tests, past an age or above a memory limit, that a crashed worker is
+restarted and its test retried, that a hung test kills its worker, that
+queued tests fail instead of waiting forever, and that
+SentryAgent.validate_game sends browser tests to the pool.
+"""
+import asyncio
+import functools
+import logging
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from genesis_engine.core.sentry_workers import SentryWorkerPool, process_tree_rss
+
+GAME = sorted((Path(__file__).parent / "generated_games").glob("*/game.html"))[0].read_text(encoding="utf-8")
+
+class FakeTester:
+    """Reacts to the 'HTML' it is given: passes, crashes, hangs or holds on to memory."""
+
+    ballast = []
+
+    async def start(self):
+        return "fake/1.0"
+
+    async def test(self, html_content, game_name):
+        if html_content.startswith("crash-once:"):
+            marker = Path(html_content.split(":", 1)[1])
+            if not marker.exists():
+                marker.touch()
+                os._exit(3)
+        elif html_content == "crash":
+            os._exit(3)
+        elif html_content == "hang":
+            await asyncio.sleep(3600)
+        elif html_content == "bloat":
+            FakeTester.ballast.append(bytearray(200 * 1024 * 1024))
+        await asyncio.sleep(0.05)
+        return {"passed": True, "console_errors": [], "runtime_errors": [], "errors": [], "pid": os.getpid()}
+
+    async def close(self):
+        pass
+
+class BrokenTester(FakeTester):
+    """A worker whose browser never starts."""
+
+    async def start(self):
+        return None
+
+class FirstOnlyTester(FakeTester):
+    """Only the first worker gets a browser; every replacement fails to start."""
+
+    def __init__(self, marker):
+        self.marker = Path(marker)
+
+    async def start(self):
+        if self.marker.exists():
+            return None
+        self.marker.touch()
+        return "fake/1.0"
+
+def _run(pool, scenario):
+    """Start ``pool``, run ``scenario(pool)`` and always shut the pool down."""
+    async def run():
+        assert await pool.start()
+        try:
+            return await scenario(pool)
+        finally:
+            await pool.close()
+    return asyncio.run(run())
+
+def test_spread_and_recycle():
+    """Concurrent tests use several processes; workers are replaced after max_tests."""
+    print("🧪 Testing dispatch and recycling by test count")
+
+    async def scenario(pool):
+        first = await asyncio.gather(*(pool.test_in_browser("ok", f"game{i}") for i in range(6)))
+        second = await asyncio.gather(*(pool.test_in_browser("ok", f"again{i}") for i in range(6)))
+        return first, second, pool.metrics()
+
+    pool = SentryWorkerPool(2, slots=2, max_tests=3, tester_factory=FakeTester)
+    first, second, metrics = _run(pool, scenario)
+    assert all(result["passed"] for result in first + second)
+    assert len({result["pid"] for result in first}) == 2 and os.getpid() not in {result["pid"] for result in first}
+    assert len({result["pid"] for result in first + second}) > 2
+    assert metrics["tests"] == 12 and metrics["recycled"]["max_tests"] >= 2 and metrics["crashes"] == 0
+    assert pool.browser_version == "fake/1.0"
+    print(f"✅ 12 tests over {len({result['pid'] for result in first + second})} worker processes")
+
+def test_crash_restart():
+    """A crash restarts the worker and retries its test once; a second crash is reported."""
+    print("🧪 Testing crash restarts")
+
+    async def scenario(pool):
+        with tempfile.TemporaryDirectory() as directory:
+            recovered = await pool.test_in_browser(f"crash-once:{directory}/crashed", "flaky")
+        failed = await pool.test_in_browser("crash", "broken")
+        after = await pool.test_in_browser("ok", "next")
+        return recovered, failed, after, pool.metrics()
+
+    recovered, failed, after, metrics = _run(SentryWorkerPool(1, tester_factory=FakeTester), scenario)
+    assert recovered["passed"] and after["passed"]
+    assert not failed["passed"] and failed["infrastructure_error"]
+    assert failed["errors"][0].startswith("Sentry worker crashed while testing")
+    assert metrics["crashes"] == 3 and metrics["retries"] == 2
+    print("✅ Crashed workers restarted")
+
+def test_hung_test_kills_worker():
+    """A test past the timeout fails and its worker is replaced."""
+    print("🧪 Testing hung tests")
+
+    async def scenario(pool):
+        started = time.monotonic()
+        hung = await pool.test_in_browser("hang", "stuck")
+        elapsed = time.monotonic() - started
+        return hung, elapsed, await pool.test_in_browser("ok", "next"), pool.metrics()
+
+    hung, elapsed, after, metrics = _run(SentryWorkerPool(1, test_timeout=1.0, tester_factory=FakeTester), scenario)
+    assert hung["errors"] == ["Browser test timed out after 1s"] and hung["infrastructure_error"]
+    assert elapsed < 5 and after["passed"] and metrics["timeouts"] == 1 and metrics["crashes"] == 0
+    print(f"✅ Hung test failed after {elapsed:.1f}s")
+
+def test_memory_recycling():
+    """A worker holding more than max_rss_mb is recycled."""
+    print("🧪 Testing recycling by memory")
+
+    async def scenario(pool):
+        bloated = await pool.test_in_browser("bloat", "bloat")
+        for _ in range(20):
+            if pool.recycled.get("max_rss"):
+                break
+            await asyncio.sleep(0.25)
+        after = await pool.test_in_browser("ok", "next")
+        return bloated, after, pool.metrics()
+
+    bloated, after, metrics = _run(SentryWorkerPool(1, max_rss_mb=150, tester_factory=FakeTester), scenario)
+    assert metrics["recycled"] == {"max_rss": 1} and after["pid"] != bloated["pid"]
+    assert process_tree_rss(os.getpid()) > 0
+    print("✅ Bloated worker recycled")
+
+def test_age_recycling():
+    """A worker older than max_age is replaced."""
+    print("🧪 Testing recycling by age")
+
+    async def scenario(pool):
+        first = await pool.test_in_browser("ok", "first")
+        for _ in range(40):
+            if pool.recycled.get("max_age") and pool.ready_workers:
+                break
+            await asyncio.sleep(0.25)
+        return first, await pool.test_in_browser("ok", "next"), pool.metrics()
+
+    first, after, metrics = _run(SentryWorkerPool(1, max_age=1.0, tester_factory=FakeTester), scenario)
+    assert metrics["recycled"].get("max_age", 0) >= 1 and after["pid"] != first["pid"]
+    print("✅ Old worker recycled")
+
+def test_start_failure():
+    """A pool whose workers cannot start a browser reports failure instead of hanging."""
+    print("🧪 Testing start failure")
+
+    async def run():
+        pool = SentryWorkerPool(2, tester_factory=BrokenTester, startup_timeout=30)
+        started = time.monotonic()
+        ok = await pool.start()
+        await pool.close()
+        return ok, time.monotonic() - started
+
+    ok, elapsed = asyncio.run(run())
+    assert not ok and elapsed < 20
+    print(f"✅ Start failure detected in {elapsed:.1f}s")
+
+def test_queued_tests_fail():
+    """Tests no worker can take fail: past the queue deadline, or at once with no worker left."""
+    print("🧪 Testing queue deadlines")
+
+    async def stuck(pool):
+        hung = asyncio.ensure_future(pool.test_in_browser("hang", "stuck"))
+        await asyncio.sleep(0.5)
+        started = time.monotonic()
+        queued = await pool.test_in_browser("ok", "queued")
+        elapsed = time.monotonic() - started
+        await hung
+        return queued, elapsed, pool.metrics()
+
+    pool = SentryWorkerPool(1, test_timeout=4.0, queue_timeout=1.0, tester_factory=FakeTester)
+    queued, elapsed, metrics = _run(pool, stuck)
+    assert queued["errors"] == ["No Sentry worker started the test within 1s"] and queued["infrastructure_error"]
+    assert elapsed < 3 and metrics["queue_timeouts"] == 1
+
+    async def no_workers(pool):
+        first = await pool.test_in_browser("ok", "first")
+        # The first worker retires after its one test and its replacement cannot start
+        for _ in range(40):
+            if pool.start_failures and not any(worker.process.is_alive() for worker in pool._workers.values()):
+                break
+            await asyncio.sleep(0.25)
+        started = time.monotonic()
+        second = await pool.test_in_browser("ok", "second")
+        return first, second, time.monotonic() - started, pool.metrics()
+
+    with tempfile.TemporaryDirectory() as directory:
+        tester = functools.partial(FirstOnlyTester, f"{directory}/started")
+        pool = SentryWorkerPool(1, max_tests=1, tester_factory=tester)
+        first, second, waited, metrics = _run(pool, no_workers)
+    assert first["passed"] and not second["passed"] and second["infrastructure_error"]
+    assert second["errors"] == ["No Sentry worker could be started to run the browser test"]
+    assert waited < 10 and metrics["start_failures"] >= 1
+    print(f"✅ Queued tests failed after {elapsed:.1f}s and {waited:.1f}s")
+
+def test_sentry_agent_uses_workers():
+    """validate_game runs the browser test in a worker and keeps the static checks in process."""
+    print("🧪 Testing SentryAgent with workers")
+    from genesis_engine.core import sentry_agent
+    from genesis_engine.core.sentry_agent import SentryAgent
+
+    async def run():
+        sentry = SentryAgent(logging.getLogger("test"))
+        sentry.cache = None
+        sentry.workers = SentryWorkerPool(1, tester_factory=FakeTester)
+        assert await sentry.workers.start()
+        try:
+            return await sentry.validate_game(GAME, "worker_game"), sentry.metrics()
+        finally:
+            await sentry.cleanup()
+
+    available = sentry_agent.PLAYWRIGHT_AVAILABLE
+    sentry_agent.PLAYWRIGHT_AVAILABLE = True
+    try:
+        results, metrics = asyncio.run(run())
+    finally:
+        sentry_agent.PLAYWRIGHT_AVAILABLE = available
+    assert results["success"] and results["browser_test_passed"] and results["syntax_valid"]
+    assert metrics["workers"]["tests"] == 1 and metrics["browser"] is None
+    print("✅ Browser test ran out of process")
+
+def main():
+    """Run all Sentry worker pool tests."""
+    print("🚀 Sentry Worker Pool Test Suite")
+    print("=" * 50)
+    test_spread_and_recycle()
+    test_crash_restart()
+    test_hung_test_kills_worker()
+    test_memory_recycling()
+    test_age_recycling()
+    test_start_failure()
+    test_queued_tests_fail()
+    test_sentry_agent_uses_workers()
+    print("\n✅ All Sentry worker pool tests passed!")
+
+if __name__ == "__main__":
+    main()
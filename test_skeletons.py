@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Test script for the AI Genesis Engine genre skeletons.
+Verifies genre classification, the Architect's genre pick, config
+validation and skeleton rendering.
+"""
+import asyncio
+import json
+import re
+import sys
+import tempfile
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from genesis_engine.core.logger import EngineLogger
+from genesis_engine.core.multi_agent_system import MultiAgentOrchestrator
+from genesis_engine.core.skeletons import SKELETONS, classify_genre, get_skeleton
+from genesis_engine.core.static_analyzer import analyze_game
+
+def test_classify_genre():
+    """Prompts map to the matching skeleton, unrelated ones to None."""
+    print("🧪 Testing genre classification")
+    assert classify_genre("A space shooter with alien invaders") == "space_shooter"
+    assert classify_genre("A platformer where you jump between ledges") == "platformer"
+    assert classify_genre("Match-3 puzzle with falling gems") == "puzzle"
+    assert classify_genre("Bouncing ball physics toy") == "bouncing_ball"
+    assert classify_genre("A card game about cooking") is None
+    # A single GDD hit is not enough on its own
+    assert classify_genre("A cooking game", "Chop vegetables, avoid the ball") is None
+    print("✅ Genres classified")
+
+def test_architect_picks_genre():
+    """The structured GDD's genre wins over keywords, which only back up a markdown GDD."""
+    print("🧪 Testing the Architect's genre pick")
+    with tempfile.TemporaryDirectory() as tmp:
+        orchestrator = MultiAgentOrchestrator(EngineLogger())
+        orchestrator.ai_client.generate_skeleton_config = lambda *args: {}
+        prompt = "A space shooter with alien invaders"
+
+        def plan(game_design, document="# GDD"):
+            session = asyncio.run(orchestrator.start_generation_session(prompt, Path(tmp), "genre", "skeleton"))
+            session.game_design, session.game_design_document = game_design, document
+            return asyncio.run(orchestrator._generate_skeleton_plan(session)), session.skeleton_genre
+
+        assert plan({"title": "Falling Gems", "genre": "puzzle"}) == (True, "puzzle")
+        assert plan({"title": "Star Chef", "genre": None}) == (False, None)
+        assert plan({"title": "Odd", "genre": "racing"}) == (False, None)
+        assert plan(None) == (True, "space_shooter")
+    print("✅ Genre taken from the Architect's design")
+
+def test_validate_config():
+    """LLM configs are clamped, type-checked and stripped of unknown keys."""
+    print("🧪 Testing config validation")
+    skeleton = get_skeleton("space_shooter")
+    config = skeleton.validate_config({
+        "title": "  Star   Raiders ",
+        "player": {"speed": 999, "lives": "4"},
+        "colors": {"enemy": "red", "player": "#00ff00"},
+        "unknown": {"value": 1}
+    })
+    assert config["title"] == "Star Raiders"
+    assert config["player"]["speed"] == 15
+    assert config["player"]["lives"] == 4
+    assert config["colors"]["enemy"] == skeleton.defaults()["colors"]["enemy"]
+    assert config["colors"]["player"] == "#00ff00"
+    assert "unknown" not in config
+    assert skeleton.validate_config(None) == skeleton.defaults()
+
+    puzzle = get_skeleton("puzzle")
+    assert puzzle.validate_config({"colors": {"blocks": ["#fff"]}})["colors"]["blocks"] == puzzle.defaults()["colors"]["blocks"]
+    print("✅ Configs validated")
+
+def test_render_all_skeletons():
+    """Every skeleton renders into a game that passes Sentry's syntax checks."""
+    print("🧪 Testing skeleton rendering")
+    for genre, skeleton in SKELETONS.items():
+        html = skeleton.render({"title": "Evil </script><script>alert(1)</script>"})
+        assert "__GAME_CONFIG__" not in html and "__GAME_TITLE__" not in html
+        assert "</script><script>alert" not in html
+        assert analyze_game(html).syntax_valid, genre
+
+        config_json = re.search(r'const CONFIG = (\{.*?\n        \});', html, re.DOTALL).group(1)
+        assert json.loads(config_json.replace("<\\/", "</"))["title"].startswith("Evil")
+        assert set(skeleton.schema()["properties"]) == set(skeleton.defaults())
+    print("✅ All skeletons render")
+
+def main():
+    """Run all skeleton tests."""
+    print("🚀 Genre Skeleton Test Suite")
+    print("=" * 50)
+    test_classify_genre()
+    test_architect_picks_genre()
+    test_validate_config()
+    test_render_all_skeletons()
+    print("\n✅ All skeleton tests passed!")
+
+if __name__ == "__main__":
+    main()
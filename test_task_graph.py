@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+Test script for the AI Genesis Engine task graph executor.
+Verifies dependency ordering, concurrency limits, retries, critical path
+export, tasks added while the graph runs and the per-step session graph.
+"""
+import asyncio
+import sys
+import tempfile
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from genesis_engine.core.logger import EngineLogger
+from genesis_engine.core.multi_agent_system import MultiAgentOrchestrator
+from genesis_engine.core.task_graph import (
+    AgentRole, AgentTask, TaskFailed, TaskGraphExecutor, TaskStatus
+)
+
+def _sleeping_task(task_id: str, role: AgentRole, delay: float, deps=None, log=None) -> AgentTask:
+    async def handler(task):
+        if log is not None:
+            log.append(("start", task.id))
+        await asyncio.sleep(delay)
+        if log is not None:
+            log.append(("end", task.id))
+        return {"slept": delay}
+
+    return AgentTask(
+        id=task_id,
+        agent_role=role,
+        task_type="sleep",
+        description=f"Sleep {delay}s",
+        input_data={},
+        dependencies=deps or [],
+        handler=handler,
+        max_retries=0
+    )
+
+def test_independent_tasks_run_concurrently():
+    """Independent tasks overlap, dependent tasks wait."""
+    print("🧪 Testing concurrent execution of independent tasks")
+    log = []
+    executor = TaskGraphExecutor()
+    executor.add_tasks([
+        _sleeping_task("design", AgentRole.ARCHITECT, 0.05, log=log),
+        _sleeping_task("engineer_a", AgentRole.ENGINEER, 0.1, ["design"], log),
+        _sleeping_task("engineer_b", AgentRole.ENGINEER, 0.1, ["design"], log),
+        _sleeping_task("sentry", AgentRole.SENTRY, 0.05, ["engineer_a", "engineer_b"], log),
+    ])
+
+    assert asyncio.run(executor.run())
+    assert log.index(("end", "design")) < log.index(("start", "engineer_a"))
+    assert log.index(("start", "engineer_b")) < log.index(("end", "engineer_a"))
+    assert executor.export()["wall_time"] < 0.35
+    print("✅ Independent tasks ran concurrently")
+
+def test_role_concurrency_limit():
+    """A role limit of one serializes that role's tasks."""
+    print("🧪 Testing per-role concurrency limits")
+    log = []
+    executor = TaskGraphExecutor(role_concurrency={AgentRole.SENTRY: 1})
+    executor.add_tasks([
+        _sleeping_task("sentry_a", AgentRole.SENTRY, 0.05, log=log),
+        _sleeping_task("sentry_b", AgentRole.SENTRY, 0.05, log=log),
+    ])
+
+    assert asyncio.run(executor.run())
+    first_end = min(log.index(("end", "sentry_a")), log.index(("end", "sentry_b")))
+    second_start = max(log.index(("start", "sentry_a")), log.index(("start", "sentry_b")))
+    assert first_end < second_start
+    print("✅ Sentry tasks were serialized")
+
+def test_retries_and_skipped_dependents():
+    """Failing tasks retry, and their dependents are skipped."""
+    print("🧪 Testing retries and dependency failure propagation")
+    attempts = {"flaky": 0}
+
+    async def flaky(task):
+        attempts["flaky"] += 1
+        if attempts["flaky"] < 3:
+            raise TaskFailed("transient failure")
+        return {"attempts": attempts["flaky"]}
+
+    async def broken(task):
+        raise TaskFailed("always fails")
+
+    executor = TaskGraphExecutor()
+    executor.add_tasks([
+        AgentTask(id="flaky", agent_role=AgentRole.ENGINEER, task_type="flaky",
+                  description="Succeeds on third attempt", input_data={},
+                  handler=flaky, max_retries=3),
+        AgentTask(id="broken", agent_role=AgentRole.DEBUGGER, task_type="broken",
+                  description="Never succeeds", input_data={},
+                  handler=broken, max_retries=1),
+        _sleeping_task("after_broken", AgentRole.SENTRY, 0.0, ["broken"]),
+    ])
+
+    assert not asyncio.run(executor.run())
+    assert executor.tasks["flaky"].status == TaskStatus.SUCCESS
+    assert executor.tasks["flaky"].retry_count == 2
+    assert executor.tasks["broken"].status == TaskStatus.ERROR
+    assert executor.tasks["broken"].retry_count == 1
+    assert executor.tasks["after_broken"].status == TaskStatus.SKIPPED
+    print("✅ Retries and skipped dependents behave correctly")
+
+def test_critical_path_export():
+    """The exported profile names the longest dependency chain."""
+    print("🧪 Testing critical path export")
+    executor = TaskGraphExecutor()
+    executor.add_tasks([
+        _sleeping_task("design", AgentRole.ARCHITECT, 0.02),
+        _sleeping_task("fast", AgentRole.ENGINEER, 0.01, ["design"]),
+        _sleeping_task("slow", AgentRole.ENGINEER, 0.08, ["design"]),
+        _sleeping_task("sentry", AgentRole.SENTRY, 0.01, ["fast", "slow"]),
+    ])
+    asyncio.run(executor.run())
+
+    profile = executor.export()
+    assert profile["critical_path"] == ["design", "slow", "sentry"]
+    assert len(profile["traceEvents"]) == 4
+    print(f"✅ Critical path: {' → '.join(profile['critical_path'])}")
+
+def test_cycle_detection():
+    """Cyclic graphs are rejected before anything runs."""
+    print("🧪 Testing cycle detection")
+    executor = TaskGraphExecutor()
+    executor.add_tasks([
+        _sleeping_task("a", AgentRole.ENGINEER, 0.0, ["b"]),
+        _sleeping_task("b", AgentRole.ENGINEER, 0.0, ["a"]),
+    ])
+    try:
+        asyncio.run(executor.run())
+    except ValueError as e:
+        print(f"✅ Cycle rejected: {e}")
+        return
+    raise AssertionError("Cycle was not detected")
+
+def test_tasks_added_while_running():
+    """A handler can add follow-up tasks, and run() waits for them."""
+    print("🧪 Testing tasks added while the graph runs")
+    executor = TaskGraphExecutor()
+
+    async def step(task):
+        count = task.input_data["count"]
+        if count < 3:
+            executor.add_task(AgentTask(
+                id=f"step_{count + 1}", agent_role=AgentRole.ENGINEER, task_type="step",
+                description="Next step", input_data={"count": count + 1},
+                dependencies=[task.id], handler=step, max_retries=0
+            ))
+        await asyncio.sleep(0.01)
+        return {"count": count}
+
+    executor.add_task(AgentTask(id="step_1", agent_role=AgentRole.ENGINEER, task_type="step",
+                                description="First step", input_data={"count": 1},
+                                handler=step, max_retries=0))
+    assert asyncio.run(executor.run())
+    assert [task.id for task in executor.topological_order()] == ["step_1", "step_2", "step_3"]
+    assert executor.export()["critical_path"] == ["step_1", "step_2", "step_3"]
+    print("✅ Follow-up tasks ran in order")
+
+def _run_standard_session(sentry_passes):
+    """Run a standard session with stubbed agents; Sentry passes on the listed cycles."""
+    calls = {"design": 0, "debugger": 0}
+    with tempfile.TemporaryDirectory() as tmp:
+        orchestrator = MultiAgentOrchestrator(EngineLogger())
+
+        async def run():
+            session = await orchestrator.start_generation_session(
+                "a pong game", Path(tmp), "graph", "standard"
+            )
+
+            async def design(session):
+                calls["design"] += 1
+                if calls["design"] == 1:
+                    raise RuntimeError("rate limited")
+                session.game_design_document = "# GDD"
+
+            async def plan(session):
+                session.technical_plan = {"content": "# Plan"}
+
+            async def nothing(session, *args):
+                return None
+
+            async def engineer(session):
+                session.generated_code = f"<!-- cycle {session.debug_cycles} -->"
+                return True
+
+            async def sentry(session):
+                return {"success": session.debug_cycles in sentry_passes, "errors": ["ReferenceError"]}
+
+            async def debugger(session, test_results):
+                calls["debugger"] += 1
+                return True
+
+            orchestrator._generate_design_document = design
+            orchestrator._generate_technical_plan = plan
+            orchestrator._save_planning_documents = nothing
+            orchestrator._save_final_game = nothing
+            orchestrator._execute_engineer_phase = engineer
+            orchestrator._execute_sentry_phase = sentry
+            orchestrator._execute_debugger_phase = debugger
+            return await orchestrator.process_session("graph"), session
+
+        success, session = asyncio.run(run())
+    return success, session, calls
+
+def test_standard_session_steps():
+    """Each Engineer, Sentry and Debugger step of a standard session is its own task."""
+    print("🧪 Testing the standard session graph")
+    success, session, calls = _run_standard_session({2})
+    tasks = {task["id"]: task for task in session.task_graph["tasks"]}
+    assert success and session.debug_cycles == 2
+    assert list(tasks) == [
+        "design_document", "technical_plan", "save_planning_documents",
+        "engineer_1", "sentry_1", "debugger_1", "engineer_2", "sentry_2"
+    ]
+    assert tasks["design_document"]["retries"] == 1 and calls["design"] == 2
+    assert tasks["sentry_1"]["role"] == "sentry" and tasks["debugger_1"]["role"] == "debugger"
+    assert tasks["engineer_2"]["dependencies"] == ["debugger_1"]
+    assert session.task_graph["critical_path"][-3:] == ["debugger_1", "engineer_2", "sentry_2"]
+
+    success, session, calls = _run_standard_session(set())
+    tasks = {task["id"]: task for task in session.task_graph["tasks"]}
+    assert not success and session.debug_cycles == 3
+    assert tasks["sentry_3"]["status"] == "error" and "debugger_3" not in tasks
+    assert calls["debugger"] == 2
+    print("✅ Session steps ran as separate tasks")
+
+def main():
+    """Run all task graph tests."""
+    print("🚀 Task Graph Executor Test Suite")
+    print("=" * 50)
+    test_independent_tasks_run_concurrently()
+    test_role_concurrency_limit()
+    test_retries_and_skipped_dependents()
+    test_critical_path_export()
+    test_cycle_detection()
+    test_tasks_added_while_running()
+    test_standard_session_steps()
+    print("\n✅ All task graph tests passed!")
+
+if __name__ == "__main__":
+    main()
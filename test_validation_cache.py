@@ -0,0 +1,121 @@
+#!/usr/bin/env python3
+"""
+Test script for Sentry's validation result cache.
+Checks the cache key, LRU eviction, the on-disk store across cache
+instances, and that SentryAgent.validate_game answers repeated HTML from
+the cache without revalidating, but never caches a browser that failed.
+"""
+import asyncio
+import logging
+import sys
+import tempfile
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from genesis_engine.config import settings
+from genesis_engine.core.sentry_agent import SentryAgent
+from genesis_engine.core.validation_cache import ValidationCache, validation_key
+
+ROOT = Path(__file__).parent
+GAME = sorted(ROOT.glob("generated_games/*/game.html"))[0].read_text(encoding="utf-8")
+
+def test_key():
+    """The key changes with the HTML, the rule set and the browser."""
+    print("🧪 Testing cache keys")
+    key = validation_key(GAME, "rules-1", "chromium/120.0")
+    assert key == validation_key(GAME, "rules-1", "chromium/120.0") and len(key) == 64
+    assert key != validation_key(GAME + " ", "rules-1", "chromium/120.0")
+    assert key != validation_key(GAME, "rules-2", "chromium/120.0")
+    assert key != validation_key(GAME, "rules-1", "chromium/121.0")
+    assert validation_key("ab", "c", "d") != validation_key("a", "bc", "d")
+    print("✅ Keys cover content, rules and browser")
+
+def test_lru():
+    """The least recently used entry is evicted; returned results are copies."""
+    print("🧪 Testing the in-memory LRU")
+    cache = ValidationCache(max_entries=2)
+    cache.put("a", {"errors": []})
+    cache.put("b", {"errors": []})
+    cache.get("a")["errors"].append("changed by a caller")
+    cache.put("c", {"errors": []})
+    assert cache.get("b") is None
+    assert cache.get("a") == {"errors": []} and cache.get("c") == {"errors": []}
+    assert cache.metrics()["entries"] == 2 and cache.metrics()["hits"] == 3 and cache.metrics()["misses"] == 1
+    print("✅ Evicted in LRU order")
+
+def test_disk_store():
+    """Entries survive a new cache instance; unreadable files are dropped."""
+    print("🧪 Testing the on-disk store")
+    with tempfile.TemporaryDirectory() as directory:
+        key = validation_key(GAME, "rules", "static")
+        ValidationCache(cache_dir=Path(directory)).put(key, {"success": True, "errors": []})
+
+        restarted = ValidationCache(cache_dir=Path(directory))
+        assert restarted.get(key) == {"success": True, "errors": []}
+        assert restarted.metrics()["disk_hits"] == 1
+        assert restarted.get(key) and restarted.metrics()["disk_hits"] == 1
+
+        broken = validation_key("other", "rules", "static")
+        path = Path(directory) / broken[:2] / f"{broken}.json"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        path.write_text("{not json", encoding="utf-8")
+        assert ValidationCache(cache_dir=Path(directory)).get(broken) is None and not path.exists()
+    print("✅ Persisted across restarts")
+
+def test_validate_game_uses_cache():
+    """A repeat of the same HTML is answered from the cache; the rule set is part of the key."""
+    print("🧪 Testing validate_game caching")
+    sentry = SentryAgent(logging.getLogger("test"))
+    runs = []
+    validate = sentry._validate
+
+    async def counting(*args):
+        runs.append(args[1])
+        return await validate(*args)
+
+    sentry._validate = counting
+    first = asyncio.run(sentry.validate_game(GAME, "first", static_only=True))
+    second = asyncio.run(sentry.validate_game(GAME, "second", static_only=True))
+    assert runs == ["first"] and not first["cached"] and second["cached"]
+    assert {**second, "cached": False} == first
+
+    seed = settings.sentry_fuzz_seed
+    settings.sentry_fuzz_seed = seed + 1
+    try:
+        asyncio.run(sentry.validate_game(GAME, "reseeded", static_only=True))
+    finally:
+        settings.sentry_fuzz_seed = seed
+    assert runs == ["first", "reseeded"]
+    print("✅ Repeats served from the cache")
+
+def test_infrastructure_errors_not_cached():
+    """A browser that failed to run the game does not poison the cache."""
+    print("🧪 Testing uncached browser failures")
+    sentry = SentryAgent(logging.getLogger("test"))
+    runs = []
+
+    async def failing(html, game_name, static_only):
+        runs.append(game_name)
+        return {"success": False, "errors": ["Browser testing failed: crashed"], "infrastructure_error": True}
+
+    sentry._validate = failing
+    asyncio.run(sentry.validate_game(GAME, "one", static_only=True))
+    asyncio.run(sentry.validate_game(GAME, "two", static_only=True))
+    assert runs == ["one", "two"] and sentry.metrics()["validation_cache"]["entries"] == 0
+    print("✅ Failures retried")
+
+def main():
+    """Run all validation cache tests."""
+    print("🚀 Validation Cache Test Suite")
+    print("=" * 50)
+    test_key()
+    test_lru()
+    test_disk_store()
+    test_validate_game_uses_cache()
+    test_infrastructure_errors_not_cached()
+    print("\n✅ All validation cache tests passed!")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Test script for the AI Genesis Engine multi-variant generation.
+Verifies the variant task graph, the shared Architect output and primary
+variant selection.
+"""
+import asyncio
+import sys
+import tempfile
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from genesis_engine.config import settings
+from genesis_engine.core.logger import EngineLogger
+from genesis_engine.core.multi_agent_system import MultiAgentOrchestrator
+from genesis_engine.core.task_graph import TaskGraphExecutor
+
+async def _start(orchestrator, project_path, variants, mode="standard"):
+    return await orchestrator.start_generation_session(
+        "a space shooter with asteroids", project_path, "variants", mode, variants=variants
+    )
+
+def test_variant_task_graph():
+    """One Architect pass fans out into a task per variant and a selection step."""
+    print("🧪 Testing variant task graph")
+    with tempfile.TemporaryDirectory() as tmp:
+        orchestrator = MultiAgentOrchestrator(EngineLogger())
+        session = asyncio.run(_start(orchestrator, Path(tmp), 3))
+        tasks = {task.id: task for task in orchestrator._build_session_tasks(session, TaskGraphExecutor())}
+        assert "autonomous_loop" not in tasks
+        assert [task_id for task_id in tasks if task_id.startswith("variant_")] == ["variant_1", "variant_2", "variant_3"]
+        assert tasks["variant_2"].dependencies == ["technical_plan"]
+        assert tasks["select_variant"].dependencies == ["variant_1", "variant_2", "variant_3"]
+
+        assert asyncio.run(_start(orchestrator, Path(tmp), 99)).variant_count == settings.max_variants
+        assert asyncio.run(_start(orchestrator, Path(tmp), 3, "incremental")).variant_count == 1
+    print("✅ Variant tasks built")
+
+def test_variant_sessions_share_plan():
+    """Variants reuse the parent's design and plan and spread their temperatures."""
+    print("🧪 Testing variant sessions")
+    with tempfile.TemporaryDirectory() as tmp:
+        orchestrator = MultiAgentOrchestrator(EngineLogger())
+        session = asyncio.run(_start(orchestrator, Path(tmp) / "shooter", 3))
+        session.game_design_document = "# GDD"
+        session.technical_plan = {"content": "# Plan"}
+
+        variants = [orchestrator._create_variant_session(session, number) for number in (1, 2, 3)]
+        assert [v.variant_temperature for v in variants] == [
+            settings.variant_temperature_min,
+            round((settings.variant_temperature_min + settings.variant_temperature_max) / 2, 2),
+            settings.variant_temperature_max
+        ]
+        assert all(v.technical_plan is session.technical_plan for v in variants)
+        assert variants[1].project_path == Path(tmp) / "shooter" / "shooter_v2"
+        assert variants[1].project_path.is_dir()
+        assert sorted(session.variants) == [1, 2, 3]
+    print("✅ Variant sessions share the Architect output")
+
+def test_select_primary_variant():
+    """The passing variant with the fewest debug cycles becomes the session's game."""
+    print("🧪 Testing primary variant selection")
+    with tempfile.TemporaryDirectory() as tmp:
+        orchestrator = MultiAgentOrchestrator(EngineLogger())
+        session = asyncio.run(_start(orchestrator, Path(tmp) / "shooter", 3))
+        session.technical_plan = {"content": "# Plan"}
+        for number, (passed, cycles) in enumerate([(True, 3), (True, 1), (False, 1)], 1):
+            variant = orchestrator._create_variant_session(session, number)
+            variant.is_complete, variant.debug_cycles = passed, cycles
+            variant.generated_code = f"<!-- variant {number} -->"
+
+        primary = asyncio.run(orchestrator._select_primary_variant(session))
+        assert primary.variant_number == 2
+        assert (session.project_path / "game.html").read_text() == "<!-- variant 2 -->"
+        assert "**Variants**: 2 of 3 passed" in (session.project_path / "README.md").read_text()
+
+        status = orchestrator.get_session_status("variants")
+        assert [v["passed"] for v in status["variants"]] == [True, True, False]
+
+        for variant in session.variants.values():
+            variant.is_complete = False
+        assert asyncio.run(orchestrator._select_primary_variant(session)) is None
+    print("✅ Primary variant selected")
+
+def main():
+    """Run all multi-variant generation tests."""
+    print("🚀 Multi-Variant Generation Test Suite")
+    print("=" * 50)
+    test_variant_task_graph()
+    test_variant_sessions_share_plan()
+    test_select_primary_variant()
+    print("\n✅ All multi-variant generation tests passed!")
+
+if __name__ == "__main__":
+    main()
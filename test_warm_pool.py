@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Test script for the AI Genesis Engine warm pool.
+Verifies rate-limit headroom tracking, gated refills, claiming games,
+staleness eviction and metrics.
+"""
+import asyncio
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+# Add src to path
+sys.path.insert(0, str(Path(__file__).parent / "src"))
+
+from genesis_engine.core import rate_limits
+from genesis_engine.core.rate_limits import RateLimitTracker
+from genesis_engine.core.warm_pool import WarmPool
+
+PROMPT = "A space shooter where you dodge asteroids and collect power-ups"
+
+def _fake_generator(calls):
+    async def generate(prompt, output_dir, generation_mode):
+        calls.append((prompt, generation_mode))
+        project_path = Path(output_dir) / f"game_{len(calls)}"
+        project_path.mkdir(parents=True)
+        (project_path / "game.html").write_text(f"<!-- {prompt} -->")
+        return {"success": True, "project_path": str(project_path), "game_file": str(project_path / "game.html")}
+    return generate
+
+def _limit_headers(remaining, limit, reset):
+    return {
+        "anthropic-ratelimit-requests-limit": str(limit),
+        "anthropic-ratelimit-requests-remaining": str(remaining),
+        "anthropic-ratelimit-requests-reset": reset.isoformat().replace("+00:00", "Z")
+    }
+
+def test_rate_limit_tracker():
+    """Headroom is the tightest limit, zero after a 429, full again after reset."""
+    print("🧪 Testing rate limit headroom")
+    tracker = RateLimitTracker()
+    assert tracker.headroom() == 1.0
+
+    future = datetime.now(timezone.utc) + timedelta(minutes=1)
+    tracker.observe({
+        **_limit_headers(40, 50, future),
+        "anthropic-ratelimit-tokens-limit": "10000",
+        "anthropic-ratelimit-tokens-remaining": "2500"
+    })
+    assert tracker.headroom() == 0.25
+    assert tracker.snapshot() == {"requests": 0.8, "tokens": 0.25}
+
+    tracker = RateLimitTracker()
+    tracker.observe(_limit_headers(0, 50, datetime.now(timezone.utc) - timedelta(seconds=1)))
+    assert tracker.headroom() == 1.0
+
+    tracker.observe({"Retry-After": "30"}, status=429)
+    assert tracker.headroom() == 0.0
+    print("✅ Headroom tracked")
+
+def test_refill_is_gated():
+    """Refills wait for idle capacity and rate-limit headroom, then fill every target."""
+    print("🧪 Testing gated refills")
+    rate_limits._rate_limit_tracker_instance = RateLimitTracker()
+    with tempfile.TemporaryDirectory() as tmp:
+        calls, busy = [], [True]
+        pool = WarmPool(Path(tmp) / "pool", Path(tmp) / "games", _fake_generator(calls),
+                        prompts=[PROMPT], genres=["platformer"], size=1, is_busy=lambda: busy[0])
+
+        assert not asyncio.run(pool.refill_once())
+        assert pool.last_skip == "busy" and calls == []
+
+        busy[0] = False
+        rate_limits.get_rate_limit_tracker().observe(
+            _limit_headers(1, 10, datetime.now(timezone.utc) + timedelta(minutes=1))
+        )
+        assert not asyncio.run(pool.refill_once())
+        assert pool.last_skip.startswith("rate limit headroom")
+
+        rate_limits._rate_limit_tracker_instance = RateLimitTracker()
+        assert asyncio.run(pool.refill_once()) and asyncio.run(pool.refill_once())
+        assert not asyncio.run(pool.refill_once())
+        assert pool.last_skip == "full"
+        assert sorted(mode or "standard" for _, mode in calls) == ["skeleton", "standard"]
+        assert (pool.entries["genre:platformer"][0].path / "pool.json").is_file()
+    print("✅ Refills gated")
+
+def test_claim_and_metrics():
+    """A hit moves the game into the output directory; misses and genres are counted."""
+    print("🧪 Testing claims and metrics")
+    rate_limits._rate_limit_tracker_instance = RateLimitTracker()
+    with tempfile.TemporaryDirectory() as tmp:
+        pool = WarmPool(Path(tmp) / "pool", Path(tmp) / "games", _fake_generator([]),
+                        prompts=[PROMPT], genres=["platformer"])
+        asyncio.run(pool.refill_once())
+        asyncio.run(pool.refill_once())
+
+        entry = pool.claim("a space shooter where you dodge asteroids, and collect power-ups!")
+        assert entry.path.parent == Path(tmp) / "games"
+        assert entry.game_file == str(entry.path / "game.html")
+        assert not (entry.path / "pool.json").exists()
+        assert pool.claim(PROMPT) is None
+
+        assert pool.match("A platformer where you jump between clouds collecting stars").genre == "platformer"
+        assert pool.claim("A platformer where you jump between clouds collecting stars") is not None
+
+        metrics = pool.metrics()
+        assert (metrics["size"], metrics["capacity"]) == (0, 2)
+        assert (metrics["hits"], metrics["misses"], metrics["hit_rate"]) == (2, 1, 0.667)
+        assert metrics["refills"] == 2
+    print("✅ Claims and metrics recorded")
+
+def test_staleness_and_reload():
+    """Games survive restarts until they exceed the maximum age."""
+    print("🧪 Testing staleness eviction")
+    rate_limits._rate_limit_tracker_instance = RateLimitTracker()
+    with tempfile.TemporaryDirectory() as tmp:
+        pool = WarmPool(Path(tmp) / "pool", Path(tmp) / "games", _fake_generator([]), prompts=[PROMPT])
+        asyncio.run(pool.refill_once())
+
+        reloaded = WarmPool(Path(tmp) / "pool", Path(tmp) / "games", _fake_generator([]), prompts=[PROMPT])
+        reloaded.load()
+        assert reloaded.metrics()["size"] == 1 and reloaded.next_target() is None
+
+        entry = next(iter(reloaded.entries.values()))[0]
+        entry.created_at = time.time() - 100
+        reloaded.max_age = 50
+        assert reloaded.metrics()["oldest_age_seconds"] >= 100
+        reloaded.evict_stale()
+        assert reloaded.metrics()["size"] == 0 and reloaded.stale_evictions == 1
+        assert not entry.path.exists()
+    print("✅ Stale games evicted")
+
+def main():
+    """Run all warm pool tests."""
+    print("🚀 Warm Pool Test Suite")
+    print("=" * 50)
+    test_rate_limit_tracker()
+    test_refill_is_gated()
+    test_claim_and_metrics()
+    test_staleness_and_reload()
+    print("\n✅ All warm pool tests passed!")
+
+if __name__ == "__main__":
+    main()